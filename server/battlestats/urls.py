@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework import routers
 from warships.views import PlayerViewSet, ClanViewSet, ShipViewSet
-from warships.views import tier_data, activity_data, type_data, randoms_data, ranked_data, clan_members, clan_data, clan_battle_seasons, player_clan_battle_seasons, landing_activity_attrition, landing_clans, landing_recent_clans, landing_players, landing_recent_players, player_name_suggestions, player_summary, players_explorer, wr_distribution, player_distribution, player_correlation_distribution, db_stats, agentic_trace_dashboard, analytics_entity_view, analytics_top_entities
+from warships.views import tier_data, activity_data, type_data, randoms_data, ranked_data, clan_members, clan_data, clan_battle_seasons, player_clan_battle_seasons, landing_activity_attrition, landing_clans, landing_recent_clans, landing_players, landing_recent_players, player_name_suggestions, player_summary, players_explorer, wr_distribution, player_distribution, player_correlation_distribution, db_stats, upstream_status, crawl_telemetry, refresh_profiles, agentic_trace_dashboard, analytics_entity_view, analytics_top_entities
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -118,6 +118,18 @@ urlpatterns = [
          db_stats, name='db_stats'),
     path('api/stats',
          db_stats, name='db_stats_no_slash'),
+    path('api/upstream/status/',
+         upstream_status, name='upstream_status'),
+    path('api/upstream/status',
+         upstream_status, name='upstream_status_no_slash'),
+    path('api/crawl/telemetry/',
+         crawl_telemetry, name='crawl_telemetry'),
+    path('api/crawl/telemetry',
+         crawl_telemetry, name='crawl_telemetry_no_slash'),
+    path('api/refresh/profiles/',
+         refresh_profiles, name='refresh_profiles'),
+    path('api/refresh/profiles',
+         refresh_profiles, name='refresh_profiles_no_slash'),
     path('api/agentic/traces/',
          agentic_trace_dashboard, name='agentic_trace_dashboard'),
     path('api/agentic/traces',
@@ -118,6 +118,28 @@ TimeoutStartSec=120
 WantedBy=multi-user.target
 EOF
 
+cat > /etc/systemd/system/battlestats-celery-enrichment.service <<EOF
+[Unit]
+Description=Battlestats Celery enrichment worker
+After=network.target redis-server.service rabbitmq-server.service battlestats-gunicorn.service
+Requires=redis-server.service rabbitmq-server.service
+
+[Service]
+Type=simple
+User=${APP_USER}
+Group=${APP_USER}
+WorkingDirectory=${APP_ROOT}/current/server
+EnvironmentFile=/etc/battlestats-server.env
+EnvironmentFile=/etc/battlestats-server.secrets.env
+ExecStart=${APP_ROOT}/venv/bin/celery -A battlestats worker -Q enrichment --concurrency=2 -n enrichment@%%h -l INFO --time-limit=600 --prefetch-multiplier=1 --max-tasks-per-child=200 --without-gossip --without-mingle
+Restart=always
+RestartSec=5
+TimeoutStartSec=120
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
 cat > /etc/systemd/system/battlestats-beat.service <<EOF
 [Unit]
 Description=Battlestats Celery beat
@@ -141,11 +163,11 @@ WantedBy=multi-user.target
 EOF
 
 systemctl daemon-reload
-systemctl enable redis-server rabbitmq-server battlestats-gunicorn battlestats-celery battlestats-beat
+systemctl enable redis-server rabbitmq-server battlestats-gunicorn battlestats-celery battlestats-celery-enrichment battlestats-beat
 systemctl restart redis-server rabbitmq-server
 
 if [[ -d "${APP_ROOT}/current/server" ]]; then
-  systemctl restart battlestats-gunicorn battlestats-celery battlestats-beat
+  systemctl restart battlestats-gunicorn battlestats-celery battlestats-celery-enrichment battlestats-beat
 fi
 REMOTE
 
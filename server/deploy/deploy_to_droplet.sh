@@ -149,7 +149,7 @@ chown -R "${APP_USER}:${APP_USER}" "${REMOTE_RELEASE}"
 ln -sfn "${REMOTE_RELEASE}" "${APP_ROOT}/current"
 
 systemctl daemon-reload
-systemctl restart redis-server rabbitmq-server battlestats-gunicorn battlestats-celery battlestats-beat
+systemctl restart redis-server rabbitmq-server battlestats-gunicorn battlestats-celery battlestats-celery-enrichment battlestats-beat
 systemctl --no-pager --full status battlestats-gunicorn | sed -n '1,25p'
 
 find "${APP_ROOT}/releases" -mindepth 1 -maxdepth 1 -type d | sort | head -n -"${KEEP_RELEASES}" | xargs -r rm -rf
@@ -25,7 +25,7 @@ def main() -> int:
     parser.add_argument("--resume", action="store_true",
                         help="Skip clans already fetched")
     parser.add_argument("--dry-run", action="store_true",
-                        help="Only crawl clan list, no members")
+                        help="Only count the clan list, no members")
     parser.add_argument("--limit", type=int, default=None,
                         help="Max clans to process")
     args = parser.parse_args()
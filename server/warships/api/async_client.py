@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from warships.api import client as sync_client
+from warships.api.circuit_breaker import get_circuit_breaker
+from warships.api.metrics import record_upstream_error, record_upstream_response
+from warships.api.rate_limit import acquire_upstream_slot
+
+
+logger = logging.getLogger(__name__)
+
+# Roster-wide fan-out (one request per clan member) runs as a single event
+# loop batch over one pooled keep-alive client instead of a thread pool.
+
+ASYNC_CONCURRENCY = int(os.getenv("WG_API_ASYNC_CONCURRENCY", "16"))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF_SECONDS = 0.5
+
+ApiCall = Tuple[str, Dict[str, Any]]
+
+
+def _build_async_client(
+    concurrency: int,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    return httpx.AsyncClient(
+        transport=transport or httpx.AsyncHTTPTransport(
+            limits=limits,
+            retries=sync_client.RETRY_TOTAL,
+        ),
+        limits=limits,
+        timeout=sync_client.REQUEST_TIMEOUT_SECONDS,
+        headers={
+            "User-Agent": "battlestats/1.0",
+            "Accept": "application/json",
+        },
+    )
+
+
+async def _request_api_payload_async(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    params: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    if not sync_client.APP_ID:
+        logger.error("WG_APP_ID environment variable is not set")
+        return None
+
+    clean_endpoint, clean_params = sync_client._prepare_request(
+        endpoint, params)
+    if not sync_client._upstream_call_allowed(clean_endpoint):
+        return None
+
+    # The limiter blocks while it waits for tokens, so keep it off the loop.
+    if not await asyncio.to_thread(acquire_upstream_slot, clean_endpoint):
+        logger.error("Rate limit wait exceeded for endpoint '%s'",
+                     clean_endpoint)
+        return None
+
+    started = time.monotonic()
+    try:
+        for attempt in range(sync_client.RETRY_TOTAL + 1):
+            response = await http_client.get(
+                sync_client.BASE_URL + clean_endpoint,
+                params=clean_params,
+            )
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= sync_client.RETRY_TOTAL:
+                break
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+        response.raise_for_status()
+        payload = response.json()
+    except httpx.HTTPError as error:
+        record_upstream_error(clean_endpoint)
+        status_code = error.response.status_code if isinstance(
+            error, httpx.HTTPStatusError) else None
+        if status_code is None or status_code >= 500 or status_code == 429:
+            get_circuit_breaker().record_failure(
+                f"{type(error).__name__}: {error}")
+        logger.error("HTTP request failed for endpoint '%s': %s",
+                     clean_endpoint, error)
+        return None
+    except ValueError as error:
+        record_upstream_error(clean_endpoint)
+        get_circuit_breaker().record_failure(f"invalid JSON: {error}")
+        logger.error("Invalid JSON from endpoint '%s': %s",
+                     clean_endpoint, error)
+        return None
+
+    elapsed = time.monotonic() - started
+    get_circuit_breaker().record_success(elapsed)
+    record_upstream_response(clean_endpoint, elapsed, len(response.content))
+    validated = sync_client._validate_api_payload(clean_endpoint, payload)
+    if validated is None:
+        record_upstream_error(clean_endpoint)
+    return validated
+
+
+async def make_api_request_async(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    params: Dict[str, Any],
+) -> Optional[Any]:
+    payload = await _request_api_payload_async(http_client, endpoint, params)
+    if payload is None:
+        return None
+    return payload.get("data")
+
+
+async def make_api_request_with_meta_async(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    params: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    payload = await _request_api_payload_async(http_client, endpoint, params)
+    if payload is None:
+        return None
+
+    return sync_client._payload_with_meta(payload)
+
+
+async def _gather_api_requests(
+    calls: Sequence[ApiCall],
+    concurrency: int,
+    with_meta: bool,
+    transport: Optional[httpx.AsyncBaseTransport],
+) -> List[Optional[Any]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    request_fn = make_api_request_with_meta_async if with_meta else make_api_request_async
+
+    async with _build_async_client(concurrency, transport=transport) as http_client:
+        async def run_one(endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+            async with semaphore:
+                try:
+                    return await request_fn(http_client, endpoint, params)
+                except Exception as error:
+                    logger.error("Async request failed for endpoint '%s': %s",
+                                 endpoint, error)
+                    return None
+
+        return await asyncio.gather(*(run_one(endpoint, params) for endpoint, params in calls))
+
+
+def run_api_requests(
+    calls: Sequence[ApiCall],
+    concurrency: Optional[int] = None,
+    with_meta: bool = False,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> List[Optional[Any]]:
+    """Run a batch of upstream calls concurrently and return results in order.
+
+    Each result matches what make_api_request (or make_api_request_with_meta)
+    would return for the same call; failed calls come back as None.
+    """
+    if not calls:
+        return []
+
+    concurrency = max(1, min(concurrency or ASYNC_CONCURRENCY, len(calls)))
+    coroutine = _gather_api_requests(
+        list(calls), concurrency, with_meta, transport)
+    started = time.monotonic()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        results = asyncio.run(coroutine)
+    else:
+        # Already inside an event loop (async view); run the batch on its own
+        # loop in a worker thread, keeping the caller's priority context.
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = executor.submit(
+                context.run, asyncio.run, coroutine).result()
+
+    logger.info(
+        "Async WG API batch: %d calls, concurrency=%d, failed=%d, %.2fs",
+        len(calls),
+        concurrency,
+        sum(1 for result in results if result is None),
+        time.monotonic() - started,
+    )
+    return results
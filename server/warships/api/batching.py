@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# WG account endpoints accept up to 100 comma-separated account ids. Loaders
+# turn per-player fetches into one request per batch, either because the
+# caller primed the ids up front or because concurrent callers landed in the
+# same short collection window. A load with no other load in flight is sent
+# straight away, so single fetches never pay for the window.
+
+ACCOUNT_BATCH_MAX_SIZE = 100
+ACCOUNT_BATCH_WINDOW_SECONDS = max(
+    float(os.getenv("WG_API_BATCH_WINDOW_MS", "10")), 0.0) / 1000.0
+ACCOUNT_BATCH_WAIT_SECONDS = 60
+
+RequestFn = Callable[[str, Dict[str, Any]], Optional[Any]]
+
+_MISSING = object()
+
+
+class AccountBatchLoader:
+    """Batch per-account requests for one WG endpoint.
+
+    ``load(account_id)`` returns the caller's slice of the upstream ``data``
+    mapping (``data[str(account_id)]``), or None when the request failed or
+    the account is absent.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        request: Optional[RequestFn] = None,
+        max_batch_size: int = ACCOUNT_BATCH_MAX_SIZE,
+        window_seconds: Optional[float] = None,
+    ):
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self._request = request
+        self.max_batch_size = max(1, min(int(max_batch_size),
+                                         ACCOUNT_BATCH_MAX_SIZE))
+        self.window_seconds = ACCOUNT_BATCH_WINDOW_SECONDS if window_seconds is None else window_seconds
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._in_flight = 0
+        self._primed = threading.local()
+        self._counters = {"requests": 0, "accounts": 0, "primed_hits": 0}
+
+    def _request_chunk(self, account_ids: List[int]) -> Optional[Dict[str, Any]]:
+        if self._request is None:
+            from warships.api.client import make_api_request
+
+            request = make_api_request
+        else:
+            request = self._request
+
+        params = {**self.params,
+                  "account_id": ",".join(str(account_id) for account_id in account_ids)}
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["accounts"] += len(account_ids)
+        data = request(self.endpoint, params)
+        return data if isinstance(data, dict) else None
+
+    def load_many(self, account_ids: Iterable[Any]) -> Dict[int, Any]:
+        """Fetch many accounts, one upstream request per ``max_batch_size`` ids.
+
+        Accounts whose chunk failed are left out of the result.
+        """
+        unique_ids = list(dict.fromkeys(int(account_id)
+                          for account_id in account_ids))
+        results: Dict[int, Any] = {}
+        for start in range(0, len(unique_ids), self.max_batch_size):
+            chunk = unique_ids[start:start + self.max_batch_size]
+            data = self._request_chunk(chunk)
+            if data is None:
+                logger.warning(
+                    "Batched %s request failed for %d accounts", self.endpoint, len(chunk))
+                continue
+            for account_id in chunk:
+                results[account_id] = data.get(str(account_id))
+        return results
+
+    def prime(self, account_ids: Iterable[Any]) -> Dict[int, Any]:
+        """Prefetch accounts so later ``load`` calls on this thread skip upstream.
+
+        Primed slices are consumed on first use and stay until ``clear_primed``;
+        priming again replaces whatever was left from the previous batch.
+        Use ``primed_account_loaders`` so they are dropped when the work that
+        primed them ends.
+        """
+        results = self.load_many(account_ids)
+        self._primed.slices = dict(results)
+        return results
+
+    def clear_primed(self) -> None:
+        self._primed.slices = {}
+
+    def _take_primed(self, account_id: int) -> Any:
+        slices = getattr(self._primed, "slices", None)
+        if not slices:
+            return _MISSING
+        value = slices.pop(account_id, _MISSING)
+        if value is not _MISSING:
+            with self._lock:
+                self._counters["primed_hits"] += 1
+        return value
+
+    def load(self, account_id: Any) -> Any:
+        account_id = int(account_id)
+        primed = self._take_primed(account_id)
+        if primed is not _MISSING:
+            return primed
+
+        if self.window_seconds <= 0:
+            data = self._request_chunk([account_id])
+            return data.get(str(account_id)) if data is not None else None
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._load_batched(account_id)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _load_batched(self, account_id: int) -> Any:
+        with self._lock:
+            batch = self._pending
+            is_leader = batch is None
+            # Only hold the batch open when another load is already running;
+            # a lone load has nobody to wait for.
+            collect = is_leader and self._in_flight > 1
+            if is_leader:
+                batch = {
+                    "ids": [],
+                    "full": threading.Event(),
+                    "done": threading.Event(),
+                    "data": None,
+                }
+                self._pending = batch
+            if account_id not in batch["ids"]:
+                batch["ids"].append(account_id)
+            if len(batch["ids"]) >= self.max_batch_size:
+                # Close the batch now; later callers start a new one.
+                self._pending = None
+                batch["full"].set()
+
+        if not is_leader:
+            if not batch["done"].wait(ACCOUNT_BATCH_WAIT_SECONDS):
+                return None
+            data = batch["data"]
+            return data.get(str(account_id)) if data is not None else None
+
+        try:
+            if collect:
+                batch["full"].wait(self.window_seconds)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+            batch["data"] = self._request_chunk(list(batch["ids"]))
+        finally:
+            batch["done"].set()
+
+        data = batch["data"]
+        return data.get(str(account_id)) if data is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["endpoint"] = self.endpoint
+        counters["accounts_per_request"] = round(
+            counters["accounts"] / counters["requests"], 2) if counters["requests"] else 0.0
+        return counters
+
+
+_LOADERS: Dict[str, AccountBatchLoader] = {}
+
+
+def register_account_loader(name: str, loader: AccountBatchLoader) -> AccountBatchLoader:
+    _LOADERS[name] = loader
+    return loader
+
+
+def get_account_loader(name: str) -> AccountBatchLoader:
+    return _LOADERS[name]
+
+
+@contextmanager
+def primed_account_loaders(names: Iterable[str], account_ids: Iterable[Any]) -> Iterator[None]:
+    """Prime several registered loaders for the same accounts for the duration of the block.
+
+    Unused slices are dropped on exit so a later task or request on the same
+    worker thread never reads them.
+    """
+    loaders = [_LOADERS[name] for name in names]
+    account_ids = list(account_ids)
+    try:
+        if account_ids:
+            for loader in loaders:
+                loader.prime(account_ids)
+        yield
+    finally:
+        for loader in loaders:
+            loader.clear_primed()
+
+
+def get_account_batching_stats() -> Dict[str, Any]:
+    return {name: loader.stats() for name, loader in sorted(_LOADERS.items())}
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+# Shared (cache-backed) breaker around upstream WG calls. After repeated
+# errors or slow responses it opens: upstream calls fail fast and request
+# paths serve stored data while refreshes are queued for later. After the
+# cool-down a single probe call is let through (half-open); its outcome
+# closes the breaker or re-opens it.
+
+BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("WG_API_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_FAILURE_WINDOW_SECONDS = int(
+    os.getenv("WG_API_BREAKER_FAILURE_WINDOW_SECONDS", "60"))
+BREAKER_OPEN_SECONDS = int(os.getenv("WG_API_BREAKER_OPEN_SECONDS", "30"))
+BREAKER_SLOW_CALL_SECONDS = float(
+    os.getenv("WG_API_BREAKER_SLOW_CALL_SECONDS", "8"))
+BREAKER_KEY_PREFIX = "warships:wg_api:breaker"
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Client errors (4xx other than 429) say nothing about upstream health."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status_code = error.response.status_code
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+class UpstreamCircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        failure_window_seconds: int = BREAKER_FAILURE_WINDOW_SECONDS,
+        open_seconds: int = BREAKER_OPEN_SECONDS,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        key_prefix: str = BREAKER_KEY_PREFIX,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.failure_window_seconds = max(1, int(failure_window_seconds))
+        self.open_seconds = max(1, int(open_seconds))
+        self.slow_call_seconds = float(slow_call_seconds)
+        self._clock = clock
+        self._state_key = f"{key_prefix}:state"
+        self._failures_key = f"{key_prefix}:failures"
+        self._probe_key = f"{key_prefix}:probe"
+        self._counter_keys = {
+            name: f"{key_prefix}:stats:{name}"
+            for name in ("trips", "rejected", "failures", "slow_calls")
+        }
+
+    def _incr(self, key: str, timeout: Optional[int] = None) -> int:
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add and incr.
+            cache.add(key, 1, timeout=timeout)
+            return 1
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            stored = cache.get(self._state_key)
+        except Exception as error:
+            logger.debug("Unable to read circuit breaker state: %s", error)
+            stored = None
+        return stored if isinstance(stored, dict) else {"state": STATE_CLOSED}
+
+    def state(self) -> str:
+        stored = self._read_state()
+        if stored.get("state") != STATE_OPEN:
+            return STATE_CLOSED
+        if self._clock() - float(stored.get("opened_at") or 0) >= self.open_seconds:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    def is_open(self) -> bool:
+        """True while upstream is considered unhealthy, including half-open."""
+        return self.state() != STATE_CLOSED
+
+    def retry_after_seconds(self) -> int:
+        stored = self._read_state()
+        if stored.get("state") != STATE_OPEN:
+            return 0
+        remaining = self.open_seconds - \
+            (self._clock() - float(stored.get("opened_at") or 0))
+        return max(int(remaining + 0.999), 1)
+
+    def allow_request(self) -> bool:
+        try:
+            state = self.state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and cache.add(self._probe_key, 1, timeout=self.open_seconds):
+                logger.info("WG API circuit breaker half-open: sending probe")
+                return True
+            self._incr(self._counter_keys["rejected"])
+            return False
+        except Exception as error:
+            logger.debug("Circuit breaker unavailable, allowing call: %s", error)
+            return True
+
+    def record_success(self, elapsed_seconds: float = 0.0) -> None:
+        if elapsed_seconds >= self.slow_call_seconds:
+            self._safe(self._incr, self._counter_keys["slow_calls"])
+            self.record_failure(f"slow call ({elapsed_seconds:.1f}s)")
+            return
+
+        try:
+            if self._read_state().get("state") == STATE_OPEN:
+                cache.delete_many([self._state_key, self._probe_key])
+                logger.warning("WG API circuit breaker closed")
+            cache.delete(self._failures_key)
+        except Exception as error:
+            logger.debug("Unable to record circuit breaker success: %s", error)
+
+    def record_failure(self, reason: str = "") -> None:
+        try:
+            self._incr(self._counter_keys["failures"])
+            if self.state() == STATE_HALF_OPEN:
+                self._trip(reason or "probe failed")
+                return
+
+            failures = self._incr(
+                self._failures_key, timeout=self.failure_window_seconds)
+            if failures >= self.failure_threshold:
+                self._trip(reason)
+        except Exception as error:
+            logger.debug("Unable to record circuit breaker failure: %s", error)
+
+    def _trip(self, reason: str) -> None:
+        cache.set(self._state_key, {
+            "state": STATE_OPEN,
+            "opened_at": self._clock(),
+            "reason": reason,
+        }, timeout=None)
+        cache.delete_many([self._failures_key, self._probe_key])
+        self._incr(self._counter_keys["trips"])
+        logger.warning(
+            "WG API circuit breaker opened for %ss: %s", self.open_seconds, reason)
+
+    def _safe(self, fn: Callable[..., Any], *args: Any) -> None:
+        try:
+            fn(*args)
+        except Exception as error:
+            logger.debug("Circuit breaker cache error: %s", error)
+
+    def stats(self) -> Dict[str, Any]:
+        stored = self._read_state()
+        try:
+            raw = cache.get_many(
+                [self._failures_key, *self._counter_keys.values()])
+        except Exception as error:
+            logger.warning("Unable to read circuit breaker stats: %s", error)
+            raw = {}
+
+        return {
+            "state": self.state(),
+            "opened_at": stored.get("opened_at") if stored.get("state") == STATE_OPEN else None,
+            "last_trip_reason": stored.get("reason"),
+            "retry_after_seconds": self.retry_after_seconds(),
+            "recent_failures": int(raw.get(self._failures_key) or 0),
+            "failure_threshold": self.failure_threshold,
+            "open_seconds": self.open_seconds,
+            "slow_call_seconds": self.slow_call_seconds,
+            **{
+                name: int(raw.get(counter_key) or 0)
+                for name, counter_key in self._counter_keys.items()
+            },
+        }
+
+
+@lru_cache(maxsize=1)
+def get_circuit_breaker() -> UpstreamCircuitBreaker:
+    return UpstreamCircuitBreaker()
+
+
+def upstream_degraded() -> bool:
+    """Request paths check this before falling through to a synchronous fetch."""
+    return get_circuit_breaker().is_open()
+
+
+def get_circuit_breaker_stats() -> Dict[str, Any]:
+    return get_circuit_breaker().stats()
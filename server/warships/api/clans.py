@@ -1,10 +1,18 @@
 from typing import Dict, List, Optional
 import logging
 
+from warships.api.async_client import run_api_requests
+from warships.api.batching import AccountBatchLoader, register_account_loader
 from warships.api.client import make_api_request
 
 logging.basicConfig(level=logging.INFO)
 
+CLAN_MEMBERSHIP_LOADER = register_account_loader("clan_membership", AccountBatchLoader(
+    "clans/accountinfo/",
+    {"extra": "clan", "fields": "account_id,account_name,clan_id,clan"},
+    request=lambda endpoint, params: _make_api_request(endpoint, params),
+))
+
 
 def _fetch_clan_data(clan_id: str) -> Dict:
     """Fetch clan info for a given player_id."""
@@ -47,6 +55,23 @@ def _fetch_clan_battle_season_stats(account_id: int) -> Dict:
     return data.get(str(account_id), {}) if data else {}
 
 
+def _fetch_clan_battle_season_stats_many(account_ids: List[int]) -> Dict[int, Dict]:
+    """Fetch clan battle season stats for many accounts in one async batch."""
+    if not account_ids:
+        return {}
+
+    logging.info(
+        f' ---> Remote fetching clan battle season stats for {len(account_ids)} accounts')
+    results = run_api_requests([
+        ("clans/seasonstats/", {"account_id": account_id})
+        for account_id in account_ids
+    ])
+    return {
+        account_id: data.get(str(account_id), {}) if isinstance(data, dict) else {}
+        for account_id, data in zip(account_ids, results)
+    }
+
+
 def _fetch_player_data_from_list(players: List[int]) -> Dict:
     """Fetch all player data for a given list of player ids."""
     member_list = ','.join(map(str, players))
@@ -61,15 +86,10 @@ def _fetch_player_data_from_list(players: List[int]) -> Dict:
 
 def _fetch_clan_membership_for_player(player_id: int) -> Dict:
     """Fetch clan membership data for a given player account id."""
-    params = {
-        "account_id": player_id,
-        "extra": "clan",
-        "fields": "account_id,account_name,clan_id,clan"
-    }
     logging.info(
         f' ---> Remote fetching clan membership for player_id: {player_id}')
-    data = _make_api_request("clans/accountinfo/", params)
-    return data.get(str(player_id), {}) if data else {}
+    data = CLAN_MEMBERSHIP_LOADER.load(player_id)
+    return data if isinstance(data, dict) else {}
 
 
 def _make_api_request(endpoint: str, params: Dict) -> Optional[Dict]:
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import logging
 import os
+import threading
+import time
 from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
+import ijson
 import requests
+import urllib3
+from django.conf import settings
+from django.core.cache import cache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from warships.api.circuit_breaker import get_circuit_breaker, is_upstream_failure
+from warships.api.metrics import record_upstream_error, record_upstream_response
+from warships.api.rate_limit import acquire_upstream_slot
+
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +32,33 @@ BASE_URL = os.getenv(
 APP_ID = os.getenv("WG_APP_ID")
 REQUEST_TIMEOUT_SECONDS = int(os.getenv("WG_REQUEST_TIMEOUT_SECONDS", "20"))
 RETRY_TOTAL = int(os.getenv("WG_API_RETRY_TOTAL", "2"))
+# Connections kept alive per upstream host. Size it to the number of threads
+# that call upstream concurrently in one process (crawl workers included).
+POOL_SIZE = int(os.getenv("WG_API_POOL_SIZE", "20"))
 
+# Identical concurrent requests share one upstream call: in-process through a
+# per-key flight, across processes through a short cache lock + result key.
+SINGLE_FLIGHT_ENABLED = os.getenv(
+    "WG_API_SINGLE_FLIGHT_ENABLED", "1").lower() not in ("0", "false", "no")
+SINGLE_FLIGHT_LOCK_SECONDS = int(os.getenv(
+    "WG_API_SINGLE_FLIGHT_LOCK_SECONDS", str(REQUEST_TIMEOUT_SECONDS + 10)))
+SINGLE_FLIGHT_RESULT_TTL_SECONDS = int(
+    os.getenv("WG_API_SINGLE_FLIGHT_RESULT_TTL_SECONDS", "5"))
+SINGLE_FLIGHT_POLL_SECONDS = 0.05
+SINGLE_FLIGHT_KEY_PREFIX = "warships:wg_api:single_flight"
+SINGLE_FLIGHT_COUNTER_KEYS = {
+    "upstream_calls": f"{SINGLE_FLIGHT_KEY_PREFIX}:stats:upstream_calls",
+    "saved_in_process": f"{SINGLE_FLIGHT_KEY_PREFIX}:stats:saved_in_process",
+    "saved_shared": f"{SINGLE_FLIGHT_KEY_PREFIX}:stats:saved_shared",
+}
 
-@lru_cache(maxsize=1)
-def _get_session() -> requests.Session:
+_flights: Dict[str, Dict[str, Any]] = {}
+_flights_lock = threading.Lock()
+_single_flight_counters = {name: 0 for name in SINGLE_FLIGHT_COUNTER_KEYS}
+
+
+@lru_cache(maxsize=None)
+def _session_for_process(pid: int) -> requests.Session:
     session = requests.Session()
     retries = Retry(
         total=RETRY_TOTAL,
@@ -35,7 +70,11 @@ def _get_session() -> requests.Session:
         allowed_methods=frozenset(["GET"]),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=retries,
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     session.headers.update({
@@ -45,16 +84,67 @@ def _get_session() -> requests.Session:
     return session
 
 
-def _request_api_payload(endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    if not APP_ID:
-        logger.error("WG_APP_ID environment variable is not set")
-        return None
+def _get_session() -> requests.Session:
+    # Keyed by pid so forked workers never share a parent's pooled sockets.
+    return _session_for_process(os.getpid())
+
 
+def _prepare_request(endpoint: str, params: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
     clean_endpoint = endpoint.lstrip("/")
     clean_params = {key: value for key,
                     value in params.items() if value is not None}
     clean_params.setdefault("application_id", APP_ID)
+    return clean_endpoint, clean_params
+
+
+def _validate_api_payload(clean_endpoint: str, payload: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(payload, dict):
+        logger.error(
+            "Unexpected non-dict API response for endpoint '%s'", clean_endpoint)
+        return None
+
+    if payload.get("status") != "ok":
+        logger.error("Error in response for endpoint '%s': %s",
+                     clean_endpoint, payload)
+        return None
 
+    data = payload.get("data")
+    if data is None:
+        logger.error("Missing data payload for endpoint '%s'", clean_endpoint)
+        return None
+
+    return payload
+
+
+def _payload_with_meta(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "data": payload.get("data"),
+        "meta": payload.get("meta") or {},
+    }
+
+
+def _upstream_call_allowed(clean_endpoint: str) -> bool:
+    if get_circuit_breaker().allow_request():
+        return True
+    logger.warning(
+        "Circuit breaker open; skipping upstream call for endpoint '%s'", clean_endpoint)
+    return False
+
+
+def _record_upstream_error(clean_endpoint: str, error: BaseException) -> None:
+    record_upstream_error(clean_endpoint)
+    if is_upstream_failure(error):
+        get_circuit_breaker().record_failure(
+            f"{type(error).__name__}: {error}")
+
+
+def _fetch_api_payload(clean_endpoint: str, clean_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not acquire_upstream_slot(clean_endpoint):
+        logger.error("Rate limit wait exceeded for endpoint '%s'",
+                     clean_endpoint)
+        return None
+
+    started = time.monotonic()
     try:
         response = _get_session().get(
             BASE_URL + clean_endpoint,
@@ -64,30 +154,190 @@ def _request_api_payload(endpoint: str, params: Dict[str, Any]) -> Optional[Dict
         response.raise_for_status()
         payload = response.json()
     except requests.RequestException as error:
+        _record_upstream_error(clean_endpoint, error)
         logger.error("HTTP request failed for endpoint '%s': %s",
                      clean_endpoint, error)
         return None
     except ValueError as error:
+        _record_upstream_error(clean_endpoint, error)
         logger.error("Invalid JSON from endpoint '%s': %s",
                      clean_endpoint, error)
         return None
 
-    if not isinstance(payload, dict):
-        logger.error(
-            "Unexpected non-dict API response for endpoint '%s'", clean_endpoint)
-        return None
+    elapsed = time.monotonic() - started
+    get_circuit_breaker().record_success(elapsed)
+    record_upstream_response(
+        clean_endpoint, elapsed, len(response.content or b""))
+    validated = _validate_api_payload(clean_endpoint, payload)
+    if validated is None:
+        record_upstream_error(clean_endpoint)
+    return validated
 
-    if payload.get("status") != "ok":
-        logger.error("Error in response for endpoint '%s': %s",
-                     clean_endpoint, payload)
+
+def _normalize_param_value(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)):
+        value = ",".join(str(item) for item in value)
+    text = str(value)
+    if "," in text:
+        # Id and field lists are order-insensitive upstream.
+        text = ",".join(sorted(part.strip() for part in text.split(",")))
+    return text
+
+
+def _single_flight_key(clean_endpoint: str, clean_params: Dict[str, Any]) -> str:
+    normalized = "&".join(
+        f"{key}={_normalize_param_value(clean_params[key])}"
+        for key in sorted(clean_params)
+        if key != "application_id"
+    )
+    digest = hashlib.sha1(
+        f"{clean_endpoint}?{normalized}".encode("utf-8")).hexdigest()
+    return f"{SINGLE_FLIGHT_KEY_PREFIX}:{digest}"
+
+
+def _shared_single_flight_enabled() -> bool:
+    return not getattr(settings, "RUNNING_TESTS", False)
+
+
+def _record_single_flight(counter: str) -> None:
+    with _flights_lock:
+        _single_flight_counters[counter] += 1
+
+    if not _shared_single_flight_enabled():
+        return
+
+    counter_key = SINGLE_FLIGHT_COUNTER_KEYS[counter]
+    try:
+        if not cache.add(counter_key, 1, timeout=None):
+            cache.incr(counter_key)
+    except Exception as error:
+        logger.debug("Unable to record single-flight stats: %s", error)
+
+
+def _fetch_api_payload_shared(key: str, clean_endpoint: str, clean_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    lock_key = f"{key}:lock"
+    result_key = f"{key}:result"
+
+    try:
+        payload = cache.get(result_key)
+        if payload is not None:
+            _record_single_flight("saved_shared")
+            return payload
+
+        is_leader = cache.add(
+            lock_key, 1, timeout=SINGLE_FLIGHT_LOCK_SECONDS)
+    except Exception as error:
+        logger.warning(
+            "Single-flight cache unavailable for endpoint '%s': %s", clean_endpoint, error)
+        is_leader = None
+
+    if is_leader is False:
+        deadline = time.monotonic() + SINGLE_FLIGHT_LOCK_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(SINGLE_FLIGHT_POLL_SECONDS)
+                payload = cache.get(result_key)
+                if payload is not None:
+                    _record_single_flight("saved_shared")
+                    return payload
+                if cache.get(lock_key) is None:
+                    break
+        except Exception as error:
+            logger.warning(
+                "Single-flight wait failed for endpoint '%s': %s", clean_endpoint, error)
+        # The other process failed or timed out; fetch for ourselves.
+        _record_single_flight("upstream_calls")
+        return _fetch_api_payload(clean_endpoint, clean_params)
+
+    _record_single_flight("upstream_calls")
+    payload = _fetch_api_payload(clean_endpoint, clean_params)
+    if is_leader:
+        try:
+            if payload is not None:
+                cache.set(result_key, payload,
+                          SINGLE_FLIGHT_RESULT_TTL_SECONDS)
+            cache.delete(lock_key)
+        except Exception as error:
+            logger.warning(
+                "Unable to publish single-flight result for endpoint '%s': %s", clean_endpoint, error)
+    return payload
+
+
+def _request_api_payload(endpoint: str, params: Dict[str, Any], coalesce: bool = True) -> Optional[Dict[str, Any]]:
+    if not APP_ID:
+        logger.error("WG_APP_ID environment variable is not set")
         return None
 
-    data = payload.get("data")
-    if data is None:
-        logger.error("Missing data payload for endpoint '%s'", clean_endpoint)
+    clean_endpoint, clean_params = _prepare_request(endpoint, params)
+    if not _upstream_call_allowed(clean_endpoint):
         return None
+    if not SINGLE_FLIGHT_ENABLED or not coalesce:
+        return _fetch_api_payload(clean_endpoint, clean_params)
 
-    return payload
+    key = _single_flight_key(clean_endpoint, clean_params)
+    with _flights_lock:
+        flight = _flights.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = {"done": threading.Event(),
+                      "payload": None, "waiters": 0}
+            _flights[key] = flight
+        else:
+            flight["waiters"] += 1
+
+    if not is_leader:
+        if flight["done"].wait(SINGLE_FLIGHT_LOCK_SECONDS):
+            _record_single_flight("saved_in_process")
+            # Each caller gets its own copy; payloads are mutated downstream.
+            return copy.deepcopy(flight["payload"])
+        _record_single_flight("upstream_calls")
+        return _fetch_api_payload(clean_endpoint, clean_params)
+
+    payload = None
+    try:
+        if _shared_single_flight_enabled():
+            payload = _fetch_api_payload_shared(
+                key, clean_endpoint, clean_params)
+        else:
+            _record_single_flight("upstream_calls")
+            payload = _fetch_api_payload(clean_endpoint, clean_params)
+        return payload
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+            if flight["waiters"]:
+                flight["payload"] = copy.deepcopy(payload)
+        flight["done"].set()
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    with _flights_lock:
+        process_counters = dict(_single_flight_counters)
+        in_flight = len(_flights)
+
+    shared_counters = None
+    if _shared_single_flight_enabled():
+        try:
+            raw = cache.get_many(list(SINGLE_FLIGHT_COUNTER_KEYS.values()))
+            shared_counters = {
+                name: int(raw.get(counter_key) or 0)
+                for name, counter_key in SINGLE_FLIGHT_COUNTER_KEYS.items()
+            }
+        except Exception as error:
+            logger.warning("Unable to read single-flight stats: %s", error)
+
+    def summarize(counters: Dict[str, int]) -> Dict[str, int]:
+        return {
+            **counters,
+            "saved_calls": counters["saved_in_process"] + counters["saved_shared"],
+        }
+
+    return {
+        "enabled": SINGLE_FLIGHT_ENABLED,
+        "in_flight": in_flight,
+        "process": summarize(process_counters),
+        "shared": summarize(shared_counters) if shared_counters is not None else None,
+    }
 
 
 def make_api_request(endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
@@ -97,12 +347,124 @@ def make_api_request(endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
     return payload.get("data")
 
 
-def make_api_request_with_meta(endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    payload = _request_api_payload(endpoint, params)
+def make_api_request_with_meta(endpoint: str, params: Dict[str, Any], coalesce: bool = True) -> Optional[Dict[str, Any]]:
+    """Like make_api_request, but keeps the response ``meta`` block.
+
+    Pass ``coalesce=False`` for requests that are never issued twice (crawl
+    pages), to skip the single-flight bookkeeping.
+    """
+    payload = _request_api_payload(endpoint, params, coalesce=coalesce)
     if payload is None:
         return None
 
+    return _payload_with_meta(payload)
+
+
+class _RowBuildError(ValueError):
+    """``build_row`` rejected a streamed item; reported like invalid JSON."""
+
+
+class _CountingReader:
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def stream_api_rows(
+    endpoint: str,
+    params: Dict[str, Any],
+    rows_prefix: str,
+    build_row: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    """Parse one array of a large payload incrementally into compact rows.
+
+    ``rows_prefix`` is the ijson path of the array items (for example
+    ``data.1001.item``). Each item is built on its own and handed to
+    ``build_row``; only the returned compact rows are kept, so the full
+    nested response never exists in memory. Returns ``{"rows", "bytes",
+    "decoded_bytes"}`` or None on the same failures make_api_request
+    reports. Streamed calls bypass single-flight coalescing.
+    """
+    if not APP_ID:
+        logger.error("WG_APP_ID environment variable is not set")
+        return None
+
+    clean_endpoint, clean_params = _prepare_request(endpoint, params)
+    if not _upstream_call_allowed(clean_endpoint):
+        return None
+    if not acquire_upstream_slot(clean_endpoint):
+        logger.error("Rate limit wait exceeded for endpoint '%s'",
+                     clean_endpoint)
+        return None
+
+    started = time.monotonic()
+    status = None
+    has_data = False
+    rows = []
+    builder = None
+    try:
+        with _get_session().get(
+            BASE_URL + clean_endpoint,
+            params=clean_params,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            reader = _CountingReader(response.raw)
+            for prefix, event, value in ijson.parse(reader, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == rows_prefix and event == "end_map":
+                        try:
+                            row = build_row(builder.value)
+                        except Exception as error:
+                            raise _RowBuildError(
+                                f"{type(error).__name__}: {error}") from error
+                        if row is not None:
+                            rows.append(row)
+                        builder = None
+                elif prefix == rows_prefix and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == "status":
+                    status = value
+                elif prefix == "data" and event == "start_map":
+                    has_data = True
+            wire_bytes = response.raw.tell()
+    # The body is read straight from urllib3, so mid-stream failures surface
+    # as urllib3 or socket errors rather than requests exceptions.
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as error:
+        _record_upstream_error(clean_endpoint, error)
+        logger.error("HTTP request failed for endpoint '%s': %s",
+                     clean_endpoint, error)
+        return None
+    except (ijson.JSONError, ValueError) as error:
+        _record_upstream_error(clean_endpoint, error)
+        logger.error("Invalid payload from endpoint '%s': %s",
+                     clean_endpoint, error)
+        return None
+
+    elapsed = time.monotonic() - started
+    get_circuit_breaker().record_success(elapsed)
+    record_upstream_response(clean_endpoint, elapsed, wire_bytes)
+    if status != "ok":
+        record_upstream_error(clean_endpoint)
+        logger.error("Error in response for endpoint '%s': status=%s",
+                     clean_endpoint, status)
+        return None
+    if not has_data:
+        record_upstream_error(clean_endpoint)
+        logger.error("Missing data payload for endpoint '%s'", clean_endpoint)
+        return None
+
     return {
-        "data": payload.get("data"),
-        "meta": payload.get("meta") or {},
+        "rows": rows,
+        "bytes": wire_bytes,
+        "decoded_bytes": reader.bytes_read,
     }
@@ -0,0 +1,639 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+# Local stand-in for the WG API so ingestion paths can be benchmarked and
+# exercised without network access. Payloads are synthetic and deterministic
+# per id (same id, same payload), unless a recorded envelope for the endpoint
+# is found in ``recordings_dir`` as ``<endpoint with / replaced by _>.json``
+# (e.g. ``ships_stats.json``). Latency, 5xx errors and 429s can be injected.
+
+SHIP_ID_BASE = 4_000_000_000
+CLAN_ID_BASE = 500_000_000
+ACCOUNT_ID_BASE = 1_000_000_000
+SHIP_TYPES = ("Destroyer", "Cruiser", "Battleship", "AirCarrier", "Submarine")
+SHIP_NATIONS = ("usa", "japan", "germany", "uk", "ussr", "france", "italy")
+RANKED_SEASON_IDS = tuple(range(1010, 1022))
+CLAN_BATTLE_SEASON_IDS = tuple(range(20, 32))
+ACHIEVEMENT_CODES = (
+    "PCH001_DoubleKill",
+    "PCH003_MainCaliber",
+    "PCH004_Dreadnought",
+    "PCH005_Support",
+    "PCH011_InstantKill",
+    "PCH016_FirstBlood",
+    "PCH020_ATBACaliber",
+    "PCH031_EarningMoney1",
+)
+
+
+class FakeUpstreamConfig:
+    def __init__(
+        self,
+        clan_count: int = 200,
+        members_per_clan: int = 30,
+        ship_count: int = 120,
+        ships_per_player: int = 40,
+        hidden_rate: float = 0.05,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int = 0,
+        recordings_dir: Optional[Path] = None,
+    ):
+        self.clan_count = max(int(clan_count), 0)
+        self.members_per_clan = max(int(members_per_clan), 0)
+        self.ship_count = max(int(ship_count), 1)
+        self.ships_per_player = min(
+            max(int(ships_per_player), 0), self.ship_count)
+        self.hidden_rate = min(max(float(hidden_rate), 0.0), 1.0)
+        self.latency_ms = max(float(latency_ms), 0.0)
+        self.latency_jitter_ms = max(float(latency_jitter_ms), 0.0)
+        self.error_rate = min(max(float(error_rate), 0.0), 1.0)
+        self.throttle_rate = min(max(float(throttle_rate), 0.0), 1.0)
+        self.seed = int(seed)
+        self.recordings_dir = Path(
+            recordings_dir) if recordings_dir else None
+
+
+def _csv_ints(value: Optional[str]) -> List[int]:
+    ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part.lstrip("-").isdigit():
+            ids.append(int(part))
+    return ids
+
+
+def _project(record: Any, fields: List[str]) -> Any:
+    """Apply WG ``fields`` selection (``a,b.c``) to one record."""
+    if not fields or not isinstance(record, dict):
+        return record
+
+    wanted: Dict[str, Optional[set]] = {}
+    for path in fields:
+        head, _, rest = path.partition(".")
+        if not rest:
+            wanted[head] = None
+        elif wanted.get(head, set()) is not None:
+            wanted.setdefault(head, set()).add(rest.partition(".")[0])
+
+    projected = {}
+    for key, subkeys in wanted.items():
+        if key not in record:
+            continue
+        value = record[key]
+        if subkeys and isinstance(value, dict) and subkeys & value.keys():
+            value = {sub: value[sub] for sub in subkeys if sub in value}
+        projected[key] = value
+    return projected
+
+
+class SyntheticWorld:
+    """Deterministic clans, players and ships behind the fake endpoints."""
+
+    def __init__(self, config: FakeUpstreamConfig):
+        self.config = config
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.ship_ids = [SHIP_ID_BASE + index *
+                         32 for index in range(config.ship_count)]
+
+    def _rng(self, *parts: Any) -> random.Random:
+        return random.Random(":".join(str(part) for part in (self.config.seed, *parts)))
+
+    def _ts(self, days_ago: float) -> int:
+        return int((self.now - timedelta(days=days_ago)).timestamp())
+
+    def clan_ids(self) -> List[int]:
+        return [CLAN_ID_BASE + index for index in range(self.config.clan_count)]
+
+    def member_ids(self, clan_id: int) -> List[int]:
+        index = clan_id - CLAN_ID_BASE
+        if not 0 <= index < self.config.clan_count:
+            return []
+        first = ACCOUNT_ID_BASE + index * self.config.members_per_clan
+        return list(range(first, first + self.config.members_per_clan))
+
+    def clan_of(self, account_id: int) -> Optional[int]:
+        index = account_id - ACCOUNT_ID_BASE
+        if index < 0 or not self.config.members_per_clan:
+            return None
+        clan_index = index // self.config.members_per_clan
+        if clan_index >= self.config.clan_count:
+            return None
+        return CLAN_ID_BASE + clan_index
+
+    def is_hidden(self, account_id: int) -> bool:
+        return self._rng("hidden", account_id).random() < self.config.hidden_rate
+
+    def player_ships(self, account_id: int) -> List[int]:
+        return sorted(self._rng("ships", account_id).sample(self.ship_ids, self.config.ships_per_player))
+
+    def ship(self, ship_id: int) -> Optional[Dict[str, Any]]:
+        if ship_id not in self.ship_ids:
+            return None
+        index = self.ship_ids.index(ship_id)
+        rng = self._rng("ship", ship_id)
+        return {
+            "ship_id": ship_id,
+            "ship_id_str": f"PSHIP{index:04d}",
+            "name": f"Synthetic {SHIP_TYPES[index % len(SHIP_TYPES)]} {index}",
+            "description": None,
+            "nation": SHIP_NATIONS[index % len(SHIP_NATIONS)],
+            "tier": index % 11 + 1,
+            "type": SHIP_TYPES[index % len(SHIP_TYPES)],
+            "is_premium": rng.random() < 0.2,
+            "is_special": False,
+            "mod_slots": 6,
+        }
+
+    def clan(self, clan_id: int) -> Optional[Dict[str, Any]]:
+        index = clan_id - CLAN_ID_BASE
+        if not 0 <= index < self.config.clan_count:
+            return None
+        members = self.member_ids(clan_id)
+        return {
+            "clan_id": clan_id,
+            "tag": f"C{index:05d}",
+            "name": f"Synthetic Clan {index}",
+            "description": "",
+            "members_count": len(members),
+            "members_ids": members,
+            "leader_id": members[0] if members else None,
+            "leader_name": f"player_{members[0]}" if members else "",
+            "created_at": self._ts(900 + index % 365),
+        }
+
+    def account(self, account_id: int) -> Optional[Dict[str, Any]]:
+        if self.clan_of(account_id) is None:
+            return None
+        rng = self._rng("account", account_id)
+        record = {
+            "account_id": account_id,
+            "nickname": f"player_{account_id}",
+            "created_at": self._ts(400 + rng.randint(0, 3000)),
+            "last_battle_time": self._ts(rng.uniform(0, 20)),
+            "updated_at": self._ts(rng.uniform(0, 2)),
+            "stats_updated_at": self._ts(rng.uniform(0, 2)),
+            "hidden_profile": self.is_hidden(account_id),
+            "leveling_tier": 15,
+            "karma": rng.randint(0, 500),
+        }
+        if record["hidden_profile"]:
+            record["statistics"] = None
+            return record
+        battles = rng.randint(200, 20000)
+        wins = int(battles * rng.uniform(0.42, 0.62))
+        record["statistics"] = {
+            "battles": battles + rng.randint(0, 500),
+            "distance": battles * 90,
+            "pvp": {
+                "battles": battles,
+                "wins": wins,
+                "losses": battles - wins - rng.randint(0, battles // 50),
+                "survived_battles": int(battles * rng.uniform(0.25, 0.45)),
+                "survived_wins": int(wins * 0.5),
+                "frags": int(battles * rng.uniform(0.4, 1.2)),
+                "damage_dealt": battles * rng.randint(20000, 80000),
+                "xp": battles * rng.randint(900, 1600),
+                "max_xp": rng.randint(2000, 5000),
+            },
+        }
+        return record
+
+    def ship_stats(self, account_id: int) -> Optional[List[Dict[str, Any]]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rows = []
+        for ship_id in self.player_ships(account_id):
+            rng = self._rng("ship_stats", account_id, ship_id)
+            battles = rng.randint(1, 800)
+            wins = int(battles * rng.uniform(0.35, 0.7))
+            rows.append({
+                "ship_id": ship_id,
+                "account_id": account_id,
+                "battles": battles + rng.randint(0, 40),
+                "distance": battles * rng.randint(60, 120),
+                "last_battle_time": self._ts(rng.uniform(0, 60)),
+                "updated_at": self._ts(rng.uniform(0, 60)),
+                "private": None,
+                "pvp": {
+                    "battles": battles,
+                    "wins": wins,
+                    "losses": battles - wins,
+                    "frags": int(battles * rng.uniform(0.3, 1.5)),
+                    "survived_battles": int(battles * rng.uniform(0.2, 0.5)),
+                    "damage_dealt": battles * rng.randint(15000, 90000),
+                    "xp": battles * rng.randint(800, 1800),
+                    "max_xp": rng.randint(1500, 4000),
+                    "max_frags_battle": rng.randint(1, 7),
+                    "main_battery": {"hits": battles * 40, "shots": battles * 140, "frags": battles // 3},
+                    "torpedoes": {"hits": battles * 2, "shots": battles * 12, "frags": battles // 10},
+                },
+            })
+        return rows
+
+    def badges(self, account_id: int) -> Optional[List[Dict[str, Any]]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("badges", account_id)
+        return [
+            {"ship_id": ship_id, "top_grade_class": rng.randint(1, 4)}
+            for ship_id in self.player_ships(account_id)
+            if rng.random() < 0.4
+        ]
+
+    def achievements(self, account_id: int) -> Optional[Dict[str, Any]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("achievements", account_id)
+        return {
+            "battle": {code: rng.randint(0, 300) for code in ACHIEVEMENT_CODES},
+            "progress": {"PCH031_EarningMoney1": rng.randint(0, 5)},
+        }
+
+    def _ranked_sprint(self, rng: random.Random) -> Dict[str, int]:
+        battles = rng.randint(5, 150)
+        return {
+            "battles": battles,
+            "victories": rng.randint(0, battles),
+            "rank": rng.randint(1, 10),
+            "best_rank_in_sprint": rng.randint(1, 10),
+        }
+
+    def rank_info(self, account_id: int) -> Optional[Dict[str, Any]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("ranked", account_id)
+        seasons = [season_id for season_id in RANKED_SEASON_IDS if rng.random() < 0.4]
+        return {
+            "account_id": account_id,
+            "rank_info": {
+                str(season_id): {"1": {str(rng.randint(1, 3)): self._ranked_sprint(rng)}}
+                for season_id in seasons
+            } or None,
+        }
+
+    def ranked_ship_stats(self, account_id: int, season_ids: List[int]) -> Optional[List[Dict[str, Any]]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("ranked_ships", account_id)
+        seasons = season_ids or list(RANKED_SEASON_IDS)
+        return [
+            {
+                "ship_id": ship_id,
+                "seasons": {
+                    str(season_id): {"rank_solo": {"battles": rng.randint(0, 60), "wins": rng.randint(0, 30)}}
+                    for season_id in seasons
+                },
+            }
+            for ship_id in self.player_ships(account_id)[:8]
+        ]
+
+    def clan_battle_stats(self, account_id: int) -> Optional[Dict[str, Any]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("clan_battles", account_id)
+        seasons = []
+        for season_id in CLAN_BATTLE_SEASON_IDS:
+            if rng.random() < 0.3:
+                battles = rng.randint(1, 80)
+                wins = rng.randint(0, battles)
+                seasons.append({"season_id": season_id, "battles": battles,
+                               "wins": wins, "losses": battles - wins})
+        return {"account_id": account_id, "seasons": seasons}
+
+    def stats_by_date(self, account_id: int) -> Optional[Dict[str, Any]]:
+        if self.clan_of(account_id) is None or self.is_hidden(account_id):
+            return None
+        rng = self._rng("statsbydate", account_id)
+        pvp = {}
+        for days_ago in range(2):
+            date = (self.now - timedelta(days=days_ago)).strftime("%Y%m%d")
+            battles = rng.randint(5000, 6000)
+            pvp[date] = {
+                "account_id": account_id,
+                "battle_type": "pvp",
+                "battles": battles,
+                "wins": battles // 2,
+                "survived_battles": battles // 3,
+                "date": date,
+            }
+        return {"pvp": pvp}
+
+
+def _account_keyed(world: SyntheticWorld, builder: Callable[[int], Any]) -> Callable[[Dict[str, str]], Any]:
+    def handler(params: Dict[str, str]) -> Any:
+        return {str(account_id): builder(account_id) for account_id in _csv_ints(params.get("account_id"))}
+    return handler
+
+
+def _endpoint_from_path(path: str) -> str:
+    endpoint = path.split("/wows/", 1)[-1].lstrip("/")
+    if endpoint and not endpoint.endswith("/"):
+        endpoint += "/"
+    return endpoint
+
+
+def _paged(rows: Dict[str, Any] | List[Any], params: Dict[str, str], default_limit: int = 100) -> tuple[Any, Dict[str, Any]]:
+    limit = max(int(params.get("limit") or default_limit), 1)
+    page = max(int(params.get("page_no") or 1), 1)
+    items = list(rows.items()) if isinstance(rows, dict) else list(rows)
+    window = items[(page - 1) * limit: page * limit]
+    page_total = (len(items) + limit - 1) // limit
+    meta = {"count": len(window), "total": len(items), "page_total": page_total,
+            "limit": limit, "page": page}
+    return (dict(window) if isinstance(rows, dict) else window), meta
+
+
+def build_endpoint_handlers(world: SyntheticWorld) -> Dict[str, Callable[[Dict[str, str]], Any]]:
+    """Map each endpoint to a handler returning ``data`` or ``(data, meta)``."""
+
+    def clans_list(params):
+        clan_ids, meta = _paged(world.clan_ids(), params)
+        return [
+            {key: clan[key] for key in ("clan_id", "tag", "name", "members_count", "created_at")}
+            for clan in map(world.clan, clan_ids)
+        ], meta
+
+    def clans_info(params):
+        return {str(clan_id): world.clan(clan_id) for clan_id in _csv_ints(params.get("clan_id"))}
+
+    def clans_accountinfo(params):
+        data = {}
+        for account_id in _csv_ints(params.get("account_id")):
+            clan_id = world.clan_of(account_id)
+            clan = world.clan(clan_id) if clan_id else None
+            data[str(account_id)] = clan and {
+                "account_id": account_id,
+                "account_name": f"player_{account_id}",
+                "clan_id": clan_id,
+                "joined_at": clan["created_at"],
+                "role": "commander" if clan["leader_id"] == account_id else "private",
+                "clan": {key: clan[key] for key in ("clan_id", "created_at", "members_count", "name", "tag")},
+            }
+        return data
+
+    def encyclopedia_ships(params):
+        ship_ids = _csv_ints(params.get("ship_id"))
+        if ship_ids:
+            return {str(ship_id): world.ship(ship_id) for ship_id in ship_ids}
+        return _paged({str(ship_id): world.ship(ship_id) for ship_id in world.ship_ids}, params)
+
+    def account_list(params):
+        search = (params.get("search") or "").strip()
+        if not search.startswith("player_") or not search[7:].isdigit():
+            return []
+        account = world.account(int(search[7:]))
+        return [{"account_id": account["account_id"], "nickname": account["nickname"]}] if account else []
+
+    def seasons_info(params):
+        return {
+            str(season_id): {
+                "season_id": season_id,
+                "season_name": f"Season {season_id - 1000}",
+                "start_at": world._ts((RANKED_SEASON_IDS[-1] - season_id + 1) * 60),
+                "close_at": world._ts((RANKED_SEASON_IDS[-1] - season_id) * 60 + 10),
+            }
+            for season_id in RANKED_SEASON_IDS
+        }
+
+    def seasons_shipstats(params):
+        season_ids = _csv_ints(params.get("season_id"))
+        return {
+            str(account_id): world.ranked_ship_stats(account_id, season_ids)
+            for account_id in _csv_ints(params.get("account_id"))
+        }
+
+    def clans_season(params):
+        return {
+            str(season_id): {
+                "season_id": season_id,
+                "name": f"Clan Season {season_id}",
+                "start_time": world._ts((CLAN_BATTLE_SEASON_IDS[-1] - season_id + 1) * 90),
+                "finish_time": world._ts((CLAN_BATTLE_SEASON_IDS[-1] - season_id) * 90 + 30),
+                "ship_tier_min": 10,
+                "ship_tier_max": 10,
+            }
+            for season_id in CLAN_BATTLE_SEASON_IDS
+        }
+
+    def encyclopedia_info(params):
+        return {
+            "ships_updated_at": world._ts(1),
+            "game_version": "0.0.0-synthetic",
+            "ship_types": {ship_type: ship_type for ship_type in SHIP_TYPES},
+            "ship_nations": {nation: nation.title() for nation in SHIP_NATIONS},
+            "languages": {"en": "English"},
+            "ship_modifications": {},
+            "ship_modules": {"Hull": "Hull", "Engine": "Engine"},
+            "ship_type_images": {},
+        }
+
+    def encyclopedia_modules(params):
+        return _paged({
+            str(module_id): {
+                "module_id": module_id,
+                "module_id_str": f"PMOD{module_id}",
+                "name": f"Synthetic module {module_id}",
+                "type": "Hull",
+                "tag": None,
+                "image": None,
+                "price_credit": 1000,
+                "profile": {},
+            }
+            for module_id in range(3_000_000_000, 3_000_000_000 + 50)
+        }, params)
+
+    return {
+        "account/info/": _account_keyed(world, world.account),
+        "account/list/": account_list,
+        "account/achievements/": _account_keyed(world, world.achievements),
+        "account/statsbydate/": _account_keyed(world, world.stats_by_date),
+        "clans/accountinfo/": clans_accountinfo,
+        "clans/info/": clans_info,
+        "clans/list/": clans_list,
+        "clans/season/": clans_season,
+        "clans/seasonstats/": _account_keyed(world, world.clan_battle_stats),
+        "encyclopedia/info/": encyclopedia_info,
+        "encyclopedia/modules/": encyclopedia_modules,
+        "encyclopedia/ships/": encyclopedia_ships,
+        "seasons/accountinfo/": _account_keyed(world, world.rank_info),
+        "seasons/info/": seasons_info,
+        "seasons/shipstats/": seasons_shipstats,
+        "ships/badges/": _account_keyed(world, world.badges),
+        "ships/stats/": _account_keyed(world, world.ship_stats),
+    }
+
+
+SUPPORTED_ENDPOINTS = tuple(sorted(build_endpoint_handlers(
+    SyntheticWorld(FakeUpstreamConfig(clan_count=0))).keys()))
+
+
+class FakeUpstreamServer:
+    """Threaded HTTP server that answers ``/wows/<endpoint>`` like the WG API.
+
+    Use as a context manager; ``base_url`` is a drop-in for WG_API_BASE_URL.
+    """
+
+    def __init__(self, config: Optional[FakeUpstreamConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeUpstreamConfig()
+        self.world = SyntheticWorld(self.config)
+        self.handlers = build_endpoint_handlers(self.world)
+        self._fault_rng = random.Random(f"faults:{self.config.seed}")
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._recordings: Dict[str, Any] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/wows/"
+
+    def start(self) -> "FakeUpstreamServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-wg-upstream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            # shutdown() blocks until serve_forever exits, so only when started.
+            self._httpd.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeUpstreamServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_endpoint = {endpoint: dict(counts)
+                           for endpoint, counts in sorted(self._counters.items())}
+        totals: Dict[str, int] = {}
+        for counts in by_endpoint.values():
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+        return {"totals": totals, "by_endpoint": by_endpoint}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def _count(self, endpoint: str, outcome: str, byte_count: int = 0) -> None:
+        with self._lock:
+            counts = self._counters.setdefault(
+                endpoint, {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "bytes": 0})
+            counts["requests"] += 1
+            counts[outcome] += 1
+            counts["bytes"] += byte_count
+
+    def _recorded(self, endpoint: str) -> Optional[Any]:
+        if self.config.recordings_dir is None:
+            return None
+        if endpoint not in self._recordings:
+            path = self.config.recordings_dir / \
+                f"{endpoint.strip('/').replace('/', '_')}.json"
+            self._recordings[endpoint] = json.loads(
+                path.read_text()) if path.exists() else None
+        return self._recordings[endpoint]
+
+    def _fault(self) -> Optional[int]:
+        with self._lock:
+            roll = self._fault_rng.random()
+        if roll < self.config.throttle_rate:
+            return 429
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return 503
+        return None
+
+    def _delay(self) -> None:
+        latency_ms = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            with self._lock:
+                latency_ms += self._fault_rng.uniform(
+                    -self.config.latency_jitter_ms, self.config.latency_jitter_ms)
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+
+    def respond(self, path: str, params: Dict[str, str]) -> tuple[int, Dict[str, Any]]:
+        """Build the (status code, JSON body) answer for one request."""
+        endpoint = _endpoint_from_path(path)
+        self._delay()
+        fault = self._fault()
+        if fault is not None:
+            return fault, {"status": "error", "error": {
+                "code": fault,
+                "message": "REQUEST_LIMIT_EXCEEDED" if fault == 429 else "SOURCE_NOT_AVAILABLE",
+            }}
+
+        recorded = self._recorded(endpoint)
+        if recorded is not None:
+            return 200, recorded
+
+        handler = self.handlers.get(endpoint)
+        if handler is None:
+            return 200, {"status": "error", "error": {"code": 404, "message": "METHOD_NOT_FOUND", "field": None}}
+        if not params.get("application_id"):
+            return 200, {"status": "error", "error": {"code": 402, "message": "APPLICATION_ID_NOT_SPECIFIED", "field": "application_id"}}
+
+        result = handler(params)
+        data, meta = result if isinstance(result, tuple) else (result, {})
+        fields = [field.strip() for field in (params.get("fields") or "").split(",") if field.strip()]
+        if fields and isinstance(data, dict):
+            data = {
+                key: [_project(row, fields) for row in value] if isinstance(value, list) else _project(value, fields)
+                for key, value in data.items()
+            }
+        elif fields and isinstance(data, list):
+            data = [_project(row, fields) for row in data]
+        meta.setdefault("count", len(data))
+        return 200, {"status": "ok", "meta": meta, "data": data}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {key: values[-1]
+                          for key, values in parse_qs(url.query).items()}
+                status_code, body = server.respond(url.path, params)
+                encoded = json.dumps(body).encode("utf-8")
+                endpoint = _endpoint_from_path(url.path)
+                outcome = {200: "ok", 429: "throttled"}.get(
+                    status_code, "errors")
+                server._count(endpoint, outcome, len(encoded))
+
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                logger.debug("fake upstream: " + format, *args)
+
+        return Handler
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from warships.api.rate_limit import PRIORITY_INTERACTIVE, current_priority, normalize_endpoint
+from warships.refresh_profile import note_upstream_call
+
+
+logger = logging.getLogger(__name__)
+
+# Per-source, per-endpoint latency and response-size histograms for upstream
+# calls. Counts accumulate in-process and are flushed to the shared cache
+# every few seconds, so web and worker processes report into one view.
+
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+FLUSH_INTERVAL_SECONDS = 5.0
+METRICS_KEY_PREFIX = "warships:wg_api:metrics:v1"
+METRICS_INDEX_KEY = f"{METRICS_KEY_PREFIX}:index"
+
+SOURCE_INTERACTIVE = "interactive"
+SOURCE_BACKGROUND = "background"
+SOURCE_CRAWL = "crawl"
+
+_traffic_source: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "wg_api_traffic_source", default=None)
+
+_lock = threading.Lock()
+_process_histograms: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_pending_flush: Dict[str, int] = {}
+_last_flush = 0.0
+
+
+@contextmanager
+def traffic_source(source: str) -> Iterator[None]:
+    """Label upstream calls made in this context (e.g. ``crawl``)."""
+    token = _traffic_source.set(source)
+    try:
+        yield
+    finally:
+        _traffic_source.reset(token)
+
+
+def current_traffic_source() -> str:
+    source = _traffic_source.get()
+    if source:
+        return source
+    return SOURCE_INTERACTIVE if current_priority() == PRIORITY_INTERACTIVE else SOURCE_BACKGROUND
+
+
+def _bucket_label(value: float, bounds: Tuple[int, ...]) -> str:
+    index = bisect.bisect_left(bounds, value)
+    return f"le_{bounds[index]}" if index < len(bounds) else "inf"
+
+
+def _empty_histogram() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "errors": 0,
+        "latency_ms_sum": 0,
+        "bytes_sum": 0,
+        "latency_ms": {},
+        "bytes": {},
+    }
+
+
+def _add(histogram: Dict[str, Any], latency_label: str, bytes_label: str, latency_ms: int, byte_count: int) -> None:
+    histogram["count"] += 1
+    histogram["latency_ms_sum"] += latency_ms
+    histogram["bytes_sum"] += byte_count
+    histogram["latency_ms"][latency_label] = histogram["latency_ms"].get(
+        latency_label, 0) + 1
+    histogram["bytes"][bytes_label] = histogram["bytes"].get(
+        bytes_label, 0) + 1
+
+
+def _shared_metrics_enabled() -> bool:
+    return not getattr(settings, "RUNNING_TESTS", False)
+
+
+def record_upstream_response(endpoint: str, elapsed_seconds: float, byte_count: int) -> None:
+    source = current_traffic_source()
+    clean_endpoint = normalize_endpoint(endpoint)
+    latency_ms = int(round(elapsed_seconds * 1000))
+    latency_label = _bucket_label(latency_ms, LATENCY_BUCKETS_MS)
+    bytes_label = _bucket_label(byte_count, BYTES_BUCKETS)
+    series = f"{source}|{clean_endpoint}"
+    note_upstream_call()
+
+    with _lock:
+        histogram = _process_histograms.setdefault(
+            (source, clean_endpoint), _empty_histogram())
+        _add(histogram, latency_label, bytes_label, latency_ms, byte_count)
+        for field, amount in (
+            ("count", 1),
+            ("latency_ms_sum", latency_ms),
+            ("bytes_sum", byte_count),
+            (f"latency_ms:{latency_label}", 1),
+            (f"bytes:{bytes_label}", 1),
+        ):
+            key = f"{series}|{field}"
+            _pending_flush[key] = _pending_flush.get(key, 0) + amount
+
+    if _shared_metrics_enabled():
+        flush_upstream_metrics()
+
+
+def record_upstream_error(endpoint: str) -> None:
+    """Count a failed call (transport error, bad JSON or error payload)."""
+    source = current_traffic_source()
+    clean_endpoint = normalize_endpoint(endpoint)
+    key = f"{source}|{clean_endpoint}|errors"
+
+    with _lock:
+        histogram = _process_histograms.setdefault(
+            (source, clean_endpoint), _empty_histogram())
+        histogram["errors"] += 1
+        _pending_flush[key] = _pending_flush.get(key, 0) + 1
+
+    if _shared_metrics_enabled():
+        flush_upstream_metrics()
+
+
+def flush_upstream_metrics(force: bool = False) -> None:
+    global _last_flush
+
+    with _lock:
+        now = time.monotonic()
+        if not _pending_flush or (not force and now - _last_flush < FLUSH_INTERVAL_SECONDS):
+            return
+        pending = dict(_pending_flush)
+        _pending_flush.clear()
+        _last_flush = now
+
+    try:
+        index = set(cache.get(METRICS_INDEX_KEY) or ())
+        series_names = {key.rsplit("|", 1)[0] for key in pending}
+        if not series_names.issubset(index):
+            cache.set(METRICS_INDEX_KEY, sorted(
+                index | series_names), timeout=None)
+        for key, amount in pending.items():
+            cache_key = f"{METRICS_KEY_PREFIX}:{key}"
+            if not cache.add(cache_key, amount, timeout=None):
+                cache.incr(cache_key, amount)
+    except Exception as error:
+        logger.debug("Unable to flush upstream metrics: %s", error)
+
+
+def _summarize(histogram: Dict[str, Any]) -> Dict[str, Any]:
+    count = histogram["count"]
+    return {
+        **histogram,
+        "latency_ms_avg": round(histogram["latency_ms_sum"] / count, 1) if count else None,
+        "bytes_avg": round(histogram["bytes_sum"] / count) if count else None,
+    }
+
+
+def _nest(histograms: Dict[Tuple[str, str], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    nested: Dict[str, Dict[str, Any]] = {}
+    for (source, endpoint), histogram in sorted(histograms.items()):
+        nested.setdefault(source, {})[endpoint] = _summarize(histogram)
+    return nested
+
+
+def _read_shared_histograms() -> Optional[Dict[Tuple[str, str], Dict[str, Any]]]:
+    try:
+        series_names = cache.get(METRICS_INDEX_KEY) or []
+        fields = ["count", "errors", "latency_ms_sum", "bytes_sum"]
+        fields += [f"latency_ms:{_bucket_label(bound, LATENCY_BUCKETS_MS)}" for bound in LATENCY_BUCKETS_MS]
+        fields += ["latency_ms:inf"]
+        fields += [f"bytes:{_bucket_label(bound, BYTES_BUCKETS)}" for bound in BYTES_BUCKETS]
+        fields += ["bytes:inf"]
+        keys = {
+            (series, field): f"{METRICS_KEY_PREFIX}:{series}|{field}"
+            for series in series_names
+            for field in fields
+        }
+        raw = cache.get_many(list(keys.values())) if keys else {}
+    except Exception as error:
+        logger.warning("Unable to read upstream metrics: %s", error)
+        return None
+
+    histograms: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for (series, field), cache_key in keys.items():
+        value = raw.get(cache_key)
+        if not value:
+            continue
+        source, endpoint = series.split("|", 1)
+        histogram = histograms.setdefault(
+            (source, endpoint), _empty_histogram())
+        if ":" in field:
+            group, label = field.split(":", 1)
+            histogram[group][label] = int(value)
+        else:
+            histogram[field] = int(value)
+    return histograms
+
+
+def get_process_upstream_totals() -> Dict[str, Dict[str, int]]:
+    """Responses and errors per endpoint seen by this process, all sources."""
+    totals: Dict[str, Dict[str, int]] = {}
+    with _lock:
+        for (_source, endpoint), histogram in _process_histograms.items():
+            row = totals.setdefault(endpoint, {"responses": 0, "errors": 0})
+            row["responses"] += histogram["count"]
+            row["errors"] += histogram["errors"]
+    return totals
+
+
+def get_upstream_metrics() -> Dict[str, Any]:
+    with _lock:
+        process = {
+            key: {
+                **histogram,
+                "latency_ms": dict(histogram["latency_ms"]),
+                "bytes": dict(histogram["bytes"]),
+            }
+            for key, histogram in _process_histograms.items()
+        }
+
+    shared = _read_shared_histograms() if _shared_metrics_enabled() else None
+    return {
+        "latency_ms_buckets": list(LATENCY_BUCKETS_MS),
+        "bytes_buckets": list(BYTES_BUCKETS),
+        "process": _nest(process),
+        "shared": _nest(shared) if shared is not None else None,
+    }
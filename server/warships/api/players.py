@@ -4,10 +4,26 @@ from typing import Dict, Optional
 from django.db.models.functions import Lower
 
 from warships.models import Player
+from warships.api.batching import AccountBatchLoader, register_account_loader
 from warships.api.client import make_api_request
 
 logging.basicConfig(level=logging.INFO)
 
+ACCOUNT_INFO_LOADER = register_account_loader("account_info", AccountBatchLoader(
+    "account/info/",
+    request=lambda endpoint, params: _make_api_request(endpoint, params),
+))
+RANKED_ACCOUNT_INFO_LOADER = register_account_loader("ranked_account_info", AccountBatchLoader(
+    "seasons/accountinfo/",
+    {"fields": "rank_info"},
+    request=lambda endpoint, params: _make_api_request(endpoint, params),
+))
+ACHIEVEMENTS_LOADER = register_account_loader("achievements", AccountBatchLoader(
+    "account/achievements/",
+    {"fields": "battle,progress"},
+    request=lambda endpoint, params: _make_api_request(endpoint, params),
+))
+
 
 def _fetch_snapshot_data(player_id: int, dates: str = '') -> Dict:
     """Fetch JSON data containing recent battle stats for a given player_id."""
@@ -24,25 +40,18 @@ def _fetch_snapshot_data(player_id: int, dates: str = '') -> Dict:
 
 def _fetch_player_personal_data(player_id: int) -> Dict:
     """Fetch JSON data for a given player_id."""
-    params = {
-        "account_id": player_id
-    }
     logging.info(
         f' ---> Remote fetching player personal (account) data for player_id: {player_id}')
-    data = _make_api_request("account/info/", params)
-    return data.get(str(player_id), {}) if data else {}
+    data = ACCOUNT_INFO_LOADER.load(player_id)
+    return data if isinstance(data, dict) else {}
 
 
 def _fetch_ranked_account_info(player_id: int) -> Dict:
     """Fetch ranked battles account info (rank_info) for a player."""
-    params = {
-        "account_id": player_id,
-        "fields": "rank_info"
-    }
     logging.info(
         f' ---> Remote fetching ranked account info for player_id: {player_id}')
-    data = _make_api_request("seasons/accountinfo/", params)
-    return data.get(str(player_id), {}) if data else {}
+    data = RANKED_ACCOUNT_INFO_LOADER.load(player_id)
+    return data if isinstance(data, dict) else {}
 
 
 def _fetch_ranked_seasons_info() -> Dict:
@@ -57,16 +66,9 @@ def _fetch_ranked_seasons_info() -> Dict:
 
 def _fetch_player_achievements(player_id: int) -> Optional[Dict]:
     """Fetch the raw achievements payload for a single player account."""
-    params = {
-        "account_id": player_id,
-        "fields": "battle,progress",
-    }
     logging.info(
         f' ---> Remote fetching achievements data for player_id: {player_id}')
-    data = _make_api_request("account/achievements/", params)
-    if not isinstance(data, dict):
-        return None
-    payload = data.get(str(player_id))
+    payload = ACHIEVEMENTS_LOADER.load(player_id)
     return payload if isinstance(payload, dict) else None
 
 
@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+# One token bucket is shared by every caller that talks to the WG API: web
+# workers, Celery workers, the clan crawl and the incremental commands. With
+# Redis configured the bucket lives in Redis; otherwise it is process-local.
+
+RATE_LIMIT_PER_SECOND = float(
+    os.getenv("WG_API_RATE_LIMIT_PER_SECOND", "10"))
+RATE_LIMIT_BURST = float(
+    os.getenv("WG_API_RATE_LIMIT_BURST", str(RATE_LIMIT_PER_SECOND)))
+BACKGROUND_RESERVE_FRACTION = float(
+    os.getenv("WG_API_RATE_LIMIT_BACKGROUND_RESERVE", "0.3"))
+INTERACTIVE_MAX_WAIT_SECONDS = float(
+    os.getenv("WG_API_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS", "10"))
+BACKGROUND_MAX_WAIT_SECONDS = float(
+    os.getenv("WG_API_RATE_LIMIT_BACKGROUND_MAX_WAIT_SECONDS", "120"))
+RATE_LIMIT_KEY_PREFIX = "warships:wg_api:rate_limit"
+RATE_LIMIT_STATS_WINDOW_SECONDS = 60
+# Refill arithmetic is floating point; without a tolerance a caller can sleep
+# for an exact deficit and still come up a hair short.
+TOKEN_EPSILON = 1e-9
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+DEFAULT_ENDPOINT_WEIGHT = 1.0
+# Heavier account-level payloads cost more of the shared budget so a backfill
+# cannot saturate upstream with them.
+DEFAULT_ENDPOINT_WEIGHTS = {
+    "ships/stats/": 2.0,
+    "seasons/shipstats/": 2.0,
+    "account/achievements/": 1.5,
+}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "wg_api_priority", default=PRIORITY_INTERACTIVE)
+
+# The script reads the Redis server clock so workers with skewed clocks
+# cannot refill (or freeze) the shared bucket.
+_TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local floor = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+if now > ts then
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    ts = now
+end
+
+local wait = 0
+if tokens + 1e-9 >= cost + floor then
+    tokens = math.max(tokens - cost, 0)
+else
+    wait = (cost + floor - tokens) / rate
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(ts))
+redis.call('EXPIRE', key, 3600)
+return {tostring(wait), tostring(tokens)}
+"""
+
+
+def _parse_endpoint_weights(raw_value: Optional[str]) -> Dict[str, float]:
+    weights = dict(DEFAULT_ENDPOINT_WEIGHTS)
+    for item in (raw_value or "").split(","):
+        endpoint, _, weight = item.partition("=")
+        endpoint = endpoint.strip().lstrip("/")
+        if not endpoint or not weight.strip():
+            continue
+        try:
+            weights[endpoint] = max(float(weight), 0.0)
+        except ValueError:
+            logger.warning(
+                "Ignoring invalid WG API endpoint weight '%s'", item)
+    return weights
+
+
+ENDPOINT_WEIGHTS = _parse_endpoint_weights(
+    os.getenv("WG_API_ENDPOINT_WEIGHTS"))
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    clean_endpoint = endpoint.strip().lstrip("/")
+    if clean_endpoint and not clean_endpoint.endswith("/"):
+        clean_endpoint += "/"
+    return clean_endpoint
+
+
+def endpoint_weight(endpoint: str) -> float:
+    return ENDPOINT_WEIGHTS.get(normalize_endpoint(endpoint), DEFAULT_ENDPOINT_WEIGHT)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def upstream_priority(priority: str) -> Iterator[None]:
+    """Run the enclosed upstream calls under the given priority class.
+
+    Interactive calls may drain the bucket to zero; background calls stop at
+    the reserved fraction so page loads always find tokens available.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown WG API priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class LocalTokenBucket:
+    """Process-local bucket used when Redis is not configured."""
+
+    name = "local"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Optional[float] = None
+        self._ts = 0.0
+        self._counters: Dict[int, Dict[str, float]] = {}
+
+    def take(self, rate: float, capacity: float, cost: float, floor: float, now: float) -> tuple[float, float]:
+        with self._lock:
+            if self._tokens is None:
+                self._tokens = capacity
+                self._ts = now
+            if now > self._ts:
+                self._tokens = min(capacity, self._tokens +
+                                   (now - self._ts) * rate)
+                self._ts = now
+
+            if self._tokens + TOKEN_EPSILON >= cost + floor:
+                self._tokens = max(self._tokens - cost, 0.0)
+                return 0.0, self._tokens
+            return (cost + floor - self._tokens) / rate, self._tokens
+
+    def peek(self, rate: float, capacity: float, now: float) -> float:
+        with self._lock:
+            if self._tokens is None:
+                return capacity
+            return min(capacity, self._tokens + max(now - self._ts, 0.0) * rate)
+
+    def incr(self, window: int, fields: Dict[str, float]) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(window, {})
+            for field, amount in fields.items():
+                counters[field] = counters.get(field, 0) + amount
+            for stale_window in [key for key in self._counters if key < window - RATE_LIMIT_STATS_WINDOW_SECONDS]:
+                del self._counters[stale_window]
+
+    def read(self, window: int) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters.get(window, {}))
+
+
+class RedisTokenBucket:
+    """Bucket shared across processes through an atomic Redis script."""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self._client = client
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._bucket_key = f"{RATE_LIMIT_KEY_PREFIX}:bucket"
+
+    def _stats_key(self, window: int) -> str:
+        return f"{RATE_LIMIT_KEY_PREFIX}:stats:{window}"
+
+    def take(self, rate: float, capacity: float, cost: float, floor: float, now: float) -> tuple[float, float]:
+        # ``now`` is ignored; the bucket runs on the Redis server clock.
+        wait, tokens = self._script(
+            keys=[self._bucket_key],
+            args=[rate, capacity, cost, floor],
+        )
+        return float(wait), float(tokens)
+
+    def peek(self, rate: float, capacity: float, now: float) -> float:
+        tokens, ts = self._client.hmget(self._bucket_key, "tokens", "ts")
+        if tokens is None or ts is None:
+            return capacity
+        seconds, microseconds = self._client.time()
+        server_now = seconds + microseconds / 1_000_000
+        return min(capacity, float(tokens) + max(server_now - float(ts), 0.0) * rate)
+
+    def incr(self, window: int, fields: Dict[str, float]) -> None:
+        key = self._stats_key(window)
+        pipe = self._client.pipeline()
+        for field, amount in fields.items():
+            pipe.hincrbyfloat(key, field, amount)
+        pipe.expire(key, RATE_LIMIT_STATS_WINDOW_SECONDS * 3)
+        pipe.execute()
+
+    def read(self, window: int) -> Dict[str, float]:
+        raw = self._client.hgetall(self._stats_key(window))
+        return {
+            (field.decode() if isinstance(field, bytes) else field): float(value)
+            for field, value in raw.items()
+        }
+
+
+class TokenBucketRateLimiter:
+    def __init__(
+        self,
+        backend,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        background_reserve: float = BACKGROUND_RESERVE_FRACTION,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.backend = backend
+        self.rate = max(float(rate), 0.001)
+        self.capacity = max(float(burst), 1.0)
+        self.background_reserve = min(max(float(background_reserve), 0.0), 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._fallback = LocalTokenBucket()
+
+    def _max_wait(self, priority: str) -> float:
+        if priority == PRIORITY_BACKGROUND:
+            return BACKGROUND_MAX_WAIT_SECONDS
+        return INTERACTIVE_MAX_WAIT_SECONDS
+
+    def _floor(self, priority: str, cost: float) -> float:
+        if priority != PRIORITY_BACKGROUND:
+            return 0.0
+        return max(min(self.capacity * self.background_reserve, self.capacity - cost), 0.0)
+
+    def _take(self, cost: float, floor: float, now: float) -> tuple[float, float]:
+        try:
+            return self.backend.take(self.rate, self.capacity, cost, floor, now)
+        except Exception as error:
+            # A Redis outage must not take upstream access down with it.
+            logger.warning(
+                "WG API rate limiter backend failed, using local bucket: %s", error)
+            return self._fallback.take(self.rate, self.capacity, cost, floor, now)
+
+    def _record(self, now: float, fields: Dict[str, float]) -> None:
+        window = int(now // RATE_LIMIT_STATS_WINDOW_SECONDS) * \
+            RATE_LIMIT_STATS_WINDOW_SECONDS
+        try:
+            self.backend.incr(window, fields)
+        except Exception as error:
+            logger.debug("Unable to record WG API rate limit stats: %s", error)
+
+    def acquire(self, endpoint: str, priority: Optional[str] = None) -> bool:
+        """Block until the endpoint's weight is available in the bucket.
+
+        Returns False when the wait would exceed the priority's budget; the
+        caller should treat that like a failed upstream request.
+        """
+        priority = priority or current_priority()
+        clean_endpoint = normalize_endpoint(endpoint)
+        cost = min(endpoint_weight(clean_endpoint), self.capacity)
+        floor = self._floor(priority, cost)
+        deadline = self._clock() + self._max_wait(priority)
+        waited = 0.0
+
+        while True:
+            now = self._clock()
+            wait, _tokens = self._take(cost, floor, now)
+            if wait <= 0:
+                self._record(now, {
+                    f"requests:{priority}": 1,
+                    f"tokens:{priority}": cost,
+                    f"wait_seconds:{priority}": waited,
+                    f"throttled:{priority}": 1 if waited > 0 else 0,
+                    f"endpoint:{clean_endpoint}": 1,
+                })
+                return True
+
+            if now + wait > deadline:
+                self._record(now, {f"rejected:{priority}": 1})
+                logger.warning(
+                    "WG API rate limit wait exceeded for endpoint '%s' (priority=%s, waited=%.2fs)",
+                    clean_endpoint,
+                    priority,
+                    waited,
+                )
+                return False
+
+            wait = max(wait, 0.001)
+            self._sleep(wait)
+            waited += wait
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        window = int(now // RATE_LIMIT_STATS_WINDOW_SECONDS) * \
+            RATE_LIMIT_STATS_WINDOW_SECONDS
+        try:
+            tokens_available = self.backend.peek(
+                self.rate, self.capacity, now)
+            current = self.backend.read(window)
+            previous = self.backend.read(
+                window - RATE_LIMIT_STATS_WINDOW_SECONDS)
+        except Exception as error:
+            logger.warning("Unable to read WG API rate limit stats: %s", error)
+            tokens_available = None
+            current = {}
+            previous = {}
+
+        elapsed = max(now - window, 1.0)
+
+        def summarize(counters: Dict[str, float], seconds: float) -> Dict[str, Any]:
+            tokens = sum(counters.get(f"tokens:{p}", 0.0) for p in PRIORITIES)
+            return {
+                "requests": int(sum(counters.get(f"requests:{p}", 0) for p in PRIORITIES)),
+                "tokens": round(tokens, 2),
+                "utilisation": round(min(tokens / (self.rate * seconds), 1.0), 4),
+                "by_priority": {
+                    p: {
+                        "requests": int(counters.get(f"requests:{p}", 0)),
+                        "throttled": int(counters.get(f"throttled:{p}", 0)),
+                        "rejected": int(counters.get(f"rejected:{p}", 0)),
+                        "wait_seconds": round(counters.get(f"wait_seconds:{p}", 0.0), 3),
+                    }
+                    for p in PRIORITIES
+                },
+                "by_endpoint": {
+                    field.split(":", 1)[1]: int(value)
+                    for field, value in sorted(counters.items())
+                    if field.startswith("endpoint:")
+                },
+            }
+
+        return {
+            "backend": self.backend.name,
+            "rate_per_second": self.rate,
+            "burst": self.capacity,
+            "background_reserve": self.background_reserve,
+            "tokens_available": None if tokens_available is None else round(tokens_available, 2),
+            "window_seconds": RATE_LIMIT_STATS_WINDOW_SECONDS,
+            "current_window": summarize(current, elapsed),
+            "previous_window": summarize(previous, RATE_LIMIT_STATS_WINDOW_SECONDS),
+        }
+
+
+def _rate_limit_redis_url() -> str:
+    if getattr(settings, "RUNNING_TESTS", False):
+        return ""
+    return os.getenv("WG_API_RATE_LIMIT_REDIS_URL") or getattr(settings, "REDIS_URL", "")
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    redis_url = _rate_limit_redis_url()
+    if redis_url:
+        try:
+            import redis
+
+            return TokenBucketRateLimiter(RedisTokenBucket(redis.Redis.from_url(redis_url)))
+        except Exception as error:
+            logger.warning(
+                "Falling back to a process-local WG API rate limiter: %s", error)
+    return TokenBucketRateLimiter(LocalTokenBucket())
+
+
+_limiter_override: Optional[TokenBucketRateLimiter] = None
+
+
+@contextmanager
+def rate_limiter_override(limiter: TokenBucketRateLimiter) -> Iterator[None]:
+    """Send every upstream call through ``limiter`` instead of the shared one.
+
+    For isolated runs such as the ingestion benchmark, which must not spend
+    (or be throttled by) the production budget.
+    """
+    global _limiter_override
+    previous = _limiter_override
+    _limiter_override = limiter
+    try:
+        yield
+    finally:
+        _limiter_override = previous
+
+
+def _active_rate_limiter() -> TokenBucketRateLimiter:
+    return _limiter_override or get_rate_limiter()
+
+
+def acquire_upstream_slot(endpoint: str) -> bool:
+    return _active_rate_limiter().acquire(endpoint)
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    return _active_rate_limiter().stats()
@@ -1,15 +1,24 @@
 import logging
 import re
-from typing import Optional, Dict, Any
+import resource
+import threading
+import uuid
+from typing import Any, Dict, Iterable, NamedTuple, Optional
 
 from django.core.cache import cache
 
-from warships.api.client import make_api_request, make_api_request_with_meta
+from warships.api.batching import AccountBatchLoader, register_account_loader
+from warships.api.client import make_api_request, make_api_request_with_meta, stream_api_rows
 from warships.models import Ship
 
 
 logging.basicConfig(level=logging.INFO)
 
+EFFICIENCY_BADGES_LOADER = register_account_loader("efficiency_badges", AccountBatchLoader(
+    "ships/badges/",
+    request=lambda endpoint, params: _make_api_request(endpoint, params),
+))
+
 
 CHART_NAME_MAX_LENGTH = 15
 SHIP_NAME_CONNECTORS = {
@@ -33,6 +42,27 @@ SHIP_NAME_REPLACEMENTS = {
 }
 ROMAN_NUMERAL_PATTERN = re.compile(r"^[IVXLCDM]+$", re.IGNORECASE)
 
+# Process-local, read-only ship catalog for building battle rows. The whole
+# table is loaded once per process and reloaded when the version key changes
+# (sync_ship_catalog writes a new one, and an evicted key counts as a change).
+SHIP_CATALOG_VERSION_KEY = "warships:ship_catalog:version:v1"
+SHIP_CATALOG_FIELDS = "ship_id,name,nation,is_premium,type,tier"
+SHIP_CATALOG_BATCH_SIZE = 100
+
+
+class ShipCatalogEntry(NamedTuple):
+    ship_id: int
+    name: str
+    chart_name: str
+    tier: int
+    ship_type: str
+
+
+_ship_catalog_lock = threading.Lock()
+# (version, entries by ship_id, ids the API did not know at that version)
+_ship_catalog_state: tuple[Optional[str], Dict[int, ShipCatalogEntry], frozenset] = (
+    None, {}, frozenset())
+
 
 def _normalize_ship_name(name: str) -> str:
     return " ".join((name or "").split())
@@ -126,50 +156,9 @@ def sync_ship_catalog(page_size: int = 100) -> dict[str, int]:
         ship_rows = [row for row in data.values() if isinstance(
             row, dict) and row.get("ship_id")]
         ship_ids = [int(row["ship_id"]) for row in ship_rows]
-        existing_by_id = Ship.objects.in_bulk(ship_ids, field_name="ship_id")
-
-        to_create: list[Ship] = []
-        to_update: list[Ship] = []
-        for row in ship_rows:
-            ship_id = int(row["ship_id"])
-            chart_name = build_ship_chart_name(str(row.get("name") or ""))
-            existing = existing_by_id.get(ship_id)
-            if existing is None:
-                to_create.append(Ship(
-                    ship_id=ship_id,
-                    name=str(row.get("name") or ""),
-                    chart_name=chart_name,
-                    nation=str(row.get("nation") or ""),
-                    ship_type=str(row.get("type") or ""),
-                    tier=row.get("tier"),
-                    is_premium=bool(row.get("is_premium")),
-                ))
-                continue
-
-            changed = False
-            for field_name, value in (
-                ("name", str(row.get("name") or "")),
-                ("chart_name", chart_name),
-                ("nation", str(row.get("nation") or "")),
-                ("ship_type", str(row.get("type") or "")),
-                ("tier", row.get("tier")),
-                ("is_premium", bool(row.get("is_premium"))),
-            ):
-                if getattr(existing, field_name) != value:
-                    setattr(existing, field_name, value)
-                    changed = True
-            if changed:
-                to_update.append(existing)
-
-        if to_create:
-            Ship.objects.bulk_create(to_create)
-            created_count += len(to_create)
-        if to_update:
-            Ship.objects.bulk_update(
-                to_update,
-                ["name", "chart_name", "nation", "ship_type", "tier", "is_premium"],
-            )
-            updated_count += len(to_update)
+        created, updated = _upsert_ship_rows(ship_rows)
+        created_count += created
+        updated_count += updated
 
         for ship_id in ship_ids:
             cache.delete(f"ship:{ship_id}")
@@ -181,6 +170,7 @@ def sync_ship_catalog(page_size: int = 100) -> dict[str, int]:
             break
         page_no += 1
 
+    invalidate_ship_catalog()
     return {
         "processed": processed_count,
         "created": created_count,
@@ -188,6 +178,181 @@ def sync_ship_catalog(page_size: int = 100) -> dict[str, int]:
     }
 
 
+def _upsert_ship_rows(ship_rows: list[Dict[str, Any]]) -> tuple[int, int]:
+    """Create or update Ship rows from encyclopedia payloads; returns (created, updated)."""
+    existing_by_id = Ship.objects.in_bulk(
+        [int(row["ship_id"]) for row in ship_rows], field_name="ship_id")
+
+    to_create: list[Ship] = []
+    to_update: list[Ship] = []
+    for row in ship_rows:
+        ship_id = int(row["ship_id"])
+        chart_name = build_ship_chart_name(str(row.get("name") or ""))
+        existing = existing_by_id.get(ship_id)
+        if existing is None:
+            to_create.append(Ship(
+                ship_id=ship_id,
+                name=str(row.get("name") or ""),
+                chart_name=chart_name,
+                nation=str(row.get("nation") or ""),
+                ship_type=str(row.get("type") or ""),
+                tier=row.get("tier"),
+                is_premium=bool(row.get("is_premium")),
+            ))
+            continue
+
+        changed = False
+        for field_name, value in (
+            ("name", str(row.get("name") or "")),
+            ("chart_name", chart_name),
+            ("nation", str(row.get("nation") or "")),
+            ("ship_type", str(row.get("type") or "")),
+            ("tier", row.get("tier")),
+            ("is_premium", bool(row.get("is_premium"))),
+        ):
+            if getattr(existing, field_name) != value:
+                setattr(existing, field_name, value)
+                changed = True
+        if changed:
+            to_update.append(existing)
+
+    if to_create:
+        Ship.objects.bulk_create(to_create)
+    if to_update:
+        Ship.objects.bulk_update(
+            to_update,
+            ["name", "chart_name", "nation", "ship_type", "tier", "is_premium"],
+        )
+    return len(to_create), len(to_update)
+
+
+def invalidate_ship_catalog() -> None:
+    """Make every process reload its ship catalog on the next lookup."""
+    try:
+        cache.set(SHIP_CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    except Exception as error:
+        logging.warning("Unable to bump ship catalog version: %s", error)
+
+
+def _ship_catalog_version() -> Optional[str]:
+    try:
+        cache.add(SHIP_CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        return cache.get(SHIP_CATALOG_VERSION_KEY)
+    except Exception as error:
+        logging.warning("Unable to read ship catalog version: %s", error)
+        return _ship_catalog_state[0]
+
+
+def _catalog_entry(ship_id: int, name: str, chart_name: str, tier: Optional[int], ship_type: str) -> Optional[ShipCatalogEntry]:
+    if not name or not ship_type or tier is None:
+        return None
+    return ShipCatalogEntry(int(ship_id), name, chart_name or build_ship_chart_name(name), tier, ship_type)
+
+
+def _load_ship_catalog(ship_ids: Optional[Iterable[int]] = None) -> Dict[int, ShipCatalogEntry]:
+    queryset = Ship.objects.all()
+    if ship_ids is not None:
+        queryset = queryset.filter(ship_id__in=list(ship_ids))
+    entries = {}
+    for row in queryset.values_list("ship_id", "name", "chart_name", "tier", "ship_type"):
+        entry = _catalog_entry(*row)
+        if entry is not None:
+            entries[entry.ship_id] = entry
+    return entries
+
+
+def _current_ship_catalog() -> tuple[Optional[str], Dict[int, ShipCatalogEntry], frozenset]:
+    global _ship_catalog_state
+
+    version = _ship_catalog_version()
+    state = _ship_catalog_state
+    if version is not None and state[0] == version:
+        return state
+
+    with _ship_catalog_lock:
+        if version is None or _ship_catalog_state[0] != version:
+            _ship_catalog_state = (version, _load_ship_catalog(), frozenset())
+        return _ship_catalog_state
+
+
+def _fetch_ship_catalog_rows(ship_ids: list[int]) -> tuple[list[Dict[str, Any]], set[int]]:
+    """Look up unknown ships in batched encyclopedia calls.
+
+    Returns the ship rows and the ids the API answered for without a ship;
+    ids in failed batches are in neither.
+    """
+    rows: list[Dict[str, Any]] = []
+    answered: set[int] = set()
+    for start in range(0, len(ship_ids), SHIP_CATALOG_BATCH_SIZE):
+        batch = ship_ids[start:start + SHIP_CATALOG_BATCH_SIZE]
+        logging.info(' ---> Remote fetching ship info for %d unknown ships', len(batch))
+        data = _make_api_request("encyclopedia/ships/", {
+            "ship_id": ",".join(str(ship_id) for ship_id in batch),
+            "fields": SHIP_CATALOG_FIELDS,
+        })
+        if not isinstance(data, dict):
+            continue
+        answered.update(batch)
+        for ship_id in batch:
+            row = data.get(str(ship_id))
+            if isinstance(row, dict):
+                rows.append({**row, "ship_id": ship_id})
+    return rows, answered
+
+
+def resolve_ship_catalog(ship_ids: Iterable[Any]) -> Dict[Any, Optional[ShipCatalogEntry]]:
+    """Resolve a whole account's ship ids to catalog entries in one pass.
+
+    Known ships come from the process-local catalog. Misses are read from
+    the Ship table in one query (another process may have added them), and
+    only ships unknown there go to the API in batched ``encyclopedia/ships``
+    calls. Ids the API does not know resolve to None until the next catalog
+    version.
+    """
+    global _ship_catalog_state
+
+    normalized: Dict[Any, Optional[int]] = {}
+    for ship_id in ship_ids:
+        try:
+            clean_ship_id = int(ship_id)
+        except (TypeError, ValueError):
+            clean_ship_id = 0
+        normalized[ship_id] = clean_ship_id if clean_ship_id > 0 else None
+
+    version, entries, unknown = _current_ship_catalog()
+    missing = sorted({
+        ship_id for ship_id in normalized.values()
+        if ship_id is not None and ship_id not in entries and ship_id not in unknown
+    })
+    if missing:
+        found = _load_ship_catalog(missing)
+        remote_ids = [ship_id for ship_id in missing if ship_id not in found]
+        answered: set[int] = set()
+        if remote_ids:
+            ship_rows, answered = _fetch_ship_catalog_rows(remote_ids)
+            if ship_rows:
+                _upsert_ship_rows(ship_rows)
+                for row in ship_rows:
+                    entry = _catalog_entry(
+                        row["ship_id"], str(row.get("name") or ""), "",
+                        row.get("tier"), str(row.get("type") or ""))
+                    if entry is not None:
+                        found[entry.ship_id] = entry
+        with _ship_catalog_lock:
+            if _ship_catalog_state[0] == version:
+                _ship_catalog_state = (
+                    version,
+                    {**_ship_catalog_state[1], **found},
+                    _ship_catalog_state[2] | (answered - set(found)),
+                )
+        entries = {**entries, **found}
+
+    return {
+        ship_id: entries.get(clean_ship_id) if clean_ship_id is not None else None
+        for ship_id, clean_ship_id in normalized.items()
+    }
+
+
 def _fetch_ranked_ship_stats_for_player(player_id: int, season_ids: Optional[list[int]] = None) -> list[dict[str, Any]]:
     """Fetch ranked ship stats for a player, optionally scoped to one or more seasons."""
     params = {
@@ -211,42 +376,67 @@ def _fetch_ranked_ship_stats_for_player(player_id: int, season_ids: Optional[lis
 
 def _fetch_efficiency_badges_for_player(player_id: int) -> list[dict[str, Any]]:
     """Fetch per-ship efficiency badge classes for a player."""
-    params = {
-        "account_id": player_id,
-    }
     logging.info(
         ' ---> Remote fetching efficiency badges for player_id: %s',
         player_id,
     )
-    data = _make_api_request("ships/badges/", params)
+    rows = EFFICIENCY_BADGES_LOADER.load(player_id)
+    return rows if isinstance(rows, list) else []
 
-    try:
-        rows = data[str(player_id)]
-    except (KeyError, TypeError):
-        rows = []
 
-    return rows if isinstance(rows, list) else []
+def _compact_ship_stats_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not isinstance(row, dict) or not row.get("ship_id"):
+        return None
+
+    pvp = row.get("pvp") or {}
+    return {
+        "ship_id": row["ship_id"],
+        "battles": row.get("battles") or 0,
+        "distance": row.get("distance") or 0,
+        "pvp": {
+            "battles": pvp.get("battles") or 0,
+            "wins": pvp.get("wins") or 0,
+            "losses": pvp.get("losses") or 0,
+            "frags": pvp.get("frags") or 0,
+        },
+    }
+
+
+def _peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
 
-def _fetch_ship_stats_for_player(player_id: str) -> Dict:
-    """Fetch all competitive data for all ships for a given player_id."""
+def _fetch_ship_stats_for_player(player_id: str) -> list[dict[str, Any]]:
+    """Fetch all competitive data for all ships for a given player_id.
+
+    Only the fields update_battle_data reads are requested, and the response
+    is parsed row by row into compact dicts.
+    """
     params = {
-        "account_id": player_id
+        "account_id": player_id,
+        "fields": "ship_id,battles,distance,pvp.battles,pvp.wins,pvp.losses,pvp.frags",
     }
     logging.info(
         f' ---> EXPENSIVE: Remote fetching all battle stats for player_id: {player_id}')
-    data = _make_api_request("ships/stats/", params)
-
-    data_dict = {}
-    try:
-        data_dict = data[str(player_id)]
-    except (KeyError, TypeError):
-        keys_to_print = list(data.keys())[
-            :10] if isinstance(data, dict) else []
+    rss_before_kb = _peak_rss_kb()
+    result = stream_api_rows(
+        "ships/stats/", params, f"data.{player_id}.item", _compact_ship_stats_row)
+    if result is None:
         logging.error(
-            f'Unexpected response while loading ship data: {keys_to_print}')
+            f'Unexpected response while loading ship data for player_id: {player_id}')
+        return []
 
-    return data_dict
+    peak_rss_kb = _peak_rss_kb()
+    logging.info(
+        'Ship stats for player_id=%s: ships=%d bytes=%d decoded_bytes=%d peak_rss_kb=%d peak_rss_growth_kb=%d',
+        player_id,
+        len(result["rows"]),
+        result["bytes"],
+        result["decoded_bytes"],
+        peak_rss_kb,
+        peak_rss_kb - rss_before_kb,
+    )
+    return result["rows"]
 
 
 def _fetch_ship_info(ship_id: str) -> Optional[Ship]:
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional
+
+# Compact storage for battles_json. The rows built by update_battle_data
+# all share one fixed set of keys, so the stored payload keeps the values
+# of each row as a positional array under a schema version instead of
+# repeating every key for every ship:
+#
+#     {"v": 1, "rows": [[ship_id, ship_name, ...], ...]}
+#
+# Decoding wraps each stored array in a BattleRow, a read-only mapping over
+# the array, rather than building a dict per ship. Payloads whose rows do
+# not match the schema (hand-built fixtures, legacy partial rows) are kept
+# as a plain list of dicts, and plain lists still decode as-is.
+
+BATTLE_ROWS_SCHEMA_VERSION = 1
+BATTLE_ROW_FIELDS = (
+    'ship_id',
+    'ship_name',
+    'ship_chart_name',
+    'ship_tier',
+    'all_battles',
+    'distance',
+    'wins',
+    'losses',
+    'ship_type',
+    'pve_battles',
+    'pvp_battles',
+    'win_ratio',
+    'kdr',
+)
+_FIELD_INDEX = {field: index for index, field in enumerate(BATTLE_ROW_FIELDS)}
+_FIELD_SET = frozenset(BATTLE_ROW_FIELDS)
+
+
+class BattleRow(Mapping):
+    """Read-only view of one stored battle row; behaves like the row's dict."""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values: List[Any]):
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[_FIELD_INDEX[key]]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = _FIELD_INDEX.get(key)
+        return default if index is None else self._values[index]
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_INDEX
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(BATTLE_ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(BATTLE_ROW_FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BattleRow):
+            return self._values == other._values
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'BattleRow({dict(self)!r})'
+
+
+def _row_values(row: Any) -> Optional[List[Any]]:
+    if isinstance(row, BattleRow):
+        return row._values
+    if isinstance(row, Mapping) and row.keys() == _FIELD_SET:
+        return [row[field] for field in BATTLE_ROW_FIELDS]
+    return None
+
+
+def encode_battle_rows(rows: Any) -> Any:
+    """Stored form of ``rows``; falls back to the rows themselves when they do not fit the schema."""
+    if not isinstance(rows, list) or not rows:
+        return rows
+    encoded = []
+    for row in rows:
+        values = _row_values(row)
+        if values is None:
+            return [dict(item) if isinstance(item, Mapping) else item for item in rows]
+        encoded.append(values)
+    return {'v': BATTLE_ROWS_SCHEMA_VERSION, 'rows': encoded}
+
+
+def decode_battle_rows(data: Any) -> Any:
+    """Rows of a stored battles payload, as BattleRow objects when encoded."""
+    if not isinstance(data, dict):
+        return data
+    version = data.get('v')
+    if version != BATTLE_ROWS_SCHEMA_VERSION:
+        raise ValueError(f'Unsupported battle rows schema version: {version!r}')
+    return [BattleRow(values) for values in data['rows']]
@@ -1,24 +1,48 @@
 from __future__ import annotations
 
+import contextvars
 import logging
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
-import requests
 from django.conf import settings as django_settings
-
-from warships.models import Clan, Player
+from django.db import connections, transaction
+from django.db.models import F
+
+from warships.api.client import make_api_request_with_meta
+from warships.api.metrics import SOURCE_CRAWL, traffic_source
+from warships.api.rate_limit import PRIORITY_BACKGROUND, upstream_priority
+from warships.crawl_telemetry import CrawlTelemetry
+from warships.enrichment_queue import enqueue_player_enrichment
+from warships.models import Clan, ClanCrawlShard, Player, PlayerExplorerSummary
+from warships.player_payloads import prefetch_player_payloads, save_player_payloads
 from warships.player_records import get_or_create_canonical_player
 
 
-BASE_URL = "https://api.worldofwarships.com/wows/"
 APP_ID = os.environ.get("WG_APP_ID")
-REQUEST_TIMEOUT = 20
 PAGE_SIZE = 100
-RATE_LIMIT_DELAY = 0.25
 BATCH_SIZE = 100
+# clans/info/ accepts up to 100 clan ids per request.
+CLAN_INFO_BATCH_SIZE = 100
+CLAN_INFO_FIELDS = "members_count,tag,name,clan_id,description,leader_id,leader_name"
+# Unchanged players are not rewritten, so their stored days-since-last-battle
+# lags the calendar; rewrite them once it is this many days behind.
+DAYS_DRIFT_TOLERANCE = max(
+    int(os.environ.get("CLAN_CRAWL_DAYS_DRIFT_TOLERANCE", "7")), 1)
+# Per-stage concurrency for the member pipeline. All stages share the WG API
+# token bucket; keep the total under WG_API_POOL_SIZE.
+CLAN_WORKERS = max(int(os.environ.get("CLAN_CRAWL_CLAN_WORKERS", "4")), 1)
+PLAYER_FETCH_WORKERS = max(
+    int(os.environ.get("CLAN_CRAWL_PLAYER_WORKERS", "2")), 1)
+WRITER_WORKERS = max(int(os.environ.get("CLAN_CRAWL_WRITER_WORKERS", "4")), 1)
+STAGE_QUEUE_SIZE = max(int(os.environ.get("CLAN_CRAWL_QUEUE_SIZE", "50")), 1)
+
+_STAGE_DONE = object()
 
 log = logging.getLogger("crawl")
 
@@ -41,28 +65,9 @@ def _from_ts(ts):
 
 
 def _api_get(endpoint: str, params: Dict) -> Optional[Dict]:
-    time.sleep(RATE_LIMIT_DELAY)
-    params["application_id"] = APP_ID
-    try:
-        resp = requests.get(
-            BASE_URL + endpoint,
-            params=params,
-            timeout=REQUEST_TIMEOUT,
-        )
-        resp.raise_for_status()
-        body = resp.json()
-    except requests.RequestException as exc:
-        log.error("Request failed for %s: %s", endpoint, exc)
-        return None
-    except ValueError as exc:
-        log.error("Bad JSON from %s: %s", endpoint, exc)
-        return None
-
-    if body.get("status") != "ok":
-        log.error("API error for %s: %s", endpoint, body.get("error"))
-        return None
-
-    return body
+    # Crawl pages are never requested twice, so skip single-flight; the
+    # pooled session, retries, breaker and rate limiter still apply.
+    return make_api_request_with_meta(endpoint, params, coalesce=False)
 
 
 def fetch_clan_list_page(page: int) -> tuple[List[Dict], int]:
@@ -82,28 +87,29 @@ def fetch_clan_list_page(page: int) -> tuple[List[Dict], int]:
     return body.get("data", []) or [], total_pages
 
 
-def fetch_member_ids(clan_id: int) -> List[int]:
-    body = _api_get(
-        "clans/info/",
-        {"clan_id": clan_id, "fields": "members_ids"},
-    )
-    if body is None:
-        return []
-    clan_data = body.get("data", {}).get(str(clan_id)) or {}
-    return clan_data.get("members_ids", []) or []
-
+def fetch_clans_info_bulk(clan_ids: List[int]) -> Dict[int, Dict]:
+    """Fetch info and member ids for up to CLAN_INFO_BATCH_SIZE clans in one call.
 
-def fetch_clan_info(clan_id: int) -> Dict:
+    Clans WG did not return (disbanded, or the whole request failed) are
+    absent from the result.
+    """
+    if not clan_ids:
+        return {}
     body = _api_get(
         "clans/info/",
         {
-            "clan_id": clan_id,
-            "fields": "members_count,tag,name,clan_id,description,leader_id,leader_name",
+            "clan_id": ",".join(str(clan_id) for clan_id in clan_ids),
+            "fields": f"{CLAN_INFO_FIELDS},members_ids",
         },
     )
     if body is None:
         return {}
-    return body.get("data", {}).get(str(clan_id)) or {}
+    data = body.get("data", {}) or {}
+    return {
+        int(clan_id): clan_data
+        for clan_id, clan_data in data.items()
+        if clan_data
+    }
 
 
 def fetch_players_bulk(player_ids: List[int]) -> Dict:
@@ -134,17 +140,30 @@ def save_clan(info: Dict) -> Clan:
     return clan
 
 
-def save_player(player_data: Dict, clan: Clan) -> None:
-    from warships.data import compute_player_verdict, refresh_player_explorer_summary, update_achievements_data, update_player_efficiency_data
-
-    if player_data is None:
-        return
-
-    pid = player_data.get("account_id")
-    if not pid:
-        return
+# Player columns written from an account/info payload.
+ACCOUNT_INFO_FIELDS = (
+    "name",
+    "clan",
+    "creation_date",
+    "last_battle_date",
+    "days_since_last_battle",
+    "is_hidden",
+    "efficiency_updated_at",
+    "verdict",
+    "total_battles",
+    "pvp_battles",
+    "pvp_wins",
+    "pvp_losses",
+    "pvp_ratio",
+    "pvp_survival_rate",
+    "stats_updated_at",
+    "last_fetch",
+)
+
+
+def _apply_account_info(player: Player, player_data: Dict, clan: Clan) -> None:
+    from warships.data import compute_player_verdict
 
-    player, _created = get_or_create_canonical_player(pid)
     player.name = player_data.get("nickname", player.name or "")
     player.clan = clan
 
@@ -163,6 +182,9 @@ def save_player(player_data: Dict, clan: Clan) -> None:
         player.days_since_last_battle = (
             _now().date() - player.last_battle_date).days
 
+    if player_data.get("stats_updated_at"):
+        player.stats_updated_at = _from_ts(player_data["stats_updated_at"])
+
     if player_data.get("hidden_profile"):
         player.is_hidden = True
         player.efficiency_json = None
@@ -191,6 +213,58 @@ def save_player(player_data: Dict, clan: Clan) -> None:
         )
 
     player.last_fetch = _now()
+
+
+def _account_info_unchanged(player: Player, player_data: Dict, clan: Clan) -> bool:
+    """True when a stored player already reflects this account/info payload.
+
+    WG bumps last_battle_time and stats_updated_at whenever a battle lands,
+    so matching both (plus name, clan and visibility) means the row, its
+    explorer summary and its enrichment are all still current.
+    """
+    if player.pk is None or player.clan_id != clan.pk:
+        return False
+    if player.name != player_data.get("nickname", player.name):
+        return False
+    if bool(player_data.get("hidden_profile")) != player.is_hidden:
+        return False
+
+    last_battle_time = player_data.get("last_battle_time")
+    if not last_battle_time or player.last_battle_date != _from_ts(last_battle_time).date():
+        return False
+    if not player.is_hidden:
+        stats_updated_at = player_data.get("stats_updated_at")
+        if not stats_updated_at or player.stats_updated_at != _from_ts(stats_updated_at):
+            return False
+
+    days_behind = (_now().date() - player.last_battle_date).days - \
+        (player.days_since_last_battle or 0)
+    return days_behind < DAYS_DRIFT_TOLERANCE
+
+
+def _has_explorer_summary(player: Player) -> bool:
+    try:
+        return player.explorer_summary is not None
+    except PlayerExplorerSummary.DoesNotExist:
+        return False
+
+
+def save_player(player_data: Dict, clan: Clan) -> bool:
+    """Save one crawled player; returns False when the stored row was already current."""
+    from warships.data import refresh_player_explorer_summary, update_achievements_data, update_player_efficiency_data
+
+    if player_data is None:
+        return False
+
+    pid = player_data.get("account_id")
+    if not pid:
+        return False
+
+    player, _created = get_or_create_canonical_player(pid)
+    if _account_info_unchanged(player, player_data, clan) and _has_explorer_summary(player):
+        return False
+
+    _apply_account_info(player, player_data, clan)
     player.save()
 
     if not player.is_hidden:
@@ -198,102 +272,485 @@ def save_player(player_data: Dict, clan: Clan) -> None:
         update_achievements_data(player.player_id)
 
     refresh_player_explorer_summary(player)
+    return True
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def save_players_bulk(player_payloads: Iterable[Optional[Dict]], clan: Clan) -> dict[str, int]:
+    """Persist one account/info batch with a fixed number of statements.
+
+    Existing rows are read in one query, new players are inserted with one
+    ``bulk_create`` and existing ones rewritten with one ``bulk_update``.
+    Explorer summaries are upserted in bulk, and badge/achievement
+    enrichment is recorded as a prioritised intent in the enrichment
+    backlog instead of being fetched inline. Players whose stored row
+    already matches the payload are left alone and counted as
+    ``players_unchanged``.
+    """
+    from warships.data import EXPLORER_SUMMARY_PAYLOAD_KINDS, player_achievements_need_refresh, player_efficiency_needs_refresh, refresh_player_explorer_summaries
+
+    payloads: Dict[int, Dict] = {}
+    for player_data in player_payloads:
+        if player_data and player_data.get("account_id"):
+            payloads[int(player_data["account_id"])] = player_data
+    if not payloads:
+        return {"players_saved": 0, "players_unchanged": 0, "created": 0, "enrichment_queued": 0, "db_round_trips": 0}
+
+    counter = _QueryCounter()
+    with connections["default"].execute_wrapper(counter), transaction.atomic():
+        existing: Dict[int, Player] = {}
+        duplicate_ids = set()
+        stored = Player.objects.filter(player_id__in=list(payloads)).select_related(
+            "explorer_summary").order_by("id")
+        for player in stored:
+            if player.player_id in existing:
+                duplicate_ids.add(player.player_id)
+                continue
+            existing[player.player_id] = player
+        for player_id in duplicate_ids:
+            # Rare; let the canonical path merge the duplicate rows.
+            existing[player_id], _created = get_or_create_canonical_player(
+                player_id)
+
+        new_players = []
+        changed_players = []
+        unchanged = 0
+        for player_id, player_data in payloads.items():
+            player = existing.get(player_id)
+            if player is None:
+                player = Player(name="", player_id=player_id)
+                new_players.append(player)
+            elif _account_info_unchanged(player, player_data, clan) and _has_explorer_summary(player):
+                unchanged += 1
+                continue
+            else:
+                changed_players.append(player)
+            _apply_account_info(player, player_data, clan)
+
+        if new_players:
+            Player.objects.bulk_create(new_players)
+            save_player_payloads(new_players, created=True)
+        if changed_players:
+            Player.objects.bulk_update(changed_players, ACCOUNT_INFO_FIELDS)
+            # Hidden profiles drop their badge payload.
+            save_player_payloads(changed_players)
+            prefetch_player_payloads(
+                [player for player in changed_players if not player.is_hidden],
+                (*EXPLORER_SUMMARY_PAYLOAD_KINDS, "achievements"))
+
+        players = [*changed_players, *new_players]
+        if players:
+            refresh_player_explorer_summaries(players)
+
+        enrichment_queued = enqueue_player_enrichment([
+            player for player in players
+            if not player.is_hidden and (
+                player_efficiency_needs_refresh(player)
+                or player_achievements_need_refresh(player)
+            )
+        ])
+
+    log.debug("Saved %d players (%d unchanged) for clan %s in %d DB round trips",
+              len(players), unchanged, clan.clan_id, counter.count)
+    return {
+        "players_saved": len(players),
+        "players_unchanged": unchanged,
+        "created": len(new_players),
+        "enrichment_queued": enrichment_queued,
+        "db_round_trips": counter.count,
+    }
 
 
-def crawl_clan_ids(limit: Optional[int] = None, heartbeat_callback: Optional[Callable[[], None]] = None) -> List[Dict]:
-    all_clans: List[Dict] = []
-    page = 1
+def crawl_clan_ids(
+    limit: Optional[int] = None,
+    heartbeat_callback: Optional[Callable[[], None]] = None,
+    on_page: Optional[Callable[[int, List[Dict]], None]] = None,
+    start_page: int = 1,
+    page_step: int = 1,
+    on_total: Optional[Callable[[int], None]] = None,
+) -> Iterator[Dict]:
+    """Yield clan stubs from clans/list/ one page at a time.
+
+    Only the current page is held, so memory does not grow with the number
+    of clans and consumers start on page 1 while later pages are pending.
+    ``on_page`` sees each page number and its stubs (already cut to
+    ``limit``) before they are yielded. Shards walk every ``page_step``-th
+    page from ``start_page``. ``on_total`` gets the estimated number of
+    clans this walk will list once the first page reports the page count.
+    """
+    found = 0
+    page = start_page
     _touch_crawl_heartbeat(heartbeat_callback)
 
     first_batch, total_pages = fetch_clan_list_page(page)
     if not first_batch:
-        log.error("Failed to fetch first page of clans/list/")
-        return []
-
-    all_clans.extend(first_batch)
-    log.info("Page 1/%d — %d clans (total pages: %d)",
-             total_pages, len(first_batch), total_pages)
+        if total_pages and page > total_pages:
+            log.info("Start page %d is past the last page (%d); nothing to crawl",
+                     page, total_pages)
+            return
+        log.error("Failed to fetch page %d of clans/list/", page)
+        raise RuntimeError("Failed to fetch clan list")
+    log.info("Page %d/%d — %d clans (total pages: %d)",
+             page, total_pages, len(first_batch), total_pages)
+
+    later_pages = iter(
+        range(start_page + page_step, total_pages + 1, page_step))
+    if on_total is not None:
+        estimated = len(range(start_page, total_pages + 1, page_step)) * PAGE_SIZE
+        on_total(min(estimated, limit) if limit else estimated)
+    batch = first_batch
+    while True:
+        if limit:
+            batch = batch[:max(limit - found, 0)]
+        if batch:
+            if on_page is not None:
+                on_page(page, batch)
+            found += len(batch)
+            yield from batch
+        if page % 50 == 0:
+            log.info("Page %d/%d — %d clans so far",
+                     page, total_pages, found)
 
-    for page in range(2, total_pages + 1):
-        _touch_crawl_heartbeat(heartbeat_callback)
-        if limit and len(all_clans) >= limit:
+        page = next(later_pages, None)
+        if page is None or (limit and found >= limit):
             break
+        _touch_crawl_heartbeat(heartbeat_callback)
         batch, _ = fetch_clan_list_page(page)
         if not batch:
             log.warning("Empty page %d, stopping pagination", page)
             break
-        all_clans.extend(batch)
-        if page % 50 == 0:
-            log.info("Page %d/%d — %d clans so far",
-                     page, total_pages, len(all_clans))
-
-    if limit:
-        all_clans = all_clans[:limit]
-
-    log.info("Collected %d clan IDs", len(all_clans))
-    return all_clans
 
+    log.info("Listed %d clan IDs", found)
+
+
+class _PageCursor:
+    """Tracks which listed pages have every clan fully processed.
+
+    Pages are registered in crawl order; ``on_advance`` fires with the
+    highest page whose clans, and every earlier page's clans, are done.
+    Listings shift during a long crawl, so one clan can appear on several
+    pending pages; finishing it clears it from all of them.
+    """
+
+    def __init__(self, on_advance: Callable[[int], None]):
+        self._on_advance = on_advance
+        self._lock = threading.Lock()
+        self._pending: Dict[int, set] = {}
+        self._pages_of: Dict[int, set] = {}
+
+    def add_page(self, page: int, clan_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._pending[page] = set(clan_ids)
+            for clan_id in self._pending[page]:
+                self._pages_of.setdefault(clan_id, set()).add(page)
+
+    def clan_done(self, clan_id: int) -> None:
+        completed = None
+        with self._lock:
+            pages = self._pages_of.pop(clan_id, None)
+            if not pages:
+                return
+            for page in pages:
+                self._pending[page].discard(clan_id)
+            while self._pending:
+                first_page = next(iter(self._pending))
+                if self._pending[first_page]:
+                    break
+                del self._pending[first_page]
+                completed = first_page
+        if completed is not None:
+            self._on_advance(completed)
+
+
+class _ClanFeed:
+    """Bounded hand-off of clan stubs from the page crawler to the pipeline."""
+
+    def __init__(self, maxsize: int = STAGE_QUEUE_SIZE, cursor: Optional[_PageCursor] = None):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(maxsize, 1))
+        self._closed = threading.Event()
+        self._cursor = cursor
+        self.count = 0
+
+    def register_page(self, page: int, stubs: List[Dict]) -> None:
+        if self._cursor is not None:
+            self._cursor.add_page(page, [stub["clan_id"] for stub in stubs])
+
+    def put(self, item: object) -> bool:
+        """Block until there is room; False once the consumer has closed the feed."""
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fill(self, clan_stubs: Iterable[Dict]) -> int:
+        try:
+            for stub in clan_stubs:
+                if not self.put(stub):
+                    break
+                self.count += 1
+        finally:
+            self.put(_STAGE_DONE)
+        return self.count
+
+    def close(self) -> None:
+        """Stop accepting stubs; unblocks the producer if nobody consumes."""
+        self._closed.set()
+
+    def __iter__(self) -> Iterator[Dict]:
+        while True:
+            stub = self._queue.get()
+            if stub is _STAGE_DONE:
+                return
+            yield stub
+
+
+class _CrawlStage:
+    """Worker threads draining one bounded queue into the next one."""
+
+    def __init__(self, name: str, workers: int, handler: Callable[[object, Callable[[object], None]], None], inbox: queue.Queue, outbox: Optional[queue.Queue], pipeline: "_ClanCrawlPipeline"):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self._pipeline = pipeline
+        self._threads = []
+        for index in range(max(int(workers), 1)):
+            # Each worker runs in a copy of the caller's context so upstream
+            # priority and traffic-source labels carry over.
+            context = contextvars.copy_context()
+            self._threads.append(threading.Thread(
+                target=context.run,
+                args=(self._work,),
+                name=f"clan-crawl-{name}-{index}",
+                daemon=True,
+            ))
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def emit(self, item: object) -> None:
+        if self.outbox is not None:
+            self.outbox.put(item)
+
+    def _work(self) -> None:
+        try:
+            while True:
+                item = self.inbox.get()
+                if item is _STAGE_DONE:
+                    # Leave the marker for the sibling workers.
+                    self.inbox.put(_STAGE_DONE)
+                    return
+                if self._pipeline.aborted:
+                    continue
+                try:
+                    self.handler(item, self.emit)
+                except Exception as error:
+                    self._pipeline.fail(self.name, error)
+        finally:
+            connections.close_all()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        if self.outbox is not None:
+            self.outbox.put(_STAGE_DONE)
+
+
+class _ClanCrawlPipeline:
+    """clans/info batch -> bulk player fetch -> DB writer, each stage bounded.
+
+    Every stage draws on the shared upstream token bucket, so adding workers
+    raises concurrency without raising the request budget.
+    """
+
+    def __init__(
+        self,
+        resume: bool,
+        heartbeat_callback: Optional[Callable[[], None]],
+        clan_workers: int = CLAN_WORKERS,
+        player_workers: int = PLAYER_FETCH_WORKERS,
+        writer_workers: int = WRITER_WORKERS,
+        queue_size: int = STAGE_QUEUE_SIZE,
+        on_clan_done: Optional[Callable[[int], None]] = None,
+        telemetry: Optional[CrawlTelemetry] = None,
+    ):
+        self.resume = resume
+        self.heartbeat_callback = heartbeat_callback
+        self._on_clan_done = on_clan_done or (lambda clan_id: None)
+        self.telemetry = telemetry
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.counters = {
+            "clans_processed": 0,
+            "players_saved": 0,
+            "players_unchanged": 0,
+            "skipped": 0,
+            "player_batches": 0,
+            "db_round_trips": 0,
+            "enrichment_queued": 0,
+        }
 
-def crawl_clan_members(clan_stubs: List[Dict], resume: bool = False, heartbeat_callback: Optional[Callable[[], None]] = None) -> dict[str, int]:
-    total = len(clan_stubs)
-    clans_processed = 0
-    players_saved = 0
-    skipped = 0
-
-    for i, stub in enumerate(clan_stubs, 1):
-        _touch_crawl_heartbeat(heartbeat_callback)
-        clan_id = stub["clan_id"]
-
-        if resume and Clan.objects.filter(clan_id=clan_id, last_fetch__isnull=False).exists():
-            skipped += 1
-            continue
-
-        info = fetch_clan_info(clan_id)
-        if not info:
-            log.warning("[%d/%d] Failed to fetch info for clan %d",
-                        i, total, clan_id)
-            continue
-
-        clan = save_clan(info)
-        members_count = info.get("members_count", 0)
-
-        if members_count == 0:
-            clans_processed += 1
-            continue
-
-        member_ids = fetch_member_ids(clan_id)
-        if not member_ids:
-            log.warning("[%d/%d] No member IDs for [%s] %s",
-                        i, total, clan.tag, clan.name)
-            clans_processed += 1
-            continue
-
+        clan_queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+        player_queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+        write_queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+        self.inbox = clan_queue
+        self.stages = [
+            _CrawlStage("clans", clan_workers, self._fetch_clans,
+                        clan_queue, player_queue, self),
+            _CrawlStage("players", player_workers, self._fetch_players,
+                        player_queue, write_queue, self),
+            _CrawlStage("writer", writer_workers,
+                        self._write_clan, write_queue, None, self),
+        ]
+        if telemetry is not None:
+            telemetry.queue_depths = self.queue_depths
+
+    @property
+    def aborted(self) -> bool:
+        return self._abort.is_set()
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {stage.name: stage.inbox.qsize() for stage in self.stages}
+
+    def on_clan_done(self, clan_id: int) -> None:
+        self._on_clan_done(clan_id)
+        if self.telemetry is not None:
+            self.telemetry.count("clans")
+
+    def fail(self, stage: str, error: BaseException) -> None:
+        log.exception("Clan crawl %s stage failed: %s", stage, error)
+        with self._lock:
+            if self.error is None:
+                self.error = error
+        self._abort.set()
+        if self.telemetry is not None:
+            self.telemetry.count(f"{stage}_stage_errors")
+
+    def _count(self, name: str, amount: int = 1) -> int:
+        with self._lock:
+            self.counters[name] += amount
+            return self.counters[name]
+
+    def _fetch_clans(self, stubs: List[Dict], emit: Callable[[object], None]) -> None:
+        _touch_crawl_heartbeat(self.heartbeat_callback)
+        clan_ids = [stub["clan_id"] for stub in stubs]
+
+        if self.resume:
+            done = set(Clan.objects.filter(
+                clan_id__in=clan_ids, last_fetch__isnull=False,
+            ).values_list("clan_id", flat=True))
+            if done:
+                self._count("skipped", len(done))
+                clan_ids = [
+                    clan_id for clan_id in clan_ids if clan_id not in done]
+                for clan_id in done:
+                    self.on_clan_done(clan_id)
+
+        infos = fetch_clans_info_bulk(clan_ids)
+        for clan_id in clan_ids:
+            info = infos.get(clan_id)
+            if not info:
+                log.warning("Failed to fetch info for clan %d", clan_id)
+                self.on_clan_done(clan_id)
+                continue
+            member_ids = info.pop("members_ids", None) or []
+            emit((info, member_ids if info.get("members_count", 0) else []))
+
+    def _fetch_players(self, item: tuple, emit: Callable[[object], None]) -> None:
+        info, member_ids = item
+        player_map: Dict = {}
         for batch_start in range(0, len(member_ids), BATCH_SIZE):
-            batch_ids = member_ids[batch_start: batch_start + BATCH_SIZE]
-            player_map = fetch_players_bulk(batch_ids)
-
-            for _pid_str, pdata in player_map.items():
-                save_player(pdata, clan)
-                players_saved += 1
-
-        clans_processed += 1
+            player_map.update(fetch_players_bulk(
+                member_ids[batch_start: batch_start + BATCH_SIZE]))
+        emit((info, member_ids, player_map))
+
+    def _write_clan(self, item: tuple, emit: Callable[[object], None]) -> None:
+        info, member_ids, player_map = item
+        _touch_crawl_heartbeat(self.heartbeat_callback)
+        started = time.monotonic()
+        clan = save_clan(info)
+        if info.get("members_count", 0) and not member_ids:
+            log.warning("No member IDs for [%s] %s", clan.tag, clan.name)
+
+        payloads = list(player_map.values())
+        for batch_start in range(0, len(payloads), BATCH_SIZE):
+            saved = save_players_bulk(
+                payloads[batch_start: batch_start + BATCH_SIZE], clan)
+            self._count("players_saved", saved["players_saved"])
+            self._count("players_unchanged", saved["players_unchanged"])
+            self._count("enrichment_queued", saved["enrichment_queued"])
+            self._count("db_round_trips", saved["db_round_trips"])
+            self._count("player_batches")
+        if self.telemetry is not None:
+            self.telemetry.record_latency(
+                "db_write", time.monotonic() - started)
+            self.telemetry.count("players", len(payloads))
+
+        clans_processed = self._count("clans_processed")
+        self.on_clan_done(clan.clan_id)
+        if self.telemetry is not None:
+            self.telemetry.publish()
         if clans_processed % 25 == 0:
             log.info(
-                "[%d/%d] Processed %d clans, %d players saved, %d skipped",
-                i,
-                total,
+                "Processed %d clans, %d players saved, %d unchanged, %d skipped",
                 clans_processed,
-                players_saved,
-                skipped,
+                self.counters["players_saved"],
+                self.counters["players_unchanged"],
+                self.counters["skipped"],
             )
 
-    log.info("Done. Clans processed: %d, skipped: %d, players saved: %d",
-             clans_processed, skipped, players_saved)
-    return {
-        "clans_processed": clans_processed,
-        "players_saved": players_saved,
-        "skipped": skipped,
-    }
+    def run(self, clan_stubs: Iterable[Dict]) -> dict[str, int]:
+        for stage in self.stages:
+            stage.start()
+        try:
+            # The clan stage works on clans/info/-sized chunks of stubs.
+            chunk: List[Dict] = []
+            for stub in clan_stubs:
+                if self.aborted:
+                    break
+                chunk.append(stub)
+                if len(chunk) >= CLAN_INFO_BATCH_SIZE:
+                    self.inbox.put(chunk)
+                    chunk = []
+            if chunk and not self.aborted:
+                self.inbox.put(chunk)
+        finally:
+            self.inbox.put(_STAGE_DONE)
+            for stage in self.stages:
+                stage.join()
+
+        if self.error is not None:
+            raise self.error
+        return dict(self.counters)
+
+
+def crawl_clan_members(
+    clan_stubs: Iterable[Dict],
+    resume: bool = False,
+    heartbeat_callback: Optional[Callable[[], None]] = None,
+    on_clan_done: Optional[Callable[[int], None]] = None,
+    telemetry: Optional[CrawlTelemetry] = None,
+) -> dict[str, int]:
+    summary = _ClanCrawlPipeline(
+        resume, heartbeat_callback, on_clan_done=on_clan_done,
+        telemetry=telemetry).run(clan_stubs)
+    log.info("Done. Clans processed: %d, skipped: %d, players saved: %d, unchanged: %d (%d DB round trips over %d batches, %d queued for enrichment)",
+             summary["clans_processed"], summary["skipped"], summary["players_saved"], summary["players_unchanged"],
+             summary["db_round_trips"], summary["player_batches"], summary["enrichment_queued"])
+    return summary
 
 
 def run_clan_crawl(
@@ -301,42 +758,147 @@ def run_clan_crawl(
     dry_run: bool = False,
     limit: Optional[int] = None,
     heartbeat_callback: Optional[Callable[[], None]] = None,
+    start_page: int = 1,
+    page_step: int = 1,
+    on_page_done: Optional[Callable[[int], None]] = None,
+    telemetry_job: str = "clan_crawl",
 ) -> dict[str, int | bool]:
+    """Crawl clans/list into the member pipeline.
+
+    Live progress is published under ``telemetry_job`` for the crawl
+    telemetry endpoint; dry runs publish nothing.
+    """
     from warships.tasks import queue_efficiency_rank_snapshot_refresh
 
     if not APP_ID:
         raise RuntimeError("WG_APP_ID environment variable is not set")
 
-    log.info("Starting crawl (resume=%s, dry_run=%s, limit=%s)",
-             resume, dry_run, limit)
-
-    clan_stubs = crawl_clan_ids(
-        limit=limit,
-        heartbeat_callback=heartbeat_callback,
-    )
-    if not clan_stubs:
-        raise RuntimeError("Failed to fetch clan list")
-
-    if dry_run:
-        log.info("Dry run complete — %d clans found", len(clan_stubs))
-        return {
-            "resume": resume,
-            "dry_run": True,
-            "limit": limit,
-            "clans_found": len(clan_stubs),
-        }
-
-    summary = crawl_clan_members(
-        clan_stubs,
-        resume=resume,
-        heartbeat_callback=heartbeat_callback,
-    )
+    log.info("Starting crawl (resume=%s, dry_run=%s, limit=%s, start_page=%d, page_step=%d)",
+             resume, dry_run, limit, start_page, page_step)
+
+    with upstream_priority(PRIORITY_BACKGROUND), traffic_source(SOURCE_CRAWL):
+        if dry_run:
+            clans_found = sum(1 for _stub in crawl_clan_ids(
+                limit=limit,
+                heartbeat_callback=heartbeat_callback,
+                start_page=start_page,
+                page_step=page_step,
+            ))
+            if not clans_found and start_page == 1:
+                raise RuntimeError("Failed to fetch clan list")
+            log.info("Dry run complete — %d clans found", clans_found)
+            return {
+                "resume": resume,
+                "dry_run": True,
+                "limit": limit,
+                "clans_found": clans_found,
+            }
+
+        # Clan pages stream into the member pipeline while later pages are
+        # still being fetched.
+        cursor = _PageCursor(on_page_done) if on_page_done else None
+        feed = _ClanFeed(cursor=cursor)
+        telemetry = CrawlTelemetry(telemetry_job, "clans", total=limit or None)
+        clan_stubs = crawl_clan_ids(
+            limit=limit,
+            heartbeat_callback=heartbeat_callback,
+            on_page=feed.register_page,
+            start_page=start_page,
+            page_step=page_step,
+            on_total=telemetry.set_total,
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="clan-crawl-pages") as executor:
+                listing = executor.submit(
+                    contextvars.copy_context().run, feed.fill, clan_stubs)
+                try:
+                    summary = crawl_clan_members(
+                        feed,
+                        resume=resume,
+                        heartbeat_callback=heartbeat_callback,
+                        on_clan_done=cursor.clan_done if cursor else None,
+                        telemetry=telemetry,
+                    )
+                finally:
+                    feed.close()
+                clans_found = listing.result()
+            if not clans_found and start_page == 1:
+                raise RuntimeError("Failed to fetch clan list")
+        except BaseException as error:
+            telemetry.finish(error)
+            raise
+        telemetry.finish()
     if summary.get("players_saved", 0) > 0:
         queue_efficiency_rank_snapshot_refresh()
     summary.update({
         "resume": resume,
         "dry_run": False,
         "limit": limit,
-        "clans_found": len(clan_stubs),
+        "clans_found": clans_found,
     })
     return summary
+
+
+def start_clan_crawl_shards(shard_count: int, limit: Optional[int] = None) -> List[ClanCrawlShard]:
+    """Reset the durable shard cursors for a fresh sharded crawl.
+
+    Shard ``i`` owns clans/list pages ``i + 1, i + 1 + shard_count, ...``;
+    ``limit`` is split across the shards.
+    """
+    shard_count = max(int(shard_count), 1)
+    shards = []
+    for index in range(shard_count):
+        shard_limit = None
+        if limit:
+            shard_limit = limit // shard_count + \
+                (1 if index < limit % shard_count else 0)
+        shards.append(ClanCrawlShard(
+            shard_index=index,
+            shard_count=shard_count,
+            next_page=index + 1,
+            limit=shard_limit,
+            # A shard whose share of the limit is zero has nothing to do.
+            status=ClanCrawlShard.STATUS_COMPLETED if shard_limit == 0 else ClanCrawlShard.STATUS_PENDING,
+        ))
+    with transaction.atomic():
+        ClanCrawlShard.objects.all().delete()
+        ClanCrawlShard.objects.bulk_create(shards)
+    return shards
+
+
+def run_clan_crawl_shard(shard_index: int, heartbeat_callback: Optional[Callable[[], None]] = None) -> dict[str, int | bool]:
+    """Crawl one shard from its durable cursor and mark it completed.
+
+    The cursor moves past a page only once every clan on it (and on the
+    shard's earlier pages) has been written, so a restart repeats at most
+    the pages that were in flight instead of probing each clan's
+    ``last_fetch``.
+    """
+    shard = ClanCrawlShard.objects.get(shard_index=shard_index)
+    if shard.status == ClanCrawlShard.STATUS_COMPLETED:
+        return {"shard_index": shard_index, "status": shard.status}
+
+    ClanCrawlShard.objects.filter(pk=shard.pk).update(
+        status=ClanCrawlShard.STATUS_RUNNING,
+        started_at=shard.started_at or _now(),
+    )
+
+    def advance(page: int) -> None:
+        ClanCrawlShard.objects.filter(pk=shard.pk, next_page__lte=page).update(
+            next_page=page + shard.shard_count)
+
+    summary = run_clan_crawl(
+        limit=shard.limit,
+        heartbeat_callback=heartbeat_callback,
+        start_page=shard.next_page,
+        page_step=shard.shard_count,
+        on_page_done=advance,
+        telemetry_job=f"clan_crawl:shard-{shard_index}",
+    )
+    ClanCrawlShard.objects.filter(pk=shard.pk).update(
+        status=ClanCrawlShard.STATUS_COMPLETED,
+        finished_at=_now(),
+        clans_processed=F("clans_processed") + summary.get("clans_processed", 0),
+        players_saved=F("players_saved") + summary.get("players_saved", 0),
+    )
+    return {"shard_index": shard_index, "status": ClanCrawlShard.STATUS_COMPLETED, **summary}
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from warships.api.metrics import get_process_upstream_totals
+
+
+logger = logging.getLogger(__name__)
+
+# Live progress for long-running ingestion jobs (the clan crawl and its
+# shards, the incremental refresh commands). Each job keeps its counters in
+# process and publishes a snapshot to the shared cache every few seconds, so
+# the read-only telemetry endpoint sees every worker without tailing logs.
+
+TELEMETRY_KEY_PREFIX = "warships:crawl:telemetry:v1"
+TELEMETRY_INDEX_KEY = f"{TELEMETRY_KEY_PREFIX}:index"
+PUBLISH_INTERVAL_SECONDS = 5.0
+# Finished runs stay visible for a day; running jobs refresh their key on
+# every publish, so a dead worker's snapshot ages out on its own.
+TELEMETRY_TTL_SECONDS = 24 * 60 * 60
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def _telemetry_key(job: str) -> str:
+    return f"{TELEMETRY_KEY_PREFIX}:{job}"
+
+
+def _per_second(amount: float, elapsed: float) -> float:
+    return round(amount / elapsed, 2) if elapsed > 0 else 0.0
+
+
+class CrawlTelemetry:
+    """Counters, rates, latencies and ETA for one ingestion run.
+
+    ``progress_counter`` names the counter that moves towards ``total`` and
+    drives the ETA. ``queue_depths`` is polled at publish time. Latencies
+    are named series (``db_write`` for crawl writes). Upstream
+    calls and errors are this process's per-endpoint totals since the run
+    started, so run one job per worker process for exact figures.
+    """
+
+    def __init__(
+        self,
+        job: str,
+        progress_counter: str,
+        total: Optional[int] = None,
+        queue_depths: Optional[Callable[[], Dict[str, int]]] = None,
+    ):
+        self.job = job
+        self.progress_counter = progress_counter
+        self.total = total
+        self.queue_depths = queue_depths
+        self.status = STATUS_RUNNING
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {progress_counter: 0}
+        self._latencies: Dict[str, Dict[str, float]] = {}
+        self._started = time.monotonic()
+        self._started_at = timezone.now().isoformat()
+        self._upstream_baseline = get_process_upstream_totals()
+        self._last_publish = 0.0
+
+    def set_total(self, total: Optional[int]) -> None:
+        with self._lock:
+            self.total = total
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record_latency(self, name: str, elapsed_seconds: float) -> None:
+        elapsed_ms = elapsed_seconds * 1000
+        with self._lock:
+            series = self._latencies.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            series["count"] += 1
+            series["total_ms"] += elapsed_ms
+            series["max_ms"] = max(series["max_ms"], elapsed_ms)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_latency(name, time.monotonic() - started)
+
+    def _upstream_since_start(self) -> Dict[str, Dict[str, int]]:
+        upstream = {}
+        for endpoint, totals in get_process_upstream_totals().items():
+            baseline = self._upstream_baseline.get(endpoint, {})
+            responses = totals["responses"] - baseline.get("responses", 0)
+            errors = totals["errors"] - baseline.get("errors", 0)
+            if responses or errors:
+                upstream[endpoint] = {
+                    "calls": responses + errors,
+                    "errors": errors,
+                }
+        return upstream
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = {name: dict(series)
+                         for name, series in self._latencies.items()}
+            total = self.total
+        upstream = self._upstream_since_start()
+        upstream_calls = sum(row["calls"] for row in upstream.values())
+
+        done = counters.get(self.progress_counter, 0)
+        rate = _per_second(done, elapsed)
+        eta_seconds = None
+        if total is not None and rate > 0:
+            eta_seconds = int(max(total - done, 0) / rate)
+
+        queue_depths = None
+        if self.queue_depths is not None:
+            try:
+                queue_depths = self.queue_depths()
+            except Exception as error:
+                logger.debug("Unable to read queue depths for %s: %s",
+                             self.job, error)
+
+        return {
+            "job": self.job,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self._started_at,
+            "updated_at": timezone.now().isoformat(),
+            "elapsed_seconds": round(elapsed, 1),
+            "counters": counters,
+            "rates": {
+                "clans_per_second": _per_second(counters.get("clans", 0), elapsed),
+                "players_per_second": _per_second(counters.get("players", 0), elapsed),
+                "upstream_calls_per_second": _per_second(upstream_calls, elapsed),
+            },
+            "upstream": upstream,
+            "errors_by_endpoint": {
+                endpoint: row["errors"]
+                for endpoint, row in upstream.items()
+                if row["errors"]
+            },
+            "latency_ms": {
+                name: {
+                    "count": series["count"],
+                    "avg": round(series["total_ms"] / series["count"], 1),
+                    "max": round(series["max_ms"], 1),
+                }
+                for name, series in sorted(latencies.items())
+            },
+            "queue_depths": queue_depths,
+            "progress": {
+                "counter": self.progress_counter,
+                "done": done,
+                "total": total,
+                "eta_seconds": eta_seconds,
+            },
+        }
+
+    def publish(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_publish < PUBLISH_INTERVAL_SECONDS:
+                return
+            self._last_publish = now
+
+        try:
+            cache.set(_telemetry_key(self.job), self.snapshot(),
+                      timeout=TELEMETRY_TTL_SECONDS)
+            jobs = set(cache.get(TELEMETRY_INDEX_KEY) or ())
+            if self.job not in jobs:
+                cache.set(TELEMETRY_INDEX_KEY, sorted(
+                    jobs | {self.job}), timeout=None)
+        except Exception as error:
+            logger.debug("Unable to publish telemetry for %s: %s",
+                         self.job, error)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.status = STATUS_FAILED if error is not None else STATUS_COMPLETED
+        self.error = f"{type(error).__name__}: {error}" if error is not None else None
+        self.publish(force=True)
+
+
+def get_crawl_telemetry() -> Dict[str, Any]:
+    try:
+        jobs = cache.get(TELEMETRY_INDEX_KEY) or []
+        raw = cache.get_many([_telemetry_key(job) for job in jobs]) if jobs else {}
+    except Exception as error:
+        logger.warning("Unable to read crawl telemetry: %s", error)
+        return {"jobs": {}}
+
+    return {
+        "jobs": {
+            job: raw[_telemetry_key(job)]
+            for job in jobs
+            if _telemetry_key(job) in raw
+        },
+    }
@@ -1,23 +1,35 @@
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, Optional, Iterable
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional, Iterable, Iterator
+import contextvars
 from datetime import datetime, timezone, timedelta, date
 import logging
 import math
 import os
+import time
 from django.core.cache import cache
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
 from django.db.models.functions import Cast, Lower, TruncMonth
 from django.utils import timezone as django_timezone
 from warships.models import Player, Snapshot, Clan, PlayerExplorerSummary, Ship
-from warships.models import PlayerAchievementStat
+from warships.models import PLAYER_PAYLOAD_FIELDS, PlayerAchievementStat, PlayerPayload
+from warships.player_payloads import has_payload, prefetch_player_payloads, save_player_payloads
+from warships.player_ship_stats import fetch_tier_type_population, sync_player_ship_stats
 from warships.player_records import get_or_create_canonical_player
 from warships.achievements_catalog import get_achievement_catalog_entry
-from warships.api.ships import _fetch_ship_stats_for_player, _fetch_ship_info, _fetch_ranked_ship_stats_for_player, _fetch_efficiency_badges_for_player, build_ship_chart_name
+from warships.api.batching import primed_account_loaders
+from warships.api.circuit_breaker import get_circuit_breaker, upstream_degraded
+from warships.api.rate_limit import PRIORITY_BACKGROUND, upstream_priority
+from warships.crawl_telemetry import CrawlTelemetry
+from warships.refresh_profile import mark_refresh_outcome, profiled_refresh, refresh_stage
+from warships.upstream_fingerprints import RESOURCE_ACCOUNT_INFO, RESOURCE_ACHIEVEMENTS, RESOURCE_BADGES, RESOURCE_RANK_INFO, RESOURCE_SHIP_STATS, payload_fingerprint, store_upstream_fingerprint, upstream_payload_unchanged
+from warships.api.ships import _fetch_ship_stats_for_player, _fetch_ship_info, resolve_ship_catalog, _fetch_ranked_ship_stats_for_player, _fetch_efficiency_badges_for_player, build_ship_chart_name
 from warships.api.players import _fetch_snapshot_data, _fetch_player_personal_data, _fetch_ranked_account_info, _fetch_player_achievements
 from warships.api.clans import _fetch_clan_data, _fetch_clan_member_ids, _fetch_clan_membership_for_player, \
-    _fetch_clan_battle_seasons_info, _fetch_clan_battle_season_stats
+    _fetch_clan_battle_seasons_info, _fetch_clan_battle_season_stats, _fetch_clan_battle_season_stats_many
 from warships.tasks import update_activity_data_task, update_battle_data_task, update_clan_data_task, update_clan_members_task, update_randoms_data_task, update_snapshot_data_task, update_tiers_data_task, update_type_data_task
 
 logging.basicConfig(level=logging.INFO)
@@ -62,8 +74,12 @@ CLAN_BATTLE_PLAYER_HYDRATION_MAX_IN_FLIGHT = max(
     1, int(os.getenv('CLAN_BATTLE_PLAYER_HYDRATION_MAX_IN_FLIGHT', '8')))
 CLAN_BATTLE_SUMMARY_STALE_DAYS = max(
     1, int(os.getenv('CLAN_BATTLE_SUMMARY_STALE_DAYS', '7')))
+# Efficiency hydration is dispatched as one batched task, so the budget is
+# sized to a single ships/badges request (100 accounts).
 CLAN_EFFICIENCY_HYDRATION_MAX_IN_FLIGHT = max(
-    1, int(os.getenv('CLAN_EFFICIENCY_HYDRATION_MAX_IN_FLIGHT', '8')))
+    1, int(os.getenv('CLAN_EFFICIENCY_HYDRATION_MAX_IN_FLIGHT', '100')))
+PLAYER_DATA_FRESH_AFTER = timedelta(minutes=1400)
+PLAYER_DETAIL_ACCOUNT_LOADERS = ('account_info', 'clan_membership')
 PLAYER_EFFICIENCY_STALE_AFTER = timedelta(hours=24)
 PLAYER_ACHIEVEMENTS_STALE_AFTER = timedelta(hours=24)
 EFFICIENCY_BADGE_CLASS_LABELS = {
@@ -108,6 +124,13 @@ HOT_ENTITY_PLAYER_LIMIT = max(
 HOT_ENTITY_CLAN_LIMIT = max(
     1, int(os.getenv('HOT_ENTITY_CLAN_LIMIT', '10')))
 CLAN_PLOT_DATA_CACHE_TTL = 15 * 60
+# Bulk preloads walk the player table in id order, one chunk at a time, and
+# keep the last finished id in the cache so a restarted job resumes there.
+PLAYER_PRELOAD_CHUNK_SIZE = max(
+    1, int(os.getenv('PLAYER_PRELOAD_CHUNK_SIZE', '500')))
+PLAYER_PRELOAD_WORKERS = max(
+    1, int(os.getenv('PLAYER_PRELOAD_WORKERS', '4')))
+PLAYER_PRELOAD_CURSOR_KEY_PREFIX = 'warships:preload:cursor:v1'
 
 
 def _dispatch_async_refresh(task, *args, **kwargs) -> None:
@@ -121,6 +144,19 @@ def _dispatch_async_refresh(task, *args, **kwargs) -> None:
         )
 
 
+def _dispatch_deferred_refresh(task, **kwargs) -> None:
+    """Queue a refresh to run once the upstream circuit breaker cools down."""
+    try:
+        task.apply_async(
+            kwargs=kwargs, countdown=get_circuit_breaker().retry_after_seconds())
+    except Exception as error:
+        logging.warning(
+            'Skipping deferred refresh for %s because broker dispatch failed: %s',
+            getattr(task, 'name', repr(task)),
+            error,
+        )
+
+
 def _is_stale_timestamp(updated_at: Optional[datetime], stale_after: timedelta) -> bool:
     if updated_at is None:
         return True
@@ -414,12 +450,22 @@ def update_player_efficiency_data(player: Player, force_refresh: bool = False) -
         player.save(update_fields=['efficiency_json', 'efficiency_updated_at'])
         return []
 
-    rows = _build_efficiency_badge_rows(
-        _fetch_efficiency_badges_for_player(player.player_id)
-    )
+    badge_rows = _fetch_efficiency_badges_for_player(player.player_id)
+    if not badge_rows and upstream_degraded():
+        # An empty fetch here is the breaker, not a player without badges.
+        return player.efficiency_json or []
+
+    badges_fingerprint = payload_fingerprint(badge_rows)
+    if player.efficiency_json is not None and upstream_payload_unchanged(player, RESOURCE_BADGES, badges_fingerprint):
+        player.efficiency_updated_at = django_timezone.now()
+        player.save(update_fields=['efficiency_updated_at'])
+        return player.efficiency_json
+
+    rows = _build_efficiency_badge_rows(badge_rows)
     player.efficiency_json = rows
     player.efficiency_updated_at = django_timezone.now()
     player.save(update_fields=['efficiency_json', 'efficiency_updated_at'])
+    store_upstream_fingerprint(player, RESOURCE_BADGES, badges_fingerprint)
     return rows
 
 
@@ -542,6 +588,19 @@ def update_achievements_data(player_id: int, force_refresh: bool = False) -> lis
             'source_kind',
         ))
 
+    achievements_fingerprint = payload_fingerprint(raw_payload)
+    if player.achievements_json is not None and upstream_payload_unchanged(player, RESOURCE_ACHIEVEMENTS, achievements_fingerprint):
+        player.achievements_updated_at = django_timezone.now()
+        player.save(update_fields=['achievements_updated_at'])
+        return list(player.achievement_stats.order_by('achievement_slug').values(
+            'achievement_code',
+            'achievement_slug',
+            'achievement_label',
+            'category',
+            'count',
+            'source_kind',
+        ))
+
     normalized_rows = normalize_player_achievement_rows(raw_payload)
     refreshed_at = django_timezone.now()
 
@@ -566,6 +625,8 @@ def update_achievements_data(player_id: int, force_refresh: bool = False) -> lis
             for row in normalized_rows
         ])
 
+    store_upstream_fingerprint(
+        player, RESOURCE_ACHIEVEMENTS, achievements_fingerprint)
     return normalized_rows
 
 
@@ -643,7 +704,7 @@ def maybe_refresh_clan_battle_data(player: Player) -> None:
 
 
 def queue_clan_efficiency_hydration(players: Iterable[Player]) -> dict[str, Any]:
-    from warships.tasks import is_efficiency_data_refresh_pending, is_efficiency_rank_snapshot_refresh_pending, queue_efficiency_data_refresh, queue_efficiency_rank_snapshot_refresh
+    from warships.tasks import is_efficiency_data_refresh_pending, is_efficiency_rank_snapshot_refresh_pending, queue_efficiency_data_refresh_batch, queue_efficiency_rank_snapshot_refresh
 
     eligible_players = [
         player for player in players if player_efficiency_needs_refresh(player)
@@ -664,30 +725,23 @@ def queue_clan_efficiency_hydration(players: Iterable[Player]) -> dict[str, Any]
 
     available_slots = max(
         0, CLAN_EFFICIENCY_HYDRATION_MAX_IN_FLIGHT - len(pending_player_ids))
-
-    for player in eligible_players:
-        if player.player_id in pending_player_ids:
-            continue
-
-        if available_slots <= 0:
-            deferred_player_ids.add(player.player_id)
-            continue
-
-        enqueue_result = queue_efficiency_data_refresh(player.player_id)
-        if enqueue_result.get("status") == "queued":
-            pending_player_ids.add(player.player_id)
-            queued_player_ids.add(player.player_id)
-            available_slots -= 1
-            continue
-
+    candidate_player_ids = [
+        player.player_id for player in eligible_players
+        if player.player_id not in pending_player_ids
+    ]
+    batch_player_ids = candidate_player_ids[:available_slots]
+    deferred_player_ids.update(candidate_player_ids[available_slots:])
+
+    if batch_player_ids:
+        enqueue_result = queue_efficiency_data_refresh_batch(batch_player_ids)
+        batch_queued_ids = set(enqueue_result.get("queued_player_ids") or [])
+        queued_player_ids.update(batch_queued_ids)
+        pending_player_ids.update(batch_queued_ids)
         if enqueue_result.get("reason") == "enqueue-failed":
-            deferred_player_ids.update(
-                queued_player.player_id
-                for queued_player in eligible_players
-                if queued_player.player_id not in pending_player_ids and queued_player.player_id != player.player_id
-            )
-            deferred_player_ids.add(player.player_id)
-            break
+            deferred_player_ids.update(batch_player_ids)
+        elif enqueue_result.get("status") == "queued" or enqueue_result.get("reason") == "already-queued":
+            # Ids the batch skipped were claimed by another in-flight dispatch.
+            pending_player_ids.update(batch_player_ids)
 
     pending_player_ids.update(deferred_player_ids)
 
@@ -834,11 +888,12 @@ def _calculate_activity_trend_direction(activity_rows: list[dict]) -> str:
     return 'flat'
 
 
-def _coerce_battle_rows(battles_rows: Any) -> list[dict]:
+def _coerce_battle_rows(battles_rows: Any) -> list[Mapping]:
     if not isinstance(battles_rows, list):
         return []
 
-    return [row for row in battles_rows if isinstance(row, dict)]
+    # Stored rows decode to BattleRow mappings; freshly built rows are dicts.
+    return [row for row in battles_rows if isinstance(row, Mapping)]
 
 
 def _coerce_efficiency_rows(efficiency_rows: Any) -> list[dict]:
@@ -1938,7 +1993,7 @@ def build_player_summary(
 
     played_rows = [
         row for row in normalized_battles_rows
-        if isinstance(row, dict) and int(row.get('pvp_battles', 0) or 0) > 0
+        if isinstance(row, Mapping) and int(row.get('pvp_battles', 0) or 0) > 0
     ]
 
     ship_type_spread = len({
@@ -1986,12 +2041,55 @@ def build_player_summary(
     return summary
 
 
+_EXPLORER_SUMMARY_FIELDS = (
+    'battles_last_29_days',
+    'wins_last_29_days',
+    'active_days_last_29_days',
+    'recent_win_rate',
+    'activity_trend_direction',
+    'player_score',
+    'ships_played_total',
+    'ship_type_spread',
+    'tier_spread',
+    'eligible_ship_count',
+    'efficiency_badge_rows_total',
+    'badge_rows_unmapped',
+    'expert_count',
+    'grade_i_count',
+    'grade_ii_count',
+    'grade_iii_count',
+    'raw_badge_points',
+    'normalized_badge_strength',
+    'ranked_seasons_participated',
+    'latest_ranked_battles',
+    'highest_ranked_league_recent',
+    'kill_ratio',
+)
+_HIDDEN_EXPLORER_RANK_RESET = {
+    'shrunken_efficiency_strength': None,
+    'efficiency_rank_percentile': None,
+    'efficiency_rank_tier': None,
+    'has_efficiency_rank_icon': False,
+    'efficiency_rank_population_size': None,
+    'efficiency_rank_updated_at': None,
+}
+
+
+# Payload kinds read by build_player_summary.
+EXPLORER_SUMMARY_PAYLOAD_KINDS = ('battles', 'activity', 'ranked', 'efficiency')
+
+
 def refresh_player_explorer_summary(
     player: Player,
     activity_rows: Any = None,
     ranked_rows: Any = None,
     battles_rows: Any = None,
 ) -> PlayerExplorerSummary:
+    if not player.is_hidden:
+        passed = {'battles': battles_rows,
+                  'activity': activity_rows, 'ranked': ranked_rows}
+        player.load_payloads([kind for kind in EXPLORER_SUMMARY_PAYLOAD_KINDS
+                              if passed.get(kind) is None])
     summary = build_player_summary(
         player,
         activity_rows=activity_rows,
@@ -2002,54 +2100,60 @@ def refresh_player_explorer_summary(
 
     explorer_summary, _ = PlayerExplorerSummary.objects.update_or_create(
         player=player,
-        defaults={
-            'battles_last_29_days': summary['battles_last_29_days'],
-            'wins_last_29_days': summary['wins_last_29_days'],
-            'active_days_last_29_days': summary['active_days_last_29_days'],
-            'recent_win_rate': summary['recent_win_rate'],
-            'activity_trend_direction': summary['activity_trend_direction'],
-            'player_score': summary['player_score'],
-            'ships_played_total': summary['ships_played_total'],
-            'ship_type_spread': summary['ship_type_spread'],
-            'tier_spread': summary['tier_spread'],
-            'eligible_ship_count': summary['eligible_ship_count'],
-            'efficiency_badge_rows_total': summary['efficiency_badge_rows_total'],
-            'badge_rows_unmapped': summary['badge_rows_unmapped'],
-            'expert_count': summary['expert_count'],
-            'grade_i_count': summary['grade_i_count'],
-            'grade_ii_count': summary['grade_ii_count'],
-            'grade_iii_count': summary['grade_iii_count'],
-            'raw_badge_points': summary['raw_badge_points'],
-            'normalized_badge_strength': summary['normalized_badge_strength'],
-            'ranked_seasons_participated': summary['ranked_seasons_participated'],
-            'latest_ranked_battles': summary['latest_ranked_battles'],
-            'highest_ranked_league_recent': summary['highest_ranked_league_recent'],
-            'kill_ratio': summary['kill_ratio'],
-        },
+        defaults={field: summary[field] for field in _EXPLORER_SUMMARY_FIELDS},
     )
 
     if player.is_hidden:
-        explorer_summary.shrunken_efficiency_strength = None
-        explorer_summary.efficiency_rank_percentile = None
-        explorer_summary.efficiency_rank_tier = None
-        explorer_summary.has_efficiency_rank_icon = False
-        explorer_summary.efficiency_rank_population_size = None
-        explorer_summary.efficiency_rank_updated_at = None
-        explorer_summary.save(update_fields=[
-            'shrunken_efficiency_strength',
-            'efficiency_rank_percentile',
-            'efficiency_rank_tier',
-            'has_efficiency_rank_icon',
-            'efficiency_rank_population_size',
-            'efficiency_rank_updated_at',
-        ])
+        for field, value in _HIDDEN_EXPLORER_RANK_RESET.items():
+            setattr(explorer_summary, field, value)
+        explorer_summary.save(update_fields=list(_HIDDEN_EXPLORER_RANK_RESET))
 
     player.explorer_summary = explorer_summary
     return explorer_summary
 
 
+def refresh_player_explorer_summaries(players: Iterable[Player]) -> int:
+    """Recompute explorer summaries for many players with one upsert per visibility.
+
+    Same rows as refresh_player_explorer_summary, but written with
+    ``bulk_create(update_conflicts=True)`` instead of a read/write pair per
+    player. Returns the number of summaries written.
+    """
+    players = list(players)
+    prefetch_player_payloads(
+        [player for player in players if not player.is_hidden],
+        EXPLORER_SUMMARY_PAYLOAD_KINDS)
+    rows_by_visibility: dict[bool, list[PlayerExplorerSummary]] = {
+        False: [], True: []}
+    for player in players:
+        summary = build_player_summary(player, use_cached_summary=False)
+        values = {field: summary[field] for field in _EXPLORER_SUMMARY_FIELDS}
+        if player.is_hidden:
+            values.update(_HIDDEN_EXPLORER_RANK_RESET)
+        rows_by_visibility[player.is_hidden].append(
+            PlayerExplorerSummary(player=player, **values))
+
+    written = 0
+    for is_hidden, rows in rows_by_visibility.items():
+        if not rows:
+            continue
+        update_fields = [*_EXPLORER_SUMMARY_FIELDS, 'refreshed_at']
+        if is_hidden:
+            update_fields.extend(_HIDDEN_EXPLORER_RANK_RESET)
+        PlayerExplorerSummary.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['player'],
+            update_fields=update_fields,
+        )
+        written += len(rows)
+    return written
+
+
 def fetch_player_summary(player_id: str) -> dict:
     player = Player.objects.get(player_id=player_id)
+    if not player.is_hidden:
+        player.load_payloads(('battles', 'activity', 'ranked'))
 
     needs_bootstrap = (
         not player.is_hidden
@@ -2296,67 +2400,127 @@ def fetch_player_explorer_page(
     return total_count, rows
 
 
-def _extract_randoms_rows(battles_json: Any, limit: Optional[int] = 20) -> list[dict]:
-    if not isinstance(battles_json, list):
-        return []
+def _randoms_row(row: dict) -> Optional[dict]:
+    ship_name = row.get('ship_name')
+    ship_type = row.get('ship_type')
+    ship_tier = row.get('ship_tier')
+    if ship_name is None or ship_type is None or ship_tier is None:
+        return None
 
-    rows = []
-    for row in battles_json:
-        if not isinstance(row, dict):
-            continue
+    return {
+        'pvp_battles': int(row.get('pvp_battles', 0) or 0),
+        'ship_name': ship_name,
+        'ship_chart_name': row.get('ship_chart_name') or build_ship_chart_name(str(ship_name)),
+        'ship_type': ship_type,
+        'ship_tier': ship_tier,
+        'win_ratio': float(row.get('win_ratio', 0) or 0),
+        'wins': int(row.get('wins', 0) or 0),
+    }
 
-        ship_name = row.get('ship_name')
-        ship_type = row.get('ship_type')
-        ship_tier = row.get('ship_tier')
-        if ship_name is None or ship_type is None or ship_tier is None:
-            continue
 
-        rows.append({
-            'pvp_battles': int(row.get('pvp_battles', 0) or 0),
-            'ship_name': ship_name,
-            'ship_chart_name': row.get('ship_chart_name') or build_ship_chart_name(str(ship_name)),
-            'ship_type': ship_type,
-            'ship_tier': ship_tier,
-            'win_ratio': float(row.get('win_ratio', 0) or 0),
-            'wins': int(row.get('wins', 0) or 0),
-        })
+def _extract_randoms_rows(battles_json: Any, limit: Optional[int] = 20) -> list[dict]:
+    if not isinstance(battles_json, list):
+        return []
 
+    rows = [
+        randoms_row for randoms_row in (
+            _randoms_row(row) for row in battles_json if isinstance(row, Mapping))
+        if randoms_row is not None
+    ]
     rows.sort(key=lambda row: row['pvp_battles'], reverse=True)
     return rows if limit is None else rows[:limit]
 
 
-def _aggregate_battles_by_key(battles_json: Any, group_key: str) -> list[dict]:
-    if not isinstance(battles_json, list):
-        return []
+def _win_ratio_row(key_field: str, key: Any, battles: int, wins: int) -> dict:
+    return {
+        key_field: key,
+        'pvp_battles': battles,
+        'wins': wins,
+        'win_ratio': round(wins / battles, 2) if battles > 0 else 0,
+    }
 
-    aggregates: dict[Any, dict[str, int]] = {}
-    for row in battles_json:
-        if not isinstance(row, dict):
-            continue
 
-        key = row.get(group_key)
-        if key is None:
+def _derive_battle_views(battles_json: Any) -> dict[str, list]:
+    """Build tiers_json, type_json and randoms_json in one pass over battles_json."""
+    tier_aggregates = {tier: [0, 0] for tier in range(1, 12)}
+    type_aggregates: dict[Any, list[int]] = {}
+    randoms_rows = []
+    for row in battles_json if isinstance(battles_json, list) else []:
+        if not isinstance(row, Mapping):
             continue
 
-        aggregate = aggregates.setdefault(key, {'pvp_battles': 0, 'wins': 0})
-        aggregate['pvp_battles'] += int(row.get('pvp_battles', 0) or 0)
-        aggregate['wins'] += int(row.get('wins', 0) or 0)
+        pvp_battles = int(row.get('pvp_battles', 0) or 0)
+        wins = int(row.get('wins', 0) or 0)
 
-    result = []
-    for key, aggregate in aggregates.items():
-        battles = aggregate['pvp_battles']
-        wins = aggregate['wins']
-        result.append({
-            group_key: key,
-            'pvp_battles': battles,
-            'wins': wins,
-            'win_ratio': round(wins / battles, 2) if battles > 0 else 0,
-        })
+        tier = row.get('ship_tier')
+        if isinstance(tier, int) and tier in tier_aggregates:
+            tier_aggregates[tier][0] += pvp_battles
+            tier_aggregates[tier][1] += wins
 
-    result.sort(key=lambda row: row['pvp_battles'], reverse=True)
-    return result
+        ship_type = row.get('ship_type')
+        if ship_type is not None:
+            aggregate = type_aggregates.setdefault(ship_type, [0, 0])
+            aggregate[0] += pvp_battles
+            aggregate[1] += wins
+
+        randoms_row = _randoms_row(row)
+        if randoms_row is not None:
+            randoms_rows.append(randoms_row)
+
+    type_rows = [_win_ratio_row('ship_type', ship_type, battles, wins)
+                 for ship_type, (battles, wins) in type_aggregates.items()]
+    type_rows.sort(key=lambda row: row['pvp_battles'], reverse=True)
+    randoms_rows.sort(key=lambda row: row['pvp_battles'], reverse=True)
+    return {
+        'tiers_json': [_win_ratio_row('ship_tier', tier, *tier_aggregates[tier])
+                       for tier in range(11, 0, -1)],
+        'type_json': type_rows,
+        'randoms_json': randoms_rows[:20],
+    }
 
 
+def _save_battle_views(
+    player: Player,
+    battles_rows: Optional[list] = None,
+    fields: Iterable[str] = ('tiers_json', 'type_json', 'randoms_json'),
+    frags_by_ship: Optional[dict] = None,
+) -> None:
+    """Persist derived battle views with one UPDATE and one payload upsert.
+
+    Passing ``battles_rows`` stores them as the new battles_json in the same
+    upsert and brings the player's PlayerShipStat rows in line with them;
+    ``frags_by_ship`` supplies exact frag counts for that sync. Timestamps
+    always move; payloads are only written when their value changed.
+    """
+    now = datetime.now()
+    fields = tuple(fields)
+    player.load_payloads([PLAYER_PAYLOAD_FIELDS[field] for field in (
+        'battles_json', *fields)])
+    source = player.battles_json if battles_rows is None else battles_rows
+    derived = _derive_battle_views(source)
+    timestamps: dict[str, Any] = {}
+    payloads: dict[str, Any] = {}
+    if battles_rows is not None:
+        timestamps['battles_updated_at'] = now
+        if player.battles_json != battles_rows:
+            payloads['battles_json'] = battles_rows
+    for field in fields:
+        timestamps[field.replace('_json', '_updated_at')] = now
+        if getattr(player, field) != derived[field]:
+            payloads[field] = derived[field]
+
+    Player.objects.filter(pk=player.pk).update(**timestamps)
+    for field, value in {**timestamps, **payloads}.items():
+        setattr(player, field, value)
+    save_player_payloads(
+        [player], kinds=[PLAYER_PAYLOAD_FIELDS[field] for field in payloads])
+    if battles_rows is not None:
+        with refresh_stage('sync_ship_stats'):
+            sync_player_ship_stats(
+                player, battles_rows, frags_by_ship=frags_by_ship)
+
+
+@profiled_refresh
 def update_battle_data(player_id: str) -> None:
     """
     Updates the battle data for a given player.
@@ -2376,26 +2540,75 @@ def update_battle_data(player_id: str) -> None:
     if player.battles_json and player.battles_updated_at and datetime.now() - player.battles_updated_at < timedelta(minutes=15):
         logging.debug(
             f'Cache exists and is fresh: returning cached data')
+        mark_refresh_outcome('fresh')
         return player.battles_json
 
     logging.info(
         f'Battles data empty or outdated: fetching new data for {player.name}')
 
     # Fetch ship stats for the player
-    ship_data = _fetch_ship_stats_for_player(player_id)
+    with refresh_stage('fetch_ship_stats'):
+        ship_data = _fetch_ship_stats_for_player(player_id)
     if not ship_data:
         logging.warning(
             f'No ship stats returned for player_id={player_id}; leaving battles_json unchanged.'
         )
+        mark_refresh_outcome('empty')
         return player.battles_json
 
+    with refresh_stage('fingerprint_check'):
+        ship_stats_fingerprint = payload_fingerprint(ship_data)
+        unchanged = bool(player.battles_json) and upstream_payload_unchanged(
+            player, RESOURCE_SHIP_STATS, ship_stats_fingerprint)
+    if unchanged:
+        player.battles_updated_at = datetime.now()
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=player.battles_updated_at)
+        # Backfilled stats hold frags rebuilt from the rounded kdr; this
+        # rewrites only ships whose stored totals differ from upstream.
+        with refresh_stage('sync_ship_stats'):
+            sync_player_ship_stats(player, player.battles_json, frags_by_ship={
+                ship['ship_id']: ship['pvp']['frags'] for ship in ship_data})
+        logging.info(
+            f'Ship stats unchanged for {player.name}; skipped battle data rebuild')
+        mark_refresh_outcome('unchanged')
+        return player.battles_json
+
+    with refresh_stage('build_rows'):
+        sorted_data, unresolved_ship_ids = _build_battle_rows(
+            player_id, ship_data)
+
+    with refresh_stage('save_battle_views'):
+        _save_battle_views(player, battles_rows=sorted_data, frags_by_ship={
+            ship['ship_id']: ship['pvp']['frags'] for ship in ship_data})
+    with refresh_stage('refresh_explorer_summary'):
+        refresh_player_explorer_summary(player, battles_rows=sorted_data)
+    # Rows built from placeholder metadata must be rebuilt once the catalog
+    # knows the ship, so an unchanged payload may not short-circuit them.
+    if unresolved_ship_ids:
+        logging.info(
+            f'Skipping ship stats fingerprint for {player.name}: '
+            f'{len(unresolved_ship_ids)} ship(s) missing from the catalog')
+    else:
+        with refresh_stage('store_fingerprint'):
+            store_upstream_fingerprint(
+                player, RESOURCE_SHIP_STATS, ship_stats_fingerprint)
+    logging.info(f"Updated battles_json data: {player.name}")
+
+
+def _build_battle_rows(player_id: str, ship_data: list) -> tuple[list[dict], list]:
+    """Battle rows sorted by pvp battles, plus the ship ids that used placeholder metadata."""
     prepared_data = []
+    unresolved_ship_ids = []
 
+    with refresh_stage('ship_catalog'):
+        catalog = resolve_ship_catalog(ship['ship_id'] for ship in ship_data)
     for ship in ship_data:
-        ship_model = _fetch_ship_info(ship['ship_id'])
+        ship_model = catalog.get(ship['ship_id'])
         ship_metadata = _build_ship_row_metadata(
             ship.get('ship_id'), ship_model)
         if ship_model is None:
+            unresolved_ship_ids.append(ship.get('ship_id'))
             logging.warning(
                 'Falling back to placeholder ship metadata for ship_id=%s while updating player_id=%s',
                 ship.get('ship_id'),
@@ -2428,17 +2641,8 @@ def update_battle_data(player_id: str) -> None:
         prepared_data.append(ship_info)
 
     # Sort the data by "pvp_battles" in descending order
-    sorted_data = sorted(prepared_data, key=lambda x: x.get(
-        'pvp_battles', 0), reverse=True)
-
-    player.battles_updated_at = datetime.now()
-    player.battles_json = sorted_data
-    player.save()
-    update_tiers_data(player.player_id)
-    update_type_data(player.player_id)
-    update_randoms_data(player.player_id)
-    refresh_player_explorer_summary(player, battles_rows=sorted_data)
-    logging.info(f"Updated battles_json data: {player.name}")
+    return sorted(prepared_data, key=lambda x: x.get(
+        'pvp_battles', 0), reverse=True), unresolved_ship_ids
 
 
 def fetch_tier_data(player_id: str) -> list:
@@ -2473,38 +2677,13 @@ def fetch_tier_data(player_id: str) -> list:
     return []
 
 
+@profiled_refresh
 def update_tiers_data(player_id: str) -> list:
     player = Player.objects.get(player_id=player_id)
-    tier_aggregates = {tier: {'pvp_battles': 0, 'wins': 0}
-                       for tier in range(1, 12)}
-    for row in player.battles_json or []:
-        if not isinstance(row, dict):
-            continue
-
-        tier = row.get('ship_tier')
-        if not isinstance(tier, int) or tier not in tier_aggregates:
-            continue
-
-        tier_aggregates[tier]['pvp_battles'] += int(
-            row.get('pvp_battles', 0) or 0)
-        tier_aggregates[tier]['wins'] += int(row.get('wins', 0) or 0)
-
-    data = []
-    for tier in range(11, 0, -1):
-        battles = tier_aggregates[tier]['pvp_battles']
-        wins = tier_aggregates[tier]['wins']
-        data.append({
-            'ship_tier': tier,
-            'pvp_battles': battles,
-            'wins': wins,
-            'win_ratio': round(wins / battles, 2) if battles > 0 else 0,
-        })
-
-    player.tiers_json = data
-    player.tiers_updated_at = datetime.now()
-    player.save()
+    _save_battle_views(player, fields=('tiers_json',))
 
 
+@profiled_refresh
 def update_snapshot_data(player_id: int) -> None:
     """
     Records today's cumulative PvP stats as a Snapshot and computes
@@ -2526,37 +2705,39 @@ def update_snapshot_data(player_id: int) -> None:
     today = datetime.now().date()
     start_date = today - timedelta(days=28)
 
-    # Purge stale zero-value snapshots left by the broken statsbydate API
-    Snapshot.objects.filter(
-        player=player, battles=0, wins=0
-    ).exclude(date=today).delete()
+    with refresh_stage('upsert_snapshot'):
+        # Purge stale zero-value snapshots left by the broken statsbydate API
+        Snapshot.objects.filter(
+            player=player, battles=0, wins=0
+        ).exclude(date=today).delete()
 
-    # Upsert today's snapshot with current cumulative totals
-    snapshot, _ = Snapshot.objects.get_or_create(player=player, date=today)
-    snapshot.battles = player.pvp_battles or 0
-    snapshot.wins = player.pvp_wins or 0
-    snapshot.last_fetch = datetime.now()
-    snapshot.save()
+        # Upsert today's snapshot with current cumulative totals
+        snapshot, _ = Snapshot.objects.get_or_create(player=player, date=today)
+        snapshot.battles = player.pvp_battles or 0
+        snapshot.wins = player.pvp_wins or 0
+        snapshot.last_fetch = datetime.now()
+        snapshot.save()
 
     # Recompute intervals for the whole 28-day window
-    snapshots = list(Snapshot.objects.filter(
-        player=player, date__gte=start_date, date__lte=today).order_by('date'))
-
-    previous_battles = None
-    previous_wins = None
-    for snap in snapshots:
-        if previous_battles is None or previous_wins is None:
-            snap.interval_battles = 0
-            snap.interval_wins = 0
-        else:
-            snap.interval_battles = max(
-                0, int(snap.battles or 0) - int(previous_battles or 0))
-            snap.interval_wins = max(
-                0, int(snap.wins or 0) - int(previous_wins or 0))
-
-        snap.save(update_fields=['interval_battles', 'interval_wins'])
-        previous_battles = snap.battles
-        previous_wins = snap.wins
+    with refresh_stage('recompute_intervals'):
+        snapshots = list(Snapshot.objects.filter(
+            player=player, date__gte=start_date, date__lte=today).order_by('date'))
+
+        previous_battles = None
+        previous_wins = None
+        for snap in snapshots:
+            if previous_battles is None or previous_wins is None:
+                snap.interval_battles = 0
+                snap.interval_wins = 0
+            else:
+                snap.interval_battles = max(
+                    0, int(snap.battles or 0) - int(previous_battles or 0))
+                snap.interval_wins = max(
+                    0, int(snap.wins or 0) - int(previous_wins or 0))
+
+            snap.save(update_fields=['interval_battles', 'interval_wins'])
+            previous_battles = snap.battles
+            previous_wins = snap.wins
 
     update_activity_data(player_id)
     logging.info(f'Updated snapshot data for player {player.name}')
@@ -2587,6 +2768,7 @@ def fetch_activity_data(player_id: str) -> list:
     return []
 
 
+@profiled_refresh
 def update_activity_data(player_id: int) -> None:
     player = Player.objects.get(player_id=player_id)
     month = []
@@ -3025,7 +3207,7 @@ def _extract_tier_type_battle_rows(battles_json: Any) -> list[dict[str, int | fl
 
     normalized_rows: list[dict[str, int | float | str]] = []
     for row in battles_json:
-        if not isinstance(row, dict):
+        if not isinstance(row, Mapping):
             continue
 
         ship_type = row.get('ship_type')
@@ -3091,31 +3273,19 @@ def _fetch_player_tier_type_population_correlation() -> dict:
     tile_counts: dict[tuple[str, int], int] = {}
     trend_tier_weighted_sum: dict[str, float] = {}
     trend_battles: dict[str, int] = {}
-    tracked_population = 0
 
-    rows = Player.objects.filter(
-        is_hidden=False,
-        pvp_battles__gte=config['min_population_battles'],
-        battles_json__isnull=False,
-    ).values_list('battles_json', flat=True)
+    cells, tracked_population = fetch_tier_type_population(
+        config['min_population_battles'])
+    for cell in cells:
+        ship_type = str(cell['ship_type'])
+        ship_tier = int(cell['ship_tier'])
+        pvp_battles = int(cell['pvp_battles'] or 0)
 
-    for battles_json in rows.iterator(chunk_size=1000):
-        normalized_rows = _extract_tier_type_battle_rows(battles_json)
-        if not normalized_rows:
-            continue
-
-        tracked_population += 1
-        for row in normalized_rows:
-            ship_type = str(row['ship_type'])
-            ship_tier = int(row['ship_tier'])
-            pvp_battles = int(row['pvp_battles'])
-
-            tile_counts[(ship_type, ship_tier)] = tile_counts.get(
-                (ship_type, ship_tier), 0) + pvp_battles
-            trend_tier_weighted_sum[ship_type] = trend_tier_weighted_sum.get(
-                ship_type, 0.0) + (ship_tier * pvp_battles)
-            trend_battles[ship_type] = trend_battles.get(
-                ship_type, 0) + pvp_battles
+        tile_counts[(ship_type, ship_tier)] = pvp_battles
+        trend_tier_weighted_sum[ship_type] = trend_tier_weighted_sum.get(
+            ship_type, 0.0) + (ship_tier * pvp_battles)
+        trend_battles[ship_type] = trend_battles.get(
+            ship_type, 0) + pvp_battles
 
     tiles = [
         {
@@ -3158,8 +3328,12 @@ def _fetch_player_tier_type_population_correlation() -> dict:
 def fetch_player_tier_type_correlation(player_id: str) -> dict:
     player = Player.objects.get(player_id=player_id)
     if not player.battles_json:
-        update_battle_data(player_id)
-        player.refresh_from_db(fields=['battles_json'])
+        if upstream_degraded():
+            _dispatch_deferred_refresh(
+                update_battle_data_task, player_id=player_id)
+        else:
+            update_battle_data(player_id)
+            player.refresh_from_db(fields=['battles_json'])
 
     population_payload = _fetch_player_tier_type_population_correlation()
     return {
@@ -3325,10 +3499,10 @@ def _build_player_ranked_wr_battles_population_correlation_payload() -> dict:
 
     records: list[tuple[int, float]] = []
     max_battles = config['min_battles']
-    rows = Player.objects.filter(
-        is_hidden=False,
-        ranked_json__isnull=False,
-    ).values_list('ranked_json', flat=True)
+    rows = PlayerPayload.objects.filter(
+        kind='ranked',
+        player__is_hidden=False,
+    ).values_list('data', flat=True)
 
     for ranked_rows in rows.iterator(chunk_size=2000):
         total_battles, win_rate = _calculate_ranked_record(ranked_rows)
@@ -3579,6 +3753,35 @@ def _get_player_clan_battle_season_stats(account_id: int) -> list:
     return seasons
 
 
+def _get_player_clan_battle_season_stats_many(account_ids: list[int]) -> dict[int, list]:
+    """Return cached clan battle season stats for many players, batch-fetching misses."""
+    cache_keys = {
+        account_id: f'clan_battles:player:{account_id}'
+        for account_id in account_ids
+    }
+    cached = cache.get_many(list(cache_keys.values()))
+    seasons_by_account = {
+        account_id: cached[cache_key]
+        for account_id, cache_key in cache_keys.items()
+        if cache_key in cached
+    }
+
+    missing_ids = [
+        account_id for account_id in cache_keys if account_id not in seasons_by_account
+    ]
+    if missing_ids:
+        raw_by_account = _fetch_clan_battle_season_stats_many(missing_ids)
+        fetched = {}
+        for account_id in missing_ids:
+            raw = raw_by_account.get(account_id)
+            seasons = raw.get('seasons', []) if raw else []
+            seasons_by_account[account_id] = seasons
+            fetched[cache_keys[account_id]] = seasons
+        cache.set_many(fetched, CLAN_BATTLE_PLAYER_STATS_CACHE_TTL)
+
+    return seasons_by_account
+
+
 def get_player_clan_battle_summary(account_id: Optional[int], allow_fetch: bool = True) -> dict[str, Any]:
     if not account_id:
         return summarize_clan_battle_seasons([])
@@ -3719,6 +3922,10 @@ def refresh_clan_battle_seasons_cache(clan_id: str) -> list:
     )
 
     if not members and clan.members_count:
+        if upstream_degraded():
+            _dispatch_deferred_refresh(
+                update_clan_members_task, clan_id=clan_id)
+            return []
         update_clan_members(clan_id=clan_id)
         members = list(
             clan.player_set.exclude(name='').exclude(
@@ -3732,52 +3939,45 @@ def refresh_clan_battle_seasons_cache(clan_id: str) -> list:
     season_meta = _get_clan_battle_seasons_metadata()
     season_summaries = {}
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = {
-            executor.submit(_get_player_clan_battle_season_stats, member['player_id']): member
-            for member in members
-        }
+    started = time.monotonic()
+    seasons_by_account = _get_player_clan_battle_season_stats_many(
+        [member['player_id'] for member in members])
+    logging.info(
+        'Loaded clan battle stats for %d members of clan %s in %.2fs',
+        len(members),
+        clan_id,
+        time.monotonic() - started,
+    )
 
-        for future in as_completed(futures):
-            member = futures[future]
-            try:
-                seasons = future.result()
-            except Exception as error:
-                logging.error(
-                    'Failed clan battle stats fetch for %s (%s): %s',
-                    member['name'],
-                    member['player_id'],
-                    error,
-                )
+    for member in members:
+        seasons = seasons_by_account.get(member['player_id']) or []
+        for season in seasons:
+            battles = int(season.get('battles', 0) or 0)
+            if battles <= 0:
                 continue
 
-            for season in seasons:
-                battles = int(season.get('battles', 0) or 0)
-                if battles <= 0:
-                    continue
-
-                sid = int(season.get('season_id', 0) or 0)
-                if sid <= 0:
-                    continue
+            sid = int(season.get('season_id', 0) or 0)
+            if sid <= 0:
+                continue
 
-                summary = season_summaries.setdefault(sid, {
-                    'season_id': sid,
-                    'season_name': season_meta.get(sid, {}).get('name', f'Season {sid}'),
-                    'season_label': season_meta.get(sid, {}).get('label', f'S{sid}'),
-                    'start_date': season_meta.get(sid, {}).get('start_date'),
-                    'end_date': season_meta.get(sid, {}).get('end_date'),
-                    'ship_tier_min': season_meta.get(sid, {}).get('ship_tier_min'),
-                    'ship_tier_max': season_meta.get(sid, {}).get('ship_tier_max'),
-                    'participants': 0,
-                    'roster_battles': 0,
-                    'roster_wins': 0,
-                    'roster_losses': 0,
-                })
-
-                summary['participants'] += 1
-                summary['roster_battles'] += battles
-                summary['roster_wins'] += int(season.get('wins', 0) or 0)
-                summary['roster_losses'] += int(season.get('losses', 0) or 0)
+            summary = season_summaries.setdefault(sid, {
+                'season_id': sid,
+                'season_name': season_meta.get(sid, {}).get('name', f'Season {sid}'),
+                'season_label': season_meta.get(sid, {}).get('label', f'S{sid}'),
+                'start_date': season_meta.get(sid, {}).get('start_date'),
+                'end_date': season_meta.get(sid, {}).get('end_date'),
+                'ship_tier_min': season_meta.get(sid, {}).get('ship_tier_min'),
+                'ship_tier_max': season_meta.get(sid, {}).get('ship_tier_max'),
+                'participants': 0,
+                'roster_battles': 0,
+                'roster_wins': 0,
+                'roster_losses': 0,
+            })
+
+            summary['participants'] += 1
+            summary['roster_battles'] += battles
+            summary['roster_wins'] += int(season.get('wins', 0) or 0)
+            summary['roster_losses'] += int(season.get('losses', 0) or 0)
 
     result = []
     for summary in sorted(season_summaries.values(), key=_clan_battle_season_sort_key, reverse=True):
@@ -3917,42 +4117,78 @@ def fetch_ranked_data(player_id: str) -> list:
             logging.info(f'Ranked data cache fresh for {player.name}')
         return player.ranked_json
 
+    if upstream_degraded():
+        from warships.tasks import queue_ranked_data_refresh
+
+        queue_ranked_data_refresh(
+            player_id, countdown=get_circuit_breaker().retry_after_seconds())
+        return []
+
     logging.info(f'Fetching ranked data for {player.name}')
     update_ranked_data(player_id)
     player.refresh_from_db()
     return player.ranked_json or []
 
 
+@profiled_refresh
 def update_ranked_data(player_id) -> None:
     """Fetch ranked data from WG API, aggregate, and cache on Player model."""
     player = Player.objects.get(player_id=player_id)
 
     # Get season metadata (cached globally)
-    season_meta = _get_ranked_seasons_metadata()
+    with refresh_stage('season_metadata'):
+        season_meta = _get_ranked_seasons_metadata()
 
     # Get player's rank_info
-    account_data = _fetch_ranked_account_info(int(player_id))
+    with refresh_stage('fetch_rank_info'):
+        account_data = _fetch_ranked_account_info(int(player_id))
     rank_info = account_data.get('rank_info') if account_data else None
 
+    if not account_data and upstream_degraded():
+        logging.warning(
+            f'Skipping ranked refresh for {player.name}: upstream circuit breaker is open')
+        mark_refresh_outcome('degraded')
+        return
+
     if not rank_info:
         logging.info(f'No ranked data for {player.name}')
         player.ranked_json = []
         player.ranked_updated_at = datetime.now()
         player.save()
+        mark_refresh_outcome('empty')
+        return
+
+    with refresh_stage('fingerprint_check'):
+        rank_info_fingerprint = payload_fingerprint(rank_info)
+        unchanged = (
+            player.ranked_json is not None
+            and _ranked_rows_have_top_ship(player.ranked_json)
+            and upstream_payload_unchanged(player, RESOURCE_RANK_INFO, rank_info_fingerprint)
+        )
+    if unchanged:
+        # No new ranked battles, so the per-season ship stats are unchanged too.
+        player.ranked_updated_at = datetime.now()
+        Player.objects.filter(pk=player.pk).update(
+            ranked_updated_at=player.ranked_updated_at)
+        logging.info(
+            f'Ranked data unchanged for {player.name}; skipped ranked rebuild')
+        mark_refresh_outcome('unchanged')
         return
 
     requested_season_ids = sorted(
         [int(season_id)
          for season_id in rank_info.keys() if str(season_id).isdigit()]
     )
-    ranked_ship_stats_rows = _fetch_ranked_ship_stats_for_player(
-        int(player_id), season_ids=requested_season_ids)
-    top_ship_names_by_season = _build_top_ranked_ship_names_by_season(
-        ranked_ship_stats_rows, requested_season_ids)
+    with refresh_stage('fetch_ranked_ship_stats'):
+        ranked_ship_stats_rows = _fetch_ranked_ship_stats_for_player(
+            int(player_id), season_ids=requested_season_ids)
 
     # Aggregate into per-season summaries
-    result = _aggregate_ranked_seasons(
-        rank_info, season_meta, top_ship_names_by_season=top_ship_names_by_season)
+    with refresh_stage('aggregate_seasons'):
+        top_ship_names_by_season = _build_top_ranked_ship_names_by_season(
+            ranked_ship_stats_rows, requested_season_ids)
+        result = _aggregate_ranked_seasons(
+            rank_info, season_meta, top_ship_names_by_season=top_ship_names_by_season)
 
     if len(result) > 50:
         logging.warning(
@@ -3964,8 +4200,13 @@ def update_ranked_data(player_id) -> None:
 
     player.ranked_json = result
     player.ranked_updated_at = datetime.now()
-    player.save()
-    refresh_player_explorer_summary(player, ranked_rows=result)
+    with refresh_stage('save_ranked_json'):
+        player.save()
+    with refresh_stage('refresh_explorer_summary'):
+        refresh_player_explorer_summary(player, ranked_rows=result)
+    with refresh_stage('store_fingerprint'):
+        store_upstream_fingerprint(
+            player, RESOURCE_RANK_INFO, rank_info_fingerprint)
     logging.info(
         f'Updated ranked data for {player.name}: {len(result)} seasons')
 
@@ -3990,12 +4231,10 @@ def fetch_type_data(player_id: str) -> list:
     return []
 
 
+@profiled_refresh
 def update_type_data(player_id: str) -> list:
     player = Player.objects.get(player_id=player_id)
-    player.type_json = _aggregate_battles_by_key(
-        player.battles_json, 'ship_type')
-    player.type_updated_at = datetime.now()
-    player.save()
+    _save_battle_views(player, fields=('type_json',))
 
     logging.info(f'Updated type data for player {player.name}')
 
@@ -4084,11 +4323,10 @@ def fetch_clan_plot_data(clan_id: str, filter_type: str = 'active') -> list:
     return payload
 
 
+@profiled_refresh
 def update_randoms_data(player_id: str) -> None:
     player = Player.objects.get(player_id=player_id)
-    player.randoms_json = _extract_randoms_rows(player.battles_json, limit=20)
-    player.randoms_updated_at = datetime.now()
-    player.save()
+    _save_battle_views(player, fields=('randoms_json',))
 
     logging.info(f'Updated randoms data for player {player.name}')
 
@@ -4156,47 +4394,106 @@ def update_clan_members(clan_id: str) -> None:
         )
         return
 
-    for member_id in member_ids:
-        player, created = get_or_create_canonical_player(member_id)
-        if created:
-            logging.info(
-                f"Created new player: {player.player_id}")
-            update_player_data(player)
-            update_battle_data(player.player_id)
+    with primed_player_detail_fetches(member_ids):
+        for member_id in member_ids:
+            player, created = get_or_create_canonical_player(member_id)
+            if created:
+                logging.info(
+                    f"Created new player: {player.player_id}")
+                update_player_data(player)
+                update_battle_data(player.player_id)
 
-        else:
-            if player.clan != clan:
-                player.clan = clan
-                player.save()
+            else:
+                if player.clan != clan:
+                    player.clan = clan
+                    player.save()
 
-        update_player_data(player)
+            update_player_data(player)
 
     invalidate_landing_clan_caches()
     _invalidate_clan_battle_summary_cache(clan_id)
 
 
+def _player_data_is_fresh(last_fetch: Optional[datetime]) -> bool:
+    return bool(last_fetch) and datetime.now() - last_fetch < PLAYER_DATA_FRESH_AFTER
+
+
+@contextmanager
+def primed_player_detail_fetches(player_ids: Iterable[int], force_refresh: bool = False) -> Iterator[list[int]]:
+    """Batch-prefetch account and clan payloads for players refreshed inside the block.
+
+    Only players whose detail data is stale (or all, with force_refresh) are
+    fetched, 100 accounts per upstream request; yields the ids that were.
+    """
+    player_ids = [int(player_id) for player_id in player_ids if player_id]
+    if not force_refresh:
+        last_fetch_by_id = dict(Player.objects.filter(
+            player_id__in=player_ids).values_list('player_id', 'last_fetch'))
+        player_ids = [
+            player_id for player_id in player_ids
+            if not _player_data_is_fresh(last_fetch_by_id.get(player_id))
+        ]
+
+    with primed_account_loaders(PLAYER_DETAIL_ACCOUNT_LOADERS, player_ids):
+        yield player_ids
+
+
+def _touch_unchanged_player_data(player: Player) -> None:
+    # The payload is identical, but days-since-last-battle still moves with
+    # the calendar.
+    player.last_fetch = datetime.now()
+    if player.last_battle_date:
+        player.days_since_last_battle = (datetime.now(
+            timezone.utc).date() - player.last_battle_date).days
+    Player.objects.filter(pk=player.pk).update(
+        last_fetch=player.last_fetch,
+        days_since_last_battle=player.days_since_last_battle,
+    )
+
+
+@profiled_refresh
 def update_player_data(player: Player, force_refresh: bool = False) -> None:
     from warships.landing import invalidate_landing_player_caches
 
-    if not force_refresh and player.last_fetch and datetime.now() - player.last_fetch < timedelta(minutes=1400):
+    if not force_refresh and _player_data_is_fresh(player.last_fetch):
         logging.debug(
             f'Player data is fresh')
+        mark_refresh_outcome('fresh')
         return
 
-    player_data = _fetch_player_personal_data(player.player_id)
+    with refresh_stage('fetch_personal_data'):
+        player_data = _fetch_player_personal_data(player.player_id)
     if not player_data:
         logging.warning(
             "Skipping player update because upstream returned no data for player_id=%s",
             player.player_id,
         )
+        mark_refresh_outcome('empty')
+        return
+
+    with refresh_stage('fetch_clan_membership'):
+        clan_membership = _fetch_clan_membership_for_player(player.player_id)
+    clan_id = clan_membership.get("clan_id") or player_data.get("clan_id")
+    with refresh_stage('fingerprint_check'):
+        account_fingerprint = payload_fingerprint(
+            {"account": player_data, "clan_id": clan_id})
+        unchanged = upstream_payload_unchanged(
+            player, RESOURCE_ACCOUNT_INFO, account_fingerprint)
+    if unchanged:
+        _touch_unchanged_player_data(player)
+        if not player.is_hidden:
+            with refresh_stage('update_efficiency_data'):
+                update_player_efficiency_data(
+                    player, force_refresh=force_refresh)
+        logging.info(
+            f"Player personal data unchanged: {player.name}")
+        mark_refresh_outcome('unchanged')
         return
 
     # Map basic fields
     player.name = player_data.get("nickname", "")
     player.player_id = player_data.get("account_id", player.player_id)
 
-    clan_membership = _fetch_clan_membership_for_player(player.player_id)
-    clan_id = clan_membership.get("clan_id") or player_data.get("clan_id")
     if clan_id:
         clan, _ = Clan.objects.get_or_create(clan_id=clan_id)
         player.clan = clan
@@ -4280,11 +4577,21 @@ def update_player_data(player: Player, force_refresh: bool = False) -> None:
         player.verdict = None
 
     player.last_fetch = datetime.now()
-    player.save()
-    if not player.is_hidden:
-        update_player_efficiency_data(player, force_refresh=force_refresh)
-    refresh_player_explorer_summary(player)
-    invalidate_landing_player_caches(include_recent=True)
+    with refresh_stage('save_player'):
+        player.save()
+    if player.is_hidden:
+        with refresh_stage('sync_ship_stats'):
+            sync_player_ship_stats(player, [])
+    else:
+        with refresh_stage('update_efficiency_data'):
+            update_player_efficiency_data(player, force_refresh=force_refresh)
+    with refresh_stage('refresh_explorer_summary'):
+        refresh_player_explorer_summary(player)
+    with refresh_stage('invalidate_landing_caches'):
+        invalidate_landing_player_caches(include_recent=True)
+    with refresh_stage('store_fingerprint'):
+        store_upstream_fingerprint(
+            player, RESOURCE_ACCOUNT_INFO, account_fingerprint)
     logging.info(f"Updated player personal data: {player.name}")
 
 
@@ -4469,24 +4776,101 @@ def warm_hot_entity_caches(
     }
 
 
-def preload_battles_json() -> None:
-    logging.info("Preloading battles_json data for all players")
-    players = Player.objects.all()
-    for player in players:
-        if not player.battles_json:
-            update_battle_data(player.player_id)
-        logging.info(f"Preloaded battles json for player: {player.name}")
-    logging.info("Preloading complete")
+def _player_preload_cursor_key(job: str) -> str:
+    return f'{PLAYER_PRELOAD_CURSOR_KEY_PREFIX}:{job}'
+
+
+def _run_player_preload(
+    job: str,
+    queryset,
+    refresh: Callable[[int], Any],
+    workers: int = PLAYER_PRELOAD_WORKERS,
+    chunk_size: int = PLAYER_PRELOAD_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Run ``refresh(player_id)`` for every player in ``queryset``.
+
+    Only ``id``/``player_id`` pairs are read, ``chunk_size`` at a time in id
+    order, and each chunk is split across ``workers`` threads that share the
+    background upstream budget. The cursor advances after a whole chunk, so
+    a restart repeats at most one chunk. Failed players are logged and left
+    for the next run.
+    """
+    workers = max(int(workers), 1)
+    chunk_size = max(int(chunk_size), 1)
+    cursor_key = _player_preload_cursor_key(job)
+    last_id = int(cache.get(cursor_key) or 0)
+    if last_id:
+        logging.info('Resuming %s after player row id %s', job, last_id)
+
+    telemetry = CrawlTelemetry(
+        job, 'players', total=queryset.filter(id__gt=last_id).count())
+    counts = {'refreshed': 0, 'errors': 0}
+
+    def refresh_stripe(player_ids: list) -> Dict[str, int]:
+        stripe_counts = {'refreshed': 0, 'errors': 0}
+        try:
+            for player_id in player_ids:
+                try:
+                    refresh(player_id)
+                    stripe_counts['refreshed'] += 1
+                except Exception as error:
+                    logging.warning(
+                        '%s failed for player_id=%s: %s', job, player_id, error)
+                    stripe_counts['errors'] += 1
+                    telemetry.count('errors')
+                telemetry.count('players')
+        finally:
+            connections.close_all()
+        return stripe_counts
+
+    with upstream_priority(PRIORITY_BACKGROUND), \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix=job) as executor:
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).order_by(
+                'id').values_list('id', 'player_id')[:chunk_size])
+            if not rows:
+                break
+            player_ids = [player_id for _row_id, player_id in rows]
+            # Each worker gets its own copy of the context so the upstream
+            # priority applies to its calls.
+            futures = [
+                executor.submit(contextvars.copy_context().run,
+                                refresh_stripe, player_ids[index::workers])
+                for index in range(min(workers, len(player_ids)))
+            ]
+            for future in futures:
+                for name, amount in future.result().items():
+                    counts[name] += amount
+
+            last_id = rows[-1][0]
+            cache.set(cursor_key, last_id, timeout=None)
+            telemetry.publish()
+            logging.info('%s progress: %d refreshed, %d errors (through row id %d)',
+                         job, counts['refreshed'], counts['errors'], last_id)
+
+    cache.delete(cursor_key)
+    telemetry.finish()
+    logging.info('%s complete: %d refreshed, %d errors',
+                 job, counts['refreshed'], counts['errors'])
+    return {'status': 'completed', **counts}
+
+
+def preload_battles_json(workers: int = PLAYER_PRELOAD_WORKERS, chunk_size: int = PLAYER_PRELOAD_CHUNK_SIZE) -> Dict[str, Any]:
+    # Hidden profiles have no ship stats to fetch.
+    missing = Player.objects.filter(
+        ~has_payload('battles', non_empty=True),
+        is_hidden=False,
+    )
+    return _run_player_preload(
+        'preload_battles_json', missing, update_battle_data,
+        workers=workers, chunk_size=chunk_size)
 
 
-def preload_activity_data() -> None:
+def preload_activity_data(workers: int = PLAYER_PRELOAD_WORKERS, chunk_size: int = PLAYER_PRELOAD_CHUNK_SIZE) -> Dict[str, Any]:
     # because this function isn't calling update_snapshot_data, it's just creating
     # an empty data structure for the player's activity_json field, which helps the
     # front end to render the activity faster, while it loads the actual data in the background
-    logging.info("Preloading activity data for all players")
-    players = Player.objects.all()
-    for player in players:
-        if not player.activity_json:
-            update_activity_data(player.player_id)
-        logging.info(f"Preloaded activity data for player: {player.name}")
-    logging.info("Preloading complete")
+    missing = Player.objects.filter(~has_payload('activity', non_empty=True))
+    return _run_player_preload(
+        'preload_activity_data', missing, update_activity_data,
+        workers=workers, chunk_size=chunk_size)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from warships.models import Player, PlayerEnrichmentIntent
+
+
+logger = logging.getLogger(__name__)
+
+# Backlog of badge/achievement refreshes for players written by the crawl.
+# The crawl only records an intent; a periodic drain hands the highest
+# priority intents to the enrichment worker pool at a fixed rate. Tiers
+# follow the incremental refresh: recently viewed players first, then recent
+# battlers, then the long tail. Within a tier, staler enrichment goes first.
+
+ENRICHMENT_HOT_LOOKBACK_DAYS = max(
+    int(os.getenv("ENRICHMENT_HOT_LOOKBACK_DAYS", "14")), 0)
+ENRICHMENT_ACTIVE_LOOKBACK_DAYS = max(
+    int(os.getenv("ENRICHMENT_ACTIVE_LOOKBACK_DAYS", "30")), 0)
+ENRICHMENT_WARM_LOOKBACK_DAYS = max(
+    int(os.getenv("ENRICHMENT_WARM_LOOKBACK_DAYS", "90")), 0)
+# Intents handed to workers per drain run; the beat interval sets the rate.
+ENRICHMENT_DRAIN_PLAYERS_PER_RUN = max(
+    int(os.getenv("ENRICHMENT_DRAIN_PLAYERS_PER_RUN", "200")), 1)
+# One enrichment task covers a single ships/badges request (100 accounts).
+ENRICHMENT_DRAIN_BATCH_SIZE = 100
+ENRICHMENT_CLAIM_TIMEOUT = timedelta(minutes=max(
+    int(os.getenv("ENRICHMENT_CLAIM_TIMEOUT_MINUTES", "30")), 1))
+ENRICHMENT_STATS_KEY_PREFIX = "warships:enrichment:stats:v1"
+
+TIERS = (
+    PlayerEnrichmentIntent.TIER_HOT,
+    PlayerEnrichmentIntent.TIER_ACTIVE,
+    PlayerEnrichmentIntent.TIER_WARM,
+    PlayerEnrichmentIntent.TIER_COLD,
+)
+# Every tier outranks the ones below it; staleness days break ties.
+TIER_BASE_PRIORITY = {
+    PlayerEnrichmentIntent.TIER_HOT: 3000.0,
+    PlayerEnrichmentIntent.TIER_ACTIVE: 2000.0,
+    PlayerEnrichmentIntent.TIER_WARM: 1000.0,
+    PlayerEnrichmentIntent.TIER_COLD: 0.0,
+}
+MAX_STALENESS_DAYS = 365
+
+
+def enrichment_tier(player: Player, now=None) -> str:
+    now = now or timezone.now()
+    if player.last_lookup and now - player.last_lookup <= timedelta(days=ENRICHMENT_HOT_LOOKBACK_DAYS):
+        return PlayerEnrichmentIntent.TIER_HOT
+    if player.last_battle_date:
+        idle_days = (now.date() - player.last_battle_date).days
+        if idle_days <= ENRICHMENT_ACTIVE_LOOKBACK_DAYS:
+            return PlayerEnrichmentIntent.TIER_ACTIVE
+        if idle_days <= ENRICHMENT_WARM_LOOKBACK_DAYS:
+            return PlayerEnrichmentIntent.TIER_WARM
+    return PlayerEnrichmentIntent.TIER_COLD
+
+
+def enrichment_priority(player: Player, now=None) -> Tuple[str, float]:
+    now = now or timezone.now()
+    tier = enrichment_tier(player, now)
+    updated = [player.efficiency_updated_at, player.achievements_updated_at]
+    if any(value is None for value in updated):
+        stale_days = MAX_STALENESS_DAYS
+    else:
+        stale_days = min((now - min(updated)).total_seconds() / 86400,
+                         MAX_STALENESS_DAYS)
+    return tier, TIER_BASE_PRIORITY[tier] + round(stale_days, 2)
+
+
+def enqueue_player_enrichment(players: Iterable[Player]) -> int:
+    """Record (or re-score) an enrichment intent for each saved player.
+
+    Re-queueing keeps the original ``requested_at`` so the measured wait
+    covers the whole time a player sat in the backlog. It also drops any
+    claim on the intent: the claimed run may already have read the player,
+    so completing it must not delete the newer request.
+    """
+    now = timezone.now()
+    intents = []
+    for player in players:
+        tier, priority = enrichment_priority(player, now)
+        intents.append(PlayerEnrichmentIntent(
+            player_id=player.pk, tier=tier, priority=priority, requested_at=now))
+    if not intents:
+        return 0
+    PlayerEnrichmentIntent.objects.bulk_create(
+        intents,
+        update_conflicts=True,
+        unique_fields=["player"],
+        update_fields=["tier", "priority", "claimed_at"],
+    )
+    return len(intents)
+
+
+def claim_enrichment_batch(limit: int) -> List[int]:
+    """Claim up to ``limit`` intents, highest priority first; returns account ids.
+
+    Concurrent drains skip each other's locked rows, and claims that were
+    never completed become claimable again after the claim timeout.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            PlayerEnrichmentIntent.objects.select_for_update(
+                skip_locked=True, of=("self",))
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - ENRICHMENT_CLAIM_TIMEOUT))
+            .order_by("-priority", "requested_at")
+            .values_list("id", "player__player_id")[:max(int(limit), 0)]
+        )
+        if rows:
+            PlayerEnrichmentIntent.objects.filter(
+                id__in=[row_id for row_id, _player_id in rows]).update(claimed_at=now)
+    return [player_id for _row_id, player_id in rows]
+
+
+def release_enrichment_claims(player_ids: Iterable[int]) -> None:
+    PlayerEnrichmentIntent.objects.filter(
+        player__player_id__in=list(player_ids)).update(claimed_at=None)
+
+
+def _stats_key(tier: str, field: str) -> str:
+    return f"{ENRICHMENT_STATS_KEY_PREFIX}:{tier}:{field}"
+
+
+def _incr_stat(key: str, amount: int) -> None:
+    if not cache.add(key, amount, timeout=None):
+        cache.incr(key, amount)
+
+
+def complete_player_enrichment(player_ids: Iterable[int]) -> int:
+    """Drop the claimed intents for ``player_ids`` and record their wait per tier."""
+    now = timezone.now()
+    intents = PlayerEnrichmentIntent.objects.filter(
+        player__player_id__in=list(player_ids), claimed_at__isnull=False)
+    completed: Dict[str, List[float]] = {}
+    for tier, requested_at in intents.values_list("tier", "requested_at"):
+        completed.setdefault(tier, []).append(
+            max((now - requested_at).total_seconds(), 0))
+    deleted, _by_model = intents.delete()
+
+    try:
+        for tier, waits in completed.items():
+            _incr_stat(_stats_key(tier, "completed"), len(waits))
+            _incr_stat(_stats_key(tier, "wait_seconds_sum"), int(sum(waits)))
+    except Exception as error:
+        logger.debug("Unable to record enrichment stats: %s", error)
+    return deleted
+
+
+def get_enrichment_backlog_stats() -> Dict[str, Any]:
+    """Backlog depth, oldest pending wait and completed wait per tier."""
+    now = timezone.now()
+    backlog = {
+        row["tier"]: row
+        for row in PlayerEnrichmentIntent.objects.values("tier").annotate(
+            pending=Count("id"),
+            claimed=Count("id", filter=Q(claimed_at__isnull=False)),
+            oldest_requested_at=Min("requested_at"),
+        )
+    }
+    try:
+        raw = cache.get_many([
+            _stats_key(tier, field)
+            for tier in TIERS
+            for field in ("completed", "wait_seconds_sum")
+        ])
+    except Exception as error:
+        logger.warning("Unable to read enrichment stats: %s", error)
+        raw = {}
+
+    tiers = {}
+    for tier in TIERS:
+        row = backlog.get(tier) or {}
+        oldest: Optional[Any] = row.get("oldest_requested_at")
+        completed = int(raw.get(_stats_key(tier, "completed")) or 0)
+        wait_sum = int(raw.get(_stats_key(tier, "wait_seconds_sum")) or 0)
+        tiers[tier] = {
+            "pending": row.get("pending", 0),
+            "claimed": row.get("claimed", 0),
+            "oldest_pending_seconds": int((now - oldest).total_seconds()) if oldest else None,
+            "completed": completed,
+            "avg_wait_seconds": round(wait_sum / completed, 1) if completed else None,
+        }
+    return {"tiers": tiers}
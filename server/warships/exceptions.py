@@ -1,6 +1,21 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler
 
 
+class UpstreamUnavailable(APIException):
+    """Raised when a lookup needs the WG API while its circuit breaker is open."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Upstream data source is temporarily unavailable; try again shortly.'
+    default_code = 'upstream_unavailable'
+
+    def __init__(self, detail=None, code=None, wait=None):
+        super().__init__(detail, code)
+        # DRF's exception handler turns `wait` into a Retry-After header.
+        self.wait = wait
+
+
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
     if response is None:
@@ -9,8 +9,10 @@ from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
 from django.db.models.functions import Cast
 from django.utils import timezone
 
-from warships.data import _calculate_tier_filtered_pvp_record, _get_published_efficiency_rank_payload, get_highest_ranked_league_name, is_clan_battle_enjoyer, is_pve_player, is_ranked_player, is_sleepy_player
+from warships.data import _get_published_efficiency_rank_payload, get_highest_ranked_league_name, is_clan_battle_enjoyer, is_pve_player, is_ranked_player, is_sleepy_player
 from warships.models import Clan, Player
+from warships.player_payloads import attach_player_payloads
+from warships.player_ship_stats import fetch_tier_filtered_pvp_records
 
 
 logger = logging.getLogger(__name__)
@@ -923,7 +925,7 @@ def resolve_landing_players_by_id_order(player_ids: list[int]) -> list[dict]:
         ).exclude(
             last_battle_date__isnull=True,
         ).values(
-            'name', 'player_id', 'pvp_ratio', 'is_hidden', 'days_since_last_battle', 'total_battles', 'pvp_battles', 'battles_json', 'ranked_json'
+            'name', 'player_id', 'pvp_ratio', 'is_hidden', 'days_since_last_battle', 'total_battles', 'pvp_battles'
         )
     )
     rows.sort(key=lambda row: selected_order.get(
@@ -963,8 +965,10 @@ def get_random_landing_player_queue_payload(
 
 
 def _serialize_landing_player_rows(rows: list[dict]) -> list[dict]:
+    attach_player_payloads(rows, ('ranked',), key='player_id')
     player_ids = [int(row.get('player_id') or 0)
                   for row in rows if row.get('player_id') is not None]
+    high_tier_records = fetch_tier_filtered_pvp_records(player_ids)
     players_by_id = {
         player.player_id: player
         for player in Player.objects.filter(player_id__in=player_ids).select_related('explorer_summary').only(
@@ -990,10 +994,8 @@ def _serialize_landing_player_rows(rows: list[dict]) -> list[dict]:
 
     for row in rows:
         player_id = int(row.get('player_id') or 0)
-        high_tier_battles, high_tier_ratio = _calculate_tier_filtered_pvp_record(
-            row.pop('battles_json', None),
-            minimum_tier=5,
-        )
+        high_tier_battles, high_tier_ratio = high_tier_records.get(
+            player_id, (0, None))
         ranked_rows = row.pop('ranked_json', None)
         player_obj = players_by_id.get(player_id)
         es = getattr(player_obj, 'explorer_summary',
@@ -1107,7 +1109,7 @@ def _build_random_landing_players(limit: int) -> list[dict]:
                       player_id in enumerate(selected_ids)}
     rows = list(
         Player.objects.filter(player_id__in=selected_ids).values(
-            'name', 'player_id', 'pvp_ratio', 'is_hidden', 'days_since_last_battle', 'total_battles', 'pvp_battles', 'battles_json', 'ranked_json'
+            'name', 'player_id', 'pvp_ratio', 'is_hidden', 'days_since_last_battle', 'total_battles', 'pvp_battles'
         )
     )
     rows.sort(key=lambda row: selected_order.get(
@@ -1140,8 +1142,6 @@ def _build_best_landing_players(limit: int) -> list[dict]:
             'days_since_last_battle',
             'total_battles',
             'pvp_battles',
-            'battles_json',
-            'ranked_json',
             'player_score',
             'efficiency_rank_percentile',
             'shrunken_efficiency_strength',
@@ -1304,11 +1304,12 @@ def _build_recent_players() -> list[dict]:
     rows = list(
         Player.objects.exclude(name='').exclude(
             last_lookup__isnull=True
-        ).values('name', 'player_id', 'pvp_ratio', 'days_since_last_battle', 'total_battles', 'pvp_battles', 'ranked_json').order_by(
+        ).values('name', 'player_id', 'pvp_ratio', 'days_since_last_battle', 'total_battles', 'pvp_battles').order_by(
             F('last_lookup').desc(nulls_last=True),
             'name',
         )[:40]
     )
+    attach_player_payloads(rows, ('ranked',), key='player_id')
     player_ids = [int(row.get('player_id') or 0)
                   for row in rows if row.get('player_id') is not None]
     players_by_id = {
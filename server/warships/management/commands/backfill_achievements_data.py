@@ -6,8 +6,10 @@ from django.core.management.base import BaseCommand
 from django.db.models import Q
 from django.utils import timezone
 
+from warships.api.batching import ACCOUNT_BATCH_MAX_SIZE, primed_account_loaders
 from warships.data import update_achievements_data
 from warships.models import Player
+from warships.player_payloads import has_payload
 
 
 class Command(BaseCommand):
@@ -52,7 +54,7 @@ class Command(BaseCommand):
         if not force:
             if only_missing or stale_cutoff is None:
                 queryset = queryset.filter(
-                    Q(achievements_json__isnull=True) |
+                    ~has_payload('achievements') |
                     Q(achievements_updated_at__isnull=True)
                 )
             else:
@@ -61,14 +63,29 @@ class Command(BaseCommand):
                     Q(achievements_updated_at__lt=stale_cutoff)
                 )
 
+        if limit:
+            queryset = queryset[:limit]
+
+        upstream_batch_size = min(batch_size, ACCOUNT_BATCH_MAX_SIZE)
         processed = 0
-        for player in queryset.iterator(chunk_size=batch_size):
-            update_achievements_data(player.player_id, force_refresh=True)
-            processed += 1
-            if processed % batch_size == 0:
-                self.stdout.write(f'Processed {processed} players...')
-            if limit and processed >= limit:
-                break
+        chunk: list[int] = []
+
+        def process_chunk(player_ids: list[int]) -> None:
+            nonlocal processed
+            with primed_account_loaders(('achievements',), player_ids):
+                for chunk_player_id in player_ids:
+                    update_achievements_data(chunk_player_id, force_refresh=True)
+                    processed += 1
+                    if processed % batch_size == 0:
+                        self.stdout.write(f'Processed {processed} players...')
+
+        for player_id_value in queryset.values_list('player_id', flat=True).iterator(chunk_size=batch_size):
+            chunk.append(player_id_value)
+            if len(chunk) >= upstream_batch_size:
+                process_chunk(chunk)
+                chunk = []
+        if chunk:
+            process_chunk(chunk)
 
         self.stdout.write(self.style.SUCCESS(
             f'Achievements backfill complete: processed={processed}'
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
+from warships.api.batching import ACCOUNT_BATCH_MAX_SIZE, primed_account_loaders
 from warships.data import update_player_efficiency_data
 from warships.models import Player
 
@@ -71,7 +72,7 @@ class Command(BaseCommand):
             '--batch-size',
             type=int,
             default=100,
-            help='Iterator batch size and progress-report interval.',
+            help='Iterator batch size and progress-report interval; upstream fetches are batched up to 100 players per request.',
         )
         parser.add_argument(
             '--state-file',
@@ -114,6 +115,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         limit = max(int(options['limit']), 0)
         batch_size = max(int(options['batch_size']), 1)
+        upstream_batch_size = min(batch_size, ACCOUNT_BATCH_MAX_SIZE)
         refresh_older_than_hours = max(
             int(options['refresh_older_than_hours']), 0)
         include_hidden = bool(options['include_hidden'])
@@ -178,6 +180,33 @@ class Command(BaseCommand):
 
             return False
 
+        def next_chunk_size() -> int:
+            if limit:
+                return max(min(upstream_batch_size, limit - attempted_this_run), 1)
+            return upstream_batch_size
+
+        def process_chunk(players: list[Player], *, advance_checkpoint: bool, failure_label: str) -> None:
+            # One batched upstream request covers the whole chunk; the
+            # per-player refresh below then reads from the primed loader.
+            with primed_account_loaders(
+                    ('efficiency_badges',), [player.player_id for player in players]):
+                for player in players:
+                    if should_stop():
+                        break
+                    try:
+                        update_player_efficiency_data(player, force_refresh=True)
+                        record_success(
+                            player, advance_checkpoint=advance_checkpoint)
+                    except Exception as error:
+                        self.stderr.write(
+                            f'Failed {failure_label} for {player.name} ({player.player_id}): {error}')
+                        record_error(player, error,
+                                     advance_checkpoint=advance_checkpoint)
+
+                if attempted_this_run % batch_size == 0:
+                    self.stdout.write(
+                        f'Attempted {attempted_this_run} players in this run...')
+
         pending_failures = list(dict.fromkeys(int(player_id)
                                 for player_id in state.get('failed_player_ids', [])))
         if pending_failures:
@@ -185,20 +214,16 @@ class Command(BaseCommand):
                 f'Retrying {len(pending_failures)} previously failed player(s) from {state_path} before continuing.'
             )
 
-        for player in Player.objects.filter(id__in=pending_failures).order_by('id'):
+        retry_players = list(
+            Player.objects.filter(id__in=pending_failures).order_by('id'))
+        for start in range(0, len(retry_players), upstream_batch_size):
             if should_stop():
                 break
-            try:
-                update_player_efficiency_data(player, force_refresh=True)
-                record_success(player, advance_checkpoint=False)
-            except Exception as error:
-                self.stderr.write(
-                    f'Failed retry for {player.name} ({player.player_id}): {error}')
-                record_error(player, error, advance_checkpoint=False)
-
-            if attempted_this_run % batch_size == 0:
-                self.stdout.write(
-                    f'Attempted {attempted_this_run} players in this run...')
+            process_chunk(
+                retry_players[start:start + upstream_batch_size],
+                advance_checkpoint=False,
+                failure_label='retry',
+            )
 
         if not should_stop():
             queryset = Player.objects.exclude(
@@ -210,24 +235,22 @@ class Command(BaseCommand):
 
             queryset = queryset.filter(id__gt=state['last_player_id'])
 
+            chunk = []
             for player in queryset.iterator(chunk_size=batch_size):
-                if should_stop():
-                    break
-
                 if not needs_efficiency_backfill(player):
                     continue
 
-                try:
-                    update_player_efficiency_data(player, force_refresh=True)
-                    record_success(player, advance_checkpoint=True)
-                except Exception as error:
-                    self.stderr.write(
-                        f'Failed efficiency backfill for {player.name} ({player.player_id}): {error}')
-                    record_error(player, error, advance_checkpoint=True)
-
-                if attempted_this_run % batch_size == 0:
-                    self.stdout.write(
-                        f'Attempted {attempted_this_run} players in this run...')
+                chunk.append(player)
+                if len(chunk) >= next_chunk_size():
+                    process_chunk(chunk, advance_checkpoint=True,
+                                  failure_label='efficiency backfill')
+                    chunk = []
+                    if should_stop():
+                        break
+
+            if chunk and not should_stop():
+                process_chunk(chunk, advance_checkpoint=True,
+                              failure_label='efficiency backfill')
 
         if errors_this_run >= max_errors:
             self.stderr.write(self.style.WARNING(
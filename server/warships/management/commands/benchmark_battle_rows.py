@@ -0,0 +1,149 @@
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+
+from warships.battle_rows import BATTLE_ROW_FIELDS, BATTLE_ROWS_SCHEMA_VERSION, decode_battle_rows, encode_battle_rows
+from warships.models import PlayerPayload
+
+
+FORMAT_LEGACY = 'legacy'
+FORMAT_ENCODED = f'encoded_v{BATTLE_ROWS_SCHEMA_VERSION}'
+SHIP_TYPES = ('Destroyer', 'Cruiser', 'Battleship', 'AirCarrier', 'Submarine')
+
+
+def _legacy_rows(rows: list) -> list[dict]:
+    return [dict(row) for row in rows]
+
+
+def _synthetic_battle_rows(players: int, ships_per_player: int, seed: int) -> list[list[dict]]:
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(players):
+        rows = []
+        for ship_id in rng.sample(range(3_000_000_000, 4_300_000_000), ships_per_player):
+            pvp_battles = rng.randint(1, 900)
+            wins = rng.randint(0, pvp_battles)
+            all_battles = pvp_battles + rng.randint(0, 60)
+            losses = pvp_battles - wins
+            name = f'Ship {ship_id % 100000}'
+            rows.append({
+                'ship_id': ship_id,
+                'ship_name': name,
+                'ship_chart_name': name,
+                'ship_tier': rng.randint(1, 11),
+                'all_battles': all_battles,
+                'distance': all_battles * rng.randint(80, 160),
+                'wins': wins,
+                'losses': losses,
+                'ship_type': rng.choice(SHIP_TYPES),
+                'pve_battles': all_battles - (wins + losses),
+                'pvp_battles': pvp_battles,
+                'win_ratio': round(wins / pvp_battles, 2),
+                'kdr': round(rng.random() * 2, 2),
+            })
+        payloads.append(sorted(rows, key=lambda row: row['pvp_battles'], reverse=True))
+    return payloads
+
+
+def _stored_battle_rows(limit: int) -> list[list[dict]]:
+    stored = PlayerPayload.objects.filter(kind='battles').exclude(
+        data=[]).order_by('player_id').values_list('data', flat=True)[:limit]
+    return [_legacy_rows(decode_battle_rows(data)) for data in stored]
+
+
+def _read_all_fields(rows: list) -> int:
+    # Stands in for a consumer that looks at every field of every row.
+    touched = 0
+    for row in rows:
+        for field in BATTLE_ROW_FIELDS:
+            if row.get(field) is not None:
+                touched += 1
+    return touched
+
+
+def _time_decode(texts: list[str], decode: Callable[[Any], list], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            _read_all_fields(decode(json.loads(text)))
+    return time.perf_counter() - started
+
+
+def run_battle_rows_benchmark(payloads: list[list[dict]], repeat: int = 5) -> list[dict]:
+    """Stored bytes and decode time per player for each battles_json format."""
+    players = len(payloads)
+    formats = (
+        (FORMAT_LEGACY, lambda rows: rows, lambda data: data),
+        (FORMAT_ENCODED, encode_battle_rows, decode_battle_rows),
+    )
+    results = []
+    for name, encode, decode in formats:
+        # Serialized like Postgres renders jsonb text, which is what the
+        # driver parses on every load.
+        texts = [json.dumps(encode(rows), separators=(', ', ': ')) for rows in payloads]
+        total_bytes = sum(len(text.encode('utf-8')) for text in texts)
+        elapsed = _time_decode(texts, decode, repeat) if players else 0.0
+        results.append({
+            'format': name,
+            'players': players,
+            'ships': sum(len(rows) for rows in payloads),
+            'bytes_total': total_bytes,
+            'bytes_per_player': round(total_bytes / players, 1) if players else None,
+            'decode_us_per_player': round(elapsed / (players * repeat) * 1_000_000, 1) if players else None,
+        })
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark battles_json storage formats; reports stored bytes and '
+        'decode time per player for the legacy list of dicts and the compact encoding.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=200,
+                            help='Stored battles payloads to sample (or synthetic players to build).')
+        parser.add_argument('--synthetic', action='store_true',
+                            help='Build synthetic battle rows instead of reading stored payloads.')
+        parser.add_argument('--ships-per-player', type=int, default=250,
+                            help='Rows per synthetic player.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Decode passes over the sample.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed for synthetic rows.')
+        parser.add_argument('--json-output', default=None,
+                            help='Also write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        players = max(int(options['players']), 1)
+        if options['synthetic']:
+            payloads = _synthetic_battle_rows(
+                players, max(int(options['ships_per_player']), 1), options['seed'])
+        else:
+            payloads = _stored_battle_rows(players)
+            if not payloads:
+                self.stdout.write(self.style.WARNING(
+                    'No stored battles payloads; rerun with --synthetic.'))
+                return
+
+        results = run_battle_rows_benchmark(
+            payloads, repeat=max(int(options['repeat']), 1))
+        for row in results:
+            self.stdout.write(
+                f'{row["format"]}: players={row["players"]}, '
+                f'ships={row["ships"]}, '
+                f'bytes_per_player={row["bytes_per_player"]}, '
+                f'decode_us_per_player={row["decode_us_per_player"]}'
+            )
+
+        if options['json_output']:
+            output_path = Path(options['json_output']).expanduser().resolve()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps({'results': results}, indent=2) + '\n')
+            self.stdout.write(f'Wrote {output_path}')
+
+        self.stdout.write(self.style.SUCCESS('Battle rows benchmark complete.'))
@@ -0,0 +1,285 @@
+import json
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable, Iterator, Optional
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from battlestats.celery import app as celery_app
+from warships import clan_crawl
+from warships.api import client
+from warships.api.fake_upstream import FakeUpstreamConfig, FakeUpstreamServer
+from warships.api.rate_limit import LocalTokenBucket, TokenBucketRateLimiter, rate_limiter_override
+from warships.data import update_battle_data
+from warships.models import Player
+
+
+PATH_CLAN_CRAWL = 'clan_crawl'
+PATH_PLAYER_REFRESH = 'incremental_player_refresh'
+PATH_RANKED = 'incremental_ranked_data'
+PATH_BATTLE_DATA = 'update_battle_data'
+# The crawl seeds the throwaway database that the later paths refresh.
+BENCHMARK_PATHS = (PATH_CLAN_CRAWL, PATH_PLAYER_REFRESH,
+                   PATH_RANKED, PATH_BATTLE_DATA)
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+BENCHMARK_APP_ID = 'benchmark'
+
+
+class _DbWriteCounter:
+    """execute_wrapper that counts write statements on every connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        is_write = sql.lstrip().split(' ', 1)[0].upper() in WRITE_STATEMENTS
+        with self._lock:
+            self.queries += 1
+            if is_write:
+                self.writes += 1
+        return execute(sql, params, many, context)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.writes = 0
+            self.queries = 0
+
+
+@contextmanager
+def _count_db_writes(counter: _DbWriteCounter) -> Iterator[None]:
+    def install(sender, connection, **kwargs):
+        if counter not in connection.execute_wrappers:
+            connection.execute_wrappers.append(counter)
+
+    for conn in connections.all():
+        install(None, conn)
+    connection_created.connect(install, weak=False)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+        for conn in connections.all():
+            if counter in conn.execute_wrappers:
+                conn.execute_wrappers.remove(counter)
+
+
+@contextmanager
+def _patched_attr(target, name: str, value) -> Iterator[None]:
+    previous = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, previous)
+
+
+@contextmanager
+def isolated_upstream(server: FakeUpstreamServer, rate_per_second: float) -> Iterator[None]:
+    """Point every WG caller at ``server`` and keep shared state out of reach.
+
+    Cache-backed state (breaker, single-flight, metrics) moves to a local
+    cache, the rate limiter to a private bucket, and task dispatches to an
+    in-memory broker so no real worker picks them up.
+    """
+    limiter = TokenBucketRateLimiter(
+        LocalTokenBucket(), rate=rate_per_second, burst=rate_per_second)
+    with ExitStack() as stack:
+        stack.enter_context(override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'warships-benchmark-ingestion',
+        }}))
+        stack.enter_context(rate_limiter_override(limiter))
+        stack.enter_context(_patched_attr(
+            client, 'BASE_URL', server.base_url))
+        stack.enter_context(_patched_attr(
+            client, 'APP_ID', client.APP_ID or BENCHMARK_APP_ID))
+        stack.enter_context(_patched_attr(
+            clan_crawl, 'APP_ID', clan_crawl.APP_ID or BENCHMARK_APP_ID))
+        stack.enter_context(_patched_attr(
+            celery_app.conf, 'broker_url', 'memory://'))
+        yield
+
+
+def _run_clan_crawl(limit: int) -> int:
+    summary = clan_crawl.run_clan_crawl(limit=limit)
+    return int(summary.get('players_saved', 0))
+
+
+def _run_state_command(command: str, state_dir: Path, limit: int, **options) -> int:
+    state_path = state_dir / f'{command}_state.json'
+    call_command(
+        command,
+        limit=limit,
+        state_file=str(state_path),
+        reset_state=True,
+        stdout=StringIO(),
+        stderr=StringIO(),
+        **options,
+    )
+    return int(json.loads(state_path.read_text()).get('processed_total', 0))
+
+
+def _run_update_battle_data(limit: int) -> int:
+    player_ids = list(
+        Player.objects.filter(is_hidden=False)
+        .order_by('id')
+        .values_list('player_id', flat=True)[:limit]
+    )
+    for player_id in player_ids:
+        update_battle_data(player_id)
+    return len(player_ids)
+
+
+def _per_player(value: int, players: int) -> Optional[float]:
+    return round(value / players, 2) if players else None
+
+
+def run_ingestion_benchmark(
+    server: FakeUpstreamServer,
+    paths: tuple[str, ...] = BENCHMARK_PATHS,
+    clan_limit: int = 20,
+    player_limit: int = 200,
+    rate_per_second: float = 1000.0,
+) -> list[dict]:
+    """Run each ingestion path against ``server`` and return one row per path."""
+    counter = _DbWriteCounter()
+    results = []
+    with TemporaryDirectory() as state_dir, isolated_upstream(server, rate_per_second), _count_db_writes(counter):
+        runners: dict[str, Callable[[], int]] = {
+            PATH_CLAN_CRAWL: lambda: _run_clan_crawl(clan_limit),
+            PATH_PLAYER_REFRESH: lambda: _run_state_command(
+                'incremental_player_refresh', Path(state_dir), player_limit,
+                hot_stale_hours=0, active_stale_hours=0, warm_stale_hours=0,
+                active_limit=player_limit, warm_limit=player_limit,
+            ),
+            PATH_RANKED: lambda: _run_state_command(
+                'incremental_ranked_data', Path(state_dir), player_limit,
+                skip_fresh_hours=0, known_limit=player_limit,
+                discovery_limit=player_limit, min_discovery_pvp_battles=0,
+            ),
+            PATH_BATTLE_DATA: lambda: _run_update_battle_data(player_limit),
+        }
+        for path in paths:
+            server.reset_stats()
+            counter.reset()
+            started = time.monotonic()
+            players = runners[path]()
+            elapsed = time.monotonic() - started
+            upstream = server.stats()['totals']
+            calls = upstream.get('requests', 0)
+            results.append({
+                'path': path,
+                'players': players,
+                'seconds': round(elapsed, 3),
+                'players_per_second': round(players / elapsed, 2) if elapsed > 0 else None,
+                'upstream_calls': calls,
+                'upstream_calls_per_player': _per_player(calls, players),
+                'upstream_bytes': upstream.get('bytes', 0),
+                'upstream_throttled': upstream.get('throttled', 0),
+                'upstream_errors': upstream.get('errors', 0),
+                'db_writes': counter.writes,
+                'db_writes_per_player': _per_player(counter.writes, players),
+                'db_queries': counter.queries,
+            })
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the ingestion paths against a local fake WG API and a '
+        'throwaway database; reports players/s, upstream calls and DB writes per player.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paths', default=','.join(BENCHMARK_PATHS),
+                            help=f'Comma-separated subset of: {", ".join(BENCHMARK_PATHS)}.')
+        parser.add_argument('--clans', type=int, default=20,
+                            help='Clans the crawl processes (--limit for run_clan_crawl).')
+        parser.add_argument('--players', type=int, default=200,
+                            help='Player limit for the refresh paths.')
+        parser.add_argument('--members-per-clan', type=int, default=30,
+                            help='Synthetic members in every fake clan.')
+        parser.add_argument('--ships-per-player', type=int, default=40,
+                            help='Synthetic ships/stats rows per player.')
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help='Fake upstream latency per request.')
+        parser.add_argument('--latency-jitter-ms', type=float, default=0.0,
+                            help='Uniform +/- jitter added to --latency-ms.')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of requests answered with HTTP 503.')
+        parser.add_argument('--throttle-rate', type=float, default=0.0,
+                            help='Fraction of requests answered with HTTP 429.')
+        parser.add_argument('--rate-limit', type=float, default=1000.0,
+                            help='Requests per second allowed by the benchmark\'s private token bucket.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed for synthetic payloads and fault injection.')
+        parser.add_argument('--recordings-dir', default=None,
+                            help='Directory of recorded envelopes (e.g. ships_stats.json) served instead of synthetic data.')
+        parser.add_argument('--json-output', default=None,
+                            help='Also write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        paths = tuple(path.strip()
+                      for path in options['paths'].split(',') if path.strip())
+        unknown = sorted(set(paths) - set(BENCHMARK_PATHS))
+        if unknown:
+            raise CommandError(
+                f'Unknown benchmark path(s): {", ".join(unknown)}')
+
+        config = FakeUpstreamConfig(
+            clan_count=max(int(options['clans']), 1),
+            members_per_clan=options['members_per_clan'],
+            ships_per_player=options['ships_per_player'],
+            latency_ms=options['latency_ms'],
+            latency_jitter_ms=options['latency_jitter_ms'],
+            error_rate=options['error_rate'],
+            throttle_rate=options['throttle_rate'],
+            seed=options['seed'],
+            recordings_dir=options['recordings_dir'],
+        )
+
+        old_db_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with FakeUpstreamServer(config) as server:
+                results = run_ingestion_benchmark(
+                    server,
+                    paths=paths,
+                    clan_limit=max(int(options['clans']), 1),
+                    player_limit=max(int(options['players']), 1),
+                    rate_per_second=max(float(options['rate_limit']), 0.001),
+                )
+        finally:
+            connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+        for row in results:
+            self.stdout.write(
+                f'{row["path"]}: players={row["players"]}, '
+                f'seconds={row["seconds"]}, '
+                f'players_per_second={row["players_per_second"]}, '
+                f'upstream_calls_per_player={row["upstream_calls_per_player"]}, '
+                f'db_writes_per_player={row["db_writes_per_player"]}, '
+                f'throttled={row["upstream_throttled"]}, '
+                f'errors={row["upstream_errors"]}'
+            )
+
+        if options['json_output']:
+            output_path = Path(options['json_output']).expanduser().resolve()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps({
+                'config': {key: value for key, value in vars(config).items() if key != 'recordings_dir'},
+                'results': results,
+            }, indent=2) + '\n')
+            self.stdout.write(f'Wrote {output_path}')
+
+        self.stdout.write(self.style.SUCCESS('Ingestion benchmark complete.'))
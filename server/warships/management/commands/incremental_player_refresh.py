@@ -2,6 +2,7 @@ import json
 import os
 from datetime import timedelta
 from pathlib import Path
+from typing import Optional
 
 from django.conf import settings
 from django.core.cache import cache
@@ -9,7 +10,8 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db.models import F, Q
 from django.utils import timezone
 
-from warships.clan_crawl import fetch_players_bulk, save_player
+from warships.clan_crawl import BATCH_SIZE as ACCOUNT_INFO_BATCH_SIZE, fetch_players_bulk, save_player
+from warships.crawl_telemetry import CrawlTelemetry
 from warships.data import (
     fetch_player_clan_battle_seasons,
     player_achievements_need_refresh,
@@ -166,16 +168,43 @@ def _build_candidate_queue(
     return ordered, tier_counts
 
 
-def _refresh_player(player_id: int) -> None:
+def _fetch_player_chunk(player_ids: list[int]) -> dict[int, Optional[dict]]:
+    """Fetch account/info for a chunk of queued players with one bulk call.
+
+    Returns a map of Player row id to upstream payload (None when the account
+    no longer exists upstream). Raises when the bulk request itself fails so
+    the caller can route every id in the chunk through the failed-id retry path.
+    """
+    account_ids = dict(
+        Player.objects.filter(id__in=player_ids).values_list('id', 'player_id')
+    )
+    if not account_ids:
+        return {}
+
+    player_map = fetch_players_bulk(sorted(set(account_ids.values())))
+    if not player_map:
+        raise RuntimeError('account/info bulk fetch returned no data')
+
+    return {
+        row_id: player_map.get(str(account_id))
+        for row_id, account_id in account_ids.items()
+    }
+
+
+def _refresh_player(player_id: int, player_map: Optional[dict[int, Optional[dict]]] = None) -> None:
     """Refresh a single player: core stats via WG API, plus conditional
-    achievements and efficiency updates."""
+    achievements and efficiency updates.
+
+    ``player_map`` is the prefetched chunk from ``_fetch_player_chunk``; when
+    omitted the player is fetched on its own.
+    """
     player = Player.objects.filter(id=player_id).select_related('clan').first()
     if player is None:
         return
 
-    # Fetch fresh data from WG API (bulk fetch with single ID)
-    player_map = fetch_players_bulk([player.player_id])
-    player_data = player_map.get(str(player.player_id))
+    if player_map is None:
+        player_map = _fetch_player_chunk([player_id])
+    player_data = player_map.get(player_id)
     if player_data is None:
         return
 
@@ -218,6 +247,15 @@ class Command(BaseCommand):
             '--batch-size', type=int, default=50,
             help='Progress-report interval while processing.',
         )
+        parser.add_argument(
+            '--chunk-size', type=int,
+            default=_env_int('PLAYER_REFRESH_CHUNK_SIZE',
+                             ACCOUNT_INFO_BATCH_SIZE),
+            help=(
+                'Players fetched per account/info request '
+                f'(max {ACCOUNT_INFO_BATCH_SIZE}).'
+            ),
+        )
         parser.add_argument(
             '--state-file', default=str(DEFAULT_STATE_FILE),
             help='Path to JSON checkpoint file.',
@@ -279,6 +317,8 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         limit = max(int(options['limit']), 0)
         batch_size = max(int(options['batch_size']), 1)
+        chunk_size = min(max(int(options['chunk_size']), 1),
+                         ACCOUNT_INFO_BATCH_SIZE)
         max_errors = max(int(options['max_errors']), 1)
         dry_run = bool(options['dry_run'])
         state_path = Path(options['state_file']).expanduser().resolve()
@@ -348,6 +388,7 @@ class Command(BaseCommand):
             if not is_retry:
                 state['next_index'] += 1
             _save_state(state_path, state)
+            telemetry.count('players')
 
         def record_error(player_id: int, error: Exception, *, is_retry: bool = False) -> None:
             nonlocal attempted_this_run, errors_this_run
@@ -363,10 +404,50 @@ class Command(BaseCommand):
             failed_ids.append(player_id)
             state['failed_player_ids'] = failed_ids
             _save_state(state_path, state)
+            telemetry.count('players')
+            telemetry.count('errors')
 
         def should_stop() -> bool:
             return (limit and attempted_this_run >= limit) or errors_this_run >= max_errors
 
+        def next_chunk_size() -> int:
+            if not limit:
+                return chunk_size
+            return max(min(chunk_size, limit - attempted_this_run), 0)
+
+        def refresh_chunk(chunk_ids: list[int], *, is_retry: bool = False) -> None:
+            # One bulk account/info call per chunk; save_player and the
+            # conditional enrichment still run per player so the checkpoint
+            # advances one id at a time.
+            try:
+                with telemetry.timed('chunk_fetch'):
+                    player_map = _fetch_player_chunk(chunk_ids)
+                chunk_error = None
+            except Exception as error:
+                player_map = {}
+                chunk_error = error
+
+            for player_id in chunk_ids:
+                if should_stop():
+                    break
+                try:
+                    if chunk_error is not None:
+                        raise chunk_error
+                    with telemetry.timed('player_refresh'):
+                        _refresh_player(player_id, player_map)
+                    state['failed_player_ids'] = [
+                        cid for cid in state['failed_player_ids'] if cid != player_id]
+                    record_success(is_retry=is_retry)
+                except Exception as error:
+                    if is_retry:
+                        self.stderr.write(
+                            f'Failed player refresh retry for id={player_id}: {error}')
+                    else:
+                        self.stderr.write(
+                            f'Failed player refresh for id={player_id}: {error}')
+                    record_error(player_id, error, is_retry=is_retry)
+            telemetry.publish()
+
         # Retry previously failed players first
         failed_retry_ids = list(dict.fromkeys(
             int(pid) for pid in state.get('failed_player_ids', [])))
@@ -374,39 +455,42 @@ class Command(BaseCommand):
             self.stdout.write(
                 f'Retrying {len(failed_retry_ids)} previously failed player(s).')
 
-        for player_id in failed_retry_ids:
-            if should_stop():
-                break
-            try:
-                _refresh_player(player_id)
-                state['failed_player_ids'] = [
-                    cid for cid in state['failed_player_ids'] if cid != player_id]
-                record_success(is_retry=True)
-            except Exception as error:
-                self.stderr.write(
-                    f'Failed player refresh retry for id={player_id}: {error}')
-                record_error(player_id, error, is_retry=True)
+        remaining = len(failed_retry_ids) + \
+            max(len(pending_player_ids) - state['next_index'], 0)
+        telemetry = CrawlTelemetry(
+            'incremental_player_refresh',
+            'players',
+            total=min(limit, remaining) if limit else remaining,
+            queue_depths=lambda: {
+                'pending': max(len(pending_player_ids) - state['next_index'], 0),
+                'failed': len(state['failed_player_ids']),
+            },
+        )
+
+        retry_index = 0
+        while retry_index < len(failed_retry_ids) and not should_stop():
+            chunk_ids = failed_retry_ids[retry_index:
+                                         retry_index + next_chunk_size()]
+            retry_index += len(chunk_ids)
+            refresh_chunk(chunk_ids, is_retry=True)
 
         # Process main queue
-        for player_id in pending_player_ids[state['next_index']:]:
-            if should_stop():
+        next_progress_at = batch_size
+        while not should_stop():
+            start = state['next_index']
+            chunk_ids = pending_player_ids[start:start + next_chunk_size()]
+            if not chunk_ids:
                 break
 
-            try:
-                _refresh_player(player_id)
-                state['failed_player_ids'] = [
-                    cid for cid in state['failed_player_ids'] if cid != player_id]
-                record_success()
-            except Exception as error:
-                self.stderr.write(
-                    f'Failed player refresh for id={player_id}: {error}')
-                record_error(player_id, error)
+            refresh_chunk(chunk_ids)
 
-            if attempted_this_run and attempted_this_run % batch_size == 0:
+            if attempted_this_run >= next_progress_at:
                 self.stdout.write(
                     f'Progress: {attempted_this_run} attempted, '
                     f'queue index {state["next_index"]}/{len(pending_player_ids)}.'
                 )
+                while next_progress_at <= attempted_this_run:
+                    next_progress_at += batch_size
 
         # Mark cycle complete if queue exhausted
         if state['next_index'] >= len(state['pending_player_ids']) and not state['failed_player_ids']:
@@ -415,6 +499,7 @@ class Command(BaseCommand):
             state['next_index'] = 0
             _save_state(state_path, state)
 
+        telemetry.finish()
         if errors_this_run >= max_errors:
             self.stderr.write(self.style.WARNING(
                 f'Aborting after {errors_this_run} errors in this run. '
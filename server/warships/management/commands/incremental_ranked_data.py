@@ -8,8 +8,10 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db.models import F, Q
 from django.utils import timezone
 
+from warships.crawl_telemetry import CrawlTelemetry
 from warships.data import update_ranked_data
 from warships.models import Player
+from warships.player_payloads import has_payload
 
 
 DEFAULT_STATE_FILE = Path(settings.BASE_DIR) / 'logs' / \
@@ -138,8 +140,7 @@ def _build_candidate_queue(
         ranked_updated_at__lt=fresh_cutoff)
 
     known_ranked_ids = list(
-        base_queryset.exclude(ranked_json__isnull=True)
-        .exclude(ranked_json=[])
+        base_queryset.filter(has_payload('ranked', non_empty=True))
         .filter(stale_known_filter)
         .order_by(
             F('last_lookup').desc(nulls_last=True),
@@ -152,7 +153,7 @@ def _build_candidate_queue(
     )
 
     discovery_ids = list(
-        base_queryset.filter(Q(ranked_json__isnull=True) | Q(ranked_json=[]))
+        base_queryset.filter(~has_payload('ranked', non_empty=True))
         .filter(pvp_battles__gte=min_discovery_pvp_battles)
         .filter(
             Q(last_lookup__gte=recent_lookup_cutoff)
@@ -255,6 +256,7 @@ class Command(BaseCommand):
             if not is_retry:
                 state['next_index'] += 1
             _save_state(state_path, state)
+            telemetry.count('players')
 
         def record_error(player_id: int, error: Exception, *, is_retry: bool = False) -> None:
             nonlocal attempted_this_run, errors_this_run
@@ -270,6 +272,9 @@ class Command(BaseCommand):
             failed_ids.append(player_id)
             state['failed_player_ids'] = failed_ids
             _save_state(state_path, state)
+            telemetry.count('players')
+            telemetry.count('errors')
+            telemetry.publish()
 
         def should_stop() -> bool:
             return (limit and attempted_this_run >= limit) or errors_this_run >= max_errors
@@ -280,6 +285,18 @@ class Command(BaseCommand):
             self.stdout.write(
                 f'Retrying {len(failed_retry_ids)} failed ranked incremental player(s) before continuing.')
 
+        remaining = len(failed_retry_ids) + \
+            max(len(pending_player_ids) - state['next_index'], 0)
+        telemetry = CrawlTelemetry(
+            'incremental_ranked_data',
+            'players',
+            total=min(limit, remaining) if limit else remaining,
+            queue_depths=lambda: {
+                'pending': max(len(pending_player_ids) - state['next_index'], 0),
+                'failed': len(state['failed_player_ids']),
+            },
+        )
+
         retry_players = {
             player.id: player
             for player in Player.objects.filter(id__in=failed_retry_ids).only('id', 'player_id', 'name')
@@ -294,7 +311,8 @@ class Command(BaseCommand):
                 _save_state(state_path, state)
                 continue
             try:
-                update_ranked_data(player.player_id)
+                with telemetry.timed('ranked_refresh'):
+                    update_ranked_data(player.player_id)
                 state['failed_player_ids'] = [
                     candidate_id for candidate_id in state['failed_player_ids'] if candidate_id != player.id]
                 record_success(is_retry=True)
@@ -314,10 +332,12 @@ class Command(BaseCommand):
                 continue
 
             try:
-                update_ranked_data(player.player_id)
+                with telemetry.timed('ranked_refresh'):
+                    update_ranked_data(player.player_id)
                 state['failed_player_ids'] = [
                     candidate_id for candidate_id in state['failed_player_ids'] if candidate_id != player.id]
                 record_success()
+                telemetry.publish()
             except Exception as error:
                 self.stderr.write(
                     f'Failed ranked incremental refresh for {player.name} ({player.player_id}): {error}')
@@ -334,6 +354,7 @@ class Command(BaseCommand):
             state['next_index'] = 0
             _save_state(state_path, state)
 
+        telemetry.finish()
         if errors_this_run >= max_errors:
             self.stderr.write(self.style.WARNING(
                 f'Aborting after {errors_this_run} errors in this run. Resume with the same --state-file.'
@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from warships.data import update_ranked_data
 from warships.models import Player
+from warships.player_payloads import has_payload
 
 
 DEFAULT_STATE_FILE = Path(settings.BASE_DIR) / 'logs' / \
@@ -190,8 +191,8 @@ class Command(BaseCommand):
                 persist()
 
         if not should_stop():
-            queryset = Player.objects.exclude(ranked_json__isnull=True).exclude(
-                ranked_json=[]).order_by('id')
+            queryset = Player.objects.filter(
+                has_payload('ranked', non_empty=True)).order_by('id')
             if not include_hidden:
                 queryset = queryset.filter(is_hidden=False)
             queryset = queryset.filter(id__gt=state['last_player_id'])
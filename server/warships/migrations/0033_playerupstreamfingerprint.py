@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warships', '0032_player_last_fetch_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerUpstreamFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True,
+                 primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=32)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('checked_at', models.DateTimeField()),
+                ('changed_at', models.DateTimeField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                 related_name='upstream_fingerprints', to='warships.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('player', 'resource'), name='unique_player_upstream_resource')],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warships', '0033_playerupstreamfingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='stats_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
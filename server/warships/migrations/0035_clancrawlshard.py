@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warships', '0034_player_stats_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClanCrawlShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True,
+                 primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard_index', models.IntegerField(unique=True)),
+                ('shard_count', models.IntegerField()),
+                ('next_page', models.IntegerField()),
+                ('limit', models.IntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), (
+                    'completed', 'Completed')], default='pending', max_length=16)),
+                ('clans_processed', models.IntegerField(default=0)),
+                ('players_saved', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warships', '0035_clancrawlshard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerEnrichmentIntent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True,
+                 primary_key=True, serialize=False, verbose_name='ID')),
+                ('tier', models.CharField(choices=[('hot', 'Hot'), ('active', 'Active'), (
+                    'warm', 'Warm'), ('cold', 'Cold')], max_length=8)),
+                ('priority', models.FloatField()),
+                ('requested_at', models.DateTimeField()),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE,
+                 related_name='enrichment_intent', to='warships.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['claimed_at', '-priority'], name='enrichment_claim_priority_idx')],
+            },
+        ),
+    ]
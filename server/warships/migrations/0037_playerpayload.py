@@ -0,0 +1,89 @@
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+
+PAYLOAD_KINDS = ('battles', 'tiers', 'activity', 'type',
+                 'randoms', 'ranked', 'efficiency', 'achievements')
+CHUNK_SIZE = 500
+
+
+def copy_payloads_off_player_rows(apps, schema_editor):
+    # Walks players in id order, one transaction per chunk, so an
+    # interrupted run keeps the chunks it finished and can be re-run.
+    Player = apps.get_model('warships', 'Player')
+    PlayerPayload = apps.get_model('warships', 'PlayerPayload')
+    fields = [f'{kind}_json' for kind in PAYLOAD_KINDS]
+
+    last_id = 0
+    while True:
+        rows = list(
+            Player.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', *fields)[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        payloads = [
+            PlayerPayload(player_id=row[0], kind=kind, data=value)
+            for row in rows
+            for kind, value in zip(PAYLOAD_KINDS, row[1:])
+            if value is not None
+        ]
+        with transaction.atomic():
+            PlayerPayload.objects.bulk_create(
+                payloads, ignore_conflicts=True)
+        last_id = rows[-1][0]
+
+
+def copy_payloads_onto_player_rows(apps, schema_editor):
+    Player = apps.get_model('warships', 'Player')
+    PlayerPayload = apps.get_model('warships', 'PlayerPayload')
+    fields = [f'{kind}_json' for kind in PAYLOAD_KINDS]
+
+    last_id = 0
+    while True:
+        players = list(Player.objects.filter(
+            id__gt=last_id).order_by('id')[:CHUNK_SIZE])
+        if not players:
+            break
+        stored = {
+            (player_id, kind): data
+            for player_id, kind, data in PlayerPayload.objects.filter(
+                player_id__in=[player.id for player in players],
+            ).values_list('player_id', 'kind', 'data')
+        }
+        for player in players:
+            for kind in PAYLOAD_KINDS:
+                setattr(player, f'{kind}_json', stored.get((player.id, kind)))
+        with transaction.atomic():
+            Player.objects.bulk_update(players, fields)
+        last_id = players[-1].id
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('warships', '0036_playerenrichmentintent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True,
+                 primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16)),
+                ('data', models.JSONField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                 related_name='payloads', to='warships.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('player', 'kind'), name='unique_player_payload_kind')],
+            },
+        ),
+        migrations.RunPython(
+            copy_payloads_off_player_rows,
+            reverse_code=copy_payloads_onto_player_rows,
+        ),
+    ]
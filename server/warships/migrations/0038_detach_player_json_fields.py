@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+PAYLOAD_FIELDS = ('battles_json', 'tiers_json', 'activity_json', 'type_json',
+                  'randoms_json', 'ranked_json', 'efficiency_json', 'achievements_json')
+
+
+class Migration(migrations.Migration):
+    # Player stops mapping the old payload columns, but they stay in the
+    # table (nullable, no longer written) so 0037 can still be reversed
+    # onto them. A later release drops the columns once PlayerPayload has
+    # been live for a full release.
+
+    dependencies = [
+        ('warships', '0037_playerpayload'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(model_name='player', name=name)
+                for name in PAYLOAD_FIELDS
+            ],
+            database_operations=[],
+        ),
+    ]
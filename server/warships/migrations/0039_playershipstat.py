@@ -0,0 +1,102 @@
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+
+CHUNK_SIZE = 500
+
+
+def _ship_stat(player_id, row):
+    if not isinstance(row, dict):
+        return None
+    try:
+        ship_id = int(row.get('ship_id') or 0)
+        pvp_battles = int(row.get('pvp_battles', 0) or 0)
+        ship_tier = int(row.get('ship_tier') or 0)
+        wins = row.get('wins')
+        if wins is None and row.get('win_ratio') is not None:
+            wins = float(row.get('win_ratio') or 0.0) * pvp_battles
+        wins = round(float(wins or 0))
+        kdr = float(row.get('kdr') or 0)
+    except (TypeError, ValueError):
+        return None
+    if ship_id <= 0 or pvp_battles <= 0:
+        return None
+    ship_type = row.get('ship_type')
+    return dict(
+        player_id=player_id,
+        ship_id=ship_id,
+        ship_tier=ship_tier,
+        ship_type=ship_type.strip() if isinstance(ship_type, str) else '',
+        pvp_battles=pvp_battles,
+        wins=max(wins, 0),
+        # Stored rows only keep the rounded kdr; the next battle refresh
+        # replaces this with the exact upstream frag count.
+        frags=max(round(kdr * pvp_battles), 0),
+    )
+
+
+def backfill_ship_stats(apps, schema_editor):
+    # Walks stored battle payloads in player order, one transaction per
+    # chunk, so an interrupted run keeps its progress and can be re-run.
+    PlayerPayload = apps.get_model('warships', 'PlayerPayload')
+    PlayerShipStat = apps.get_model('warships', 'PlayerShipStat')
+
+    last_id = 0
+    while True:
+        rows = list(
+            PlayerPayload.objects.filter(kind='battles', player_id__gt=last_id)
+            .order_by('player_id')
+            .values_list('player_id', 'data')[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        stats = []
+        for player_id, data in rows:
+            for row in data if isinstance(data, list) else []:
+                values = _ship_stat(player_id, row)
+                if values is not None:
+                    stats.append(PlayerShipStat(**values))
+        with transaction.atomic():
+            PlayerShipStat.objects.bulk_create(stats, ignore_conflicts=True)
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('warships', '0038_detach_player_json_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerShipStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True,
+                 primary_key=True, serialize=False, verbose_name='ID')),
+                ('ship_id', models.BigIntegerField()),
+                ('ship_tier', models.IntegerField(default=0)),
+                ('ship_type', models.CharField(
+                    blank=True, default='', max_length=200)),
+                ('pvp_battles', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('frags', models.IntegerField(default=0)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                 related_name='ship_stats', to='warships.player')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['ship_type', 'ship_tier'],
+                                 name='ship_stat_type_tier_idx'),
+                    models.Index(fields=['player', 'ship_tier'],
+                                 name='ship_stat_player_tier_idx'),
+                ],
+                'constraints': [models.UniqueConstraint(fields=('player', 'ship_id'), name='unique_player_ship_stat')],
+            },
+        ),
+        migrations.RunPython(
+            backfill_ship_stats,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations, transaction
+
+
+CHUNK_SIZE = 500
+SCHEMA_VERSION = 1
+# Mirrors warships.battle_rows.BATTLE_ROW_FIELDS at schema version 1.
+BATTLE_ROW_FIELDS = (
+    'ship_id', 'ship_name', 'ship_chart_name', 'ship_tier', 'all_battles',
+    'distance', 'wins', 'losses', 'ship_type', 'pve_battles', 'pvp_battles',
+    'win_ratio', 'kdr',
+)
+
+
+def _encode(data):
+    if not isinstance(data, list) or not data:
+        return None
+    if not all(isinstance(row, dict) and row.keys() == set(BATTLE_ROW_FIELDS) for row in data):
+        return None
+    return {
+        'v': SCHEMA_VERSION,
+        'rows': [[row[field] for field in BATTLE_ROW_FIELDS] for row in data],
+    }
+
+
+def _decode(data):
+    if not isinstance(data, dict) or data.get('v') != SCHEMA_VERSION:
+        return None
+    return [dict(zip(BATTLE_ROW_FIELDS, values)) for values in data['rows']]
+
+
+def _rewrite_battle_payloads(apps, convert):
+    # One transaction per chunk, so an interrupted run keeps its progress;
+    # payloads already in the target form convert to None and are skipped.
+    PlayerPayload = apps.get_model('warships', 'PlayerPayload')
+
+    last_id = 0
+    while True:
+        payloads = list(
+            PlayerPayload.objects.filter(kind='battles', id__gt=last_id)
+            .order_by('id')[:CHUNK_SIZE]
+        )
+        if not payloads:
+            break
+        changed = []
+        for payload in payloads:
+            data = convert(payload.data)
+            if data is not None:
+                payload.data = data
+                changed.append(payload)
+        with transaction.atomic():
+            PlayerPayload.objects.bulk_update(changed, ['data'])
+        last_id = payloads[-1].id
+
+
+def encode_battle_payloads(apps, schema_editor):
+    _rewrite_battle_payloads(apps, _encode)
+
+
+def decode_battle_payloads(apps, schema_editor):
+    _rewrite_battle_payloads(apps, _decode)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('warships', '0039_playershipstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            encode_battle_payloads,
+            reverse_code=decode_battle_payloads,
+        ),
+    ]
@@ -1,6 +1,50 @@
 from django.db import models
 from django.db.models.functions import Lower
 
+from warships.battle_rows import decode_battle_rows, encode_battle_rows
+
+
+# Per-player JSON payloads stored in PlayerPayload, one row per kind.
+PLAYER_PAYLOAD_KINDS = (
+    'battles',
+    'tiers',
+    'activity',
+    'type',
+    'randoms',
+    'ranked',
+    'efficiency',
+    'achievements',
+)
+PLAYER_PAYLOAD_FIELDS = {f'{kind}_json': kind for kind in PLAYER_PAYLOAD_KINDS}
+# Kinds stored in a compact encoding, as (encode, decode) pairs.
+PLAYER_PAYLOAD_CODECS = {
+    'battles': (encode_battle_rows, decode_battle_rows),
+}
+
+
+def encode_player_payload(kind, value):
+    codec = PLAYER_PAYLOAD_CODECS.get(kind)
+    return value if codec is None or value is None else codec[0](value)
+
+
+def decode_player_payload(kind, data):
+    codec = PLAYER_PAYLOAD_CODECS.get(kind)
+    return data if codec is None or data is None else codec[1](data)
+
+
+def _payload_property(kind):
+    def _get(self):
+        payloads = self._loaded_payloads()
+        if kind not in payloads:
+            self.load_payloads((kind,))
+        return payloads[kind]
+
+    def _set(self, value):
+        self._loaded_payloads()[kind] = value
+        self.__dict__.setdefault('_dirty_payloads', set()).add(kind)
+
+    return property(_get, _set, doc=f"The {kind} payload, loaded on first access.")
+
 
 class Player(models.Model):
     name = models.CharField(max_length=200)
@@ -24,34 +68,84 @@ class Player(models.Model):
         'Clan', on_delete=models.CASCADE, null=True, blank=True)
     last_lookup = models.DateTimeField(null=True, blank=True)
     last_fetch = models.DateTimeField(null=True, blank=True)
+    # account/info stats_updated_at, used to skip unchanged crawl rows.
+    stats_updated_at = models.DateTimeField(null=True, blank=True)
 
-    # TODO: consider refactoring these fields into a separate model
-    battles_json = models.JSONField(null=True, blank=True)
+    # The JSON payloads themselves live in PlayerPayload; the *_json
+    # properties below load them on first access.
     battles_updated_at = models.DateTimeField(null=True, blank=True)
-
-    tiers_json = models.JSONField(null=True, blank=True)
     tiers_updated_at = models.DateTimeField(null=True, blank=True)
-
-    activity_json = models.JSONField(null=True, blank=True)
     activity_updated_at = models.DateTimeField(null=True, blank=True)
-
-    type_json = models.JSONField(null=True, blank=True)
     type_updated_at = models.DateTimeField(null=True, blank=True)
-
-    randoms_json = models.JSONField(null=True, blank=True)
     randoms_updated_at = models.DateTimeField(null=True, blank=True)
-
-    ranked_json = models.JSONField(null=True, blank=True)
     ranked_updated_at = models.DateTimeField(null=True, blank=True)
-
-    efficiency_json = models.JSONField(null=True, blank=True)
     efficiency_updated_at = models.DateTimeField(null=True, blank=True)
-
-    achievements_json = models.JSONField(null=True, blank=True)
     achievements_updated_at = models.DateTimeField(null=True, blank=True)
 
     verdict = models.CharField(max_length=20, null=True, blank=True)
 
+    battles_json = _payload_property('battles')
+    tiers_json = _payload_property('tiers')
+    activity_json = _payload_property('activity')
+    type_json = _payload_property('type')
+    randoms_json = _payload_property('randoms')
+    ranked_json = _payload_property('ranked')
+    efficiency_json = _payload_property('efficiency')
+    achievements_json = _payload_property('achievements')
+
+    def _loaded_payloads(self):
+        return self.__dict__.setdefault('_payloads', {})
+
+    def load_payloads(self, kinds=PLAYER_PAYLOAD_KINDS):
+        """Fetch the given payload kinds in one query, skipping loaded ones."""
+        payloads = self._loaded_payloads()
+        missing = [kind for kind in kinds if kind not in payloads]
+        if not missing:
+            return
+        stored = {}
+        if self.pk is not None:
+            stored = dict(PlayerPayload.objects.filter(
+                player_id=self.pk, kind__in=missing).values_list('kind', 'data'))
+        for kind in missing:
+            payloads[kind] = decode_player_payload(kind, stored.get(kind))
+
+    def save(self, *args, **kwargs):
+        """Save the row, then write payloads that were assigned since loading.
+
+        ``update_fields`` may name ``*_json`` payloads; those are written
+        from the loaded value and the row update covers the remaining
+        columns only.
+        """
+        from warships.player_payloads import save_player_payloads
+
+        update_fields = kwargs.get('update_fields')
+        kinds = None
+        if update_fields is not None:
+            update_fields = list(update_fields)
+            kinds = [PLAYER_PAYLOAD_FIELDS[name]
+                     for name in update_fields if name in PLAYER_PAYLOAD_FIELDS]
+            kwargs['update_fields'] = [
+                name for name in update_fields if name not in PLAYER_PAYLOAD_FIELDS]
+        adding = self._state.adding
+        if update_fields is None or kwargs['update_fields'] or not kinds:
+            super().save(*args, **kwargs)
+        save_player_payloads([self], kinds=kinds, created=adding)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        kinds = PLAYER_PAYLOAD_KINDS
+        if fields is not None:
+            kinds = [PLAYER_PAYLOAD_FIELDS[name]
+                     for name in fields if name in PLAYER_PAYLOAD_FIELDS]
+            fields = [name for name in fields if name not in PLAYER_PAYLOAD_FIELDS]
+        payloads = self._loaded_payloads()
+        dirty = self.__dict__.get('_dirty_payloads', set())
+        for kind in kinds:
+            payloads.pop(kind, None)
+            dirty.discard(kind)
+        if fields is None or fields:
+            super().refresh_from_db(using=using, fields=fields,
+                                    from_queryset=from_queryset)
+
     def __str__(self):
         clan_name = self.clan.name if self.clan else "No Clan"
         return f"{self.name} ({self.player_id}) {clan_name}"
@@ -300,3 +394,141 @@ class PlayerAchievementStat(models.Model):
 
     def __str__(self):
         return f"{self.player.name} - {self.achievement_label}"
+
+
+class PlayerPayload(models.Model):
+    """One JSON payload (battles, ranked, ...) of a player, kept off the Player row."""
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='payloads',
+    )
+    kind = models.CharField(max_length=16)
+    data = models.JSONField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['player', 'kind'],
+                name='unique_player_payload_kind',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} {self.kind}"
+
+
+class PlayerShipStat(models.Model):
+    """PvP totals of one ship for one player, mirrored from battles_json."""
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='ship_stats',
+    )
+    ship_id = models.BigIntegerField()
+    ship_tier = models.IntegerField(default=0)
+    ship_type = models.CharField(max_length=200, blank=True, default='')
+    pvp_battles = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    frags = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['player', 'ship_id'],
+                name='unique_player_ship_stat',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['ship_type', 'ship_tier'],
+                         name='ship_stat_type_tier_idx'),
+            models.Index(fields=['player', 'ship_tier'],
+                         name='ship_stat_player_tier_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} ship {self.ship_id}: {self.pvp_battles} battles"
+
+
+class PlayerUpstreamFingerprint(models.Model):
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='upstream_fingerprints',
+    )
+    resource = models.CharField(max_length=32)
+    fingerprint = models.CharField(max_length=64)
+    checked_at = models.DateTimeField()
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['player', 'resource'],
+                name='unique_player_upstream_resource',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} {self.resource}:{self.fingerprint[:12]}"
+
+
+class ClanCrawlShard(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    shard_index = models.IntegerField(unique=True)
+    shard_count = models.IntegerField()
+    # Next clans/list page this shard still has to crawl.
+    next_page = models.IntegerField()
+    limit = models.IntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    clans_processed = models.IntegerField(default=0)
+    players_saved = models.IntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Clan crawl shard {self.shard_index}/{self.shard_count} ({self.status}, page {self.next_page})"
+
+
+class PlayerEnrichmentIntent(models.Model):
+    """A pending badge/achievement refresh, drained highest priority first."""
+    TIER_HOT = 'hot'
+    TIER_ACTIVE = 'active'
+    TIER_WARM = 'warm'
+    TIER_COLD = 'cold'
+    TIER_CHOICES = [
+        (TIER_HOT, 'Hot'),
+        (TIER_ACTIVE, 'Active'),
+        (TIER_WARM, 'Warm'),
+        (TIER_COLD, 'Cold'),
+    ]
+
+    player = models.OneToOneField(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='enrichment_intent',
+    )
+    tier = models.CharField(max_length=8, choices=TIER_CHOICES)
+    priority = models.FloatField()
+    requested_at = models.DateTimeField()
+    # Set while a drain has handed the intent to a worker; claims older than
+    # the claim timeout are picked up again.
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['claimed_at', '-priority'],
+                         name='enrichment_claim_priority_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} {self.tier} ({self.priority:.1f})"
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.db.models import Exists, OuterRef, Q
+
+from warships.models import PLAYER_PAYLOAD_KINDS, Player, PlayerPayload, decode_player_payload, encode_player_payload
+
+# Helpers for the per-kind player payload store. Player exposes each payload
+# as a lazy ``*_json`` property; list and detail paths that render payloads
+# for many players load just the kinds they need with one query here
+# instead of one query per player.
+
+
+def _payload_kinds(kinds: Iterable[str]) -> List[str]:
+    kinds = list(kinds)
+    unknown = set(kinds) - set(PLAYER_PAYLOAD_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown player payload kinds: {sorted(unknown)}")
+    return kinds
+
+
+def prefetch_player_payloads(players: Sequence[Player], kinds: Iterable[str]) -> Sequence[Player]:
+    """Load ``kinds`` for every saved player in one query; loaded kinds are kept."""
+    kinds = _payload_kinds(kinds)
+    pending = {
+        player.pk: player
+        for player in players
+        if player.pk is not None and any(kind not in player._loaded_payloads() for kind in kinds)
+    }
+    if not pending:
+        return players
+
+    stored: Dict[tuple, Any] = {
+        (player_id, kind): data
+        for player_id, kind, data in PlayerPayload.objects.filter(
+            player_id__in=list(pending), kind__in=kinds,
+        ).values_list('player_id', 'kind', 'data').iterator(chunk_size=1000)
+    }
+    for player_pk, player in pending.items():
+        payloads = player._loaded_payloads()
+        for kind in kinds:
+            if kind not in payloads:
+                payloads[kind] = decode_player_payload(
+                    kind, stored.get((player_pk, kind)))
+    return players
+
+
+def attach_player_payloads(rows: List[Dict[str, Any]], kinds: Iterable[str], key: str = 'id') -> List[Dict[str, Any]]:
+    """Add ``<kind>_json`` entries to ``.values()`` rows in one query.
+
+    ``key`` names the row column identifying the player: the row ``id`` or
+    the account ``player_id``.
+    """
+    kinds = _payload_kinds(kinds)
+    lookup = {'id': 'player_id', 'player_id': 'player__player_id'}[key]
+    player_ids = [row[key] for row in rows if row.get(key) is not None]
+    stored: Dict[tuple, Any] = {}
+    if player_ids:
+        stored = {
+            (player_id, kind): data
+            for player_id, kind, data in PlayerPayload.objects.filter(
+                **{f'{lookup}__in': player_ids}, kind__in=kinds,
+            ).values_list(lookup, 'kind', 'data').iterator(chunk_size=1000)
+        }
+    for row in rows:
+        for kind in kinds:
+            row[f'{kind}_json'] = decode_player_payload(
+                kind, stored.get((row.get(key), kind)))
+    return rows
+
+
+def has_payload(kind: str, non_empty: bool = False) -> Exists:
+    """Filter expression matching players with a stored ``kind`` payload.
+
+    ``non_empty`` also excludes payloads stored as an empty list.
+    """
+    _payload_kinds([kind])
+    payloads = PlayerPayload.objects.filter(player=OuterRef('pk'), kind=kind)
+    if non_empty:
+        payloads = payloads.exclude(data=[])
+    return Exists(payloads)
+
+
+def save_player_payloads(players: Iterable[Player], kinds: Optional[Iterable[str]] = None, created: bool = False) -> int:
+    """Write pending payload changes for ``players`` in at most two statements.
+
+    Without ``kinds`` the payloads assigned since loading are written;
+    with ``kinds`` every loaded payload of those kinds is. A ``None``
+    payload deletes the stored row. ``created`` players have no stored
+    rows yet, so their ``None`` payloads need no delete and their unloaded
+    kinds are known to be empty.
+    """
+    upserts: List[PlayerPayload] = []
+    deletes: List[Q] = []
+    for player in players:
+        payloads = player._loaded_payloads()
+        if created:
+            for kind in PLAYER_PAYLOAD_KINDS:
+                payloads.setdefault(kind, None)
+        dirty = player.__dict__.setdefault('_dirty_payloads', set())
+        if kinds is None:
+            pending = set(dirty)
+        else:
+            pending = set(_payload_kinds(kinds)) & payloads.keys()
+        for kind in pending:
+            value = payloads[kind]
+            if value is not None:
+                upserts.append(PlayerPayload(
+                    player_id=player.pk, kind=kind, data=encode_player_payload(kind, value)))
+            elif not created:
+                deletes.append(Q(player_id=player.pk, kind=kind))
+        dirty.difference_update(pending)
+
+    if deletes:
+        PlayerPayload.objects.filter(reduce(operator.or_, deletes)).delete()
+    if upserts:
+        PlayerPayload.objects.bulk_create(
+            upserts,
+            update_conflicts=True,
+            unique_fields=['player', 'kind'],
+            update_fields=['data'],
+        )
+    return len(upserts) + len(deletes)
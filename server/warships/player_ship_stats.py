@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Count, Sum
+
+from warships.models import Player, PlayerShipStat
+
+# Normalised per-ship PvP totals. update_battle_data mirrors each player's
+# battle rows into PlayerShipStat so population features (the tier x type
+# heatmap, high-tier landing records) aggregate with GROUP BY instead of
+# decoding every player's battles_json.
+
+STAT_FIELDS = ('ship_tier', 'ship_type', 'pvp_battles', 'wins', 'frags')
+
+
+def _ship_stat_values(row: Any, frags_by_ship: Optional[Mapping[int, int]] = None) -> Optional[Tuple[int, tuple]]:
+    if not isinstance(row, Mapping):
+        return None
+    try:
+        ship_id = int(row.get('ship_id') or 0)
+        ship_tier = int(row.get('ship_tier') or 0)
+        pvp_battles = int(row.get('pvp_battles', 0) or 0)
+        wins = row.get('wins')
+        if wins is None and row.get('win_ratio') is not None:
+            wins = float(row.get('win_ratio') or 0.0) * pvp_battles
+        wins = round(float(wins or 0))
+    except (TypeError, ValueError):
+        return None
+    if ship_id <= 0 or pvp_battles <= 0:
+        return None
+
+    if frags_by_ship is not None and ship_id in frags_by_ship:
+        frags = int(frags_by_ship[ship_id] or 0)
+    else:
+        # Stored rows only keep the rounded per-battle kdr.
+        frags = round(float(row.get('kdr') or 0) * pvp_battles)
+    ship_type = row.get('ship_type')
+    ship_type = ship_type.strip() if isinstance(ship_type, str) else ''
+    return ship_id, (ship_tier, ship_type, pvp_battles, max(wins, 0), max(frags, 0))
+
+
+def sync_player_ship_stats(
+    player: Player,
+    battle_rows: Iterable[Any],
+    frags_by_ship: Optional[Mapping[int, int]] = None,
+) -> Dict[str, int]:
+    """Bring ``player``'s PlayerShipStat rows in line with ``battle_rows``.
+
+    Only ships whose totals moved are upserted and ships no longer played
+    in randoms are deleted, so a typical refresh writes a handful of rows.
+    ``frags_by_ship`` supplies exact frag counts when the caller has the
+    upstream payload; otherwise frags are rebuilt from the row's kdr.
+    """
+    wanted: Dict[int, tuple] = {}
+    for row in battle_rows or []:
+        values = _ship_stat_values(row, frags_by_ship)
+        if values is not None:
+            wanted[values[0]] = values[1]
+
+    stored = {
+        ship_id: tuple(values)
+        for ship_id, *values in PlayerShipStat.objects.filter(player=player).values_list(
+            'ship_id', *STAT_FIELDS)
+    }
+    changed = [
+        PlayerShipStat(player=player, ship_id=ship_id,
+                       **dict(zip(STAT_FIELDS, values)))
+        for ship_id, values in wanted.items()
+        if stored.get(ship_id) != values
+    ]
+    removed = [ship_id for ship_id in stored if ship_id not in wanted]
+
+    if removed:
+        PlayerShipStat.objects.filter(
+            player=player, ship_id__in=removed).delete()
+    if changed:
+        PlayerShipStat.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['player', 'ship_id'],
+            update_fields=list(STAT_FIELDS),
+        )
+    return {'written': len(changed), 'deleted': len(removed), 'unchanged': len(wanted) - len(changed)}
+
+
+def fetch_tier_type_population(min_pvp_battles: int) -> Tuple[List[Dict[str, Any]], int]:
+    """PvP battles per (ship type, tier) over visible players, and how many players contributed."""
+    stats = PlayerShipStat.objects.filter(
+        player__is_hidden=False,
+        player__pvp_battles__gte=min_pvp_battles,
+        ship_tier__gt=0,
+        pvp_battles__gt=0,
+    ).exclude(ship_type='')
+    cells = list(
+        stats.values('ship_type', 'ship_tier')
+        .annotate(pvp_battles=Sum('pvp_battles'))
+        .order_by()
+    )
+    tracked_population = stats.aggregate(
+        players=Count('player', distinct=True))['players']
+    return cells, tracked_population
+
+
+def fetch_tier_filtered_pvp_records(player_ids: Iterable[int], minimum_tier: int = 5) -> Dict[int, Tuple[int, Optional[float]]]:
+    """PvP battles and win rate from ships at ``minimum_tier`` and above, by account id.
+
+    Players without qualifying ships map to ``(0, None)``.
+    """
+    player_ids = [int(player_id) for player_id in player_ids]
+    records: Dict[int, Tuple[int, Optional[float]]] = {
+        player_id: (0, None) for player_id in player_ids}
+    if not player_ids:
+        return records
+
+    rows = PlayerShipStat.objects.filter(
+        player__player_id__in=player_ids,
+        ship_tier__gte=minimum_tier,
+        pvp_battles__gt=0,
+    ).values('player__player_id').annotate(
+        battles=Sum('pvp_battles'),
+        wins=Sum('wins'),
+    ).order_by()
+    for row in rows:
+        battles = int(row['battles'] or 0)
+        if battles > 0:
+            records[row['player__player_id']] = (
+                battles, round((int(row['wins'] or 0) / battles) * 100, 2))
+    return records
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+# Span-style timing for the player refresh pipeline. The outermost decorated
+# refresh (update_battle_data, update_player_data, ...) opens a profile;
+# nested refreshes and ``refresh_stage`` blocks inside it become stages. Each
+# stage records its inclusive duration and the upstream calls, SQL queries
+# and cache operations made while it ran. A finished profile is logged as
+# one JSON line and folded into per-process aggregates, which are flushed
+# to the shared cache like the upstream request metrics.
+
+PROFILE_KEY_PREFIX = "warships:refresh:profile:v1"
+PROFILE_INDEX_KEY = f"{PROFILE_KEY_PREFIX}:index"
+FLUSH_INTERVAL_SECONDS = 5.0
+TOTAL_STAGE = "total"
+OUTCOME_COMPLETED = "completed"
+OUTCOME_FAILED = "failed"
+
+COUNTER_FIELDS = ("upstream_calls", "sql_queries", "cache_ops")
+SUMMED_FIELDS = ("count", "duration_ms_sum", *COUNTER_FIELDS)
+# Backend methods counted as one cache operation each. Composite helpers
+# such as get_or_set are counted through the primitives they call.
+CACHE_OPERATIONS = ("get", "set", "add", "delete", "touch",
+                    "incr", "get_many", "set_many", "delete_many")
+
+_active_profile: contextvars.ContextVar[Optional["_Profile"]] = contextvars.ContextVar(
+    "refresh_profile", default=None)
+
+_lock = threading.Lock()
+_process_aggregates: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+_pending_flush: Dict[str, int] = {}
+_last_flush = 0.0
+
+
+class _Profile:
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.outcome = OUTCOME_COMPLETED
+        self.path: List[str] = []
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._counters = {field: 0 for field in COUNTER_FIELDS}
+        self._lock = threading.Lock()
+
+    def note(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[field] += amount
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+def _note(field: str, amount: int = 1) -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.note(field, amount)
+
+
+def note_upstream_call() -> None:
+    """Count one upstream request against the active refresh profile."""
+    _note("upstream_calls")
+
+
+def mark_refresh_outcome(outcome: str) -> None:
+    """Label the active profile (e.g. ``fresh`` or ``unchanged``).
+
+    Only the outermost refresh labels its profile, so a nested refresh that
+    returns early does not relabel its caller.
+    """
+    profile = _active_profile.get()
+    if profile is not None and not profile.path:
+        profile.outcome = outcome
+
+
+def _count_queries(execute, sql, params, many, context):
+    _note("sql_queries")
+    return execute(sql, params, many, context)
+
+
+def _instrument_cache(backend) -> None:
+    # Backends are per thread, so the wrappers are installed once per
+    # instance and only count while a profile is active.
+    if getattr(backend, "_refresh_profile_instrumented", False):
+        return
+    for name in CACHE_OPERATIONS:
+        method = getattr(backend, name, None)
+        if method is not None:
+            setattr(backend, name, _counted_cache_operation(method))
+    backend._refresh_profile_instrumented = True
+
+
+def _counted_cache_operation(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def counted(*args, **kwargs):
+        _note("cache_ops")
+        return method(*args, **kwargs)
+
+    return counted
+
+
+def _add_stage(profile: _Profile, stage: str, elapsed_ms: float, before: Dict[str, int]) -> None:
+    after = profile.counters()
+    row = profile.stages.setdefault(stage, {
+        "count": 0, "duration_ms": 0.0, **{field: 0 for field in COUNTER_FIELDS}})
+    row["count"] += 1
+    row["duration_ms"] += elapsed_ms
+    for field in COUNTER_FIELDS:
+        row[field] += after[field] - before[field]
+
+
+@contextmanager
+def refresh_stage(name: str) -> Iterator[None]:
+    """Time one stage of the active refresh; a no-op outside a profile.
+
+    Repeated stages (one per ship, say) accumulate into a single entry.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+
+    profile.path.append(name)
+    stage = ".".join(profile.path)
+    before = profile.counters()
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        _add_stage(profile, stage, (time.monotonic() - started) * 1000, before)
+        profile.path.pop()
+
+
+def profiled_refresh(func: Callable) -> Callable:
+    """Profile ``func`` as a pipeline, or as a stage when already profiling."""
+    pipeline = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active_profile.get() is not None:
+            with refresh_stage(pipeline):
+                return func(*args, **kwargs)
+
+        profile = _Profile(pipeline)
+        token = _active_profile.set(profile)
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            with connection.execute_wrapper(_count_queries):
+                try:
+                    _instrument_cache(caches["default"])
+                except Exception as cache_error:
+                    logger.debug("Unable to instrument cache: %s", cache_error)
+                return func(*args, **kwargs)
+        except BaseException as raised:
+            error = raised
+            profile.outcome = OUTCOME_FAILED
+            raise
+        finally:
+            _active_profile.reset(token)
+            _finish_profile(profile, (time.monotonic() - started) * 1000, error)
+
+    return wrapper
+
+
+def _finish_profile(profile: _Profile, elapsed_ms: float, error: Optional[BaseException]) -> None:
+    totals = profile.counters()
+    summary = {
+        "pipeline": profile.pipeline,
+        "outcome": profile.outcome,
+        "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        "duration_ms": round(elapsed_ms, 1),
+        **totals,
+        "stages": {
+            stage: {**row, "duration_ms": round(row["duration_ms"], 1)}
+            for stage, row in profile.stages.items()
+        },
+    }
+    logger.info("refresh_profile %s", json.dumps(summary, sort_keys=True),
+                extra={"refresh_profile": summary})
+
+    rows = [(TOTAL_STAGE, elapsed_ms, totals), *(
+        (stage, row["duration_ms"], row) for stage, row in profile.stages.items())]
+    with _lock:
+        for stage, duration_ms, row in rows:
+            count = row.get("count", 1)
+            delta = {
+                "count": count,
+                "duration_ms_sum": int(round(duration_ms)),
+                **{field: row[field] for field in COUNTER_FIELDS},
+            }
+            aggregate = _process_aggregates.setdefault(
+                (profile.pipeline, profile.outcome, stage), _empty_aggregate())
+            aggregate["duration_ms_max"] = max(
+                aggregate["duration_ms_max"], int(round(duration_ms / count)))
+            series = f"{profile.pipeline}|{profile.outcome}|{stage}"
+            for field, amount in delta.items():
+                aggregate[field] += amount
+                key = f"{series}|{field}"
+                _pending_flush[key] = _pending_flush.get(key, 0) + amount
+
+    if _shared_profiles_enabled():
+        flush_refresh_profiles()
+
+
+def _empty_aggregate() -> Dict[str, Any]:
+    return {"count": 0, "duration_ms_sum": 0, "duration_ms_max": 0,
+            **{field: 0 for field in COUNTER_FIELDS}}
+
+
+def _shared_profiles_enabled() -> bool:
+    return not getattr(settings, "RUNNING_TESTS", False)
+
+
+def flush_refresh_profiles(force: bool = False) -> None:
+    global _last_flush
+
+    with _lock:
+        now = time.monotonic()
+        if not _pending_flush or (not force and now - _last_flush < FLUSH_INTERVAL_SECONDS):
+            return
+        pending = dict(_pending_flush)
+        _pending_flush.clear()
+        _last_flush = now
+
+    try:
+        index = set(cache.get(PROFILE_INDEX_KEY) or ())
+        series_names = {key.rsplit("|", 1)[0] for key in pending}
+        if not series_names.issubset(index):
+            cache.set(PROFILE_INDEX_KEY, sorted(
+                index | series_names), timeout=None)
+        for key, amount in pending.items():
+            cache_key = f"{PROFILE_KEY_PREFIX}:{key}"
+            if not cache.add(cache_key, amount, timeout=None):
+                cache.incr(cache_key, amount)
+    except Exception as error:
+        logger.debug("Unable to flush refresh profiles: %s", error)
+
+
+def _summarize(aggregate: Dict[str, Any]) -> Dict[str, Any]:
+    count = aggregate["count"]
+    summary = {**aggregate}
+    summary["duration_ms_avg"] = round(
+        aggregate["duration_ms_sum"] / count, 1) if count else None
+    for field in COUNTER_FIELDS:
+        summary[f"{field}_avg"] = round(
+            aggregate[field] / count, 2) if count else None
+    return summary
+
+
+def _nest(aggregates: Dict[Tuple[str, str, str], Dict[str, Any]]) -> Dict[str, Any]:
+    nested: Dict[str, Any] = {}
+    for (pipeline, outcome, stage), aggregate in sorted(aggregates.items()):
+        nested.setdefault(pipeline, {}).setdefault(
+            outcome, {})[stage] = _summarize(aggregate)
+    return nested
+
+
+def _read_shared_aggregates() -> Optional[Dict[Tuple[str, str, str], Dict[str, Any]]]:
+    try:
+        series_names = cache.get(PROFILE_INDEX_KEY) or []
+        keys = {
+            (series, field): f"{PROFILE_KEY_PREFIX}:{series}|{field}"
+            for series in series_names
+            for field in SUMMED_FIELDS
+        }
+        raw = cache.get_many(list(keys.values())) if keys else {}
+    except Exception as error:
+        logger.warning("Unable to read refresh profiles: %s", error)
+        return None
+
+    aggregates: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for (series, field), cache_key in keys.items():
+        value = raw.get(cache_key)
+        if not value:
+            continue
+        pipeline, outcome, stage = series.split("|", 2)
+        aggregate = aggregates.setdefault(
+            (pipeline, outcome, stage), _empty_aggregate())
+        aggregate[field] = int(value)
+    for aggregate in aggregates.values():
+        # Maxima cannot be summed across processes.
+        aggregate.pop("duration_ms_max", None)
+    return aggregates
+
+
+def get_refresh_profiles() -> Dict[str, Any]:
+    """Per-pipeline, per-outcome stage aggregates for this process and all processes."""
+    with _lock:
+        process = {key: dict(aggregate)
+                   for key, aggregate in _process_aggregates.items()}
+
+    shared = _read_shared_aggregates() if _shared_profiles_enabled() else None
+    return {
+        "process": _nest(process),
+        "shared": _nest(shared) if shared is not None else None,
+    }
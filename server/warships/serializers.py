@@ -1,9 +1,26 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Player, Clan, Ship
+from .player_payloads import prefetch_player_payloads
 from .data import _calculate_player_kill_ratio, _coerce_battle_rows, _get_published_efficiency_rank_payload, build_player_summary, get_highest_ranked_league_name, get_published_clan_battle_summary_payload, is_clan_battle_enjoyer, is_pve_player
 
 
+# Payloads rendered in player responses; the rest stay in the payload store.
+PLAYER_RESPONSE_PAYLOAD_KINDS = ('efficiency', 'randoms', 'ranked')
+
+
+class PlayerListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        players = list(data.all() if isinstance(
+            data, models.manager.BaseManager) else data)
+        prefetch_player_payloads(players, PLAYER_RESPONSE_PAYLOAD_KINDS)
+        return super().to_representation(players)
+
+
 class PlayerSerializer(serializers.ModelSerializer):
+    efficiency_json = serializers.JSONField(read_only=True)
+    randoms_json = serializers.JSONField(read_only=True)
+    ranked_json = serializers.JSONField(read_only=True)
     clan_name = serializers.SerializerMethodField()
     clan_id = serializers.SerializerMethodField()
     clan_tag = serializers.SerializerMethodField()
@@ -26,6 +43,7 @@ class PlayerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Player
         fields = '__all__'
+        list_serializer_class = PlayerListSerializer
         extra_kwargs = {
             'pvp_frags': {'write_only': True},
             'pvp_survived_battles': {'write_only': True},
@@ -139,6 +139,25 @@ def ensure_daily_clan_crawl_schedule(sender, **kwargs):
         },
     )
 
+    enrichment_drain_minutes = int(
+        os.getenv("ENRICHMENT_DRAIN_MINUTES", "1"))
+    enrichment_drain_schedule, _ = IntervalSchedule.objects.get_or_create(
+        every=enrichment_drain_minutes,
+        period=IntervalSchedule.MINUTES,
+    )
+
+    PeriodicTask.objects.update_or_create(
+        name="player-enrichment-drain",
+        defaults={
+            "task": "warships.tasks.drain_player_enrichment_task",
+            "interval": enrichment_drain_schedule,
+            "enabled": crawler_schedules_enabled,
+            "args": json.dumps([]),
+            "kwargs": json.dumps({}),
+            "description": "Hands the highest-priority crawl enrichment intents to the enrichment worker pool at a fixed rate.",
+        },
+    )
+
     warm_clan_ids = _configured_clan_battle_warm_ids()
     if warm_clan_ids:
         warm_minutes = int(os.getenv("CLAN_BATTLE_WARM_MINUTES", "30"))
@@ -2,11 +2,15 @@ from __future__ import absolute_import, unicode_literals
 import logging
 import os
 import time
+from typing import Optional
+from uuid import uuid4
 
 from django.core.cache import cache
 from django.core.management import call_command
 
 from battlestats.celery import app
+from warships.api.circuit_breaker import upstream_degraded
+from warships.api.rate_limit import PRIORITY_BACKGROUND, upstream_priority
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,8 @@ CLAN_CRAWL_LOCK_KEY = "warships:tasks:crawl_all_clans:lock"
 CLAN_CRAWL_LOCK_TIMEOUT = 8 * 60 * 60
 CLAN_CRAWL_HEARTBEAT_KEY = "warships:tasks:crawl_all_clans:heartbeat"
 CLAN_CRAWL_HEARTBEAT_STALE_AFTER = 15 * 60
+# Parallel clans/list page shards for the full crawl; 1 keeps the single crawl.
+CLAN_CRAWL_SHARDS = max(int(os.getenv("CLAN_CRAWL_SHARDS", "1")), 1)
 RESOURCE_TASK_LOCK_TIMEOUT = 15 * 60
 RANKED_INCREMENTAL_LOCK_KEY = "warships:tasks:incremental_ranked_data:lock"
 RANKED_INCREMENTAL_LOCK_TIMEOUT = 6 * 60 * 60
@@ -33,6 +39,9 @@ RANKED_REFRESH_DISPATCH_TIMEOUT = 15 * 60
 CLAN_BATTLE_REFRESH_DISPATCH_TIMEOUT = 15 * 60
 EFFICIENCY_REFRESH_DISPATCH_TIMEOUT = 15 * 60
 EFFICIENCY_SNAPSHOT_REFRESH_DISPATCH_TIMEOUT = 15 * 60
+# Crawl enrichment runs on its own worker pool so it never queues behind
+# (or in front of) interactive refreshes.
+ENRICHMENT_QUEUE = os.getenv("ENRICHMENT_QUEUE", "enrichment")
 PLAYER_RANKED_WR_BATTLES_CORRELATION_REFRESH_DISPATCH_TIMEOUT = 15 * 60
 BROKER_DISPATCH_FAILURE_COOLDOWN = 60
 LANDING_PAGE_WARM_LOCK_KEY = "warships:tasks:warm_landing_page_content:lock"
@@ -58,6 +67,14 @@ def _task_lock_key(task_name: str, resource_id: object) -> str:
     return f"warships:tasks:{task_name}:{resource_id}:lock"
 
 
+def _clan_crawl_shard_lock_key(shard_index: object) -> str:
+    return f"warships:tasks:crawl_clan_shard:{shard_index}:lock"
+
+
+def _clan_crawl_shard_heartbeat_key(shard_index: object) -> str:
+    return f"warships:tasks:crawl_clan_shard:{shard_index}:heartbeat"
+
+
 def _ranked_refresh_dispatch_key(player_id: object) -> str:
     return f"warships:tasks:update_ranked_data_dispatch:{player_id}"
 
@@ -90,6 +107,10 @@ def _efficiency_refresh_failure_key() -> str:
     return "warships:tasks:update_player_efficiency_data_dispatch:cooldown"
 
 
+def _enrichment_drain_failure_key() -> str:
+    return "warships:tasks:drain_player_enrichment_dispatch:cooldown"
+
+
 def _efficiency_snapshot_refresh_failure_key() -> str:
     return "warships:tasks:refresh_efficiency_rank_snapshot_dispatch:cooldown"
 
@@ -194,6 +215,14 @@ def touch_clan_crawl_heartbeat(timestamp: float | None = None) -> float:
     return heartbeat
 
 
+def touch_clan_crawl_shard_heartbeat(shard_index: int, timestamp: float | None = None) -> float:
+    # Shards also keep the crawl-wide heartbeat fresh for lock watchers.
+    heartbeat = touch_clan_crawl_heartbeat(timestamp)
+    cache.set(_clan_crawl_shard_heartbeat_key(shard_index), heartbeat,
+              timeout=CLAN_CRAWL_LOCK_TIMEOUT)
+    return heartbeat
+
+
 def _crawl_heartbeat_is_fresh(heartbeat, now_ts: float) -> bool:
     if heartbeat is None:
         return False
@@ -224,7 +253,7 @@ def is_ranked_data_refresh_pending(player_id: object) -> bool:
     return bool(cache.get(_ranked_refresh_dispatch_key(player_id)))
 
 
-def queue_ranked_data_refresh(player_id: object):
+def queue_ranked_data_refresh(player_id: object, countdown: Optional[int] = None):
     if cache.get(_ranked_refresh_failure_key()):
         return {"status": "skipped", "reason": "broker-unavailable"}
 
@@ -233,7 +262,11 @@ def queue_ranked_data_refresh(player_id: object):
         return {"status": "skipped", "reason": "already-queued"}
 
     try:
-        update_ranked_data_task.delay(player_id=player_id)
+        if countdown:
+            update_ranked_data_task.apply_async(
+                kwargs={"player_id": player_id}, countdown=countdown)
+        else:
+            update_ranked_data_task.delay(player_id=player_id)
         return {"status": "queued"}
     except Exception as error:
         cache.delete(dispatch_key)
@@ -297,6 +330,78 @@ def queue_efficiency_data_refresh(player_id: object):
         return {"status": "skipped", "reason": "enqueue-failed"}
 
 
+def queue_efficiency_data_refresh_batch(player_ids):
+    """Queue one efficiency refresh task for several players.
+
+    Players that already have a refresh queued are skipped; the rest share a
+    single task so their ships/badges payloads come back in one request.
+    """
+    if cache.get(_efficiency_refresh_failure_key()):
+        return {"status": "skipped", "reason": "broker-unavailable", "queued_player_ids": []}
+
+    claimed_player_ids = [
+        player_id for player_id in player_ids
+        if cache.add(_efficiency_refresh_dispatch_key(player_id), "queued",
+                     timeout=EFFICIENCY_REFRESH_DISPATCH_TIMEOUT)
+    ]
+    if not claimed_player_ids:
+        return {"status": "skipped", "reason": "already-queued", "queued_player_ids": []}
+
+    try:
+        update_players_efficiency_data_task.delay(
+            player_ids=claimed_player_ids)
+        return {"status": "queued", "queued_player_ids": claimed_player_ids}
+    except Exception as error:
+        cache.delete_many([
+            _efficiency_refresh_dispatch_key(player_id)
+            for player_id in claimed_player_ids
+        ])
+        cache.set(_efficiency_refresh_failure_key(), True,
+                  timeout=BROKER_DISPATCH_FAILURE_COOLDOWN)
+        logger.warning(
+            "Skipping batched efficiency refresh enqueue for %d players because broker dispatch failed: %s",
+            len(claimed_player_ids),
+            error,
+        )
+        return {"status": "skipped", "reason": "enqueue-failed", "queued_player_ids": []}
+
+
+def dispatch_player_enrichment_backlog(limit=None):
+    """Hand the highest-priority enrichment intents to the enrichment workers.
+
+    Intents are claimed in the database first; a failed broker dispatch
+    releases the unsent claims so the next drain picks them up again. Nothing
+    is claimed while the upstream breaker is open, since those batches could
+    not fetch anything.
+    """
+    from warships.enrichment_queue import ENRICHMENT_DRAIN_BATCH_SIZE, ENRICHMENT_DRAIN_PLAYERS_PER_RUN, claim_enrichment_batch, release_enrichment_claims
+
+    if cache.get(_enrichment_drain_failure_key()):
+        return {"status": "skipped", "reason": "broker-unavailable", "dispatched": 0}
+    if upstream_degraded():
+        return {"status": "skipped", "reason": "upstream-degraded", "dispatched": 0}
+
+    player_ids = claim_enrichment_batch(
+        ENRICHMENT_DRAIN_PLAYERS_PER_RUN if limit is None else limit)
+    dispatched = 0
+    for batch_start in range(0, len(player_ids), ENRICHMENT_DRAIN_BATCH_SIZE):
+        batch = player_ids[batch_start:batch_start + ENRICHMENT_DRAIN_BATCH_SIZE]
+        try:
+            enrich_crawled_players_task.delay(player_ids=batch)
+        except Exception as error:
+            release_enrichment_claims(player_ids[batch_start:])
+            cache.set(_enrichment_drain_failure_key(), True,
+                      timeout=BROKER_DISPATCH_FAILURE_COOLDOWN)
+            logger.warning(
+                "Skipping enrichment dispatch for %d players because broker dispatch failed: %s",
+                len(player_ids) - batch_start,
+                error,
+            )
+            return {"status": "skipped", "reason": "enqueue-failed", "dispatched": dispatched}
+        dispatched += len(batch)
+    return {"status": "completed", "dispatched": dispatched}
+
+
 def is_efficiency_rank_snapshot_refresh_pending() -> bool:
     return bool(cache.get(_efficiency_snapshot_refresh_dispatch_key()))
 
@@ -411,14 +516,14 @@ def update_battle_data_task(self, player_id):
 def preload_battles_json_task():
     from warships.data import preload_battles_json
     logger.info("Starting preload_battles_json_task")
-    preload_battles_json()
+    return preload_battles_json()
 
 
 @app.task(**TASK_OPTS)
 def preload_activity_data_task():
     from warships.data import preload_activity_data
     logger.info("Starting preload_activity_data_task")
-    preload_activity_data()
+    return preload_activity_data()
 
 
 @app.task(**TASK_OPTS)
@@ -514,6 +619,121 @@ def update_player_efficiency_data_task(self, player_id):
         cache.delete(_efficiency_refresh_dispatch_key(player_id))
 
 
+@app.task(bind=True, **TASK_OPTS)
+def update_players_efficiency_data_task(self, player_ids):
+    from warships.api.batching import primed_account_loaders
+    from warships.data import refresh_player_explorer_summary, update_player_efficiency_data
+    from warships.models import Player
+
+    logger.info(
+        "Starting update_players_efficiency_data_task for %d players", len(player_ids))
+
+    results = {}
+    try:
+        with primed_account_loaders(("efficiency_badges",), player_ids):
+            players = Player.objects.in_bulk(
+                player_ids, field_name="player_id")
+            for player_id in player_ids:
+                player = players.get(player_id)
+                if player is None:
+                    results[player_id] = {
+                        "status": "skipped", "reason": "missing"}
+                    continue
+
+                def _refresh_player_efficiency(player=player):
+                    update_player_efficiency_data(player=player)
+                    refresh_player_explorer_summary(player)
+
+                results[player_id] = _run_locked_task(
+                    "update_player_efficiency_data",
+                    player_id,
+                    self.request.id,
+                    _refresh_player_efficiency,
+                )
+    finally:
+        cache.delete_many([
+            _efficiency_refresh_dispatch_key(player_id)
+            for player_id in player_ids
+        ])
+
+    queue_efficiency_rank_snapshot_refresh()
+    return {"status": "completed", "players": results}
+
+
+@app.task(bind=True, **TASK_OPTS)
+def drain_player_enrichment_task(self, limit=None):
+    logger.info("Starting drain_player_enrichment_task")
+    return dispatch_player_enrichment_backlog(limit=limit)
+
+
+@app.task(bind=True, queue=ENRICHMENT_QUEUE, **TASK_OPTS)
+def enrich_crawled_players_task(self, player_ids):
+    from warships.api.batching import primed_account_loaders
+    from warships.data import refresh_player_explorer_summary, update_achievements_data, update_player_efficiency_data
+    from warships.enrichment_queue import complete_player_enrichment, release_enrichment_claims
+    from warships.models import Player
+
+    logger.info(
+        "Starting enrich_crawled_players_task for %d players", len(player_ids))
+
+    # An intent is only dropped once its player was refreshed with upstream
+    # available. Players that failed, were already being refreshed or ran
+    # while the breaker was open get their claim released for the next drain;
+    # if the worker dies first, the claim times out instead.
+    results = {}
+    completed_ids = []
+    released_ids = []
+    with upstream_priority(PRIORITY_BACKGROUND), primed_account_loaders(
+            ("efficiency_badges", "achievements"), player_ids):
+        players = {
+            player.player_id: player
+            for player in Player.objects.filter(player_id__in=player_ids).order_by("-id")
+        }
+        for player_id in player_ids:
+            player = players.get(player_id)
+            if player is None or player.is_hidden:
+                results[player_id] = {
+                    "status": "skipped", "reason": "missing" if player is None else "hidden"}
+                completed_ids.append(player_id)
+                continue
+            if upstream_degraded():
+                results[player_id] = {
+                    "status": "skipped", "reason": "upstream-degraded"}
+                released_ids.append(player_id)
+                continue
+
+            def _enrich_player(player=player):
+                update_player_efficiency_data(player)
+                update_achievements_data(player.player_id)
+                refresh_player_explorer_summary(player)
+
+            try:
+                result = _run_locked_task(
+                    "enrich_crawled_player",
+                    player_id,
+                    self.request.id,
+                    _enrich_player,
+                )
+            except Exception as error:
+                logger.warning(
+                    "Enrichment failed for player_id=%s: %s", player_id, error)
+                result = {"status": "failed", "reason": "error"}
+            # With the breaker open the refresh returns stored rows unchanged.
+            if result["status"] == "completed" and upstream_degraded():
+                result = {"status": "skipped", "reason": "upstream-degraded"}
+            results[player_id] = result
+            if result["status"] == "completed":
+                completed_ids.append(player_id)
+            else:
+                released_ids.append(player_id)
+
+    complete_player_enrichment(completed_ids)
+    if released_ids:
+        release_enrichment_claims(released_ids)
+    queue_efficiency_rank_snapshot_refresh()
+    return {"status": "completed", "players": results}
+
+
 @app.task(bind=True, **TASK_OPTS)
 def refresh_efficiency_rank_snapshot_task(self):
     from warships.data import recompute_efficiency_rank_snapshot
@@ -684,10 +904,56 @@ def refill_landing_random_clans_queue_task(self):
         cache.delete(LANDING_RANDOM_CLAN_QUEUE_REFILL_DISPATCH_KEY)
 
 
+def _dispatch_clan_crawl_shards(shard_indexes) -> list[int]:
+    dispatched = []
+    for shard_index in shard_indexes:
+        # Count as alive until the worker picks it up, so the watchdog does
+        # not re-dispatch a shard that is only waiting in the queue.
+        touch_clan_crawl_shard_heartbeat(shard_index)
+        crawl_clan_shard_task.delay(shard_index=shard_index)
+        dispatched.append(shard_index)
+    return dispatched
+
+
+def _clan_crawl_lock_value(request_id: Optional[str]) -> str:
+    # Direct and eager calls have no request id; the lock must still hold a
+    # value, since the watchdog reads an empty key as an idle crawl.
+    return request_id or f"sharded:{uuid4()}"
+
+
+def _start_sharded_clan_crawl(request_id: Optional[str], resume: bool, limit, shard_count: int):
+    from warships.clan_crawl import start_clan_crawl_shards
+    from warships.models import ClanCrawlShard
+
+    if not cache.add(CLAN_CRAWL_LOCK_KEY, _clan_crawl_lock_value(request_id), timeout=CLAN_CRAWL_LOCK_TIMEOUT):
+        logger.warning(
+            "Skipping sharded crawl_all_clans_task because another crawl is already running")
+        return {"status": "skipped", "reason": "already-running"}
+
+    unfinished = ClanCrawlShard.objects.exclude(
+        status=ClanCrawlShard.STATUS_COMPLETED)
+    if not (resume and unfinished.filter(shard_count=shard_count).exists()):
+        start_clan_crawl_shards(shard_count, limit=limit)
+
+    shard_indexes = list(ClanCrawlShard.objects.exclude(
+        status=ClanCrawlShard.STATUS_COMPLETED).order_by("shard_index").values_list("shard_index", flat=True))
+    if not shard_indexes:
+        cache.delete(CLAN_CRAWL_LOCK_KEY)
+        return {"status": "completed", "shards": []}
+
+    logger.info("Dispatching %d clan crawl shards (resume=%s, limit=%s)",
+                len(shard_indexes), resume, limit)
+    return {"status": "dispatched", "shards": _dispatch_clan_crawl_shards(shard_indexes)}
+
+
 @app.task(bind=True, **CRAWL_TASK_OPTS)
-def crawl_all_clans_task(self, resume=True, dry_run=False, limit=None):
+def crawl_all_clans_task(self, resume=True, dry_run=False, limit=None, shards=None):
     from warships.clan_crawl import run_clan_crawl
 
+    shard_count = CLAN_CRAWL_SHARDS if shards is None else max(int(shards), 1)
+    if shard_count > 1 and not dry_run:
+        return _start_sharded_clan_crawl(self.request.id, resume, limit, shard_count)
+
     if not cache.add(CLAN_CRAWL_LOCK_KEY, self.request.id, timeout=CLAN_CRAWL_LOCK_TIMEOUT):
         logger.warning(
             "Skipping crawl_all_clans_task because another crawl is already running")
@@ -714,12 +980,77 @@ def crawl_all_clans_task(self, resume=True, dry_run=False, limit=None):
         cache.delete(CLAN_CRAWL_HEARTBEAT_KEY)
 
 
+@app.task(bind=True, **CRAWL_TASK_OPTS)
+def crawl_clan_shard_task(self, shard_index):
+    from warships.clan_crawl import run_clan_crawl_shard
+    from warships.models import ClanCrawlShard
+
+    lock_key = _clan_crawl_shard_lock_key(shard_index)
+    lock_value = _clan_crawl_lock_value(self.request.id)
+    if not cache.add(lock_key, lock_value, timeout=CLAN_CRAWL_LOCK_TIMEOUT):
+        logger.warning(
+            "Skipping crawl_clan_shard_task for shard=%s because it is already running", shard_index)
+        return {"status": "skipped", "reason": "already-running"}
+
+    # A restarted shard may outlive the crawl-wide lock's first holder.
+    cache.add(CLAN_CRAWL_LOCK_KEY, lock_value,
+              timeout=CLAN_CRAWL_LOCK_TIMEOUT)
+
+    def heartbeat():
+        touch_clan_crawl_shard_heartbeat(shard_index)
+
+    try:
+        heartbeat()
+        logger.info("Starting crawl_clan_shard_task shard=%s", shard_index)
+        summary = run_clan_crawl_shard(
+            shard_index, heartbeat_callback=heartbeat)
+        logger.info("Finished crawl_clan_shard_task shard=%s: %s",
+                    shard_index, summary)
+    finally:
+        cache.delete(lock_key)
+        cache.delete(_clan_crawl_shard_heartbeat_key(shard_index))
+
+    if not ClanCrawlShard.objects.exclude(status=ClanCrawlShard.STATUS_COMPLETED).exists():
+        cache.delete(CLAN_CRAWL_LOCK_KEY)
+        cache.delete(CLAN_CRAWL_HEARTBEAT_KEY)
+    return {"status": "completed", **summary}
+
+
+def _restart_dead_clan_crawl_shards(now_ts: float):
+    from warships.models import ClanCrawlShard
+
+    unfinished = list(ClanCrawlShard.objects.exclude(
+        status=ClanCrawlShard.STATUS_COMPLETED).order_by("shard_index").values_list("shard_index", flat=True))
+    if not unfinished:
+        return None
+
+    dead = [
+        shard_index for shard_index in unfinished
+        if not _crawl_heartbeat_is_fresh(cache.get(_clan_crawl_shard_heartbeat_key(shard_index)), now_ts)
+    ]
+    if not dead:
+        logger.info(
+            "Crawl watchdog found %d active crawl shards with fresh heartbeats", len(unfinished))
+        return {"status": "skipped", "reason": "running"}
+
+    logger.warning(
+        "Crawl watchdog found stale crawl shards %s; restarting them from their cursors", dead)
+    for shard_index in dead:
+        cache.delete(_clan_crawl_shard_lock_key(shard_index))
+    cache.add(CLAN_CRAWL_LOCK_KEY, "watchdog", timeout=CLAN_CRAWL_LOCK_TIMEOUT)
+    return {"status": "scheduled", "reason": "stale-shards", "shards": _dispatch_clan_crawl_shards(dead)}
+
+
 @app.task(**TASK_OPTS)
 def ensure_crawl_all_clans_running_task():
     heartbeat = cache.get(CLAN_CRAWL_HEARTBEAT_KEY)
     lock_value = cache.get(CLAN_CRAWL_LOCK_KEY)
     now_ts = time.time()
 
+    shard_result = _restart_dead_clan_crawl_shards(now_ts)
+    if shard_result is not None:
+        return shard_result
+
     if lock_value is not None:
         if _crawl_heartbeat_is_fresh(heartbeat, now_ts):
             logger.info(
@@ -753,30 +1084,32 @@ def incremental_player_refresh_task(self):
         return {"status": "skipped", "reason": "already-running"}
 
     try:
-        call_command(
-            'incremental_player_refresh',
-            state_file=os.getenv(
-                'PLAYER_REFRESH_STATE_FILE', 'logs/incremental_player_refresh_state.json'),
-            limit=int(os.getenv('PLAYER_REFRESH_TOTAL_LIMIT', '1200')),
-            batch_size=int(os.getenv('PLAYER_REFRESH_BATCH_SIZE', '50')),
-            hot_stale_hours=int(
-                os.getenv('PLAYER_REFRESH_HOT_STALE_HOURS', '12')),
-            active_stale_hours=int(
-                os.getenv('PLAYER_REFRESH_ACTIVE_STALE_HOURS', '24')),
-            warm_stale_hours=int(
-                os.getenv('PLAYER_REFRESH_WARM_STALE_HOURS', '72')),
-            active_limit=int(
-                os.getenv('PLAYER_REFRESH_ACTIVE_LIMIT', '500')),
-            warm_limit=int(
-                os.getenv('PLAYER_REFRESH_WARM_LIMIT', '200')),
-            hot_lookback_days=int(
-                os.getenv('PLAYER_REFRESH_HOT_LOOKBACK_DAYS', '14')),
-            active_lookback_days=int(
-                os.getenv('PLAYER_REFRESH_ACTIVE_LOOKBACK_DAYS', '30')),
-            warm_lookback_days=int(
-                os.getenv('PLAYER_REFRESH_WARM_LOOKBACK_DAYS', '90')),
-            max_errors=int(os.getenv('PLAYER_REFRESH_MAX_ERRORS', '25')),
-        )
+        with upstream_priority(PRIORITY_BACKGROUND):
+            call_command(
+                'incremental_player_refresh',
+                state_file=os.getenv(
+                    'PLAYER_REFRESH_STATE_FILE', 'logs/incremental_player_refresh_state.json'),
+                limit=int(os.getenv('PLAYER_REFRESH_TOTAL_LIMIT', '1200')),
+                batch_size=int(os.getenv('PLAYER_REFRESH_BATCH_SIZE', '50')),
+                chunk_size=int(os.getenv('PLAYER_REFRESH_CHUNK_SIZE', '100')),
+                hot_stale_hours=int(
+                    os.getenv('PLAYER_REFRESH_HOT_STALE_HOURS', '12')),
+                active_stale_hours=int(
+                    os.getenv('PLAYER_REFRESH_ACTIVE_STALE_HOURS', '24')),
+                warm_stale_hours=int(
+                    os.getenv('PLAYER_REFRESH_WARM_STALE_HOURS', '72')),
+                active_limit=int(
+                    os.getenv('PLAYER_REFRESH_ACTIVE_LIMIT', '500')),
+                warm_limit=int(
+                    os.getenv('PLAYER_REFRESH_WARM_LIMIT', '200')),
+                hot_lookback_days=int(
+                    os.getenv('PLAYER_REFRESH_HOT_LOOKBACK_DAYS', '14')),
+                active_lookback_days=int(
+                    os.getenv('PLAYER_REFRESH_ACTIVE_LOOKBACK_DAYS', '30')),
+                warm_lookback_days=int(
+                    os.getenv('PLAYER_REFRESH_WARM_LOOKBACK_DAYS', '90')),
+                max_errors=int(os.getenv('PLAYER_REFRESH_MAX_ERRORS', '25')),
+            )
         return {"status": "completed"}
     finally:
         cache.delete(PLAYER_REFRESH_LOCK_KEY)
@@ -797,26 +1130,27 @@ def incremental_ranked_data_task(self):
         return {"status": "skipped", "reason": "already-running"}
 
     try:
-        call_command(
-            'incremental_ranked_data',
-            state_file=os.getenv(
-                'RANKED_INCREMENTAL_STATE_FILE', 'logs/incremental_ranked_data_state.json'),
-            limit=int(os.getenv('RANKED_INCREMENTAL_LIMIT', '150')),
-            batch_size=int(os.getenv('RANKED_INCREMENTAL_BATCH_SIZE', '50')),
-            skip_fresh_hours=int(
-                os.getenv('RANKED_INCREMENTAL_SKIP_FRESH_HOURS', '24')),
-            known_limit=int(
-                os.getenv('RANKED_INCREMENTAL_KNOWN_LIMIT', '300')),
-            discovery_limit=int(
-                os.getenv('RANKED_INCREMENTAL_DISCOVERY_LIMIT', '75')),
-            recent_lookup_days=int(
-                os.getenv('RANKED_INCREMENTAL_RECENT_LOOKUP_DAYS', '14')),
-            recent_battle_days=int(
-                os.getenv('RANKED_INCREMENTAL_RECENT_BATTLE_DAYS', '30')),
-            min_discovery_pvp_battles=int(
-                os.getenv('RANKED_INCREMENTAL_MIN_DISCOVERY_PVP_BATTLES', '1000')),
-            max_errors=int(os.getenv('RANKED_INCREMENTAL_MAX_ERRORS', '25')),
-        )
+        with upstream_priority(PRIORITY_BACKGROUND):
+            call_command(
+                'incremental_ranked_data',
+                state_file=os.getenv(
+                    'RANKED_INCREMENTAL_STATE_FILE', 'logs/incremental_ranked_data_state.json'),
+                limit=int(os.getenv('RANKED_INCREMENTAL_LIMIT', '150')),
+                batch_size=int(os.getenv('RANKED_INCREMENTAL_BATCH_SIZE', '50')),
+                skip_fresh_hours=int(
+                    os.getenv('RANKED_INCREMENTAL_SKIP_FRESH_HOURS', '24')),
+                known_limit=int(
+                    os.getenv('RANKED_INCREMENTAL_KNOWN_LIMIT', '300')),
+                discovery_limit=int(
+                    os.getenv('RANKED_INCREMENTAL_DISCOVERY_LIMIT', '75')),
+                recent_lookup_days=int(
+                    os.getenv('RANKED_INCREMENTAL_RECENT_LOOKUP_DAYS', '14')),
+                recent_battle_days=int(
+                    os.getenv('RANKED_INCREMENTAL_RECENT_BATTLE_DAYS', '30')),
+                min_discovery_pvp_battles=int(
+                    os.getenv('RANKED_INCREMENTAL_MIN_DISCOVERY_PVP_BATTLES', '1000')),
+                max_errors=int(os.getenv('RANKED_INCREMENTAL_MAX_ERRORS', '25')),
+            )
         return {"status": "completed"}
     finally:
         cache.delete(RANKED_INCREMENTAL_LOCK_KEY)
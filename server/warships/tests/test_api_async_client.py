@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from django.test import TestCase
+
+from warships.api.async_client import run_api_requests
+from warships.api.clans import _fetch_clan_battle_season_stats_many
+
+
+def _ok(data, meta=None):
+    payload = {"status": "ok", "data": data}
+    if meta is not None:
+        payload["meta"] = meta
+    return httpx.Response(200, json=payload)
+
+
+@patch("warships.api.async_client.acquire_upstream_slot", return_value=True)
+@patch("warships.api.client.APP_ID", "test-app")
+class AsyncApiClientTests(TestCase):
+    def test_results_are_returned_in_call_order(self, _mock_acquire):
+        async def handler(request):
+            account_id = request.url.params["account_id"]
+            # Later calls finish first so ordering cannot come from completion.
+            await asyncio.sleep(0.01 * (5 - int(account_id)))
+            return _ok({account_id: {"id": int(account_id)}})
+
+        results = run_api_requests(
+            [("account/info/", {"account_id": account_id})
+             for account_id in range(5)],
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertEqual([result[str(index)]["id"]
+                         for index, result in enumerate(results)], [0, 1, 2, 3, 4])
+
+    def test_concurrency_is_bounded(self, _mock_acquire):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _ok({})
+
+        run_api_requests(
+            [("clans/seasonstats/", {"account_id": index})
+             for index in range(20)],
+            concurrency=4,
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertEqual(peak, 4)
+
+    def test_payload_validation_matches_sync_client(self, _mock_acquire):
+        def handler(request):
+            account_id = request.url.params["account_id"]
+            if account_id == "1":
+                return httpx.Response(200, json={"status": "error", "error": {"message": "INVALID_ACCOUNT_ID"}})
+            if account_id == "2":
+                return httpx.Response(200, json={"status": "ok"})
+            if account_id == "3":
+                return httpx.Response(200, content=b"not json")
+            return _ok({"id": 4}, meta={"count": 1})
+
+        results = run_api_requests(
+            [("account/info/", {"account_id": index})
+             for index in range(1, 5)],
+            with_meta=True,
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertEqual(results[:3], [None, None, None])
+        self.assertEqual(results[3], {"data": {"id": 4}, "meta": {"count": 1}})
+
+    @patch("warships.api.async_client.RETRY_BACKOFF_SECONDS", 0)
+    def test_retries_throttled_responses(self, _mock_acquire):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.url.path)
+            if len(attempts) == 1:
+                return httpx.Response(429)
+            return _ok({"1": {"seasons": []}})
+
+        results = run_api_requests(
+            [("clans/seasonstats/", {"account_id": 1})],
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(results, [{"1": {"seasons": []}}])
+
+    def test_denied_rate_limit_slot_skips_request(self, mock_acquire):
+        mock_acquire.return_value = False
+
+        def handler(request):
+            raise AssertionError("upstream should not be called")
+
+        results = run_api_requests(
+            [("account/info/", {"account_id": 1})],
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertEqual(results, [None])
+
+
+class ClanBattleSeasonStatsBatchTests(TestCase):
+    @patch("warships.api.clans.run_api_requests")
+    def test_batch_fetch_maps_results_by_account(self, mock_run):
+        mock_run.return_value = [
+            {"11": {"seasons": [{"season_id": 1, "battles": 4}]}},
+            None,
+        ]
+
+        result = _fetch_clan_battle_season_stats_many([11, 12])
+
+        mock_run.assert_called_once_with([
+            ("clans/seasonstats/", {"account_id": 11}),
+            ("clans/seasonstats/", {"account_id": 12}),
+        ])
+        self.assertEqual(result[11]["seasons"][0]["battles"], 4)
+        self.assertEqual(result[12], {})
@@ -0,0 +1,168 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from warships.api.batching import AccountBatchLoader, primed_account_loaders, register_account_loader
+from warships.data import update_clan_members
+from warships.models import Clan, Player
+
+
+def _echo_request(calls):
+    def request(endpoint, params):
+        calls.append(params["account_id"])
+        return {
+            account_id: {"account_id": int(account_id)}
+            for account_id in params["account_id"].split(",")
+        }
+
+    return request
+
+
+class AccountBatchLoaderTests(TestCase):
+    def test_load_many_splits_ids_into_requests_of_one_hundred(self):
+        calls = []
+        loader = AccountBatchLoader(
+            "account/info/", request=_echo_request(calls))
+
+        results = loader.load_many(range(1, 251))
+
+        self.assertEqual([len(call.split(",")) for call in calls], [100, 100, 50])
+        self.assertEqual(len(results), 250)
+        self.assertEqual(results[250], {"account_id": 250})
+        self.assertEqual(loader.stats()["accounts_per_request"], 83.33)
+
+    def test_primed_accounts_are_served_without_another_request(self):
+        calls = []
+        loader = AccountBatchLoader(
+            "account/info/", request=_echo_request(calls), window_seconds=0)
+
+        loader.prime([1, 2, 3])
+        self.assertEqual(loader.load(2), {"account_id": 2})
+        self.assertEqual(len(calls), 1)
+
+        # Primed slices are consumed on use.
+        loader.load(2)
+        self.assertEqual(calls, ["1,2,3", "2"])
+        self.assertEqual(loader.stats()["primed_hits"], 1)
+
+    def test_primed_accounts_are_dropped_when_the_block_ends(self):
+        calls = []
+        loader = register_account_loader("test_primed_block", AccountBatchLoader(
+            "account/info/", request=_echo_request(calls), window_seconds=0))
+
+        with primed_account_loaders(("test_primed_block",), [1, 2]):
+            self.assertEqual(loader.load(1), {"account_id": 1})
+        loader.load(2)
+
+        self.assertEqual(calls, ["1,2", "2"])
+
+    def test_lone_load_skips_the_collection_window(self):
+        calls = []
+        loader = AccountBatchLoader(
+            "account/info/", request=_echo_request(calls), window_seconds=5)
+
+        started = time.monotonic()
+        self.assertEqual(loader.load(7), {"account_id": 7})
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(calls, ["7"])
+
+    def test_concurrent_loads_share_one_request(self):
+        calls = []
+        echo = _echo_request(calls)
+        first_started = threading.Event()
+        release_first = threading.Event()
+
+        def request(endpoint, params):
+            if not first_started.is_set():
+                first_started.set()
+                release_first.wait(5)
+            return echo(endpoint, params)
+
+        loader = AccountBatchLoader(
+            "account/info/", request=request, window_seconds=0.2)
+        results = {}
+
+        def worker(account_id):
+            results[account_id] = loader.load(account_id)
+
+        threads = [threading.Thread(target=worker, args=(account_id,))
+                   for account_id in range(1, 6)]
+        # The first load goes out alone; the rest arrive while it is in
+        # flight and collect into one batch.
+        threads[0].start()
+        first_started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads[1:]:
+            thread.join(5)
+        release_first.set()
+        threads[0].join(5)
+
+        self.assertEqual(
+            sorted(sorted(call.split(",")) for call in calls),
+            [["1"], ["2", "3", "4", "5"]],
+        )
+        self.assertEqual(results[4], {"account_id": 4})
+
+    def test_failed_chunk_is_left_out_of_results(self):
+        def request(endpoint, params):
+            if params["account_id"].startswith("101"):
+                return None
+            return {account_id: {} for account_id in params["account_id"].split(",")}
+
+        loader = AccountBatchLoader("account/info/", request=request)
+
+        results = loader.load_many(range(1, 151))
+
+        self.assertEqual(len(results), 100)
+        self.assertNotIn(120, results)
+
+
+class ClanMemberBatchingTests(TestCase):
+    @patch("warships.data.update_battle_data")
+    @patch("warships.data.update_achievements_data", return_value=[])
+    @patch("warships.data._fetch_clan_member_ids", return_value=[9101, 9102, 9103])
+    @patch("warships.api.players._make_api_request")
+    @patch("warships.api.clans._make_api_request")
+    def test_update_clan_members_fetches_member_accounts_in_one_request(
+        self,
+        mock_clan_request,
+        mock_player_request,
+        _mock_fetch_clan_member_ids,
+        _mock_update_achievements_data,
+        _mock_update_battle_data,
+    ):
+        clan = Clan.objects.create(clan_id=9100, name="BatchedClan", tag="BAT")
+
+        def account_info(endpoint, params):
+            return {
+                account_id: {
+                    "account_id": int(account_id),
+                    "nickname": f"Member{account_id}",
+                    "hidden_profile": True,
+                }
+                for account_id in params["account_id"].split(",")
+            }
+
+        mock_player_request.side_effect = account_info
+        mock_clan_request.side_effect = lambda endpoint, params: {
+            account_id: {"clan_id": 9100} for account_id in params["account_id"].split(",")
+        }
+
+        update_clan_members(str(clan.clan_id))
+
+        account_info_calls = [
+            call for call in mock_player_request.call_args_list
+            if call.args[0] == "account/info/"
+        ]
+        self.assertEqual(len(account_info_calls), 1)
+        self.assertEqual(
+            account_info_calls[0].args[1]["account_id"], "9101,9102,9103")
+        self.assertEqual(mock_clan_request.call_count, 1)
+        self.assertEqual(
+            set(Player.objects.filter(clan=clan).values_list("name", flat=True)),
+            {"Member9101", "Member9102", "Member9103"},
+        )
@@ -0,0 +1,180 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase
+
+from warships.api.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, UpstreamCircuitBreaker, get_circuit_breaker, is_upstream_failure
+from warships.api.client import make_api_request
+from warships.data import fetch_ranked_data
+from warships.models import Player
+
+
+class FakeClock:
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock=None, **kwargs):
+    options = {
+        "failure_threshold": 3,
+        "failure_window_seconds": 60,
+        "open_seconds": 30,
+        "slow_call_seconds": 5,
+        "key_prefix": "test:breaker",
+    }
+    options.update(kwargs)
+    return UpstreamCircuitBreaker(clock=clock or FakeClock(), **options)
+
+
+def _trip_shared_breaker():
+    breaker = get_circuit_breaker()
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure("test outage")
+    return breaker
+
+
+class UpstreamCircuitBreakerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_opens_after_threshold_and_rejects_calls(self):
+        breaker = _breaker()
+
+        for _ in range(2):
+            breaker.record_failure("timeout")
+        self.assertEqual(breaker.state(), STATE_CLOSED)
+        self.assertTrue(breaker.allow_request())
+
+        breaker.record_failure("timeout")
+
+        self.assertEqual(breaker.state(), STATE_OPEN)
+        self.assertFalse(breaker.allow_request())
+        stats = breaker.stats()
+        self.assertEqual(stats["trips"], 1)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["retry_after_seconds"], 30)
+
+    def test_success_resets_consecutive_failures(self):
+        breaker = _breaker()
+
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        breaker.record_success(0.2)
+        breaker.record_failure("timeout")
+
+        self.assertEqual(breaker.state(), STATE_CLOSED)
+
+    def test_half_open_allows_one_probe_then_closes_on_success(self):
+        clock = FakeClock()
+        breaker = _breaker(clock=clock)
+        for _ in range(3):
+            breaker.record_failure("502")
+
+        clock.now += 31
+        self.assertEqual(breaker.state(), STATE_HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_success(0.1)
+
+        self.assertEqual(breaker.state(), STATE_CLOSED)
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens_and_slow_calls_count_as_failures(self):
+        clock = FakeClock()
+        breaker = _breaker(clock=clock)
+        for _ in range(3):
+            breaker.record_success(6.0)
+        self.assertEqual(breaker.state(), STATE_OPEN)
+
+        clock.now += 31
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure("probe timeout")
+
+        self.assertEqual(breaker.state(), STATE_OPEN)
+        self.assertEqual(breaker.stats()["trips"], 2)
+        self.assertEqual(breaker.stats()["slow_calls"], 3)
+
+    def test_client_errors_do_not_count_as_upstream_failures(self):
+        not_found = requests.Response()
+        not_found.status_code = 404
+        throttled = requests.Response()
+        throttled.status_code = 429
+
+        self.assertFalse(is_upstream_failure(
+            requests.HTTPError(response=not_found)))
+        self.assertTrue(is_upstream_failure(
+            requests.HTTPError(response=throttled)))
+        self.assertTrue(is_upstream_failure(requests.Timeout()))
+
+
+@patch("warships.api.client.APP_ID", "test-app")
+class CircuitBreakerDegradedModeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch("warships.api.client._fetch_api_payload")
+    def test_open_breaker_skips_upstream_requests(self, mock_fetch):
+        _trip_shared_breaker()
+
+        self.assertIsNone(make_api_request("account/info/", {"account_id": 1}))
+        mock_fetch.assert_not_called()
+
+    @patch("warships.api.client.acquire_upstream_slot", return_value=True)
+    @patch("warships.api.client._get_session")
+    def test_repeated_upstream_errors_trip_the_breaker(self, mock_get_session, _mock_acquire):
+        session = MagicMock()
+        session.get.side_effect = requests.ConnectionError("connection refused")
+        mock_get_session.return_value = session
+        breaker = get_circuit_breaker()
+
+        for account_id in range(breaker.failure_threshold + 2):
+            make_api_request("account/info/", {"account_id": account_id})
+
+        self.assertEqual(session.get.call_count, breaker.failure_threshold)
+        self.assertEqual(breaker.state(), STATE_OPEN)
+
+    @patch("warships.views._fetch_player_id_by_name")
+    def test_unknown_player_lookup_fails_fast_while_open(self, mock_fetch_player_id):
+        _trip_shared_breaker()
+
+        response = self.client.get("/api/player/OutageCaptain/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        mock_fetch_player_id.assert_not_called()
+
+    @patch("warships.tasks.queue_ranked_data_refresh")
+    @patch("warships.data.update_ranked_data")
+    def test_first_ranked_view_queues_refresh_instead_of_fetching(
+        self,
+        mock_update_ranked_data,
+        mock_queue_ranked_data_refresh,
+    ):
+        player = Player.objects.create(name="OutageRanked", player_id=8901)
+        _trip_shared_breaker()
+
+        self.assertEqual(fetch_ranked_data(player.player_id), [])
+        mock_update_ranked_data.assert_not_called()
+        mock_queue_ranked_data_refresh.assert_called_once()
+        self.assertGreater(
+            mock_queue_ranked_data_refresh.call_args.kwargs["countdown"], 0)
+
+    def test_upstream_status_reports_breaker_state(self):
+        _trip_shared_breaker()
+
+        payload = self.client.get(
+            "/api/upstream/status/").json()["circuit_breaker"]
+
+        self.assertEqual(payload["state"], STATE_OPEN)
+        self.assertEqual(payload["trips"], 1)
@@ -0,0 +1,113 @@
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase, TransactionTestCase
+
+from warships import clan_crawl
+from warships.api import client
+from warships.api.fake_upstream import SUPPORTED_ENDPOINTS, FakeUpstreamConfig, FakeUpstreamServer
+from warships.management.commands.benchmark_ingestion import BENCHMARK_PATHS, run_ingestion_benchmark
+from warships.models import Clan, Player
+
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+UPSTREAM_CONTRACTS_DIR = REPO_ROOT / "agents" / "contracts" / "upstream"
+# Some contracts quote markdown in their notes and are not valid YAML, so
+# read only the top-level endpoint line.
+CONTRACT_ENDPOINT_RE = re.compile(r"^endpoint:\s*(\S+)\s*$", re.MULTILINE)
+
+
+class FakeUpstreamServerTests(TestCase):
+    def test_every_upstream_contract_endpoint_is_served(self):
+        contract_paths = sorted(UPSTREAM_CONTRACTS_DIR.glob("*.yaml"))
+        self.assertTrue(contract_paths)
+        for contract_path in contract_paths:
+            with self.subTest(contract=contract_path.name):
+                match = CONTRACT_ENDPOINT_RE.search(contract_path.read_text(encoding="utf-8"))
+                self.assertIsNotNone(match, "contract has no top-level endpoint line")
+                self.assertIn(match.group(1).split("/wows/", 1)[-1], SUPPORTED_ENDPOINTS)
+
+    def test_payloads_are_deterministic_and_honour_field_selection(self):
+        server = FakeUpstreamServer(FakeUpstreamConfig(
+            clan_count=2, members_per_clan=3, ships_per_player=4, hidden_rate=0))
+        params = {
+            "application_id": "test-app",
+            "account_id": "1000000001",
+            "fields": "ship_id,battles,pvp.wins",
+        }
+        try:
+            status, first = server.respond("/wows/ships/stats/", params)
+            _status, second = server.respond("/wows/ships/stats/", params)
+        finally:
+            server.stop()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(first, second)
+        rows = first["data"]["1000000001"]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(set(rows[0]), {"ship_id", "battles", "pvp"})
+        self.assertEqual(set(rows[0]["pvp"]), {"wins"})
+
+    def test_injected_throttling_and_errors(self):
+        throttled = FakeUpstreamServer(FakeUpstreamConfig(throttle_rate=1.0))
+        failing = FakeUpstreamServer(FakeUpstreamConfig(error_rate=1.0))
+        try:
+            throttled_status, throttled_body = throttled.respond(
+                "/wows/clans/list/", {"application_id": "test-app"})
+            error_status, _body = failing.respond(
+                "/wows/clans/list/", {"application_id": "test-app"})
+        finally:
+            throttled.stop()
+            failing.stop()
+
+        self.assertEqual(throttled_status, 429)
+        self.assertEqual(throttled_body["status"], "error")
+        self.assertEqual(error_status, 503)
+
+    @patch("warships.api.client.APP_ID", "test-app")
+    @patch("warships.api.client.acquire_upstream_slot", return_value=True)
+    def test_client_reads_from_fake_upstream(self, _mock_acquire):
+        with FakeUpstreamServer(FakeUpstreamConfig(clan_count=1, members_per_clan=2)) as server:
+            with patch("warships.api.client.BASE_URL", server.base_url):
+                data = client.make_api_request(
+                    "clans/info/", {"clan_id": 500000000, "fields": "members_ids"})
+            stats = server.stats()
+
+        self.assertEqual(data, {"500000000": {"members_ids": [1000000000, 1000000001]}})
+        self.assertEqual(stats["by_endpoint"]["clans/info/"]["ok"], 1)
+
+
+    @patch("warships.api.client.APP_ID", "test-app")
+    @patch("warships.api.client.acquire_upstream_slot", return_value=True)
+    def test_crawler_fetches_info_and_members_for_many_clans_in_one_call(self, _mock_acquire):
+        with FakeUpstreamServer(FakeUpstreamConfig(clan_count=3, members_per_clan=2)) as server:
+            with patch("warships.api.client.BASE_URL", server.base_url):
+                infos = clan_crawl.fetch_clans_info_bulk(
+                    [500000000, 500000001, 500000002])
+            stats = server.stats()
+
+        self.assertEqual(sorted(infos), [500000000, 500000001, 500000002])
+        self.assertEqual(infos[500000001]["members_ids"],
+                         [1000000002, 1000000003])
+        self.assertIn("leader_name", infos[500000001])
+        self.assertEqual(stats["by_endpoint"]["clans/info/"]["ok"], 1)
+
+class IngestionBenchmarkTests(TransactionTestCase):
+    def test_benchmark_reports_every_ingestion_path(self):
+        config = FakeUpstreamConfig(
+            clan_count=2, members_per_clan=3, ship_count=6, ships_per_player=3, hidden_rate=0)
+        with FakeUpstreamServer(config) as server:
+            results = run_ingestion_benchmark(
+                server, clan_limit=2, player_limit=4)
+
+        self.assertEqual([row["path"] for row in results], list(BENCHMARK_PATHS))
+        self.assertEqual(Clan.objects.count(), 2)
+        self.assertEqual(Player.objects.count(), 6)
+        for row in results:
+            with self.subTest(path=row["path"]):
+                self.assertGreater(row["players"], 0)
+                self.assertGreater(row["upstream_calls_per_player"], 0)
+                self.assertGreater(row["db_writes"], 0)
+        crawl = results[0]
+        self.assertEqual(crawl["players"], 6)
@@ -0,0 +1,217 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase
+
+from warships.api import client
+from warships.api.metrics import SOURCE_BACKGROUND, SOURCE_CRAWL, SOURCE_INTERACTIVE, get_process_upstream_totals, get_upstream_metrics, record_upstream_error, record_upstream_response, traffic_source
+from warships.api.rate_limit import PRIORITY_BACKGROUND, upstream_priority
+from warships.clan_crawl import fetch_clan_list_page
+from warships.crawl_telemetry import CrawlTelemetry
+from warships.models import Player
+from warships.refresh_profile import mark_refresh_outcome, profiled_refresh, refresh_stage
+
+
+def _ok_response(payload, size=2048):
+    response = MagicMock()
+    response.json.return_value = payload
+    response.content = b"x" * size
+    return response
+
+
+@patch.dict("warships.api.metrics._pending_flush", clear=True)
+@patch.dict("warships.api.metrics._process_histograms", clear=True)
+class UpstreamMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_histograms_are_bucketed_per_source_and_endpoint(self):
+        record_upstream_response("/account/info/", 0.04, 900)
+        with upstream_priority(PRIORITY_BACKGROUND):
+            record_upstream_response("account/info/", 0.3, 20000)
+        with traffic_source(SOURCE_CRAWL):
+            record_upstream_response("clans/list/", 12.0, 5_000_000)
+
+        metrics = get_upstream_metrics()["process"]
+
+        interactive = metrics[SOURCE_INTERACTIVE]["account/info/"]
+        self.assertEqual(interactive["count"], 1)
+        self.assertEqual(interactive["latency_ms"], {"le_50": 1})
+        self.assertEqual(interactive["bytes"], {"le_1024": 1})
+        self.assertEqual(
+            metrics[SOURCE_BACKGROUND]["account/info/"]["latency_ms"], {"le_500": 1})
+        crawl = metrics[SOURCE_CRAWL]["clans/list/"]
+        self.assertEqual(crawl["latency_ms"], {"inf": 1})
+        self.assertEqual(crawl["bytes"], {"inf": 1})
+        self.assertEqual(crawl["bytes_avg"], 5_000_000)
+
+    @patch("warships.api.client.APP_ID", "test-app")
+    @patch("warships.api.client.acquire_upstream_slot", return_value=True)
+    @patch("warships.api.client._get_session")
+    def test_crawl_requests_use_pooled_session_and_record_crawl_metrics(self, mock_get_session, _mock_acquire):
+        session = MagicMock()
+        session.get.return_value = _ok_response({
+            "status": "ok",
+            "meta": {"total": 250},
+            "data": [{"clan_id": 1}],
+        })
+        mock_get_session.return_value = session
+        upstream_calls_before = client.get_single_flight_stats()[
+            "process"]["upstream_calls"]
+
+        with traffic_source(SOURCE_CRAWL):
+            clans, total_pages = fetch_clan_list_page(1)
+
+        self.assertEqual(clans, [{"clan_id": 1}])
+        self.assertEqual(total_pages, 3)
+        session.get.assert_called_once()
+        self.assertEqual(
+            session.get.call_args.kwargs["params"]["application_id"], "test-app")
+        self.assertEqual(
+            client.get_single_flight_stats()["process"]["upstream_calls"],
+            upstream_calls_before,
+        )
+        crawl = get_upstream_metrics()["process"][SOURCE_CRAWL]["clans/list/"]
+        self.assertEqual(crawl["count"], 1)
+        self.assertEqual(crawl["bytes_sum"], 2048)
+
+    def test_session_is_reused_within_a_process_and_rebuilt_after_fork(self):
+        client._session_for_process.cache_clear()
+        try:
+            with patch("warships.api.client.os.getpid", return_value=101):
+                first = client._get_session()
+                self.assertIs(client._get_session(), first)
+            with patch("warships.api.client.os.getpid", return_value=202):
+                forked = client._get_session()
+
+            self.assertIsNot(forked, first)
+            adapter = first.get_adapter("https://api.worldofwarships.com/")
+            self.assertEqual(adapter._pool_maxsize, client.POOL_SIZE)
+        finally:
+            client._session_for_process.cache_clear()
+
+    def test_upstream_status_reports_request_metrics(self):
+        record_upstream_response("clans/info/", 0.1, 4000)
+
+        payload = self.client.get(
+            "/api/upstream/status/").json()["request_metrics"]
+
+        self.assertEqual(
+            payload["process"][SOURCE_INTERACTIVE]["clans/info/"]["count"], 1)
+        self.assertIsNone(payload["shared"])
+
+    @patch("warships.api.client.APP_ID", "test-app")
+    @patch("warships.api.client.acquire_upstream_slot", return_value=True)
+    @patch("warships.api.client._get_session")
+    def test_failed_requests_are_counted_as_endpoint_errors(self, mock_get_session, _mock_acquire):
+        session = MagicMock()
+        session.get.side_effect = [
+            requests.ConnectionError("reset"),
+            _ok_response({"status": "error", "error": {"code": 407}}),
+        ]
+        mock_get_session.return_value = session
+
+        with traffic_source(SOURCE_CRAWL):
+            self.assertIsNone(client.make_api_request_with_meta(
+                "clans/info/", {"clan_id": 1}, coalesce=False))
+            self.assertIsNone(client.make_api_request_with_meta(
+                "clans/info/", {"clan_id": 1}, coalesce=False))
+
+        crawl = get_upstream_metrics()["process"][SOURCE_CRAWL]["clans/info/"]
+        self.assertEqual(crawl["count"], 1)
+        self.assertEqual(crawl["errors"], 2)
+        self.assertEqual(get_process_upstream_totals()["clans/info/"], {
+            "responses": 1, "errors": 2})
+
+    def test_crawl_telemetry_endpoint_reports_live_progress(self):
+        telemetry = CrawlTelemetry(
+            "clan_crawl", "clans", total=10, queue_depths=lambda: {"writer": 3})
+        with traffic_source(SOURCE_CRAWL):
+            record_upstream_response("clans/info/", 0.1, 4000)
+            record_upstream_error("account/info/")
+        telemetry.count("clans", 4)
+        telemetry.count("players", 80)
+        telemetry.record_latency("db_write", 0.05)
+        telemetry.publish(force=True)
+
+        payload = self.client.get("/api/crawl/telemetry/").json()
+
+        job = payload["jobs"]["clan_crawl"]
+        self.assertEqual(job["status"], "running")
+        self.assertEqual(job["upstream"]["clans/info/"],
+                         {"calls": 1, "errors": 0})
+        self.assertEqual(job["errors_by_endpoint"], {"account/info/": 1})
+        self.assertEqual(job["latency_ms"]["db_write"],
+                         {"count": 1, "avg": 50.0, "max": 50.0})
+        self.assertEqual(job["queue_depths"], {"writer": 3})
+        self.assertEqual(job["progress"]["done"], 4)
+        self.assertEqual(job["progress"]["total"], 10)
+        self.assertIsNotNone(job["progress"]["eta_seconds"])
+        self.assertGreater(job["rates"]["players_per_second"], 0)
+
+
+@profiled_refresh
+def _child_refresh():
+    cache.set("refresh-profile-test", 1)
+    return cache.get("refresh-profile-test")
+
+
+@profiled_refresh
+def _parent_refresh(outcome=None):
+    if outcome:
+        mark_refresh_outcome(outcome)
+        return None
+    with refresh_stage("fetch"):
+        record_upstream_response("account/info/", 0.02, 100)
+    for _ in range(3):
+        with refresh_stage("lookup"):
+            Player.objects.filter(player_id=1).exists()
+    return _child_refresh()
+
+
+@patch.dict("warships.api.metrics._pending_flush", clear=True)
+@patch.dict("warships.api.metrics._process_histograms", clear=True)
+@patch.dict("warships.refresh_profile._pending_flush", clear=True)
+@patch.dict("warships.refresh_profile._process_aggregates", clear=True)
+class RefreshProfileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_profile_attributes_calls_queries_and_cache_ops_to_stages(self):
+        with self.assertLogs("warships.refresh_profile", level="INFO") as logs:
+            self.assertEqual(_parent_refresh(), 1)
+
+        self.assertIn('"pipeline": "_parent_refresh"', logs.output[0])
+        self.assertNotIn("_child_refresh", [
+            record.refresh_profile["pipeline"] for record in logs.records])
+
+        payload = self.client.get("/api/refresh/profiles/").json()
+
+        stages = payload["process"]["_parent_refresh"]["completed"]
+        self.assertEqual(stages["total"]["count"], 1)
+        self.assertEqual(stages["total"]["upstream_calls"], 1)
+        self.assertEqual(stages["total"]["cache_ops"], 2)
+        self.assertGreaterEqual(stages["total"]["sql_queries"], 3)
+        self.assertEqual(stages["fetch"]["upstream_calls"], 1)
+        self.assertEqual(stages["fetch"]["sql_queries"], 0)
+        self.assertEqual(stages["lookup"]["count"], 3)
+        self.assertEqual(stages["lookup"]["sql_queries"], 3)
+        self.assertEqual(stages["lookup"]["sql_queries_avg"], 1.0)
+        self.assertEqual(stages["_child_refresh"]["cache_ops"], 2)
+        self.assertNotIn("_child_refresh", payload["process"])
+        self.assertIsNone(payload["shared"])
+
+    def test_outcome_labels_split_the_aggregates(self):
+        _parent_refresh(outcome="fresh")
+        _parent_refresh()
+
+        payload = self.client.get("/api/refresh/profiles/").json()
+
+        pipeline = payload["process"]["_parent_refresh"]
+        self.assertEqual(list(pipeline["fresh"]), ["total"])
+        self.assertEqual(pipeline["fresh"]["total"]["upstream_calls"], 0)
+        self.assertEqual(pipeline["completed"]["total"]["count"], 1)
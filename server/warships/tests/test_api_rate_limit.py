@@ -0,0 +1,242 @@
+import time
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from warships.api.client import make_api_request
+from warships.api.rate_limit import LocalTokenBucket, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RedisTokenBucket, TokenBucketRateLimiter, _parse_endpoint_weights, current_priority, endpoint_weight, upstream_priority
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover - optional test dependency
+    fakeredis = None
+
+
+class FakeClock:
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SkewedClock:
+    """Wall clock shifted by ``skew`` seconds whose sleeps really sleep."""
+
+    def __init__(self, skew=0.0):
+        self.skew = skew
+        self.sleeps = []
+
+    def __call__(self):
+        return time.time() + self.skew
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        time.sleep(seconds)
+
+
+def _limiter(backend=None, rate=10, burst=10, background_reserve=0.3, clock=None):
+    clock = clock or FakeClock()
+    limiter = TokenBucketRateLimiter(
+        backend or LocalTokenBucket(),
+        rate=rate,
+        burst=burst,
+        background_reserve=background_reserve,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    return limiter, clock
+
+
+class TokenBucketRateLimiterTests(TestCase):
+    def test_burst_is_granted_without_waiting_then_throttled(self):
+        limiter, clock = _limiter(rate=10, burst=5)
+
+        for _ in range(5):
+            self.assertTrue(limiter.acquire(
+                "account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+        self.assertTrue(limiter.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(len(clock.sleeps), 1)
+        self.assertAlmostEqual(clock.sleeps[0], 0.1)
+
+    def test_background_priority_leaves_reserve_for_interactive_calls(self):
+        limiter, clock = _limiter(rate=10, burst=10, background_reserve=0.3)
+
+        for _ in range(7):
+            self.assertTrue(limiter.acquire(
+                "account/info/", PRIORITY_BACKGROUND))
+        self.assertEqual(clock.sleeps, [])
+
+        for _ in range(3):
+            self.assertTrue(limiter.acquire(
+                "account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+        self.assertTrue(limiter.acquire("account/info/", PRIORITY_BACKGROUND))
+        self.assertAlmostEqual(sum(clock.sleeps), 0.4)
+
+    def test_endpoint_weight_consumes_more_tokens(self):
+        limiter, clock = _limiter(rate=10, burst=4)
+
+        self.assertTrue(limiter.acquire("ships/stats/", PRIORITY_INTERACTIVE))
+        self.assertTrue(limiter.acquire("/ships/stats", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+        self.assertTrue(limiter.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertAlmostEqual(clock.sleeps[0], 0.1)
+
+    def test_acquire_gives_up_when_wait_exceeds_priority_budget(self):
+        limiter, clock = _limiter(rate=0.01, burst=1)
+
+        self.assertTrue(limiter.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertFalse(limiter.acquire(
+            "account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+        stats = limiter.stats()
+        self.assertEqual(
+            stats["current_window"]["by_priority"][PRIORITY_INTERACTIVE]["rejected"], 1)
+
+    def test_stats_report_utilisation_by_priority_and_endpoint(self):
+        limiter, clock = _limiter(rate=10, burst=10)
+        clock.now = 1_000_020.0
+
+        limiter.acquire("account/info/", PRIORITY_INTERACTIVE)
+        limiter.acquire("ships/stats/", PRIORITY_BACKGROUND)
+
+        stats = limiter.stats()
+
+        self.assertEqual(stats["backend"], "local")
+        self.assertEqual(stats["tokens_available"], 7.0)
+        current = stats["current_window"]
+        self.assertEqual(current["requests"], 2)
+        self.assertEqual(current["tokens"], 3.0)
+        self.assertEqual(current["by_endpoint"], {
+            "account/info/": 1,
+            "ships/stats/": 1,
+        })
+        self.assertEqual(
+            current["by_priority"][PRIORITY_BACKGROUND]["requests"], 1)
+        self.assertEqual(stats["previous_window"]["requests"], 0)
+
+    def test_backend_error_falls_back_to_local_bucket(self):
+        backend = MagicMock()
+        backend.name = "redis"
+        backend.take.side_effect = ConnectionError("redis down")
+        limiter, clock = _limiter(backend=backend)
+
+        self.assertTrue(limiter.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+    @skipUnless(fakeredis is not None, "fakeredis is not installed")
+    def test_redis_bucket_is_shared_between_limiters(self):
+        server = fakeredis.FakeServer()
+        clock = SkewedClock()
+        first, _ = _limiter(
+            backend=RedisTokenBucket(fakeredis.FakeRedis(server=server)),
+            rate=10,
+            burst=3,
+            clock=clock,
+        )
+        second, _ = _limiter(
+            backend=RedisTokenBucket(fakeredis.FakeRedis(server=server)),
+            rate=10,
+            burst=3,
+            clock=clock,
+        )
+
+        self.assertTrue(first.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertTrue(second.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertTrue(first.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(clock.sleeps, [])
+
+        self.assertTrue(second.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertAlmostEqual(clock.sleeps[0], 0.1, delta=0.02)
+
+        stats = first.stats()
+        self.assertEqual(stats["backend"], "redis")
+        self.assertEqual(stats["current_window"]["requests"], 4)
+
+    @skipUnless(fakeredis is not None, "fakeredis is not installed")
+    def test_redis_bucket_ignores_worker_clock_skew(self):
+        server = fakeredis.FakeServer()
+        ahead_clock = SkewedClock(skew=3600)
+        behind_clock = SkewedClock(skew=-3600)
+        ahead, _ = _limiter(
+            backend=RedisTokenBucket(fakeredis.FakeRedis(server=server)),
+            rate=10,
+            burst=2,
+            clock=ahead_clock,
+        )
+        behind, _ = _limiter(
+            backend=RedisTokenBucket(fakeredis.FakeRedis(server=server)),
+            rate=10,
+            burst=2,
+            clock=behind_clock,
+        )
+
+        self.assertTrue(ahead.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertTrue(ahead.acquire("account/info/", PRIORITY_INTERACTIVE))
+        # A clock an hour behind neither stalls refills nor skips the wait.
+        self.assertTrue(behind.acquire("account/info/", PRIORITY_INTERACTIVE))
+        self.assertEqual(len(behind_clock.sleeps), 1)
+        self.assertAlmostEqual(behind_clock.sleeps[0], 0.1, delta=0.02)
+        self.assertEqual(ahead_clock.sleeps, [])
+
+
+class RateLimitConfigTests(TestCase):
+    def test_endpoint_weight_overrides_are_parsed(self):
+        weights = _parse_endpoint_weights(
+            "/clans/info/=3, account/info/=0.5,bogus=abc,=2")
+
+        self.assertEqual(weights["clans/info/"], 3.0)
+        self.assertEqual(weights["account/info/"], 0.5)
+        self.assertNotIn("bogus", weights)
+        self.assertEqual(weights["ships/stats/"], 2.0)
+
+    def test_unknown_endpoint_uses_default_weight(self):
+        self.assertEqual(endpoint_weight("encyclopedia/ships"), 1.0)
+        self.assertEqual(endpoint_weight("ships/stats"), 2.0)
+
+    def test_upstream_priority_is_scoped(self):
+        self.assertEqual(current_priority(), PRIORITY_INTERACTIVE)
+        with upstream_priority(PRIORITY_BACKGROUND):
+            self.assertEqual(current_priority(), PRIORITY_BACKGROUND)
+        self.assertEqual(current_priority(), PRIORITY_INTERACTIVE)
+
+        with self.assertRaises(ValueError):
+            with upstream_priority("urgent"):
+                pass
+
+
+class ClientRateLimitTests(TestCase):
+    @patch("warships.api.client._get_session")
+    @patch("warships.api.client.acquire_upstream_slot", return_value=False)
+    @patch("warships.api.client.APP_ID", "test-app")
+    def test_make_api_request_skips_upstream_when_slot_denied(self, mock_acquire, mock_session):
+        result = make_api_request("account/info/", {"account_id": 1})
+
+        self.assertIsNone(result)
+        mock_acquire.assert_called_once_with("account/info/")
+        mock_session.assert_not_called()
+
+
+class UpstreamStatusViewTests(TestCase):
+    def test_upstream_status_reports_rate_limiter_stats(self):
+        response = self.client.get("/api/upstream/status/")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()["rate_limiter"]
+        self.assertEqual(payload["backend"], "local")
+        self.assertIn("current_window", payload)
+        self.assertIn("by_priority", payload["current_window"])
+        self.assertIn("saved_calls", response.json()
+                      ["single_flight"]["process"])
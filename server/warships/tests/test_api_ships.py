@@ -1,9 +1,14 @@
-from unittest.mock import patch
+import io
+import json
+from unittest.mock import MagicMock, patch
 
+import requests
 from django.core.cache import cache
 from django.test import TestCase, override_settings
+from urllib3.response import HTTPResponse
 
-from warships.api.ships import _fetch_ship_info, build_ship_chart_name
+from warships.api.client import stream_api_rows
+from warships.api.ships import _fetch_ship_info, _fetch_ship_stats_for_player, build_ship_chart_name, invalidate_ship_catalog, resolve_ship_catalog
 from warships.models import Ship
 
 
@@ -58,3 +63,183 @@ class ShipInfoApiTests(TestCase):
     def test_build_ship_chart_name_abbreviates_long_names(self):
         self.assertEqual(build_ship_chart_name(
             "Admiral Graf Spee"), "Adm. Graf Spee")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ShipCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Ship.objects.create(ship_id=4181604048, name="Shimakaze", nation="japan",
+                            ship_type="Destroyer", tier=10)
+        Ship.objects.create(ship_id=3751721936, name="Admiral Graf Spee", nation="germany",
+                            ship_type="Cruiser", tier=6)
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch("warships.api.ships._make_api_request")
+    def test_known_ships_resolve_from_process_catalog(self, mock_make_api_request):
+        resolve_ship_catalog([4181604048])
+
+        with self.assertNumQueries(0):
+            catalog = resolve_ship_catalog([4181604048, "3751721936", "bad", -1])
+
+        self.assertEqual(catalog[4181604048].name, "Shimakaze")
+        self.assertEqual(catalog["3751721936"].chart_name, "Adm. Graf Spee")
+        self.assertIsNone(catalog["bad"])
+        self.assertIsNone(catalog[-1])
+        mock_make_api_request.assert_not_called()
+
+    @patch("warships.api.ships._make_api_request")
+    def test_unknown_ships_are_fetched_in_one_batched_call(self, mock_make_api_request):
+        mock_make_api_request.return_value = {
+            "3": {"ship_id": 3, "name": "Khabarovsk", "nation": "ussr",
+                  "is_premium": False, "type": "Destroyer", "tier": 10},
+            "4": None,
+        }
+
+        catalog = resolve_ship_catalog([4181604048, 3, 4])
+        again = resolve_ship_catalog([3, 4])
+
+        mock_make_api_request.assert_called_once()
+        endpoint, params = mock_make_api_request.call_args.args
+        self.assertEqual(endpoint, "encyclopedia/ships/")
+        self.assertEqual(params["ship_id"], "3,4")
+        self.assertEqual(catalog[3].ship_type, "Destroyer")
+        self.assertIsNone(catalog[4])
+        self.assertEqual(again[3].tier, 10)
+        self.assertEqual(Ship.objects.get(ship_id=3).chart_name, "Khabarovsk")
+
+    @patch("warships.api.ships._make_api_request", return_value=None)
+    def test_catalog_reloads_after_version_bump(self, _mock_make_api_request):
+        self.assertEqual(resolve_ship_catalog([4181604048])[4181604048].tier, 10)
+        Ship.objects.filter(ship_id=4181604048).update(tier=11)
+        self.assertEqual(resolve_ship_catalog([4181604048])[4181604048].tier, 10)
+
+        invalidate_ship_catalog()
+
+        self.assertEqual(resolve_ship_catalog([4181604048])[4181604048].tier, 11)
+
+
+def _streamed_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = HTTPResponse(
+        body=io.BytesIO(json.dumps(payload).encode("utf-8")),
+        preload_content=False,
+    )
+    return response
+
+
+class _ResetAfterFirstRead(io.BytesIO):
+    """Body that hands out one chunk and then drops the connection."""
+
+    def __init__(self, payload, first_chunk_size):
+        super().__init__(payload)
+        self._first_chunk_size = first_chunk_size
+        self._reads = 0
+
+    def read(self, size=-1):
+        self._reads += 1
+        if self._reads > 1:
+            raise ConnectionResetError("connection reset by peer")
+        return super().read(self._first_chunk_size)
+
+
+@patch("warships.api.client.acquire_upstream_slot", return_value=True)
+@patch("warships.api.client.APP_ID", "test-app")
+class ShipStatsStreamingTests(TestCase):
+    @patch("warships.api.client._get_session")
+    def test_fetch_ship_stats_requests_projection_and_builds_compact_rows(self, mock_get_session, _mock_acquire):
+        payload = {
+            "status": "ok",
+            "meta": {"count": 1, "hidden": None},
+            "data": {
+                "5001": [
+                    {
+                        "ship_id": 4181604048,
+                        "battles": 30,
+                        "distance": 4200,
+                        "pvp": {"battles": 25, "wins": 14, "losses": 11, "frags": 20, "xp": 1},
+                        "pve": {"battles": 5},
+                    },
+                    {
+                        "ship_id": 3751721936,
+                        "battles": 2,
+                        "distance": 90,
+                        "pvp": {"battles": 2, "wins": 1, "losses": 1, "frags": 0},
+                    },
+                ],
+            },
+        }
+        session = MagicMock()
+        session.get.return_value = _streamed_response(payload)
+        mock_get_session.return_value = session
+
+        rows = _fetch_ship_stats_for_player("5001")
+
+        params = session.get.call_args.kwargs["params"]
+        self.assertEqual(params["account_id"], "5001")
+        self.assertIn("pvp.frags", params["fields"].split(","))
+        self.assertTrue(session.get.call_args.kwargs["stream"])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0], {
+            "ship_id": 4181604048,
+            "battles": 30,
+            "distance": 4200,
+            "pvp": {"battles": 25, "wins": 14, "losses": 11, "frags": 20},
+        })
+
+    @patch("warships.api.client._get_session")
+    def test_fetch_ship_stats_returns_empty_rows_for_hidden_or_error_payloads(self, mock_get_session, _mock_acquire):
+        session = MagicMock()
+        session.get.side_effect = [
+            _streamed_response(
+                {"status": "ok", "meta": {"hidden": [5002]}, "data": {"5002": None}}),
+            _streamed_response(
+                {"status": "error", "error": {"message": "INVALID_ACCOUNT_ID"}}),
+        ]
+        mock_get_session.return_value = session
+
+        self.assertEqual(_fetch_ship_stats_for_player("5002"), [])
+        self.assertEqual(_fetch_ship_stats_for_player("5003"), [])
+
+    @patch("warships.api.client._record_upstream_error")
+    @patch("warships.api.client._get_session")
+    def test_connection_drop_mid_stream_is_recorded_and_returns_no_rows(
+        self, mock_get_session, mock_record_upstream_error, _mock_acquire,
+    ):
+        body = json.dumps({
+            "status": "ok",
+            "data": {"5004": [{"ship_id": ship_id, "battles": 1} for ship_id in range(1, 200)]},
+        }).encode("utf-8")
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = HTTPResponse(
+            body=_ResetAfterFirstRead(body, 64), preload_content=False)
+        session = MagicMock()
+        session.get.return_value = response
+        mock_get_session.return_value = session
+
+        self.assertEqual(_fetch_ship_stats_for_player("5004"), [])
+
+        mock_record_upstream_error.assert_called_once()
+        self.assertEqual(
+            mock_record_upstream_error.call_args.args[0], "ships/stats/")
+
+    @patch("warships.api.client._record_upstream_error")
+    @patch("warships.api.client._get_session")
+    def test_row_builder_error_is_recorded_and_returns_none(
+        self, mock_get_session, mock_record_upstream_error, _mock_acquire,
+    ):
+        session = MagicMock()
+        session.get.return_value = _streamed_response(
+            {"status": "ok", "data": {"5005": [{"ship_id": 1}]}})
+        mock_get_session.return_value = session
+
+        def build_row(row):
+            raise KeyError("pvp")
+
+        self.assertIsNone(stream_api_rows(
+            "ships/stats/", {"account_id": "5005"}, "data.5005.item", build_row))
+        mock_record_upstream_error.assert_called_once()
@@ -0,0 +1,135 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from warships.api import client
+from warships.api.client import _single_flight_key, get_single_flight_stats, make_api_request
+
+
+def _ok(data):
+    return {"status": "ok", "data": data}
+
+
+@patch("warships.api.client.APP_ID", "test-app")
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _saved(self, scope="process"):
+        return get_single_flight_stats()[scope]["saved_calls"]
+
+    def test_concurrent_identical_requests_share_one_upstream_call(self):
+        release = threading.Event()
+        calls = []
+
+        def fake_fetch(clean_endpoint, clean_params):
+            calls.append(clean_params)
+            release.wait(5)
+            return _ok({"1": {"nickname": "Captain"}})
+
+        key = _single_flight_key(
+            "account/info/", {"account_id": 1, "application_id": "test-app"})
+        saved_before = self._saved()
+        results = []
+
+        def worker():
+            results.append(make_api_request(
+                "account/info/", {"account_id": 1}))
+
+        with patch("warships.api.client._fetch_api_payload", side_effect=fake_fetch):
+            threads = [threading.Thread(target=worker) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                flight = client._flights.get(key)
+                if flight is not None and flight["waiters"] == 4:
+                    break
+                time.sleep(0.01)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result == {"1": {"nickname": "Captain"}}
+                        for result in results))
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(self._saved() - saved_before, 4)
+        self.assertNotIn(key, client._flights)
+
+    def test_key_ignores_param_and_id_list_order(self):
+        first = _single_flight_key(
+            "account/info/", {"account_id": "3,1,2", "fields": "a,b", "application_id": "x"})
+        second = _single_flight_key(
+            "account/info/", {"fields": "b,a", "account_id": "1,2,3", "application_id": "y"})
+        other = _single_flight_key(
+            "account/info/", {"account_id": "1,2,4", "fields": "a,b"})
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    @patch("warships.api.client._shared_single_flight_enabled", return_value=True)
+    @patch("warships.api.client.SINGLE_FLIGHT_POLL_SECONDS", 0.01)
+    def test_waits_for_result_published_by_another_process(self, _mock_shared):
+        key = _single_flight_key(
+            "seasons/info/", {"application_id": "test-app"})
+        cache.add(f"{key}:lock", 1, timeout=30)
+        timer = threading.Timer(0.05, lambda: cache.set(
+            f"{key}:result", _ok({"1001": {"season_name": "S1"}}), 5))
+        saved_before = self._saved()
+
+        with patch("warships.api.client._fetch_api_payload") as mock_fetch:
+            timer.start()
+            result = make_api_request("seasons/info/", {})
+            timer.join()
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(result, {"1001": {"season_name": "S1"}})
+        self.assertEqual(self._saved() - saved_before, 1)
+        self.assertGreaterEqual(self._saved("shared"), 1)
+
+    @patch("warships.api.client._shared_single_flight_enabled", return_value=True)
+    @patch("warships.api.client.SINGLE_FLIGHT_POLL_SECONDS", 0.01)
+    def test_fetches_itself_when_other_process_releases_without_result(self, _mock_shared):
+        key = _single_flight_key(
+            "clans/season/", {"application_id": "test-app"})
+        cache.add(f"{key}:lock", 1, timeout=30)
+        timer = threading.Timer(0.05, lambda: cache.delete(f"{key}:lock"))
+
+        with patch("warships.api.client._fetch_api_payload", return_value=_ok({"30": {}})) as mock_fetch:
+            timer.start()
+            result = make_api_request("clans/season/", {})
+            timer.join()
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(result, {"30": {}})
+
+    @patch("warships.api.client._shared_single_flight_enabled", return_value=True)
+    def test_leader_publishes_result_and_releases_lock(self, _mock_shared):
+        key = _single_flight_key(
+            "account/info/", {"account_id": 7, "application_id": "test-app"})
+
+        with patch("warships.api.client._fetch_api_payload", return_value=_ok({"7": {}})) as mock_fetch:
+            make_api_request("account/info/", {"account_id": 7})
+            second = make_api_request("account/info/", {"account_id": 7})
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(second, {"7": {}})
+        self.assertIsNone(cache.get(f"{key}:lock"))
+        self.assertEqual(cache.get(f"{key}:result"), _ok({"7": {}}))
+
+    @patch("warships.api.client.SINGLE_FLIGHT_ENABLED", False)
+    def test_disabled_single_flight_calls_upstream_directly(self):
+        with patch("warships.api.client._fetch_api_payload", return_value=_ok({})) as mock_fetch:
+            make_api_request("account/info/", {"account_id": 1})
+            make_api_request("account/info/", {"account_id": 1})
+
+        self.assertEqual(mock_fetch.call_count, 2)
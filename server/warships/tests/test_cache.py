@@ -5,6 +5,7 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from warships.models import Player, Clan, PlayerExplorerSummary, Ship
+from warships.player_ship_stats import sync_player_ship_stats
 
 
 LOCMEM_CACHES = {
@@ -24,7 +25,7 @@ class LandingPlayersCacheTests(TestCase):
         cache.clear()
 
     def _create_best_player(self, player_id: int, name: str):
-        return Player.objects.create(
+        player = Player.objects.create(
             name=name,
             player_id=player_id,
             pvp_battles=3200,
@@ -32,9 +33,12 @@ class LandingPlayersCacheTests(TestCase):
             days_since_last_battle=0,
             last_battle_date=timezone.now().date(),
             battles_json=[
-                {"ship_tier": 10, "pvp_battles": 3200, "wins": 1760},
+                {"ship_id": 1, "ship_tier": 10,
+                    "pvp_battles": 3200, "wins": 1760},
             ],
         )
+        sync_player_ship_stats(player, player.battles_json)
+        return player
 
     def test_landing_players_cache_miss_then_hit(self):
         self._create_best_player(1001, "CachePlayer")
@@ -353,6 +357,26 @@ class ClanBattlePlayerStatsCacheTests(TestCase):
         self.assertEqual(result2[0]["battles"], 12)
         mock_fetch.assert_not_called()
 
+    @patch("warships.data._fetch_clan_battle_season_stats_many")
+    def test_player_clan_battle_stats_batch_only_fetches_cache_misses(self, mock_fetch_many):
+        from warships.data import _get_player_clan_battle_season_stats_many
+
+        cache.set("clan_battles:player:111", [
+                  {"season_id": 50, "battles": 3}], 60)
+        mock_fetch_many.return_value = {
+            222: {"seasons": [{"season_id": 50, "battles": 8}]},
+            333: {},
+        }
+
+        result = _get_player_clan_battle_season_stats_many([111, 222, 333])
+
+        mock_fetch_many.assert_called_once_with([222, 333])
+        self.assertEqual(result[111][0]["battles"], 3)
+        self.assertEqual(result[222][0]["battles"], 8)
+        self.assertEqual(result[333], [])
+        self.assertEqual(cache.get("clan_battles:player:222")
+                         [0]["battles"], 8)
+
     @patch("warships.data._get_player_clan_battle_season_stats")
     @patch("warships.data._get_clan_battle_seasons_metadata")
     def test_fetch_player_clan_battle_seasons_enriches_and_sorts_rows(self, mock_meta, mock_player_stats):
@@ -454,7 +478,7 @@ class ClanBattleSummaryCacheTests(TestCase):
     def tearDown(self):
         cache.clear()
 
-    @patch("warships.data._get_player_clan_battle_season_stats")
+    @patch("warships.data._get_player_clan_battle_season_stats_many")
     @patch("warships.data._get_clan_battle_seasons_metadata")
     def test_clan_battle_summary_cached_after_first_call(self, mock_meta, mock_player_stats):
         from warships.data import refresh_clan_battle_seasons_cache, _get_clan_battle_summary_cache_key
@@ -474,10 +498,10 @@ class ClanBattleSummaryCacheTests(TestCase):
                 "ship_tier_max": 10,
             }
         }
-        mock_player_stats.side_effect = [
-            [{"season_id": 50, "battles": 10, "wins": 6, "losses": 4}],
-            [{"season_id": 50, "battles": 20, "wins": 9, "losses": 11}],
-        ]
+        mock_player_stats.return_value = {
+            1001: [{"season_id": 50, "battles": 10, "wins": 6, "losses": 4}],
+            1002: [{"season_id": 50, "battles": 20, "wins": 9, "losses": 11}],
+        }
 
         result1 = refresh_clan_battle_seasons_cache("77")
         self.assertEqual(result1[0]["participants"], 2)
@@ -486,14 +510,15 @@ class ClanBattleSummaryCacheTests(TestCase):
         self.assertEqual(result1[0]["roster_win_rate"], 50.0)
         self.assertIsNotNone(
             cache.get(_get_clan_battle_summary_cache_key("77")))
-        self.assertEqual(mock_player_stats.call_count, 2)
+        mock_player_stats.assert_called_once()
+        self.assertCountEqual(mock_player_stats.call_args.args[0], [1001, 1002])
 
         mock_player_stats.reset_mock()
         result2 = cache.get(_get_clan_battle_summary_cache_key("77"))
         self.assertEqual(result2[0]["roster_battles"], 30)
         mock_player_stats.assert_not_called()
 
-    @patch("warships.data._get_player_clan_battle_season_stats")
+    @patch("warships.data._get_player_clan_battle_season_stats_many")
     @patch("warships.data._get_clan_battle_seasons_metadata")
     def test_clan_battle_summary_orders_by_season_dates_and_keeps_all_rows(self, mock_meta, mock_player_stats):
         from warships.data import refresh_clan_battle_seasons_cache
@@ -528,11 +553,11 @@ class ClanBattleSummaryCacheTests(TestCase):
                 "ship_tier_max": 10,
             },
         }
-        mock_player_stats.return_value = [
+        mock_player_stats.return_value = {2001: [
             {"season_id": 301, "battles": 7, "wins": 3, "losses": 4},
             {"season_id": 32, "battles": 12, "wins": 8, "losses": 4},
             {"season_id": 31, "battles": 10, "wins": 6, "losses": 4},
-        ]
+        ]}
 
         result = refresh_clan_battle_seasons_cache("78")
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from datetime import timedelta
 from unittest.mock import patch
 import time
 from unittest.mock import ANY
@@ -14,8 +15,11 @@ from django_celery_beat.models import CrontabSchedule, IntervalSchedule, Periodi
 
 from warships.signals import ensure_daily_clan_crawl_schedule
 from warships.landing import LANDING_RECENT_CLANS_CACHE_KEY, LANDING_RECENT_PLAYERS_CACHE_KEY, get_landing_players_payload
-from warships.tasks import CLAN_CRAWL_HEARTBEAT_KEY, CLAN_CRAWL_LOCK_KEY, HOT_ENTITY_CACHE_WARM_LOCK_KEY, LANDING_PAGE_WARM_LOCK_KEY, RANKED_INCREMENTAL_LOCK_KEY, crawl_all_clans_task, ensure_crawl_all_clans_running_task, incremental_ranked_data_task, is_efficiency_data_refresh_pending, is_efficiency_rank_snapshot_refresh_pending, is_ranked_data_refresh_pending, queue_clan_battle_data_refresh, queue_efficiency_data_refresh, queue_efficiency_rank_snapshot_refresh, queue_ranked_data_refresh, refresh_efficiency_rank_snapshot_task, update_clan_battle_summary_task, update_clan_data_task, update_clan_members_task, update_player_data_task, update_player_efficiency_data_task, update_ranked_data_task, warm_clan_battle_summaries_task, warm_hot_entity_caches_task, warm_landing_page_content_task
-from warships.models import Player
+from warships.clan_crawl import start_clan_crawl_shards
+from warships.enrichment_queue import complete_player_enrichment, enqueue_player_enrichment, get_enrichment_backlog_stats
+from warships.tasks import CLAN_CRAWL_HEARTBEAT_KEY, CLAN_CRAWL_LOCK_KEY, _clan_crawl_shard_heartbeat_key, _task_lock_key, crawl_clan_shard_task, dispatch_player_enrichment_backlog, enrich_crawled_players_task, HOT_ENTITY_CACHE_WARM_LOCK_KEY, LANDING_PAGE_WARM_LOCK_KEY, RANKED_INCREMENTAL_LOCK_KEY, crawl_all_clans_task, ensure_crawl_all_clans_running_task, incremental_ranked_data_task, is_efficiency_data_refresh_pending, is_efficiency_rank_snapshot_refresh_pending, is_ranked_data_refresh_pending, queue_clan_battle_data_refresh, queue_efficiency_data_refresh, queue_efficiency_rank_snapshot_refresh, queue_ranked_data_refresh, refresh_efficiency_rank_snapshot_task, update_clan_battle_summary_task, update_clan_data_task, update_clan_members_task, update_player_data_task, update_player_efficiency_data_task, update_ranked_data_task, warm_clan_battle_summaries_task, warm_hot_entity_caches_task, warm_landing_page_content_task
+from warships.models import ClanCrawlShard, Player, PlayerEnrichmentIntent
+from warships.player_ship_stats import sync_player_ship_stats
 
 
 @override_settings(
@@ -145,6 +149,15 @@ class ClanCrawlSchedulerTests(TestCase):
         self.assertEqual(hot_cache_schedule.every, 30)
         self.assertEqual(hot_cache_schedule.period, IntervalSchedule.MINUTES)
 
+        drain_task = PeriodicTask.objects.get(name="player-enrichment-drain")
+        self.assertEqual(
+            drain_task.task,
+            "warships.tasks.drain_player_enrichment_task",
+        )
+        self.assertTrue(drain_task.enabled)
+        self.assertEqual(IntervalSchedule.objects.get(
+            id=drain_task.interval_id).every, 1)
+
     def test_post_migrate_disables_crawler_tasks_when_schedules_disabled(self):
         app_config = apps.get_app_config("warships")
 
@@ -161,6 +174,8 @@ class ClanCrawlSchedulerTests(TestCase):
             name="daily-ranked-incrementals").enabled)
         self.assertFalse(PeriodicTask.objects.get(
             name="clan-crawl-watchdog").enabled)
+        self.assertFalse(PeriodicTask.objects.get(
+            name="player-enrichment-drain").enabled)
         self.assertTrue(PeriodicTask.objects.get(
             name="landing-page-warmer").enabled)
 
@@ -193,6 +208,54 @@ class ClanCrawlSchedulerTests(TestCase):
         self.assertIsNone(cache.get(CLAN_CRAWL_LOCK_KEY))
         mock_delay.assert_called_once_with(resume=True)
 
+    def test_sharded_crawl_dispatches_one_task_per_shard(self):
+        with patch("warships.tasks.crawl_clan_shard_task.delay") as mock_delay:
+            result = crawl_all_clans_task.run(
+                resume=False, limit=10, shards=3)
+
+        self.assertEqual(result, {"status": "dispatched", "shards": [0, 1, 2]})
+        self.assertEqual(
+            list(ClanCrawlShard.objects.order_by("shard_index").values_list(
+                "next_page", "limit", "status")),
+            [(1, 4, "pending"), (2, 3, "pending"), (3, 3, "pending")],
+        )
+        self.assertEqual(mock_delay.call_count, 3)
+        self.assertIsNotNone(cache.get(CLAN_CRAWL_LOCK_KEY))
+
+    def test_watchdog_restarts_only_dead_shards(self):
+        start_clan_crawl_shards(3)
+        cache.set(_clan_crawl_shard_heartbeat_key(0), time.time(), timeout=60)
+        cache.set(_clan_crawl_shard_heartbeat_key(1),
+                  time.time() - 3600, timeout=60)
+        cache.set(_clan_crawl_shard_heartbeat_key(2), time.time(), timeout=60)
+
+        with patch("warships.tasks.crawl_clan_shard_task.delay") as mock_shard_delay, patch("warships.tasks.crawl_all_clans_task.delay") as mock_crawl_delay:
+            result = ensure_crawl_all_clans_running_task.run()
+
+        self.assertEqual(
+            result, {"status": "scheduled", "reason": "stale-shards", "shards": [1]})
+        mock_shard_delay.assert_called_once_with(shard_index=1)
+        mock_crawl_delay.assert_not_called()
+
+    def test_last_shard_to_finish_releases_the_crawl_lock(self):
+        start_clan_crawl_shards(2)
+        ClanCrawlShard.objects.filter(shard_index=1).update(
+            status=ClanCrawlShard.STATUS_COMPLETED)
+        cache.add(CLAN_CRAWL_LOCK_KEY, "sharded-run", timeout=60)
+
+        def finish_shard(shard_index, heartbeat_callback):
+            heartbeat_callback()
+            ClanCrawlShard.objects.filter(shard_index=shard_index).update(
+                status=ClanCrawlShard.STATUS_COMPLETED)
+            return {"clans_processed": 4}
+
+        with patch("warships.clan_crawl.run_clan_crawl_shard", side_effect=finish_shard):
+            result = crawl_clan_shard_task.run(shard_index=0)
+
+        self.assertEqual(result["status"], "completed")
+        self.assertIsNone(cache.get(CLAN_CRAWL_LOCK_KEY))
+        self.assertIsNone(cache.get(_clan_crawl_shard_heartbeat_key(0)))
+
     def test_warm_clan_battle_summaries_task_refreshes_each_configured_clan(self):
         with patch("warships.data.refresh_clan_battle_seasons_cache") as mock_refresh:
             result = warm_clan_battle_summaries_task.run(
@@ -250,21 +313,23 @@ class ClanCrawlSchedulerTests(TestCase):
 
     def test_force_refresh_rebuilds_landing_cache_without_manual_invalidation(self):
         today = timezone.now().date()
-        Player.objects.create(
+        old_player = Player.objects.create(
             name="LandingWarmOld",
             player_id=9101,
             is_hidden=False,
             pvp_ratio=62.0,
             pvp_battles=3200,
             last_battle_date=today,
-            battles_json=[{"ship_tier": 8, "pvp_battles": 3200, "wins": 1984}],
+            battles_json=[{"ship_id": 1, "ship_tier": 8,
+                           "pvp_battles": 3200, "wins": 1984}],
         )
+        sync_player_ship_stats(old_player, old_player.battles_json)
 
         first_names = [row["name"]
                        for row in get_landing_players_payload("best", 40)]
         self.assertIn("LandingWarmOld", first_names)
 
-        Player.objects.create(
+        new_player = Player.objects.create(
             name="LandingWarmNew",
             player_id=9102,
             is_hidden=False,
@@ -272,8 +337,9 @@ class ClanCrawlSchedulerTests(TestCase):
             pvp_battles=3600,
             last_battle_date=today,
             battles_json=[
-                {"ship_tier": 10, "pvp_battles": 3600, "wins": 2448}],
+                {"ship_id": 2, "ship_tier": 10, "pvp_battles": 3600, "wins": 2448}],
         )
+        sync_player_ship_stats(new_player, new_player.battles_json)
 
         cache.set(LANDING_RECENT_PLAYERS_CACHE_KEY, ["stale"], timeout=60)
         cache.set(LANDING_RECENT_CLANS_CACHE_KEY, ["stale"], timeout=60)
@@ -528,3 +594,148 @@ class RefreshTaskLockTests(TestCase):
             name="clan-battle-summary-warmer")
         self.assertEqual(warmer_task.task,
                          "warships.tasks.warm_clan_battle_summaries_task")
+
+
+class PlayerEnrichmentBacklogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _players(self):
+        now = timezone.now()
+        stale = now - timedelta(days=40)
+        cold = Player.objects.create(
+            name="ColdCaptain", player_id=8101,
+            last_battle_date=(now - timedelta(days=400)).date())
+        active = Player.objects.create(
+            name="ActiveCaptain", player_id=8102,
+            last_battle_date=(now - timedelta(days=3)).date(),
+            efficiency_updated_at=stale, achievements_updated_at=stale)
+        hot = Player.objects.create(
+            name="HotCaptain", player_id=8103, last_lookup=now)
+        return cold, active, hot
+
+    def test_drain_dispatches_highest_priority_intents_first(self):
+        enqueue_player_enrichment(self._players())
+
+        with patch("warships.tasks.enrich_crawled_players_task.delay") as mock_delay:
+            result = dispatch_player_enrichment_backlog(limit=2)
+
+        self.assertEqual(result, {"status": "completed", "dispatched": 2})
+        mock_delay.assert_called_once_with(player_ids=[8103, 8102])
+        self.assertEqual(
+            list(PlayerEnrichmentIntent.objects.filter(claimed_at__isnull=True)
+                 .values_list("player__player_id", flat=True)),
+            [8101],
+        )
+
+    def test_drain_releases_claims_when_broker_dispatch_fails(self):
+        enqueue_player_enrichment(self._players())
+
+        with patch("warships.tasks.enrich_crawled_players_task.delay", side_effect=RuntimeError("broker down")):
+            result = dispatch_player_enrichment_backlog()
+
+        self.assertEqual(result["reason"], "enqueue-failed")
+        self.assertFalse(PlayerEnrichmentIntent.objects.filter(
+            claimed_at__isnull=False).exists())
+
+        with patch("warships.tasks.enrich_crawled_players_task.delay") as mock_delay:
+            result = dispatch_player_enrichment_backlog()
+
+        self.assertEqual(result["reason"], "broker-unavailable")
+        mock_delay.assert_not_called()
+
+    def test_completed_enrichment_leaves_backlog_and_records_wait(self):
+        cold, active, hot = self._players()
+        enqueue_player_enrichment([cold, active, hot])
+
+        with patch("warships.tasks.enrich_crawled_players_task.delay"):
+            dispatch_player_enrichment_backlog(limit=1)
+        self.assertEqual(complete_player_enrichment([8103, 8102]), 1)
+
+        tiers = get_enrichment_backlog_stats()["tiers"]
+        self.assertEqual(tiers[PlayerEnrichmentIntent.TIER_HOT]["pending"], 0)
+        self.assertEqual(tiers[PlayerEnrichmentIntent.TIER_HOT]["completed"], 1)
+        self.assertIsNotNone(
+            tiers[PlayerEnrichmentIntent.TIER_HOT]["avg_wait_seconds"])
+        self.assertEqual(tiers[PlayerEnrichmentIntent.TIER_ACTIVE]["pending"], 1)
+        self.assertEqual(tiers[PlayerEnrichmentIntent.TIER_ACTIVE]["claimed"], 0)
+        self.assertEqual(tiers[PlayerEnrichmentIntent.TIER_COLD]["pending"], 1)
+
+    def test_drain_claims_nothing_while_upstream_is_degraded(self):
+        enqueue_player_enrichment(self._players())
+
+        with patch("warships.tasks.upstream_degraded", return_value=True), \
+                patch("warships.tasks.enrich_crawled_players_task.delay") as mock_delay:
+            result = dispatch_player_enrichment_backlog()
+
+        self.assertEqual(result["reason"], "upstream-degraded")
+        mock_delay.assert_not_called()
+        self.assertFalse(PlayerEnrichmentIntent.objects.filter(
+            claimed_at__isnull=False).exists())
+
+    @patch("warships.tasks.queue_efficiency_rank_snapshot_refresh")
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data.update_achievements_data")
+    @patch("warships.data.update_player_efficiency_data")
+    def test_enrichment_releases_players_that_were_not_refreshed(
+        self,
+        mock_update_efficiency,
+        _mock_update_achievements,
+        _mock_refresh_summary,
+        _mock_queue_snapshot,
+    ):
+        enqueue_player_enrichment(self._players())
+        with patch("warships.tasks.enrich_crawled_players_task.delay"):
+            dispatch_player_enrichment_backlog()
+
+        def refresh(player):
+            if player.player_id == 8102:
+                raise RuntimeError("upstream payload was malformed")
+
+        mock_update_efficiency.side_effect = refresh
+        cache.add(_task_lock_key("enrich_crawled_player", 8101), "other-task")
+
+        result = enrich_crawled_players_task.run(
+            player_ids=[8103, 8102, 8101])
+
+        self.assertEqual(result["players"][8103]["status"], "completed")
+        self.assertEqual(result["players"][8102]["status"], "failed")
+        self.assertEqual(result["players"][8101]["reason"], "already-running")
+        self.assertEqual(
+            sorted(PlayerEnrichmentIntent.objects.filter(claimed_at__isnull=True)
+                   .values_list("player__player_id", flat=True)),
+            [8101, 8102],
+        )
+
+    @patch("warships.tasks.queue_efficiency_rank_snapshot_refresh")
+    @patch("warships.data.update_player_efficiency_data")
+    def test_enrichment_keeps_intents_while_upstream_is_degraded(
+        self,
+        mock_update_efficiency,
+        _mock_queue_snapshot,
+    ):
+        enqueue_player_enrichment(self._players())
+        with patch("warships.tasks.enrich_crawled_players_task.delay"):
+            dispatch_player_enrichment_backlog()
+
+        with patch("warships.tasks.upstream_degraded", return_value=True):
+            result = enrich_crawled_players_task.run(
+                player_ids=[8103, 8102, 8101])
+
+        mock_update_efficiency.assert_not_called()
+        self.assertEqual(result["players"][8103]["reason"], "upstream-degraded")
+        self.assertEqual(PlayerEnrichmentIntent.objects.count(), 3)
+        self.assertEqual(
+            PlayerEnrichmentIntent.objects.filter(claimed_at__isnull=False).count(), 0)
+
+    def test_requeue_while_claimed_survives_completion_of_the_claim(self):
+        cold, active, hot = self._players()
+        enqueue_player_enrichment([cold, active, hot])
+
+        with patch("warships.tasks.enrich_crawled_players_task.delay"):
+            dispatch_player_enrichment_backlog(limit=1)
+        enqueue_player_enrichment([hot])
+
+        self.assertEqual(complete_player_enrichment([8103]), 0)
+        intent = PlayerEnrichmentIntent.objects.get(player=hot)
+        self.assertIsNone(intent.claimed_at)
@@ -1,15 +1,19 @@
 from datetime import datetime, timedelta
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from django.test import TestCase, override_settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.cache import cache
 from django.utils import timezone
 
-from warships.clan_crawl import run_clan_crawl, save_player
+from warships.clan_crawl import _PageCursor, crawl_clan_ids, run_clan_crawl, run_clan_crawl_shard, save_player, save_players_bulk, start_clan_crawl_shards
 from warships.api.players import _fetch_player_achievements
-from warships.data import update_snapshot_data, fetch_activity_data, fetch_clan_plot_data, fetch_randoms_data, fetch_player_summary, fetch_tier_data, fetch_type_data, update_player_data, update_clan_data, update_clan_members, update_tiers_data, update_type_data, update_randoms_data, update_battle_data, _build_top_ranked_ship_names_by_season, update_ranked_data, refresh_player_explorer_summary, fetch_player_explorer_rows, compute_player_verdict, _inactivity_score_cap, _calculate_actual_kdr, _calculate_tier_filtered_pvp_record, _calculate_ranked_record, get_highest_ranked_league_name, _aggregate_ranked_seasons, fetch_ranked_data, clan_ranked_hydration_needs_refresh, queue_clan_efficiency_hydration, queue_clan_ranked_hydration, normalize_player_achievement_rows, recompute_efficiency_rank_snapshot, update_achievements_data, _efficiency_rank_tier_from_percentile
+from warships.api.ships import ShipCatalogEntry
+from warships.crawl_telemetry import get_crawl_telemetry
+from warships.data import preload_activity_data, preload_battles_json, update_snapshot_data, fetch_activity_data, fetch_clan_plot_data, fetch_randoms_data, fetch_player_summary, fetch_tier_data, fetch_type_data, update_player_data, update_clan_data, update_clan_members, update_tiers_data, update_type_data, update_randoms_data, update_battle_data, _build_top_ranked_ship_names_by_season, update_ranked_data, refresh_player_explorer_summary, fetch_player_explorer_rows, compute_player_verdict, _inactivity_score_cap, _calculate_actual_kdr, _calculate_tier_filtered_pvp_record, _calculate_ranked_record, get_highest_ranked_league_name, _aggregate_ranked_seasons, fetch_ranked_data, clan_ranked_hydration_needs_refresh, queue_clan_efficiency_hydration, queue_clan_ranked_hydration, normalize_player_achievement_rows, recompute_efficiency_rank_snapshot, update_achievements_data, _efficiency_rank_tier_from_percentile
 from warships.landing import LANDING_CLANS_CACHE_KEY, LANDING_CLANS_DIRTY_KEY, LANDING_PLAYERS_DIRTY_KEY, LANDING_RECENT_CLANS_CACHE_KEY, LANDING_RECENT_CLANS_DIRTY_KEY, LANDING_RECENT_PLAYERS_CACHE_KEY, LANDING_RECENT_PLAYERS_DIRTY_KEY, landing_player_cache_key
-from warships.models import Player, Snapshot, Clan, PlayerAchievementStat, PlayerExplorerSummary, Ship
+from warships.models import Player, PlayerEnrichmentIntent, PlayerPayload, Snapshot, Clan, ClanCrawlShard, PlayerAchievementStat, PlayerExplorerSummary, Ship
 
 
 class SnapshotDataTests(TestCase):
@@ -88,6 +92,168 @@ class ClanCrawlPublicationTests(TestCase):
         mock_queue_efficiency_rank_snapshot_refresh.assert_not_called()
 
 
+def _crawl_clan_page(page):
+    clans = [{"clan_id": 1000 + (page - 1) * 2 + offset} for offset in range(2)]
+    return clans, 3
+
+
+def _crawl_clans_info(clan_ids):
+    return {
+        clan_id: {
+            "clan_id": clan_id,
+            "name": f"Clan {clan_id}",
+            "tag": f"C{clan_id}",
+            "members_count": 2,
+            "members_ids": [clan_id * 10, clan_id * 10 + 1],
+        }
+        for clan_id in clan_ids
+    }
+
+
+def _crawl_players_bulk(player_ids):
+    return {
+        str(pid): {
+            "account_id": pid,
+            "nickname": f"player{pid}",
+            "hidden_profile": True,
+            "last_battle_time": 1700000000,
+        }
+        for pid in player_ids
+    }
+
+
+@patch("warships.clan_crawl.fetch_players_bulk", side_effect=_crawl_players_bulk)
+@patch("warships.clan_crawl.fetch_clans_info_bulk", side_effect=_crawl_clans_info)
+@patch("warships.clan_crawl.fetch_clan_list_page", side_effect=_crawl_clan_page)
+@patch("warships.tasks.queue_efficiency_rank_snapshot_refresh")
+@patch("warships.clan_crawl.APP_ID", "fixture-app-id")
+class ClanCrawlPipelineTests(TransactionTestCase):
+    def test_pipeline_saves_every_clan_and_member_within_limit(self, *mocks):
+        fetch_clans_info_bulk = mocks[2]
+        heartbeat = Mock()
+
+        summary = run_clan_crawl(limit=5, heartbeat_callback=heartbeat)
+
+        self.assertEqual(summary["clans_found"], 5)
+        self.assertEqual(summary["clans_processed"], 5)
+        self.assertEqual(summary["players_saved"], 10)
+        self.assertEqual(summary["skipped"], 0)
+        self.assertEqual(
+            sorted(Clan.objects.values_list("clan_id", flat=True)),
+            [1000, 1001, 1002, 1003, 1004],
+        )
+        self.assertEqual(Player.objects.filter(clan__clan_id=1004).count(), 2)
+        self.assertTrue(heartbeat.called)
+        fetch_clans_info_bulk.assert_called_once_with(
+            [1000, 1001, 1002, 1003, 1004])
+
+    def test_resume_skips_clans_already_fetched(self, *_mocks):
+        Clan.objects.create(clan_id=1000, name="Done", last_fetch=timezone.now())
+        Clan.objects.create(clan_id=1001, name="Pending", last_fetch=None)
+
+        summary = run_clan_crawl(resume=True, limit=2)
+
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["clans_processed"], 1)
+        self.assertEqual(Clan.objects.get(clan_id=1000).name, "Done")
+        self.assertEqual(Clan.objects.get(clan_id=1001).name, "Clan 1001")
+
+    def test_recrawl_leaves_unchanged_players_alone(self, *_mocks):
+        run_clan_crawl(limit=2)
+        Player.objects.update(last_fetch=None)
+
+        summary = run_clan_crawl(limit=2)
+
+        self.assertEqual(summary["players_saved"], 0)
+        self.assertEqual(summary["players_unchanged"], 4)
+        self.assertFalse(Player.objects.exclude(last_fetch=None).exists())
+
+    def test_shard_walks_its_own_pages_and_advances_its_cursor(self, *_mocks):
+        start_clan_crawl_shards(2)
+
+        first = run_clan_crawl_shard(0)
+        second = run_clan_crawl_shard(1)
+
+        self.assertEqual(first["clans_processed"], 4)
+        self.assertEqual(second["clans_processed"], 2)
+        self.assertEqual(
+            sorted(Clan.objects.values_list("clan_id", flat=True)),
+            [1000, 1001, 1002, 1003, 1004, 1005],
+        )
+        self.assertEqual(
+            list(ClanCrawlShard.objects.order_by("shard_index").values_list(
+                "status", "next_page", "clans_processed")),
+            [("completed", 5, 4), ("completed", 4, 2)],
+        )
+
+    def test_clan_discovery_streams_one_page_at_a_time(self, *mocks):
+        fetch_clan_list_page = mocks[1]
+
+        stubs = crawl_clan_ids()
+
+        self.assertEqual(fetch_clan_list_page.call_count, 0)
+        self.assertEqual(next(stubs), {"clan_id": 1000})
+        self.assertEqual(fetch_clan_list_page.call_count, 1)
+        self.assertEqual([stub["clan_id"] for stub in stubs],
+                         [1001, 1002, 1003, 1004, 1005])
+        self.assertEqual(fetch_clan_list_page.call_count, 3)
+
+    def test_dry_run_counts_clans_without_crawling_members(self, *mocks):
+        fetch_clans_info_bulk = mocks[2]
+
+        summary = run_clan_crawl(dry_run=True, limit=3)
+
+        self.assertEqual(summary["clans_found"], 3)
+        fetch_clans_info_bulk.assert_not_called()
+
+    def test_stage_failure_is_raised_to_the_caller(self, *mocks):
+        fetch_players_bulk = mocks[3]
+        fetch_players_bulk.side_effect = ValueError("bad payload")
+
+        with self.assertRaises(ValueError):
+            run_clan_crawl(limit=4)
+
+        self.assertFalse(Player.objects.exists())
+        telemetry = get_crawl_telemetry()["jobs"]["clan_crawl"]
+        self.assertEqual(telemetry["status"], "failed")
+        self.assertGreaterEqual(
+            telemetry["counters"]["players_stage_errors"], 1)
+
+    def test_crawl_publishes_progress_telemetry(self, *_mocks):
+        cache.clear()
+
+        run_clan_crawl(limit=5)
+
+        telemetry = get_crawl_telemetry()["jobs"]["clan_crawl"]
+        self.assertEqual(telemetry["status"], "completed")
+        self.assertEqual(telemetry["progress"], {
+            "counter": "clans", "done": 5, "total": 5, "eta_seconds": 0})
+        self.assertEqual(telemetry["counters"]["players"], 10)
+        self.assertEqual(telemetry["latency_ms"]["db_write"]["count"], 5)
+        self.assertEqual(set(telemetry["queue_depths"]),
+                         {"clans", "players", "writer"})
+        self.assertIn("clans_per_second", telemetry["rates"])
+
+
+class ClanCrawlPageCursorTests(SimpleTestCase):
+    def test_clan_listed_on_two_pages_does_not_stall_the_cursor(self):
+        advanced = []
+        cursor = _PageCursor(advanced.append)
+        cursor.add_page(1, [10, 11])
+        cursor.add_page(2, [11, 12])
+
+        for clan_id in (10, 11, 12, 11):
+            cursor.clan_done(clan_id)
+
+        self.assertEqual(advanced, [1, 2])
+
+        cursor.add_page(3, [11, 13])
+        cursor.clan_done(13)
+        cursor.clan_done(11)
+
+        self.assertEqual(advanced, [1, 2, 3])
+
+
 class ActivityDataRefreshTests(TestCase):
     def test_fetch_activity_data_for_missing_player_returns_empty_list(self):
         self.assertEqual(fetch_activity_data("999999"), [])
@@ -152,6 +318,46 @@ class ActivityDataRefreshTests(TestCase):
         mock_update_snapshot_task.assert_called_once_with(player.player_id)
 
 
+class PlayerPreloadTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch("warships.data.update_battle_data")
+    def test_preload_battles_json_only_refreshes_players_missing_battles(self, mock_update_battle_data):
+        for player_id in range(501, 506):
+            Player.objects.create(name=f"Empty{player_id}", player_id=player_id)
+        Player.objects.create(name="Loaded", player_id=506,
+                              battles_json=[{"ship_name": "Yamato"}])
+        Player.objects.create(name="Hidden", player_id=507, is_hidden=True)
+
+        summary = preload_battles_json(workers=2, chunk_size=2)
+
+        self.assertEqual(summary, {"status": "completed", "refreshed": 5, "errors": 0})
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_update_battle_data.call_args_list),
+            [501, 502, 503, 504, 505],
+        )
+        self.assertIsNone(cache.get("warships:preload:cursor:v1:preload_battles_json"))
+
+    @patch("warships.data.update_activity_data")
+    def test_preload_activity_data_resumes_from_cursor_and_counts_errors(self, mock_update_activity_data):
+        players = [
+            Player.objects.create(name=f"Quiet{player_id}", player_id=player_id)
+            for player_id in range(601, 605)
+        ]
+        cache.set("warships:preload:cursor:v1:preload_activity_data",
+                  players[1].id, timeout=None)
+        mock_update_activity_data.side_effect = [None, RuntimeError("boom")]
+
+        summary = preload_activity_data(workers=1, chunk_size=10)
+
+        self.assertEqual(summary, {"status": "completed", "refreshed": 1, "errors": 1})
+        self.assertEqual(
+            [call.args[0] for call in mock_update_activity_data.call_args_list],
+            [603, 604],
+        )
+
+
 class RandomsDataRefreshTests(TestCase):
     @patch("warships.data.update_randoms_data_task.delay")
     @patch("warships.data.update_battle_data_task.delay")
@@ -547,12 +753,12 @@ class RandomsCachePolicyTests(TestCase):
         self.assertEqual(
             player.randoms_json[0]["ship_chart_name"], "Adm. Graf Spee")
 
-    @patch("warships.data._fetch_ship_info")
+    @patch("warships.data.resolve_ship_catalog", return_value={})
     @patch("warships.data._fetch_ship_stats_for_player")
     def test_update_battle_data_keeps_rows_when_ship_metadata_is_missing(
         self,
         mock_fetch_ship_stats_for_player,
-        mock_fetch_ship_info,
+        _mock_resolve_ship_catalog,
     ):
         player = Player.objects.create(
             name="ShipFallbackUser",
@@ -572,7 +778,6 @@ class RandomsCachePolicyTests(TestCase):
                 },
             },
         ]
-        mock_fetch_ship_info.return_value = None
 
         update_battle_data(player.player_id)
         player.refresh_from_db()
@@ -585,6 +790,81 @@ class RandomsCachePolicyTests(TestCase):
         self.assertEqual(player.battles_json[0]["ship_tier"], 0)
 
 
+    @patch("warships.data.resolve_ship_catalog")
+    @patch("warships.data._fetch_ship_stats_for_player")
+    def test_update_battle_data_derives_views_in_one_player_update(
+        self,
+        mock_fetch_ship_stats_for_player,
+        mock_resolve_ship_catalog,
+    ):
+        player = Player.objects.create(
+            name="SinglePassUser",
+            player_id=4462,
+            pvp_battles=30,
+            activity_json=[{"date": "2026-01-01", "battles": 1, "wins": 1}],
+        )
+        mock_fetch_ship_stats_for_player.return_value = [
+            {"ship_id": 1, "battles": 20, "distance": 900,
+             "pvp": {"battles": 20, "wins": 12, "losses": 8, "frags": 18}},
+            {"ship_id": 2, "battles": 10, "distance": 400,
+             "pvp": {"battles": 10, "wins": 4, "losses": 6, "frags": 5}},
+        ]
+        mock_resolve_ship_catalog.return_value = {
+            1: ShipCatalogEntry(1, "Shimakaze", "Shimakaze", 10, "Destroyer"),
+            2: ShipCatalogEntry(2, "Yamato", "Yamato", 10, "Battleship"),
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            update_battle_data(player.player_id)
+
+        player_writes = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith(('UPDATE "warships_player"', 'INSERT INTO "warships_player"'))
+        ]
+        payload_writes = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "warships_playerpayload"')
+        ]
+        self.assertEqual(len(player_writes), 1)
+        self.assertNotIn("_json", player_writes[0])
+        self.assertEqual(len(payload_writes), 1)
+        self.assertEqual(
+            set(PlayerPayload.objects.filter(player=player).values_list("kind", flat=True)),
+            {"activity", "battles", "tiers", "type", "randoms"},
+        )
+
+        player.refresh_from_db()
+        self.assertEqual(player.battles_json[0]["ship_name"], "Shimakaze")
+        tier_ten = next(row for row in player.tiers_json if row["ship_tier"] == 10)
+        self.assertEqual((tier_ten["pvp_battles"], tier_ten["wins"]), (30, 16))
+        self.assertEqual([row["ship_type"] for row in player.type_json], [
+            "Destroyer", "Battleship"])
+        self.assertEqual(player.randoms_json[1]["ship_name"], "Yamato")
+        self.assertEqual(player.tiers_updated_at, player.battles_updated_at)
+        self.assertEqual(PlayerExplorerSummary.objects.get(
+            player=player).ships_played_total, 2)
+
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=datetime.now() - timedelta(hours=2))
+        mock_fetch_ship_stats_for_player.return_value[0]["distance"] = 950
+        with CaptureQueriesContext(connection) as queries:
+            update_battle_data(player.player_id)
+
+        player_writes = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "warships_player"')
+        ]
+        payload_writes = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "warships_playerpayload"')
+        ]
+        self.assertEqual(len(player_writes), 1)
+        self.assertIn('"tiers_updated_at"', player_writes[0])
+        self.assertEqual(len(payload_writes), 1)
+        self.assertIn("'battles'", payload_writes[0])
+        self.assertNotIn("'tiers'", payload_writes[0])
+
+
 class AggregateChartDataTests(TestCase):
     def test_update_tiers_data_aggregates_without_pandas(self):
         player = Player.objects.create(
@@ -1102,7 +1382,7 @@ class RankedDataRefreshTests(TestCase):
         self.assertEqual(hydration_state["max_in_flight"], 1)
         mock_queue_ranked_data_refresh.assert_not_called()
 
-    @patch("warships.tasks.queue_efficiency_data_refresh")
+    @patch("warships.tasks.queue_efficiency_data_refresh_batch")
     @patch("warships.tasks.is_efficiency_data_refresh_pending")
     @patch("warships.tasks.is_efficiency_rank_snapshot_refresh_pending", return_value=False)
     def test_queue_clan_efficiency_hydration_only_enqueues_missing_or_stale_players(
@@ -1134,7 +1414,8 @@ class RankedDataRefreshTests(TestCase):
         )
 
         mock_is_efficiency_data_refresh_pending.side_effect = lambda player_id: player_id == queued_player.player_id
-        mock_queue_efficiency_data_refresh.return_value = {"status": "queued"}
+        mock_queue_efficiency_data_refresh.return_value = {
+            "status": "queued", "queued_player_ids": [7117]}
 
         hydration_state = queue_clan_efficiency_hydration(
             [fresh_player, missing_player, queued_player]
@@ -1143,9 +1424,9 @@ class RankedDataRefreshTests(TestCase):
         self.assertEqual(hydration_state["pending_player_ids"], {7117, 7118})
         self.assertEqual(hydration_state["queued_player_ids"], {7117})
         self.assertEqual(hydration_state["deferred_player_ids"], set())
-        mock_queue_efficiency_data_refresh.assert_called_once_with(7117)
+        mock_queue_efficiency_data_refresh.assert_called_once_with([7117])
 
-    @patch("warships.tasks.queue_efficiency_data_refresh")
+    @patch("warships.tasks.queue_efficiency_data_refresh_batch")
     @patch("warships.tasks.is_efficiency_data_refresh_pending")
     @patch("warships.data.CLAN_EFFICIENCY_HYDRATION_MAX_IN_FLIGHT", 1)
     @patch("warships.tasks.is_efficiency_rank_snapshot_refresh_pending", return_value=False)
@@ -2280,6 +2561,116 @@ class PlayerExplorerSummaryTests(TestCase):
         self.assertTrue(PlayerExplorerSummary.objects.filter(
             player=canonical).exists())
 
+    @patch("warships.data._fetch_player_achievements")
+    @patch("warships.data._fetch_efficiency_badges_for_player")
+    def test_clan_crawl_save_players_bulk_upserts_batch_and_defers_enrichment(
+        self,
+        mock_fetch_efficiency_badges,
+        mock_fetch_player_achievements,
+    ):
+        clan = Clan.objects.create(clan_id=9931, name="BulkClan", tag="BLK")
+        existing = Player.objects.create(name="Before", player_id=9932)
+        PlayerExplorerSummary.objects.create(player=existing, player_score=1.0)
+
+        result = save_players_bulk([
+            {
+                "account_id": 9931,
+                "nickname": "BulkVisible",
+                "last_battle_time": int((timezone.now() - timedelta(days=2)).timestamp()),
+                "hidden_profile": False,
+                "statistics": {
+                    "battles": 500,
+                    "pvp": {"battles": 400, "wins": 220, "losses": 180, "survived_battles": 150},
+                },
+            },
+            {"account_id": 9932, "nickname": "BulkHidden", "hidden_profile": True},
+            None,
+        ], clan)
+
+        self.assertEqual(result["players_saved"], 2)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["enrichment_queued"], 1)
+        self.assertGreater(result["db_round_trips"], 0)
+        visible = Player.objects.get(player_id=9931)
+        self.assertEqual(visible.clan, clan)
+        self.assertEqual(visible.pvp_battles, 400)
+        self.assertEqual(visible.pvp_ratio, 55.0)
+        self.assertEqual(visible.verdict, "Warrior")
+        existing.refresh_from_db()
+        self.assertEqual(existing.name, "BulkHidden")
+        self.assertTrue(existing.is_hidden)
+        self.assertEqual(PlayerExplorerSummary.objects.get(
+            player=visible).battles_last_29_days, 0)
+        self.assertIsNone(PlayerExplorerSummary.objects.get(
+            player=existing).player_score)
+        mock_fetch_efficiency_badges.assert_not_called()
+        mock_fetch_player_achievements.assert_not_called()
+        intent = PlayerEnrichmentIntent.objects.get(player=visible)
+        self.assertEqual(intent.tier, PlayerEnrichmentIntent.TIER_ACTIVE)
+        self.assertIsNone(intent.claimed_at)
+        self.assertFalse(PlayerEnrichmentIntent.objects.filter(
+            player=existing).exists())
+
+    def test_clan_crawl_save_players_bulk_skips_players_whose_stats_did_not_move(self):
+        clan = Clan.objects.create(clan_id=9934, name="DeltaClan", tag="DLT")
+        last_battle_time = int((timezone.now() - timedelta(days=3)).timestamp())
+        payload = {
+            "account_id": 9934,
+            "nickname": "DeltaCaptain",
+            "last_battle_time": last_battle_time,
+            "stats_updated_at": last_battle_time + 60,
+            "hidden_profile": False,
+            "statistics": {"battles": 300, "pvp": {"battles": 250, "wins": 140, "losses": 110, "survived_battles": 80}},
+        }
+
+        first = save_players_bulk([payload], clan)
+        second = save_players_bulk([payload], clan)
+        moved = save_players_bulk(
+            [{**payload, "stats_updated_at": last_battle_time + 120}], clan)
+
+        self.assertEqual((first["players_saved"], first["players_unchanged"]), (1, 0))
+        self.assertEqual((second["players_saved"], second["players_unchanged"]), (0, 1))
+        self.assertEqual((moved["players_saved"], moved["players_unchanged"]), (1, 0))
+        self.assertEqual(
+            [first["enrichment_queued"], second["enrichment_queued"], moved["enrichment_queued"]], [1, 0, 1])
+        self.assertEqual(PlayerEnrichmentIntent.objects.filter(
+            player__player_id=9934).count(), 1)
+        self.assertLess(second["db_round_trips"], first["db_round_trips"])
+
+    @patch("warships.data.update_achievements_data", return_value=[])
+    @patch("warships.data._fetch_efficiency_badges_for_player", return_value=[])
+    def test_clan_crawl_save_player_skips_unchanged_player(self, mock_fetch_efficiency_badges, _mock_update_achievements):
+        clan = Clan.objects.create(clan_id=9935, name="DeltaSingleClan", tag="DSC")
+        last_battle_time = int((timezone.now() - timedelta(days=1)).timestamp())
+        payload = {
+            "account_id": 9935,
+            "nickname": "SteadyCaptain",
+            "last_battle_time": last_battle_time,
+            "stats_updated_at": last_battle_time,
+            "hidden_profile": False,
+            "statistics": {"battles": 200, "pvp": {"battles": 150, "wins": 80, "losses": 70, "survived_battles": 50}},
+        }
+
+        self.assertTrue(save_player(payload, clan))
+        self.assertFalse(save_player(payload, clan))
+        Player.objects.filter(player_id=9935).update(days_since_last_battle=-10)
+        self.assertTrue(save_player(payload, clan))
+
+    def test_clan_crawl_save_players_bulk_round_trips_do_not_grow_with_batch_size(self):
+        clan = Clan.objects.create(clan_id=9933, name="SizedClan", tag="SZ")
+
+        def payloads(start, count):
+            return [{"account_id": start + offset, "nickname": f"p{start + offset}", "hidden_profile": True}
+                    for offset in range(count)]
+
+        save_players_bulk(payloads(93300, 5), clan)
+        save_players_bulk(payloads(93400, 50), clan)
+        small = save_players_bulk(payloads(93300, 5), clan)
+        large = save_players_bulk(payloads(93400, 50), clan)
+
+        self.assertEqual(large["players_saved"], 50)
+        self.assertEqual(small["db_round_trips"], large["db_round_trips"])
+
     @patch("warships.data.update_player_data")
     @patch("warships.data._fetch_clan_member_ids", return_value=[9924])
     def test_update_clan_members_collapses_duplicate_players_by_player_id(
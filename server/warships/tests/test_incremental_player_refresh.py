@@ -2,7 +2,7 @@ import json
 from datetime import timedelta
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 
 from django.core.cache import cache
 from django.core.management import call_command
@@ -247,6 +247,9 @@ class CheckpointTests(TestCase):
             }))
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -256,7 +259,7 @@ class CheckpointTests(TestCase):
                 )
 
             self.assertEqual(mock_refresh.call_count, 1)
-            mock_refresh.assert_called_with(second.id)
+            mock_refresh.assert_called_with(second.id, ANY)
 
     def test_fresh_run_ignores_stale_checkpoint(self):
         """--reset-state forces queue rebuild."""
@@ -276,6 +279,9 @@ class CheckpointTests(TestCase):
             }))
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -315,6 +321,9 @@ class ErrorBudgetTests(TestCase):
             }))
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player',
                 side_effect=Exception('API down'),
             ):
@@ -333,6 +342,110 @@ class ErrorBudgetTests(TestCase):
             )
 
 
+class ChunkedFetchTests(TestCase):
+    """Tests for bulk account/info fetching across queued players."""
+
+    def _write_state(self, state_path, pending_ids, failed_ids=None):
+        state_path.write_text(json.dumps({
+            'version': 1,
+            'pending_player_ids': pending_ids,
+            'next_index': 0,
+            'processed_total': 0,
+            'succeeded_total': 0,
+            'error_total': 0,
+            'failed_player_ids': failed_ids or [],
+            'tier_counts': {'hot': 0, 'active': len(pending_ids), 'warm': 0},
+        }))
+
+    @patch('warships.management.commands.incremental_player_refresh.save_player')
+    @patch('warships.management.commands.incremental_player_refresh.fetch_players_bulk')
+    def test_queue_is_fetched_with_one_bulk_call_per_chunk(self, mock_fetch, mock_save):
+        """Five queued players with --chunk-size 2 take three account/info calls."""
+        players = [
+            Player.objects.create(
+                name=f'Chunk{i}', player_id=77000 + i, is_hidden=True)
+            for i in range(5)
+        ]
+        mock_fetch.side_effect = lambda ids: {
+            str(pid): {'account_id': pid, 'hidden_profile': True} for pid in ids
+        }
+
+        with TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / 'state.json'
+            self._write_state(state_path, [p.id for p in players])
+
+            call_command(
+                'incremental_player_refresh',
+                '--state-file', str(state_path),
+                '--chunk-size', '2',
+                '--limit', '10',
+            )
+
+            state = json.loads(state_path.read_text())
+
+        self.assertEqual(
+            [call.args[0] for call in mock_fetch.call_args_list],
+            [[77000, 77001], [77002, 77003], [77004]],
+        )
+        self.assertEqual(mock_save.call_count, 5)
+        self.assertEqual(state['succeeded_total'], 5)
+        self.assertEqual(state['failed_player_ids'], [])
+
+    @patch('warships.management.commands.incremental_player_refresh.save_player')
+    @patch('warships.management.commands.incremental_player_refresh.fetch_players_bulk')
+    def test_chunk_respects_remaining_limit(self, mock_fetch, mock_save):
+        """A chunk never requests more players than the run limit allows."""
+        players = [
+            Player.objects.create(
+                name=f'Limit{i}', player_id=77100 + i, is_hidden=True)
+            for i in range(5)
+        ]
+        mock_fetch.side_effect = lambda ids: {
+            str(pid): {'account_id': pid, 'hidden_profile': True} for pid in ids
+        }
+
+        with TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / 'state.json'
+            self._write_state(state_path, [p.id for p in players])
+
+            call_command(
+                'incremental_player_refresh',
+                '--state-file', str(state_path),
+                '--limit', '3',
+            )
+
+            state = json.loads(state_path.read_text())
+
+        mock_fetch.assert_called_once_with([77100, 77101, 77102])
+        self.assertEqual(state['next_index'], 3)
+
+    @patch('warships.management.commands.incremental_player_refresh.save_player')
+    @patch('warships.management.commands.incremental_player_refresh.fetch_players_bulk', return_value={})
+    def test_failed_bulk_fetch_marks_chunk_for_retry(self, mock_fetch, mock_save):
+        """An empty bulk response records every player in the chunk as failed."""
+        players = [
+            Player.objects.create(name=f'Down{i}', player_id=77200 + i)
+            for i in range(3)
+        ]
+
+        with TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / 'state.json'
+            self._write_state(state_path, [p.id for p in players])
+
+            call_command(
+                'incremental_player_refresh',
+                '--state-file', str(state_path),
+                '--limit', '10',
+            )
+
+            state = json.loads(state_path.read_text())
+
+        mock_fetch.assert_called_once()
+        mock_save.assert_not_called()
+        self.assertEqual(state['error_total'], 3)
+        self.assertEqual(state['failed_player_ids'], [p.id for p in players])
+
+
 class LockExclusionTests(TestCase):
     """Tests for lock exclusion with clan crawl."""
 
@@ -356,6 +469,9 @@ class LockExclusionTests(TestCase):
             state_path = Path(temp_dir) / 'state.json'
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -377,6 +493,9 @@ class LockExclusionTests(TestCase):
             state_path = Path(temp_dir) / 'state.json'
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -412,6 +531,9 @@ class RetryTests(TestCase):
             }))
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -442,6 +564,9 @@ class DryRunTests(TestCase):
             state_path = Path(temp_dir) / 'state.json'
 
             with patch(
+                'warships.management.commands.incremental_player_refresh._fetch_player_chunk',
+                return_value={},
+            ), patch(
                 'warships.management.commands.incremental_player_refresh._refresh_player'
             ) as mock_refresh:
                 call_command(
@@ -428,3 +428,22 @@ class EntityVisitMaintenanceCommandTests(TestCase):
         self.assertEqual(payload['status'], 'completed')
         self.assertEqual(EntityVisitEvent.objects.count(), 1)
         self.assertEqual(EntityVisitDaily.objects.count(), 1)
+
+
+class BenchmarkBattleRowsCommandTests(TestCase):
+    def test_command_reports_both_formats_for_synthetic_rows(self):
+        stdout = StringIO()
+
+        with TemporaryDirectory() as output_dir:
+            output_path = Path(output_dir) / 'battle_rows.json'
+            call_command('benchmark_battle_rows', synthetic=True, players=3,
+                         ships_per_player=20, repeat=1,
+                         json_output=str(output_path), stdout=stdout)
+            results = json.loads(output_path.read_text())['results']
+
+        self.assertEqual([row['format'] for row in results],
+                         ['legacy', 'encoded_v1'])
+        self.assertTrue(all(row['ships'] == 60 for row in results))
+        self.assertLess(results[1]['bytes_per_player'],
+                        results[0]['bytes_per_player'])
+        self.assertIn('Battle rows benchmark complete.', stdout.getvalue())
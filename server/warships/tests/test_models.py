@@ -1,6 +1,9 @@
 from django.test import TestCase
 
-from warships.models import Player
+from warships.battle_rows import BATTLE_ROW_FIELDS, BattleRow
+from warships.models import Player, PlayerPayload, PlayerShipStat
+from warships.player_payloads import attach_player_payloads, has_payload, prefetch_player_payloads
+from warships.player_ship_stats import fetch_tier_filtered_pvp_records, fetch_tier_type_population, sync_player_ship_stats
 
 
 class PlayerModelTests(TestCase):
@@ -8,3 +11,184 @@ class PlayerModelTests(TestCase):
         player = Player.objects.create(name="SoloPlayer", player_id=1001)
 
         self.assertEqual(str(player), "SoloPlayer (1001) No Clan")
+
+
+class PlayerPayloadTests(TestCase):
+    def test_payloads_round_trip_through_the_side_table(self):
+        player = Player.objects.create(
+            name="PayloadPlayer",
+            player_id=1002,
+            battles_json=[{"ship_name": "Yamato", "pvp_battles": 10}],
+            ranked_json=None,
+        )
+
+        self.assertEqual(set(PlayerPayload.objects.filter(
+            player=player).values_list("kind", flat=True)), {"battles"})
+
+        stored = Player.objects.get(pk=player.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(stored.battles_json[0]["ship_name"], "Yamato")
+        with self.assertNumQueries(1):
+            self.assertIsNone(stored.ranked_json)
+        with self.assertNumQueries(0):
+            stored.battles_json
+
+    def test_save_with_payload_update_fields_skips_the_player_row(self):
+        player = Player.objects.create(name="EfficiencyPlayer", player_id=1003)
+        player.efficiency_json = [{"ship_id": 1, "top_grade_class": 1}]
+        player.name = "Unsaved"
+
+        player.save(update_fields=["efficiency_json"])
+
+        player.refresh_from_db()
+        self.assertEqual(player.name, "EfficiencyPlayer")
+        self.assertEqual(player.efficiency_json[0]["ship_id"], 1)
+
+        player.efficiency_json = None
+        player.save()
+        self.assertFalse(PlayerPayload.objects.filter(player=player).exists())
+
+    def test_full_save_only_writes_assigned_payloads(self):
+        player = Player.objects.create(
+            name="DirtyPlayer", player_id=1004, tiers_json=[{"ship_tier": 8}])
+        stored = Player.objects.get(pk=player.pk)
+        stored.tiers_json
+        stored.name = "Renamed"
+
+        with self.assertNumQueries(1):
+            stored.save()
+
+    def test_prefetch_and_attach_load_many_players_in_one_query(self):
+        players = [
+            Player.objects.create(name=f"Bulk{index}", player_id=1010 + index,
+                                  ranked_json=[{"season_id": index}])
+            for index in range(3)
+        ]
+        stored = list(Player.objects.filter(pk__in=[p.pk for p in players]))
+
+        with self.assertNumQueries(1):
+            prefetch_player_payloads(stored, ("ranked", "efficiency"))
+        with self.assertNumQueries(0):
+            self.assertEqual(sorted(p.ranked_json[0]["season_id"] for p in stored), [0, 1, 2])
+            self.assertTrue(all(p.efficiency_json is None for p in stored))
+
+        rows = list(Player.objects.filter(
+            pk__in=[p.pk for p in players]).values("player_id"))
+        with self.assertNumQueries(1):
+            attach_player_payloads(rows, ("ranked",), key="player_id")
+        self.assertEqual({row["player_id"]: row["ranked_json"][0]["season_id"]
+                          for row in rows}, {1010: 0, 1011: 1, 1012: 2})
+
+    def test_has_payload_filters_on_stored_kinds(self):
+        Player.objects.create(name="Ranked", player_id=1020, ranked_json=[{"season_id": 1}])
+        Player.objects.create(name="EmptyRanked", player_id=1021, ranked_json=[])
+        Player.objects.create(name="NoRanked", player_id=1022)
+
+        self.assertEqual(set(Player.objects.filter(has_payload("ranked")).values_list(
+            "name", flat=True)), {"Ranked", "EmptyRanked"})
+        self.assertEqual(set(Player.objects.filter(~has_payload("ranked", non_empty=True)).values_list(
+            "name", flat=True)), {"EmptyRanked", "NoRanked"})
+
+
+
+def _battle_row(ship_id, pvp_battles):
+    row = {field: None for field in BATTLE_ROW_FIELDS}
+    row.update(ship_id=ship_id, ship_name=f"Ship {ship_id}", ship_tier=10,
+               ship_type="Destroyer", pvp_battles=pvp_battles, wins=pvp_battles // 2)
+    return row
+
+
+class BattleRowEncodingTests(TestCase):
+    def test_battle_rows_are_stored_compactly_and_read_back_as_rows(self):
+        rows = [_battle_row(1, 40), _battle_row(2, 10)]
+        player = Player.objects.create(
+            name="EncodedPlayer", player_id=1201, battles_json=rows)
+
+        stored = PlayerPayload.objects.get(player=player, kind="battles").data
+        self.assertEqual(stored["v"], 1)
+        self.assertEqual(stored["rows"][0], [rows[0][field]
+                         for field in BATTLE_ROW_FIELDS])
+
+        loaded = Player.objects.get(pk=player.pk).battles_json
+        self.assertIsInstance(loaded[0], BattleRow)
+        self.assertEqual(loaded, rows)
+        self.assertEqual(loaded[0]["pvp_battles"], 40)
+        self.assertIsNone(loaded[0].get("unknown"))
+        self.assertEqual(dict(loaded[1]), rows[1])
+
+    def test_rows_outside_the_schema_are_stored_as_plain_rows(self):
+        rows = [{"ship_tier": 8, "pvp_battles": 12, "wins": 6}]
+        player = Player.objects.create(
+            name="PartialRows", player_id=1202, battles_json=rows)
+
+        self.assertEqual(PlayerPayload.objects.get(
+            player=player, kind="battles").data, rows)
+        self.assertEqual(Player.objects.get(pk=player.pk).battles_json, rows)
+
+
+class PlayerShipStatTests(TestCase):
+    def test_sync_writes_only_changed_ships_and_deletes_dropped_ones(self):
+        player = Player.objects.create(name="StatPlayer", player_id=1101)
+        rows = [
+            {"ship_id": 1, "ship_tier": 10, "ship_type": "Destroyer",
+                "pvp_battles": 40, "wins": 24, "kdr": 1.5},
+            {"ship_id": 2, "ship_tier": 8, "ship_type": "Cruiser",
+                "pvp_battles": 20, "wins": 10, "kdr": 0.8},
+            {"ship_id": 3, "ship_tier": 6, "ship_type": "Battleship",
+                "pvp_battles": 0, "wins": 0, "kdr": 0},
+        ]
+
+        result = sync_player_ship_stats(player, rows, frags_by_ship={1: 61})
+
+        self.assertEqual(result, {"written": 2, "deleted": 0, "unchanged": 0})
+        self.assertEqual(
+            dict(PlayerShipStat.objects.filter(
+                player=player).values_list("ship_id", "frags")),
+            {1: 61, 2: 16},
+        )
+
+        rows[0] = {**rows[0], "pvp_battles": 41, "wins": 25}
+        result = sync_player_ship_stats(player, rows[:1])
+
+        self.assertEqual(result, {"written": 1, "deleted": 1, "unchanged": 0})
+        stat = PlayerShipStat.objects.get(player=player)
+        self.assertEqual((stat.ship_id, stat.pvp_battles, stat.wins), (1, 41, 25))
+
+        with self.assertNumQueries(1):
+            result = sync_player_ship_stats(player, rows[:1], frags_by_ship={1: stat.frags})
+        self.assertEqual(result, {"written": 0, "deleted": 0, "unchanged": 1})
+
+    def test_population_queries_aggregate_visible_players(self):
+        visible = Player.objects.create(
+            name="Visible", player_id=1102, pvp_battles=500)
+        other = Player.objects.create(
+            name="Other", player_id=1103, pvp_battles=800)
+        hidden = Player.objects.create(
+            name="Hidden", player_id=1104, pvp_battles=900, is_hidden=True)
+        sync_player_ship_stats(visible, [
+            {"ship_id": 1, "ship_tier": 10, "ship_type": "Destroyer",
+                "pvp_battles": 40, "wins": 24},
+            {"ship_id": 2, "ship_tier": 4, "ship_type": "Cruiser",
+                "pvp_battles": 60, "wins": 50},
+        ])
+        sync_player_ship_stats(other, [
+            {"ship_id": 1, "ship_tier": 10, "ship_type": "Destroyer",
+                "pvp_battles": 15, "wins": 8},
+        ])
+        sync_player_ship_stats(hidden, [
+            {"ship_id": 1, "ship_tier": 10, "ship_type": "Destroyer",
+                "pvp_battles": 100, "wins": 60},
+        ])
+
+        cells, tracked_population = fetch_tier_type_population(100)
+
+        self.assertEqual(tracked_population, 2)
+        self.assertEqual(
+            {(cell["ship_type"], cell["ship_tier"]): cell["pvp_battles"]
+             for cell in cells},
+            {("Destroyer", 10): 55, ("Cruiser", 4): 60},
+        )
+        self.assertEqual(
+            fetch_tier_filtered_pvp_records([1102, 1103, 1199]),
+            {1102: (40, 60.0), 1103: (15, 53.33), 1199: (0, None)},
+        )
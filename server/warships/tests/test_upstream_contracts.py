@@ -7,6 +7,7 @@ from django.test import SimpleTestCase
 
 from warships.api import clans as clans_api
 from warships.api import players as players_api
+from warships.api import ships as ships_api
 
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -56,14 +57,21 @@ def _documented_response_paths(contract: dict) -> set[str]:
 
 
 def _requested_field_paths(func: object) -> set[str]:
-    source = inspect.getsource(func)
-    match = re.search(r'["\']fields["\']\s*:\s*["\']([^"\']+)["\']', source)
-    if not match:
-        return set()
+    # Batched fetches declare their fields on the shared account loader.
+    loader_params = getattr(func, "params", None)
+    if isinstance(loader_params, dict):
+        fields = str(loader_params.get("fields") or "")
+    else:
+        source = inspect.getsource(func)
+        match = re.search(
+            r'["\']fields["\']\s*:\s*["\']([^"\']+)["\']', source)
+        if not match:
+            return set()
+        fields = match.group(1)
 
     return {
         field.strip()
-        for field in match.group(1).split(",")
+        for field in fields.split(",")
         if field.strip()
     }
 
@@ -91,7 +99,7 @@ class UpstreamContractAlignmentTests(SimpleTestCase):
         contract = _load_contract("wows-account-achievements.yaml")
         documented_paths = _documented_response_paths(contract)
         requested_paths = _requested_field_paths(
-            players_api._fetch_player_achievements)
+            players_api.ACHIEVEMENTS_LOADER)
 
         self.assertTrue(requested_paths)
         self.assertTrue(requested_paths.issubset(documented_paths))
@@ -100,7 +108,16 @@ class UpstreamContractAlignmentTests(SimpleTestCase):
         contract = _load_contract("wows-clans-accountinfo.yaml")
         documented_paths = _documented_response_paths(contract)
         requested_paths = _requested_field_paths(
-            clans_api._fetch_clan_membership_for_player)
+            clans_api.CLAN_MEMBERSHIP_LOADER)
+
+        self.assertTrue(requested_paths)
+        self.assertTrue(requested_paths.issubset(documented_paths))
+
+    def test_ships_stats_requested_fields_exist_in_contract(self):
+        contract = _load_contract("wows-ships-stats.yaml")
+        documented_paths = _documented_response_paths(contract)
+        requested_paths = _requested_field_paths(
+            ships_api._fetch_ship_stats_for_player)
 
         self.assertTrue(requested_paths)
         self.assertTrue(requested_paths.issubset(documented_paths))
@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from warships.data import _save_battle_views, update_battle_data, update_player_data, update_ranked_data
+from warships.models import Player, PlayerShipStat, PlayerUpstreamFingerprint, Ship
+from warships.upstream_fingerprints import RESOURCE_SHIP_STATS, get_upstream_fingerprint_stats, payload_fingerprint
+
+
+SHIP_STATS = [
+    {
+        "ship_id": 999001,
+        "battles": 20,
+        "distance": 1000,
+        "pvp": {"battles": 20, "wins": 12, "losses": 8, "frags": 18},
+    },
+]
+
+SHIP_CATALOG = {
+    999001: Ship(ship_id=999001, name="Steady", chart_name="Steady",
+                 nation="usa", ship_type="Cruiser", tier=8),
+}
+
+RANK_INFO = {
+    "rank_info": {
+        "1100": {"1": {"1": {"battles": 7, "victories": 4, "rank": 5, "best_rank_in_sprint": 5}}},
+    },
+}
+
+
+class UpstreamFingerprintTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_payload_fingerprint_ignores_key_order(self):
+        self.assertEqual(
+            payload_fingerprint({"a": 1, "b": [1, 2]}),
+            payload_fingerprint({"b": [1, 2], "a": 1}),
+        )
+        self.assertNotEqual(
+            payload_fingerprint({"a": 1}),
+            payload_fingerprint({"a": 2}),
+        )
+
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data._save_battle_views", side_effect=_save_battle_views)
+    @patch("warships.data.resolve_ship_catalog", return_value=SHIP_CATALOG)
+    @patch("warships.data._fetch_ship_stats_for_player", return_value=SHIP_STATS)
+    def test_unchanged_ship_stats_only_bump_freshness(
+        self,
+        _mock_fetch_ship_stats,
+        _mock_resolve_ship_catalog,
+        mock_save_battle_views,
+        mock_refresh_summary,
+    ):
+        player = Player.objects.create(
+            name="SteadyCaptain", player_id=8801, pvp_battles=20)
+
+        update_battle_data(player.player_id)
+        self.assertEqual(mock_save_battle_views.call_count, 1)
+        self.assertTrue(PlayerUpstreamFingerprint.objects.filter(
+            player=player, resource=RESOURCE_SHIP_STATS).exists())
+
+        stale_at = datetime.now() - timedelta(hours=2)
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=stale_at)
+
+        update_battle_data(player.player_id)
+        player.refresh_from_db()
+
+        self.assertEqual(mock_save_battle_views.call_count, 1)
+        self.assertEqual(mock_refresh_summary.call_count, 1)
+        self.assertGreater(player.battles_updated_at, stale_at)
+        stats = get_upstream_fingerprint_stats()[RESOURCE_SHIP_STATS]
+        self.assertEqual(stats["checked"], 1)
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(stats["skip_rate"], 1.0)
+
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data.resolve_ship_catalog", return_value=SHIP_CATALOG)
+    @patch("warships.data._fetch_ship_stats_for_player", return_value=SHIP_STATS)
+    def test_unchanged_ship_stats_correct_backfilled_frags(
+        self,
+        _mock_fetch_ship_stats,
+        _mock_resolve_ship_catalog,
+        _mock_refresh_summary,
+    ):
+        player = Player.objects.create(
+            name="BackfilledCaptain", player_id=8804, pvp_battles=20)
+        update_battle_data(player.player_id)
+        # As left by the migration backfill: frags rebuilt from the kdr.
+        PlayerShipStat.objects.filter(player=player).update(frags=17)
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=datetime.now() - timedelta(hours=2))
+
+        update_battle_data(player.player_id)
+
+        self.assertEqual(
+            PlayerShipStat.objects.get(player=player, ship_id=999001).frags, 18)
+        self.assertEqual(
+            get_upstream_fingerprint_stats()[RESOURCE_SHIP_STATS]["unchanged"], 1)
+
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data.resolve_ship_catalog", return_value=SHIP_CATALOG)
+    @patch("warships.data._fetch_ship_stats_for_player")
+    def test_changed_ship_stats_rebuild_battle_rows(
+        self,
+        mock_fetch_ship_stats,
+        _mock_resolve_ship_catalog,
+        _mock_refresh_summary,
+    ):
+        player = Player.objects.create(
+            name="ActiveCaptain", player_id=8802, pvp_battles=20)
+        mock_fetch_ship_stats.return_value = SHIP_STATS
+        update_battle_data(player.player_id)
+
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=datetime.now() - timedelta(hours=2))
+        mock_fetch_ship_stats.return_value = [
+            {**SHIP_STATS[0], "battles": 21,
+                "pvp": {"battles": 21, "wins": 13, "losses": 8, "frags": 19}},
+        ]
+        update_battle_data(player.player_id)
+        player.refresh_from_db()
+
+        self.assertEqual(player.battles_json[0]["pvp_battles"], 21)
+        self.assertEqual(
+            get_upstream_fingerprint_stats()[RESOURCE_SHIP_STATS]["unchanged"], 0)
+
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data.resolve_ship_catalog")
+    @patch("warships.data._fetch_ship_stats_for_player", return_value=SHIP_STATS)
+    def test_placeholder_ship_rows_are_not_fingerprinted(
+        self,
+        _mock_fetch_ship_stats,
+        mock_resolve_ship_catalog,
+        _mock_refresh_summary,
+    ):
+        player = Player.objects.create(
+            name="NewShipCaptain", player_id=8803, pvp_battles=20)
+        mock_resolve_ship_catalog.return_value = {}
+        update_battle_data(player.player_id)
+        player.refresh_from_db()
+
+        self.assertEqual(player.battles_json[0]["ship_tier"], 0)
+        self.assertFalse(PlayerUpstreamFingerprint.objects.filter(
+            player=player, resource=RESOURCE_SHIP_STATS).exists())
+
+        # Same upstream payload once the catalog has caught up.
+        Player.objects.filter(pk=player.pk).update(
+            battles_updated_at=datetime.now() - timedelta(hours=2))
+        mock_resolve_ship_catalog.return_value = SHIP_CATALOG
+        update_battle_data(player.player_id)
+        player.refresh_from_db()
+
+        self.assertEqual(player.battles_json[0]["ship_name"], "Steady")
+        self.assertEqual(
+            PlayerShipStat.objects.get(player=player, ship_id=999001).ship_tier, 8)
+        self.assertTrue(PlayerUpstreamFingerprint.objects.filter(
+            player=player, resource=RESOURCE_SHIP_STATS).exists())
+
+    @patch("warships.landing.invalidate_landing_player_caches")
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data.update_player_efficiency_data")
+    @patch("warships.data._fetch_clan_membership_for_player", return_value={})
+    @patch("warships.data._fetch_player_personal_data")
+    def test_unchanged_account_info_skips_derived_writes_and_invalidation(
+        self,
+        mock_fetch_personal_data,
+        _mock_fetch_clan_membership,
+        _mock_update_efficiency,
+        mock_refresh_summary,
+        mock_invalidate_landing,
+    ):
+        player = Player.objects.create(name="", player_id=8803)
+        mock_fetch_personal_data.return_value = {
+            "account_id": 8803,
+            "nickname": "QuietCaptain",
+            "hidden_profile": True,
+            "last_battle_time": int((datetime.now() - timedelta(days=3)).timestamp()),
+        }
+
+        update_player_data(player, force_refresh=True)
+        update_player_data(player, force_refresh=True)
+        player.refresh_from_db()
+
+        self.assertEqual(player.name, "QuietCaptain")
+        self.assertEqual(mock_refresh_summary.call_count, 1)
+        self.assertEqual(mock_invalidate_landing.call_count, 1)
+        self.assertIsNotNone(player.last_fetch)
+
+    @patch("warships.data.refresh_player_explorer_summary")
+    @patch("warships.data._fetch_ranked_ship_stats_for_player", return_value=[])
+    @patch("warships.data._fetch_ranked_account_info", return_value=RANK_INFO)
+    @patch("warships.data._get_ranked_seasons_metadata", return_value={})
+    def test_unchanged_rank_info_skips_ranked_ship_stats_fetch(
+        self,
+        _mock_seasons_metadata,
+        _mock_fetch_ranked_account_info,
+        mock_fetch_ranked_ship_stats,
+        _mock_refresh_summary,
+    ):
+        player = Player.objects.create(name="RankedRegular", player_id=8804)
+
+        update_ranked_data(player.player_id)
+        update_ranked_data(player.player_id)
+
+        self.assertEqual(mock_fetch_ranked_ship_stats.call_count, 1)
+        self.assertEqual(
+            get_upstream_fingerprint_stats()["rank_info"]["unchanged"], 1)
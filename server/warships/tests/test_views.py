@@ -8,10 +8,22 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from warships.landing import LANDING_CLANS_BEST_CACHE_KEY, LANDING_CLANS_CACHE_KEY, LANDING_RECENT_CLANS_CACHE_KEY, LANDING_RECENT_PLAYERS_CACHE_KEY, LANDING_RECENT_PLAYERS_DIRTY_KEY, landing_player_cache_key, warm_landing_page_content
-from warships.models import Player, Clan, PlayerExplorerSummary
+from warships.models import Player, Clan, PlayerExplorerSummary, PlayerPayload
+from warships.player_payloads import has_payload
+from warships.player_ship_stats import sync_player_ship_stats
 from warships.views import PUBLIC_API_THROTTLES, landing_players, _missing_player_lookup_cache_key
 
 
+def _store_fixture_ship_stats():
+    # Fixture battle rows carry no ship ids; number them so each row
+    # becomes its own PlayerShipStat like a refresh would store it.
+    for player in Player.objects.filter(has_payload('battles')):
+        sync_player_ship_stats(player, [
+            {"ship_id": index + 1, **row}
+            for index, row in enumerate(player.battles_json)
+        ])
+
+
 class PlayerViewSetTests(TestCase):
     @patch("warships.views.update_clan_members_task.delay")
     @patch("warships.views.update_clan_data_task.delay")
@@ -1773,6 +1785,7 @@ class ApiContractTests(TestCase):
             shrunken_efficiency_strength=0.44,
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1811,6 +1824,7 @@ class ApiContractTests(TestCase):
             player_score=8.1,
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1836,6 +1850,7 @@ class ApiContractTests(TestCase):
             ],
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1861,6 +1876,7 @@ class ApiContractTests(TestCase):
             ],
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1940,6 +1956,7 @@ class ApiContractTests(TestCase):
             ],
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1966,6 +1983,7 @@ class ApiContractTests(TestCase):
                 ],
             )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -1987,6 +2005,7 @@ class ApiContractTests(TestCase):
             ],
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get("/api/landing/players/?mode=best&limit=40")
 
         self.assertEqual(response.status_code, 200)
@@ -2999,6 +3018,7 @@ class ApiContractTests(TestCase):
             ],
         )
 
+        _store_fixture_ship_stats()
         response = self.client.get(
             "/api/fetch/player_correlation/tier_type/8831/")
 
@@ -3678,6 +3698,40 @@ class ApiThrottleTests(TestCase):
         self.assertIn("X-Randoms-Updated-At", response)
         mock_fetch_randoms_data.assert_called_once_with("654")
 
+    @patch("warships.views.fetch_randoms_data")
+    def test_randoms_data_all_reads_encoded_battle_rows(self, mock_fetch_randoms_data):
+        battles = [
+            {
+                "ship_id": 4001, "ship_name": "Encoded Cruiser", "ship_chart_name": "Encoded Cruiser",
+                "ship_tier": 10, "all_battles": 120, "distance": 15000, "wins": 66, "losses": 54,
+                "ship_type": "Cruiser", "pve_battles": 0, "pvp_battles": 120, "win_ratio": 0.55, "kdr": 1.2,
+            },
+            {
+                "ship_id": 4002, "ship_name": "Encoded Destroyer", "ship_chart_name": "Encoded Destroyer",
+                "ship_tier": 8, "all_battles": 45, "distance": 6000, "wins": 20, "losses": 25,
+                "ship_type": "Destroyer", "pve_battles": 0, "pvp_battles": 45, "win_ratio": 0.44, "kdr": 0.9,
+            },
+        ]
+        player = Player.objects.create(
+            name="EncodedRows",
+            player_id=655,
+            battles_json=battles,
+            randoms_updated_at=timezone.now(),
+        )
+        mock_fetch_randoms_data.return_value = []
+
+        self.assertEqual(
+            PlayerPayload.objects.get(player=player, kind="battles").data["v"], 1)
+
+        response = self.client.get("/api/fetch/randoms_data/655/?all=true")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["ship_name"], row["ship_tier"], row["pvp_battles"], row["wins"])
+             for row in response.json()],
+            [("Encoded Cruiser", 10, 120, 66), ("Encoded Destroyer", 8, 45, 20)],
+        )
+
     @patch("warships.views.is_clan_battle_summary_refresh_pending", return_value=True)
     @patch("warships.tasks.queue_clan_battle_summary_refresh")
     def test_clan_battle_seasons_flags_pending_refresh_on_empty_cache(self, mock_queue_refresh, _mock_pending):
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+from typing import Any
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from warships.models import Player, PlayerUpstreamFingerprint
+
+
+logger = logging.getLogger(__name__)
+
+# Refresh pipelines fingerprint the raw upstream payload for each resource.
+# When it matches the stored fingerprint the derived rows are still valid, so
+# the caller only bumps its freshness timestamp instead of rebuilding them.
+
+RESOURCE_SHIP_STATS = 'ships/stats'
+RESOURCE_ACCOUNT_INFO = 'account/info'
+RESOURCE_RANK_INFO = 'rank_info'
+RESOURCE_BADGES = 'badges'
+RESOURCE_ACHIEVEMENTS = 'achievements'
+UPSTREAM_FINGERPRINT_RESOURCES = (
+    RESOURCE_SHIP_STATS,
+    RESOURCE_ACCOUNT_INFO,
+    RESOURCE_RANK_INFO,
+    RESOURCE_BADGES,
+    RESOURCE_ACHIEVEMENTS,
+)
+UPSTREAM_FINGERPRINT_STATS_PREFIX = 'upstream:fingerprint:stats:v1'
+
+
+def payload_fingerprint(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True,
+                         separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _stats_key(resource: str, counter: str) -> str:
+    return f'{UPSTREAM_FINGERPRINT_STATS_PREFIX}:{resource}:{counter}'
+
+
+def _record_check(resource: str, unchanged: bool) -> None:
+    counters = ('checked', 'unchanged') if unchanged else ('checked',)
+    for counter in counters:
+        counter_key = _stats_key(resource, counter)
+        try:
+            if not cache.add(counter_key, 1, timeout=None):
+                cache.incr(counter_key)
+        except Exception as error:
+            logger.debug('Unable to record fingerprint stats: %s', error)
+
+
+def upstream_payload_unchanged(player: Player, resource: str, fingerprint: str) -> bool:
+    """Return True when the stored fingerprint for this resource matches.
+
+    A match also refreshes the fingerprint's checked_at timestamp. A miss
+    leaves the stored fingerprint alone; callers store the new one with
+    store_upstream_fingerprint once the derived writes have succeeded.
+    """
+    unchanged = PlayerUpstreamFingerprint.objects.filter(
+        player=player,
+        resource=resource,
+        fingerprint=fingerprint,
+    ).update(checked_at=timezone.now()) > 0
+    _record_check(resource, unchanged)
+    return unchanged
+
+
+def store_upstream_fingerprint(player: Player, resource: str, fingerprint: str) -> None:
+    now = timezone.now()
+    PlayerUpstreamFingerprint.objects.update_or_create(
+        player=player,
+        resource=resource,
+        defaults={
+            'fingerprint': fingerprint,
+            'checked_at': now,
+            'changed_at': now,
+        },
+    )
+
+
+def get_upstream_fingerprint_stats() -> dict[str, Any]:
+    keys = {
+        (resource, counter): _stats_key(resource, counter)
+        for resource in UPSTREAM_FINGERPRINT_RESOURCES
+        for counter in ('checked', 'unchanged')
+    }
+    try:
+        raw = cache.get_many(list(keys.values()))
+    except Exception as error:
+        logger.warning('Unable to read fingerprint stats: %s', error)
+        raw = {}
+
+    stats: dict[str, Any] = {}
+    for resource in UPSTREAM_FINGERPRINT_RESOURCES:
+        checked = int(raw.get(keys[(resource, 'checked')]) or 0)
+        unchanged = int(raw.get(keys[(resource, 'unchanged')]) or 0)
+        stats[resource] = {
+            'checked': checked,
+            'unchanged': unchanged,
+            'skip_rate': round(unchanged / checked, 4) if checked else None,
+        }
+    return stats
+
@@ -15,7 +15,18 @@ from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from django.utils import timezone
 from warships.models import Player, Clan, Ship
+from warships.player_payloads import prefetch_player_payloads
+from warships.api.batching import get_account_batching_stats
+from warships.api.circuit_breaker import get_circuit_breaker, get_circuit_breaker_stats, upstream_degraded
+from warships.api.client import get_single_flight_stats
+from warships.api.metrics import get_upstream_metrics
 from warships.api.players import _fetch_player_id_by_name
+from warships.api.rate_limit import get_rate_limit_stats
+from warships.crawl_telemetry import get_crawl_telemetry
+from warships.enrichment_queue import get_enrichment_backlog_stats
+from warships.exceptions import UpstreamUnavailable
+from warships.refresh_profile import get_refresh_profiles
+from warships.upstream_fingerprints import get_upstream_fingerprint_stats
 from warships.serializers import PlayerSerializer, ClanSerializer, ShipSerializer, ActivityDataSerializer, \
     TierDataSerializer, TypeDataSerializer, RandomsDataSerializer, ClanDataSerializer, ClanMemberSerializer, \
     RankedDataSerializer, ClanBattleSeasonSummarySerializer, PlayerClanBattleSeasonSerializer, PlayerSummarySerializer, PlayerExplorerRowSerializer, \
@@ -115,6 +126,12 @@ class PlayerViewSet(viewsets.ModelViewSet):
             if cache.get(missing_lookup_cache_key):
                 raise Http404("Player matching query does not exist.")
 
+            if upstream_degraded():
+                # Nothing stored to serve and no name lookup possible; fail
+                # fast instead of holding a worker on a failing upstream.
+                raise UpstreamUnavailable(
+                    wait=get_circuit_breaker().retry_after_seconds())
+
             player_id = _fetch_player_id_by_name(normalized_lookup_value)
             if not player_id:
                 cache.set(missing_lookup_cache_key, True,
@@ -131,6 +148,10 @@ class PlayerViewSet(viewsets.ModelViewSet):
             update_player_data(player=obj, force_refresh=True)
             obj.refresh_from_db()
 
+        # Rendered payloads plus the ones the explorer summary check reads.
+        prefetch_player_payloads(
+            [obj], ('battles', 'activity', 'efficiency', 'randoms', 'ranked'))
+
         needs_efficiency_refresh = (
             not obj.is_hidden and
             obj.efficiency_json is None and
@@ -527,6 +548,7 @@ def clan_members(request, clan_id: str) -> Response:
         *_player_score_ordering('last_battle_date'))
 
     members = list(members)
+    prefetch_player_payloads(members, ('ranked', 'efficiency'))
     hydration_state = queue_clan_ranked_hydration(members)
     pending_player_ids = hydration_state['pending_player_ids']
     efficiency_hydration_state = queue_clan_efficiency_hydration(members)
@@ -737,6 +759,34 @@ def db_stats(request) -> Response:
     return Response(data)
 
 
+@api_view(["GET"])
+@throttle_classes(PUBLIC_API_THROTTLES)
+def upstream_status(request) -> Response:
+    return Response({
+        'rate_limiter': get_rate_limit_stats(),
+        'single_flight': get_single_flight_stats(),
+        'account_batching': get_account_batching_stats(),
+        'payload_fingerprints': get_upstream_fingerprint_stats(),
+        'circuit_breaker': get_circuit_breaker_stats(),
+        'request_metrics': get_upstream_metrics(),
+    })
+
+
+@api_view(["GET"])
+@throttle_classes(PUBLIC_API_THROTTLES)
+def crawl_telemetry(request) -> Response:
+    return Response({
+        **get_crawl_telemetry(),
+        'enrichment': get_enrichment_backlog_stats(),
+    })
+
+
+@api_view(["GET"])
+@throttle_classes(PUBLIC_API_THROTTLES)
+def refresh_profiles(request) -> Response:
+    return Response(get_refresh_profiles())
+
+
 @api_view(["GET"])
 @throttle_classes(PUBLIC_API_THROTTLES)
 def agentic_trace_dashboard(request) -> Response: